@@ -0,0 +1,25 @@
+"""add videos thumbnails
+
+Revision ID: 2e8b5c1f7a94
+Revises: 9f4c2a7d1e36
+Create Date: 2026-10-18 18:55:32.604117
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "2e8b5c1f7a94"
+down_revision = "9f4c2a7d1e36"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column("videos", sa.Column("thumbnails", sa.JSON(), nullable=True))
+
+
+def downgrade():
+    op.drop_column("videos", "thumbnails")
@@ -0,0 +1,77 @@
+"""add videos version
+
+Revision ID: 3c1f7a9e5b20
+Revises: fa2d49431393
+Create Date: 2026-10-18 12:24:51.870412
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "3c1f7a9e5b20"
+down_revision = "fa2d49431393"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "videos",
+        sa.Column(
+            "version",
+            sa.BigInteger(),
+            server_default=sa.text("1"),
+            nullable=False,
+        ),
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION bump_row_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := OLD.version + 1;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER videos_row_version
+        BEFORE UPDATE ON videos
+        FOR EACH ROW WHEN (OLD IS DISTINCT FROM NEW)
+        EXECUTE FUNCTION bump_row_version();
+        """
+    )
+
+    # One bump per statement rather than per row, so bulk writes stay cheap.
+    op.execute(
+        """
+        CREATE FUNCTION bump_list_version() RETURNS trigger AS $$
+        BEGIN
+            PERFORM catalog_counter_add(TG_ARGV[0], 1);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER videos_list_version
+        AFTER INSERT OR UPDATE OR DELETE ON videos
+        FOR EACH STATEMENT EXECUTE FUNCTION bump_list_version('videos:version');
+        """
+    )
+    op.execute("SELECT catalog_counter_add('videos:version', 1);")
+
+
+def downgrade():
+    op.execute("DROP TRIGGER videos_list_version ON videos;")
+    op.execute("DROP FUNCTION bump_list_version();")
+    op.execute("DROP TRIGGER videos_row_version ON videos;")
+    op.execute("DROP FUNCTION bump_row_version();")
+    op.execute("DELETE FROM catalog_counters WHERE name = 'videos:version';")
+    op.drop_column("videos", "version")
@@ -0,0 +1,60 @@
+"""add outbox table
+
+Revision ID: 5b7d1f3a9c2e
+Revises: 8d2e4b6a1c07
+Create Date: 2026-10-18 16:02:13.540218
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "5b7d1f3a9c2e"
+down_revision = "8d2e4b6a1c07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "outbox",
+        sa.Column("id", sa.BigInteger(), nullable=False),
+        sa.Column("topic", sa.String(), nullable=False),
+        sa.Column("operation", sa.String(), nullable=False),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("payload", sa.JSON(), nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.Column(
+            "available_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_outbox_available_at_id",
+        "outbox",
+        ["available_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_outbox_topic_key_id",
+        "outbox",
+        ["topic", "key", "id"],
+        unique=False,
+    )
+
+
+def downgrade():
+    op.drop_index("ix_outbox_topic_key_id", table_name="outbox")
+    op.drop_index("ix_outbox_available_at_id", table_name="outbox")
+    op.drop_table("outbox")
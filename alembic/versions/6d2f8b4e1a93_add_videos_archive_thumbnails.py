@@ -0,0 +1,28 @@
+"""add videos archive thumbnails
+
+Revision ID: 6d2f8b4e1a93
+Revises: 4c9e1a7f3b25
+Create Date: 2026-10-18 22:41:17.308552
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "6d2f8b4e1a93"
+down_revision = "4c9e1a7f3b25"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        "videos_archive",
+        sa.Column("thumbnails", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade():
+    op.drop_column("videos_archive", "thumbnails")
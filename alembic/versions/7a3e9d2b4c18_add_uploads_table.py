@@ -0,0 +1,42 @@
+"""add uploads table
+
+Revision ID: 7a3e9d2b4c18
+Revises: 2e8b5c1f7a94
+Create Date: 2026-10-18 20:12:47.881350
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a3e9d2b4c18"
+down_revision = "2e8b5c1f7a94"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "uploads",
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("url", sa.String(), nullable=False),
+        sa.Column("width", sa.Integer(), nullable=False),
+        sa.Column("height", sa.Integer(), nullable=False),
+        sa.Column("size", sa.BigInteger(), nullable=False),
+        sa.Column("variants", sa.JSON(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("key"),
+        sa.UniqueConstraint("url"),
+    )
+
+
+def downgrade():
+    op.drop_table("uploads")
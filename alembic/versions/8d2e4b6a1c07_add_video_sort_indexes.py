@@ -0,0 +1,50 @@
+"""add video sort indexes
+
+Revision ID: 8d2e4b6a1c07
+Revises: 3c1f7a9e5b20
+Create Date: 2026-10-18 14:20:41.183902
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "8d2e4b6a1c07"
+down_revision = "3c1f7a9e5b20"
+branch_labels = None
+depends_on = None
+
+LIVE = "deleted = false AND delete_type IS DISTINCT FROM 'PERMANENT'"
+INDEXES = {
+    "ix_videos_live_date_id": ["date", "id"],
+    "ix_videos_live_duration_id": ["duration", "id"],
+    "ix_videos_live_title_id": ["title", "id"],
+}
+
+
+def upgrade():
+    # Built concurrently so that writes to videos aren't blocked meanwhile.
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(
+                name,
+                "videos",
+                columns,
+                unique=False,
+                postgresql_where=sa.text(LIVE),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name="videos",
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
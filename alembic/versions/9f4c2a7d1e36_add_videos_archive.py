@@ -0,0 +1,61 @@
+"""add videos archive
+
+Revision ID: 9f4c2a7d1e36
+Revises: 5b7d1f3a9c2e
+Create Date: 2026-10-18 17:41:05.327914
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9f4c2a7d1e36"
+down_revision = "5b7d1f3a9c2e"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "videos_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("slug", sa.String(), nullable=False),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("yt_id", sa.String(), nullable=False),
+        sa.Column("yt_thumbnail", sa.String(), nullable=False),
+        sa.Column("duration", sa.Integer(), nullable=False),
+        sa.Column("is_blocked_in_russia", sa.Boolean(), nullable=False),
+        sa.Column(
+            "archived_at",
+            sa.TIMESTAMP(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+
+    # Built concurrently so that writes to videos aren't blocked meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_videos_purge_pending_id",
+            "videos",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text("delete_type = 'PERMANENT'"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_videos_purge_pending_id",
+            table_name="videos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+    op.drop_table("videos_archive")
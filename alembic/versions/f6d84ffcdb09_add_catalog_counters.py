@@ -0,0 +1,152 @@
+"""add catalog counters
+
+Revision ID: f6d84ffcdb09
+Revises: 7e3bdedfd323
+Create Date: 2026-10-18 09:12:40.118204
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f6d84ffcdb09"
+down_revision = "7e3bdedfd323"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "catalog_counters",
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column(
+            "value",
+            sa.BigInteger(),
+            server_default=sa.text("0"),
+            nullable=False,
+        ),
+        sa.PrimaryKeyConstraint("name"),
+    )
+    op.create_index(
+        op.f("ix_posts_published_at"),
+        "posts",
+        ["published_at"],
+        unique=False,
+    )
+
+    op.execute(
+        """
+        CREATE FUNCTION catalog_counter_add(counter_name varchar, delta bigint)
+        RETURNS void AS $$
+            INSERT INTO catalog_counters (name, value)
+            VALUES (counter_name, delta)
+            ON CONFLICT (name)
+            DO UPDATE SET value = catalog_counters.value + EXCLUDED.value;
+        $$ LANGUAGE sql;
+        """
+    )
+
+    # Live videos and soft-deleted videos are counted separately so that
+    # count(include_deleted=True) is the sum of both counters. Permanently
+    # deleted videos are not counted at all.
+    op.execute(
+        """
+        CREATE FUNCTION video_counter_name(deleted boolean, delete_type deletetype)
+        RETURNS varchar AS $$
+            SELECT CASE
+                WHEN delete_type = 'PERMANENT' THEN NULL
+                WHEN deleted IS NOT FALSE THEN 'videos:deleted'
+                ELSE 'videos:live'
+            END;
+        $$ LANGUAGE sql IMMUTABLE;
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION videos_count_trigger() RETURNS trigger AS $$
+        DECLARE
+            old_name varchar;
+            new_name varchar;
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                old_name := video_counter_name(OLD.deleted, OLD.delete_type);
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                new_name := video_counter_name(NEW.deleted, NEW.delete_type);
+            END IF;
+            IF old_name IS DISTINCT FROM new_name THEN
+                IF old_name IS NOT NULL THEN
+                    PERFORM catalog_counter_add(old_name, -1);
+                END IF;
+                IF new_name IS NOT NULL THEN
+                    PERFORM catalog_counter_add(new_name, 1);
+                END IF;
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE FUNCTION rows_count_trigger() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' THEN
+                PERFORM catalog_counter_add(TG_ARGV[0], 1);
+            ELSIF TG_OP = 'DELETE' THEN
+                PERFORM catalog_counter_add(TG_ARGV[0], -1);
+            END IF;
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql;
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER videos_count
+        AFTER INSERT OR DELETE OR UPDATE OF deleted, delete_type ON videos
+        FOR EACH ROW EXECUTE FUNCTION videos_count_trigger();
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER posts_count
+        AFTER INSERT OR DELETE ON posts
+        FOR EACH ROW EXECUTE FUNCTION rows_count_trigger('posts');
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER comments_count
+        AFTER INSERT OR DELETE ON comments
+        FOR EACH ROW EXECUTE FUNCTION rows_count_trigger('comments');
+        """
+    )
+
+    op.execute(
+        """
+        INSERT INTO catalog_counters (name, value)
+        SELECT video_counter_name(deleted, delete_type), count(*)
+        FROM videos
+        WHERE video_counter_name(deleted, delete_type) IS NOT NULL
+        GROUP BY 1
+        UNION ALL
+        SELECT 'posts', count(*) FROM posts
+        UNION ALL
+        SELECT 'comments', count(*) FROM comments;
+        """
+    )
+
+
+def downgrade():
+    op.execute("DROP TRIGGER comments_count ON comments;")
+    op.execute("DROP TRIGGER posts_count ON posts;")
+    op.execute("DROP TRIGGER videos_count ON videos;")
+    op.execute("DROP FUNCTION rows_count_trigger();")
+    op.execute("DROP FUNCTION videos_count_trigger();")
+    op.execute("DROP FUNCTION video_counter_name(boolean, deletetype);")
+    op.execute("DROP FUNCTION catalog_counter_add(varchar, bigint);")
+    op.drop_index(op.f("ix_posts_published_at"), table_name="posts")
+    op.drop_table("catalog_counters")
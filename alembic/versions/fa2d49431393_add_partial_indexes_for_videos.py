@@ -0,0 +1,58 @@
+"""add partial indexes for videos
+
+Revision ID: fa2d49431393
+Revises: f6d84ffcdb09
+Create Date: 2026-10-18 11:02:17.529133
+
+"""
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "fa2d49431393"
+down_revision = "f6d84ffcdb09"
+branch_labels = None
+depends_on = None
+
+NOT_PURGED = "delete_type IS DISTINCT FROM 'PERMANENT'"
+
+
+def upgrade():
+    # Built concurrently so that writes to videos aren't blocked meanwhile.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_videos_live_id",
+            "videos",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text(f"deleted = false AND {NOT_PURGED}"),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.create_index(
+            "ix_videos_not_purged_id",
+            "videos",
+            ["id"],
+            unique=False,
+            postgresql_where=sa.text(NOT_PURGED),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_videos_not_purged_id",
+            table_name="videos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+        op.drop_index(
+            "ix_videos_live_id",
+            table_name="videos",
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -1,19 +1,109 @@
+import argparse
+import asyncio
+import logging
+
 import uvicorn
 import uvicorn.config
 
 from edm_su_api.internal.entity.settings import settings
 
-log_config = uvicorn.config.LOGGING_CONFIG
-log_config["formatters"]["access"]["fmt"] = (
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-log_config["formatters"]["default"]["fmt"] = (
-    "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-uvicorn.run(
-    "edm_su_api.internal.controller.http:app",
-    log_config=log_config,
-    log_level=settings.log_level.lower(),
-    host=settings.host,
-    port=settings.port,
-)
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def serve(_: argparse.Namespace) -> None:
+    log_config = uvicorn.config.LOGGING_CONFIG
+    log_config["formatters"]["access"]["fmt"] = LOG_FORMAT
+    log_config["formatters"]["default"]["fmt"] = LOG_FORMAT
+    uvicorn.run(
+        "edm_su_api.internal.controller.http:app",
+        log_config=log_config,
+        log_level=settings.log_level.lower(),
+        host=settings.host,
+        port=settings.port,
+    )
+
+
+def reindex(args: argparse.Namespace) -> None:
+    from edm_su_api.internal.controller.cli import reindex_videos  # noqa: PLC0415
+
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO)
+    asyncio.run(reindex_videos(args.batch_size, args.concurrency))
+
+
+def purge(args: argparse.Namespace) -> None:
+    from edm_su_api.internal.controller.cli import purge_deleted_videos  # noqa: PLC0415
+
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO)
+    asyncio.run(purge_deleted_videos(args.batch_size))
+
+
+def thumbnails(args: argparse.Namespace) -> None:
+    from edm_su_api.internal.controller.cli import backfill_thumbnails  # noqa: PLC0415
+
+    logging.basicConfig(format=LOG_FORMAT, level=logging.INFO)
+    asyncio.run(backfill_thumbnails(args.batch_size, args.concurrency))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="edm_su_api")
+    parser.set_defaults(handler=serve)
+    commands = parser.add_subparsers(title="commands")
+
+    serve_parser = commands.add_parser("serve", help="run the HTTP API (default)")
+    serve_parser.set_defaults(handler=serve)
+
+    reindex_parser = commands.add_parser(
+        "reindex",
+        help="rebuild the video search index without downtime",
+    )
+    reindex_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.video_export_batch_size,
+        help="videos read from the database and sent per request",
+    )
+    reindex_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="document batches sent to Meilisearch at once",
+    )
+    reindex_parser.set_defaults(handler=reindex)
+
+    purge_parser = commands.add_parser(
+        "purge",
+        help="move permanently deleted videos to the archive",
+    )
+    purge_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.video_purge_batch_size,
+        help="videos archived per transaction",
+    )
+    purge_parser.set_defaults(handler=purge)
+
+    thumbnails_parser = commands.add_parser(
+        "thumbnails",
+        help="mirror the video thumbnails missing from our storage",
+    )
+    thumbnails_parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.video_thumbnail_batch_size,
+        help="videos mirrored per transaction",
+    )
+    thumbnails_parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.video_thumbnail_concurrency,
+        help="videos fetched and uploaded at once",
+    )
+    thumbnails_parser.set_defaults(handler=thumbnails)
+
+    args = parser.parse_args()
+    args.handler(args)
+
+
+# Guarded so that the processes rendering thumbnails can import this module.
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import logging
+
+from edm_su_api.internal.controller.jobs.purge import purge_videos
+from edm_su_api.internal.controller.jobs.thumbnails import mirror_thumbnails
+from edm_su_api.internal.usecase.repository.video import (
+    MeilisearchVideoReindexRepository,
+    PostgresVideoRepository,
+)
+from edm_su_api.internal.usecase.video import ReindexVideosUseCase
+from edm_su_api.pkg.images import shutdown_image_executor
+from edm_su_api.pkg.meilisearch import ms_client
+from edm_su_api.pkg.postgres import async_session
+
+logger = logging.getLogger("app.cli")
+
+
+async def reindex_videos(batch_size: int, concurrency: int) -> None:
+    """Rebuild the video search index from the database, then swap it in."""
+    try:
+        async with async_session() as session, session.begin():
+            usecase = ReindexVideosUseCase(
+                PostgresVideoRepository(session),
+                MeilisearchVideoReindexRepository(ms_client, concurrency=concurrency),
+            )
+            count = await usecase.execute(batch_size=batch_size)
+    finally:
+        await ms_client.aclose()
+
+    logger.info("Reindexed %d videos", count)
+
+
+async def purge_deleted_videos(batch_size: int) -> None:
+    """Archive the permanently deleted videos now rather than on schedule."""
+    count = await purge_videos(batch_size)
+    logger.info("Archived %d permanently deleted videos", count)
+
+
+async def backfill_thumbnails(batch_size: int, concurrency: int) -> None:
+    """Mirror the thumbnails of every video that has none yet."""
+    try:
+        result = await mirror_thumbnails(
+            batch_size=batch_size,
+            concurrency=concurrency,
+        )
+    finally:
+        shutdown_image_executor()
+        await ms_client.aclose()
+
+    logger.info(
+        "Mirrored the thumbnails of %d videos, %d failed",
+        len(result.mirrored),
+        len(result.failed),
+    )
@@ -6,9 +6,19 @@ from fastapi import FastAPI
 from starlette.middleware.cors import CORSMiddleware
 
 from edm_su_api import __version__
+from edm_su_api.internal.controller.http.middleware import ResponseCacheMiddleware
 from edm_su_api.internal.controller.http.router import api_router
+from edm_su_api.internal.controller.http.timing import (
+    ServerTimingMiddleware,
+    TimedJSONResponse,
+)
+from edm_su_api.internal.controller.jobs import start_jobs
 from edm_su_api.internal.entity.settings import settings
+from edm_su_api.pkg.authzed import spicedb_clients
+from edm_su_api.pkg.cache import response_cache
+from edm_su_api.pkg.images import shutdown_image_executor
 from edm_su_api.pkg.meilisearch import config_ms, ms_client
+from edm_su_api.pkg.s3 import open_s3_client
 
 openapi_url = None if settings.disable_openapi else "/openapi.json"
 
@@ -44,10 +54,15 @@ logging.config.dictConfig(LOGGING_CONFIG)
 
 
 @asynccontextmanager
-async def lifespan(_: FastAPI) -> AsyncGenerator[None]:
+async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     await config_ms(ms_client)
-    yield
+    await spicedb_clients.warm_up()
+    async with open_s3_client() as s3_client, start_jobs():
+        app.state.s3_client = s3_client
+        yield
+    await spicedb_clients.close()
     await ms_client.aclose()
+    shutdown_image_executor()
 
 
 app = FastAPI(
@@ -55,12 +70,26 @@ app = FastAPI(
     debug=False,
     version=__version__,
     lifespan=lifespan,
+    default_response_class=TimedJSONResponse,
 )
 
 origins = ["https://edm.su", "http://localhost:3000"]
 
 app.include_router(api_router)
 
+if settings.response_cache_ttl > 0:
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=response_cache,
+        ttl=settings.response_cache_ttl,
+        stale_ttl=settings.response_cache_stale_ttl,
+    )
+
+if settings.server_timing:
+    app.add_middleware(
+        ServerTimingMiddleware,
+        query_threshold=settings.dev_query_threshold if settings.dev_mode else 0,
+    )
 
 app.add_middleware(
     CORSMiddleware,
@@ -68,5 +97,5 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
-    expose_headers=["x-total-count"],
+    expose_headers=["x-total-count", "x-next-cursor", "link", "x-cache", "etag"],
 )
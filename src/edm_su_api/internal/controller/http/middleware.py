@@ -0,0 +1,214 @@
+import asyncio
+import logging
+import time
+from collections.abc import Iterable
+from urllib.parse import parse_qsl, urlencode
+
+from starlette import status
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing_extensions import Self
+
+from edm_su_api.pkg.cache import CachedResponse, ResponseCache
+
+CACHE_TAGS_HEADER = "x-cache-tags"
+
+logger = logging.getLogger("app.cache")
+
+# Dropped from refresh requests: answered with a 304, they'd store nothing.
+CONDITIONAL_HEADERS = frozenset({b"if-none-match", b"if-modified-since"})
+
+
+def cache_key(scope: Scope) -> str:
+    query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+    return f"{scope['path']}?{urlencode(sorted(query))}"
+
+
+def request_header(scope: Scope, name: bytes) -> str | None:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def is_anonymous(scope: Scope) -> bool:
+    user = request_header(scope, b"x-user")
+    return not user or user.lower() == "anonymous"
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Compare an If-None-Match header with an ETag, weakly as RFC 9110 asks."""
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag.removeprefix("W/") in candidates
+
+
+def split_tags(
+    headers: Iterable[tuple[bytes, bytes]],
+) -> tuple[list[tuple[bytes, bytes]], frozenset[str]]:
+    kept = []
+    tags: set[str] = set()
+    for name, value in headers:
+        if name.lower() == CACHE_TAGS_HEADER.encode():
+            tags.update(tag.strip() for tag in value.decode().split(","))
+        else:
+            kept.append((name, value))
+    tags.discard("")
+    return kept, frozenset(tags)
+
+
+class ResponseCacheMiddleware:
+    """Serve anonymous GET responses from a shared cache.
+
+    Handlers opt in by tagging their response (see `tag_response`). Tagged
+    200 responses to anonymous requests are fresh for `ttl` seconds, then
+    served stale for up to `stale_ttl` more seconds while a single
+    background request refreshes them. Purges issued while handling other
+    requests are applied once the request, and its transaction, is done.
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        cache: ResponseCache,
+        ttl: float,
+        stale_ttl: float = 0,
+    ) -> None:
+        self.app = app
+        self.cache = cache
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._revalidating: dict[str, asyncio.Task[None]] = {}
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] != "GET":
+            async with self.cache.defer_purges():
+                await self.app(scope, receive, send)
+            return
+
+        if not is_anonymous(scope):
+            await self._fetch(scope, receive, send, key=None)
+            return
+
+        key = cache_key(scope)
+        cached = await self.cache.get(key)
+        if cached is not None:
+            age = time.monotonic() - cached.stored_at
+            if age < self.ttl:
+                await self._send_cached(scope, cached, send, "HIT", age)
+                return
+            if age < self.ttl + self.stale_ttl:
+                self._revalidate(scope, key)
+                await self._send_cached(scope, cached, send, "STALE", age)
+                return
+
+        await self._fetch(scope, receive, send, key=key)
+
+    async def _fetch(
+        self: Self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        key: str | None,
+    ) -> None:
+        """Run the request, storing the response under `key` if it's tagged."""
+        generation = self.cache.generation
+        start: Message | None = None
+        tags: frozenset[str] = frozenset()
+        body: list[bytes] = []
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start, tags
+            if message["type"] == "http.response.start":
+                headers, tags = split_tags(message.get("headers", []))
+                if key is not None and tags and message["status"] == status.HTTP_200_OK:
+                    start = {**message, "headers": headers}
+                    headers = [*headers, (b"x-cache", b"MISS")]
+                message = {**message, "headers": headers}
+            elif message["type"] == "http.response.body" and start is not None:
+                body.append(message.get("body", b""))
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+        # A purge while the handler was running may have come too late for
+        # the rows it read, so this response can't be trusted to be fresh.
+        if key is None or start is None or generation != self.cache.generation:
+            return
+        await self.cache.set(
+            key,
+            CachedResponse(
+                status=start["status"],
+                headers=start["headers"],
+                body=b"".join(body),
+                tags=tags,
+                stored_at=time.monotonic(),
+            ),
+        )
+
+    def _revalidate(self: Self, scope: Scope, key: str) -> None:
+        if key in self._revalidating:
+            return
+
+        headers = [
+            (name, value)
+            for name, value in scope["headers"]
+            if name not in CONDITIONAL_HEADERS
+        ]
+        task = asyncio.create_task(self._refresh({**scope, "headers": headers}, key))
+        self._revalidating[key] = task
+        task.add_done_callback(lambda _: self._revalidating.pop(key, None))
+
+    async def _refresh(self: Self, scope: Scope, key: str) -> None:
+        request_sent = False
+
+        async def receive() -> Message:
+            nonlocal request_sent
+            if request_sent:
+                await asyncio.Event().wait()
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(_: Message) -> None:
+            pass
+
+        try:
+            await self._fetch(scope, receive, send, key=key)
+        except Exception:
+            logger.exception("Failed to revalidate %s", key)
+
+    @staticmethod
+    async def _send_cached(
+        scope: Scope,
+        cached: CachedResponse,
+        send: Send,
+        state: str,
+        age: float,
+    ) -> None:
+        headers = [
+            *cached.headers,
+            (b"x-cache", state.encode()),
+            (b"age", str(int(age)).encode()),
+        ]
+        status_code = cached.status
+        body = cached.body
+
+        etag = dict(cached.headers).get(b"etag")
+        if_none_match = request_header(scope, b"if-none-match")
+        if etag and if_none_match and etag_matches(if_none_match, etag.decode()):
+            status_code = status.HTTP_304_NOT_MODIFIED
+            body = b""
+            headers = [
+                (name, value) for name, value in headers if name != b"content-length"
+            ]
+
+        await send(
+            {
+                "type": "http.response.start",
+                "status": status_code,
+                "headers": headers,
+            },
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,77 @@
+import logging
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from typing_extensions import Self, override
+
+from edm_su_api.pkg.timing import DB, SERIALIZE, RequestTimings, collect_timings, timed
+
+logger = logging.getLogger("app.timing")
+
+
+class TimedJSONResponse(JSONResponse):
+    """JSON response recording the time spent encoding its body."""
+
+    @override
+    def render(self: Self, content: Any) -> bytes:
+        with timed(SERIALIZE):
+            return super().render(content)
+
+
+class ServerTimingMiddleware:
+    """Tell where the time of a request went in a Server-Timing header.
+
+    The header lists the time spent in PostgreSQL, Meilisearch, SpiceDB
+    and S3 and encoding the body, up to the moment the response starts.
+
+    With a `query_threshold`, requests running more queries than that are
+    logged along with the statement they repeated the most, which is how
+    N+1 queries show up.
+    """
+
+    def __init__(
+        self: Self,
+        app: ASGIApp,
+        *,
+        query_threshold: int = 0,
+    ) -> None:
+        self.app = app
+        self.query_threshold = query_threshold
+
+    async def __call__(self: Self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        with collect_timings(track_statements=self.query_threshold > 0) as timings:
+
+            async def send_with_timing(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    message["headers"] = [
+                        *message.get("headers", []),
+                        (b"server-timing", timings.server_timing().encode()),
+                    ]
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                self._check_queries(scope, timings)
+
+    def _check_queries(self: Self, scope: Scope, timings: RequestTimings) -> None:
+        queries = timings.counts[DB]
+        if not self.query_threshold or queries <= self.query_threshold:
+            return
+
+        statement, repeats = "", 0
+        if timings.statements:
+            statement, repeats = timings.statements.most_common(1)[0]
+        logger.warning(
+            "%s %s ran %d queries, %d of them the same: %s",
+            scope["method"],
+            scope["path"],
+            queries,
+            repeats,
+            statement,
+        )
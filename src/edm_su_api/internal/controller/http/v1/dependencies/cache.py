@@ -0,0 +1,44 @@
+import hashlib
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Request, Response, status
+
+from edm_su_api import __version__
+from edm_su_api.internal.controller.http.middleware import (
+    CACHE_TAGS_HEADER,
+    etag_matches,
+)
+from edm_su_api.internal.usecase.repository.cache import ResponseCacheRepository
+from edm_su_api.pkg.cache import response_cache
+
+
+def tag_response(response: Response, *tags: str) -> None:
+    """Let the response cache store the response under the given tags."""
+    response.headers[CACHE_TAGS_HEADER] = ",".join(tags)
+
+
+def make_etag(*parts: object) -> str:
+    """Build a strong ETag from everything the representation depends on."""
+    raw = ":".join(str(part) for part in (__version__, *parts))
+    return f'"{hashlib.blake2b(raw.encode(), digest_size=12).hexdigest()}"'
+
+
+def set_etag(request: Request, response: Response, etag: str) -> None:
+    """Set the ETag, or answer 304 if the client already has this version."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers={"ETag": etag},
+        )
+    response.headers["ETag"] = etag
+
+
+async def create_cache_repository() -> ResponseCacheRepository:
+    return ResponseCacheRepository(response_cache)
+
+
+CacheRepository = Annotated[
+    ResponseCacheRepository,
+    Depends(create_cache_repository),
+]
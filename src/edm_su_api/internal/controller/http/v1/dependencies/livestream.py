@@ -4,6 +4,10 @@ from fastapi import Depends, HTTPException, Path
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from edm_su_api.internal.controller.http.v1.dependencies.cache import CacheRepository
+from edm_su_api.internal.controller.http.v1.dependencies.upload import (
+    UploadRepository,
+)
 from edm_su_api.internal.entity.livestreams import LiveStream
 from edm_su_api.internal.usecase.exceptions.livestream import (
     LiveStreamNotFoundError,
@@ -38,32 +42,40 @@ PgRepository = Annotated[
 
 def create_get_all_live_streams_usecase(
     repository: PgRepository,
+    upload_repository: UploadRepository,
 ) -> GetAllLiveStreamsUseCase:
-    return GetAllLiveStreamsUseCase(repository=repository)
+    return GetAllLiveStreamsUseCase(
+        repository=repository,
+        upload_repo=upload_repository,
+    )
 
 
 def create_get_live_stream_usecase(
     repository: PgRepository,
+    upload_repository: UploadRepository,
 ) -> GetLiveStreamUseCase:
-    return GetLiveStreamUseCase(repository=repository)
+    return GetLiveStreamUseCase(repository=repository, upload_repo=upload_repository)
 
 
 def create_create_live_stream_usecase(
     repository: PgRepository,
+    cache_repository: CacheRepository,
 ) -> CreateLiveStreamUseCase:
-    return CreateLiveStreamUseCase(repository=repository)
+    return CreateLiveStreamUseCase(repository=repository, cache_repo=cache_repository)
 
 
 def create_delete_live_stream_usecase(
     repository: PgRepository,
+    cache_repository: CacheRepository,
 ) -> DeleteLiveStreamUseCase:
-    return DeleteLiveStreamUseCase(repository=repository)
+    return DeleteLiveStreamUseCase(repository=repository, cache_repo=cache_repository)
 
 
 def create_update_live_stream_usecase(
     repository: PgRepository,
+    cache_repository: CacheRepository,
 ) -> UpdateLiveStreamUseCase:
-    return UpdateLiveStreamUseCase(repository=repository)
+    return UpdateLiveStreamUseCase(repository=repository, cache_repo=cache_repository)
 
 
 async def find_livestream(
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from edm_su_api.internal.usecase.repository.outbox import PostgresOutboxRepository
+from edm_su_api.pkg.postgres import get_session
+
+
+async def create_outbox_repository(
+    *,
+    session: Annotated[
+        AsyncSession,
+        Depends(get_session),
+    ],
+) -> PostgresOutboxRepository:
+    return PostgresOutboxRepository(session)
+
+
+OutboxRepository = Annotated[
+    PostgresOutboxRepository,
+    Depends(create_outbox_repository),
+]
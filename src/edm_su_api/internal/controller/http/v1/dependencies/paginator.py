@@ -1,8 +1,12 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from typing import Annotated
 
-from fastapi import Depends, Query
+from fastapi import Depends, HTTPException, Query, status
 from typing_extensions import Self
 
+CURSOR_PREFIX = "id:"
+
 
 class Paginator:
     def __init__(
@@ -20,4 +24,65 @@ class Paginator:
         self.limit = limit
 
 
+def encode_cursor(last_id: int) -> str:
+    raw = f"{CURSOR_PREFIX}{last_id}".encode()
+    return urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    msg = "Invalid cursor"
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        raw = urlsafe_b64decode(padded.encode()).decode()
+    except (binascii.Error, UnicodeDecodeError) as e:
+        raise ValueError(msg) from e
+
+    prefix, _, last_id = raw.partition(":")
+    if f"{prefix}:" != CURSOR_PREFIX or not last_id.isdigit():
+        raise ValueError(msg)
+    return int(last_id)
+
+
+class CursorPaginator(Paginator):
+    """Paginator with an optional keyset cursor.
+
+    When `cursor` is set, `skip` is ignored and the page starts right after
+    the row the cursor points to.
+    """
+
+    def __init__(
+        self: Self,
+        skip: Annotated[
+            int,
+            Query(ge=0),
+        ] = 0,
+        limit: Annotated[
+            int,
+            Query(ge=1, le=50),
+        ] = 25,
+        cursor: Annotated[
+            str | None,
+            Query(
+                description=(
+                    "Opaque cursor from the `X-Next-Cursor` header of the previous page"
+                ),
+            ),
+        ] = None,
+    ) -> None:
+        super().__init__(skip, limit)
+        self.cursor = cursor
+        self.after_id: int | None = None
+
+        if cursor:
+            try:
+                self.after_id = decode_cursor(cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                    detail="Invalid cursor",
+                ) from e
+            self.skip = 0
+
+
 PaginatorDeps = Annotated[Paginator, Depends(Paginator)]
+CursorPaginatorDeps = Annotated[CursorPaginator, Depends(CursorPaginator)]
@@ -1,18 +1,160 @@
 from typing import Annotated
 
-from fastapi import Depends
+from fastapi import Depends, HTTPException, Request, status
+from typing_extensions import Self
 
+from edm_su_api.internal.controller.http.v1.dependencies.auth import (
+    CurrentUser,
+    OptionalUser,
+)
+from edm_su_api.internal.controller.http.v1.dependencies.outbox import (
+    OutboxRepository,
+)
+from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.usecase.repository.permission import (
+    AbstractPermissionCheckRepository,
+    AbstractPermissionLookupRepository,
+    CachedPermissionCheckRepository,
+    CachedPermissionLookupRepository,
+    Object,
+    OutboxPermissionRepository,
+    PermissionCheck,
+    SpiceDBPermissionCheckRepository,
+    SpiceDBPermissionLookupRepository,
     SpiceDBPermissionRepository,
 )
-from edm_su_api.pkg.authzed import get_spicedb_client
+from edm_su_api.pkg.authzed import spicedb_clients
+from edm_su_api.pkg.cache import permission_decisions, readable_resources
 
 
 async def create_spicedb_repository() -> SpiceDBPermissionRepository:
-    return SpiceDBPermissionRepository(await get_spicedb_client())
+    return SpiceDBPermissionRepository(
+        await spicedb_clients.get(),
+        permission_decisions,
+    )
 
 
 SpiceDBPermissionsRepo = Annotated[
     SpiceDBPermissionRepository,
     Depends(create_spicedb_repository),
 ]
+
+
+async def create_outbox_permissions_repository(
+    outbox_repository: OutboxRepository,
+) -> OutboxPermissionRepository:
+    return OutboxPermissionRepository(outbox_repository)
+
+
+OutboxPermissionsRepo = Annotated[
+    OutboxPermissionRepository,
+    Depends(create_outbox_permissions_repository),
+]
+
+
+async def create_permission_check_repository() -> AbstractPermissionCheckRepository:
+    repository = SpiceDBPermissionCheckRepository(await spicedb_clients.get())
+    if settings.permission_cache_ttl > 0:
+        return CachedPermissionCheckRepository(repository, permission_decisions)
+    return repository
+
+
+PermissionCheckRepository = Annotated[
+    AbstractPermissionCheckRepository,
+    Depends(create_permission_check_repository),
+]
+
+
+class RequirePermission:
+    """Reject with 403 users without `permission` on a resource.
+
+    The resource is `resource_type` with the id taken from the path
+    parameter `param`, or `resource_id` for a resource every request
+    checks, e.g. a role.
+    """
+
+    def __init__(
+        self: Self,
+        resource_type: str,
+        permission: str,
+        *,
+        param: str = "slug",
+        resource_id: str | None = None,
+    ) -> None:
+        self.resource_type = resource_type
+        self.permission = permission
+        self.param = param
+        self.resource_id = resource_id
+
+    async def __call__(
+        self: Self,
+        request: Request,
+        user: CurrentUser,
+        repository: PermissionCheckRepository,
+    ) -> None:
+        resource_id = self.resource_id or request.path_params[self.param]
+        (allowed,) = await repository.check_many(
+            [
+                PermissionCheck(
+                    Object(self.resource_type, resource_id),
+                    self.permission,
+                    Object("user", user.id),
+                ),
+            ],
+        )
+        if not allowed:
+            raise HTTPException(status.HTTP_403_FORBIDDEN)
+
+
+# Creating a resource has no resource to check yet: only admins may do it,
+# as only they get to write resources once created.
+require_admin = RequirePermission("role", "member", resource_id="admin")
+
+
+async def create_permission_lookup_repository() -> AbstractPermissionLookupRepository:
+    repository = SpiceDBPermissionLookupRepository(await spicedb_clients.get())
+    if settings.permission_lookup_cache_ttl > 0:
+        return CachedPermissionLookupRepository(repository, readable_resources)
+    return repository
+
+
+PermissionLookupRepository = Annotated[
+    AbstractPermissionLookupRepository,
+    Depends(create_permission_lookup_repository),
+]
+
+
+class ReadableSlugs:
+    """Slugs of the `resource_type` resources the user may read.
+
+    `None` means no filter: when filtering is off, for guests, and for users
+    who read nothing beyond what `user:*` is granted. Guests only read
+    through `user:*` readers, and those cover every listed row, so such
+    users see the plain listing too. The `user:*` lookup is cached once and
+    shared by every user.
+    """
+
+    def __init__(self: Self, resource_type: str, permission: str = "read") -> None:
+        self.resource_type = resource_type
+        self.permission = permission
+
+    async def __call__(
+        self: Self,
+        user: OptionalUser,
+        repository: PermissionLookupRepository,
+    ) -> frozenset[str] | None:
+        if not settings.permission_listing_filter or user is None or user.is_guest:
+            return None
+        readable = await repository.lookup_resources(
+            self.resource_type,
+            self.permission,
+            Object("user", user.id),
+        )
+        public = await repository.lookup_resources(
+            self.resource_type,
+            self.permission,
+            Object("user", "*"),
+        )
+        if readable <= public:
+            return None
+        return readable
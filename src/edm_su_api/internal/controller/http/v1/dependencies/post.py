@@ -3,9 +3,13 @@ from typing import Annotated
 from fastapi import Depends, HTTPException, Path, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from edm_su_api.internal.controller.http.v1.dependencies.cache import CacheRepository
 from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
     SpiceDBPermissionsRepo,
 )
+from edm_su_api.internal.controller.http.v1.dependencies.upload import (
+    UploadRepository,
+)
 from edm_su_api.internal.entity.post import Post
 from edm_su_api.internal.usecase.exceptions.post import PostNotFoundError
 from edm_su_api.internal.usecase.post import (
@@ -44,15 +48,17 @@ def create_create_post_usecase(
     *,
     repository: PgRepository,
     spicedb_repository: SpiceDBPermissionsRepo,
+    cache_repository: CacheRepository,
 ) -> CreatePostUseCase:
-    return CreatePostUseCase(repository, spicedb_repository)
+    return CreatePostUseCase(repository, spicedb_repository, cache_repository)
 
 
 def create_get_all_posts_usecase(
     *,
     repository: PgRepository,
+    upload_repository: UploadRepository,
 ) -> GetAllPostsUseCase:
-    return GetAllPostsUseCase(repository)
+    return GetAllPostsUseCase(repository, upload_repo=upload_repository)
 
 
 def create_get_count_posts_usecase(
@@ -65,16 +71,18 @@ def create_get_count_posts_usecase(
 def create_get_post_by_slug_usecase(
     *,
     repository: PgRepository,
+    upload_repository: UploadRepository,
 ) -> GetPostBySlugUseCase:
-    return GetPostBySlugUseCase(repository)
+    return GetPostBySlugUseCase(repository, upload_repo=upload_repository)
 
 
 def create_delete_post_usecase(
     *,
     repository: PgRepository,
     spicedb_repository: SpiceDBPermissionsRepo,
+    cache_repository: CacheRepository,
 ) -> DeletePostUseCase:
-    return DeletePostUseCase(repository, spicedb_repository)
+    return DeletePostUseCase(repository, spicedb_repository, cache_repository)
 
 
 async def create_pg_history_repository(
@@ -98,8 +106,14 @@ def create_update_post_usecase(
     repository: PgRepository,
     history_repository: PgHistoryRepository,
     spicedb_repository: SpiceDBPermissionsRepo,
+    cache_repository: CacheRepository,
 ) -> UpdatePostUseCase:
-    return UpdatePostUseCase(repository, history_repository, spicedb_repository)
+    return UpdatePostUseCase(
+        repository,
+        history_repository,
+        spicedb_repository,
+        cache_repository,
+    )
 
 
 def create_get_post_history_usecase(
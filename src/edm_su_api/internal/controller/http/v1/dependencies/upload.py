@@ -1,12 +1,27 @@
 from typing import Annotated
 
 from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from types_aiobotocore_s3.client import S3Client
 
+from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.usecase.repository.upload import (
+    ExecutorImageRenderer,
+    PostgresUploadRepository,
+    S3MultipartUploadRepository,
     S3PreSignedUploadRepository,
+    S3UploadObjectRepository,
 )
-from edm_su_api.internal.usecase.upload import GeneratePreSignedUploadUseCase
+from edm_su_api.internal.usecase.upload import (
+    AbortMultipartUploadUseCase,
+    CompleteImageUploadUseCase,
+    CompleteMultipartUploadUseCase,
+    CreateMultipartUploadUseCase,
+    GeneratePreSignedUploadUseCase,
+    GenerateUploadPartUrlsUseCase,
+)
+from edm_su_api.pkg.images import get_image_executor, image_formats
+from edm_su_api.pkg.postgres import get_session
 from edm_su_api.pkg.s3 import get_s3_client
 
 
@@ -23,3 +38,64 @@ def create_generate_pre_signed_upload_use_case(
     ],
 ) -> GeneratePreSignedUploadUseCase:
     return GeneratePreSignedUploadUseCase(repo)
+
+
+def create_upload_repository(
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> PostgresUploadRepository:
+    return PostgresUploadRepository(session)
+
+
+UploadRepository = Annotated[
+    PostgresUploadRepository,
+    Depends(create_upload_repository),
+]
+
+
+def create_complete_image_upload_use_case(
+    repository: UploadRepository,
+    s3_client: Annotated[S3Client, Depends(get_s3_client)],
+) -> CompleteImageUploadUseCase:
+    return CompleteImageUploadUseCase(
+        repository,
+        S3UploadObjectRepository(s3_client),
+        ExecutorImageRenderer(get_image_executor(), formats=image_formats()),
+        max_size=settings.upload_max_image_size,
+        max_pixels=settings.upload_max_image_pixels,
+    )
+
+
+def create_multipart_upload_repository(
+    s3_client: Annotated[S3Client, Depends(get_s3_client)],
+) -> S3MultipartUploadRepository:
+    return S3MultipartUploadRepository(s3_client)
+
+
+MultipartUploadRepository = Annotated[
+    S3MultipartUploadRepository,
+    Depends(create_multipart_upload_repository),
+]
+
+
+def create_create_multipart_upload_use_case(
+    repository: MultipartUploadRepository,
+) -> CreateMultipartUploadUseCase:
+    return CreateMultipartUploadUseCase(repository)
+
+
+def create_generate_upload_part_urls_use_case(
+    repository: MultipartUploadRepository,
+) -> GenerateUploadPartUrlsUseCase:
+    return GenerateUploadPartUrlsUseCase(repository)
+
+
+def create_complete_multipart_upload_use_case(
+    repository: MultipartUploadRepository,
+) -> CompleteMultipartUploadUseCase:
+    return CompleteMultipartUploadUseCase(repository)
+
+
+def create_abort_multipart_upload_use_case(
+    repository: MultipartUploadRepository,
+) -> AbortMultipartUploadUseCase:
+    return AbortMultipartUploadUseCase(repository)
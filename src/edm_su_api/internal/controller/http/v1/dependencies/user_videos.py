@@ -3,7 +3,10 @@ from typing import Annotated
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.usecase.repository.user_videos import (
+    AbstractUserVideosRepository,
+    CachedUserVideosRepository,
     PostgresUserVideosRepository,
 )
 from edm_su_api.internal.usecase.user_videos import (
@@ -11,6 +14,7 @@ from edm_su_api.internal.usecase.user_videos import (
     LikeVideoUseCase,
     UnlikeVideoUseCase,
 )
+from edm_su_api.pkg.cache import liked_videos_cache
 from edm_su_api.pkg.postgres import get_session
 
 
@@ -30,16 +34,31 @@ PgRepository = Annotated[
 ]
 
 
-def create_like_video_usecase(
+async def create_user_videos_repository(
     *,
     repository: PgRepository,
+) -> AbstractUserVideosRepository:
+    if settings.liked_videos_cache_ttl > 0:
+        return CachedUserVideosRepository(repository, liked_videos_cache)
+    return repository
+
+
+UserVideosRepository = Annotated[
+    AbstractUserVideosRepository,
+    Depends(create_user_videos_repository),
+]
+
+
+def create_like_video_usecase(
+    *,
+    repository: UserVideosRepository,
 ) -> LikeVideoUseCase:
     return LikeVideoUseCase(repository)
 
 
 def create_unlike_video_usecase(
     *,
-    repository: PgRepository,
+    repository: UserVideosRepository,
 ) -> UnlikeVideoUseCase:
     return UnlikeVideoUseCase(repository)
 
@@ -1,29 +1,54 @@
+from datetime import date
 from typing import Annotated
 
-from fastapi import Depends, HTTPException, Path
+from fastapi import Depends, HTTPException, Path, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette import status
 
+from edm_su_api.internal.controller.http.v1.dependencies.auth import OptionalUser
+from edm_su_api.internal.controller.http.v1.dependencies.cache import (
+    CacheRepository,
+    make_etag,
+    set_etag,
+)
+from edm_su_api.internal.controller.http.v1.dependencies.outbox import (
+    OutboxRepository,
+)
 from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
-    SpiceDBPermissionsRepo,
+    OutboxPermissionsRepo,
+    ReadableSlugs,
+)
+from edm_su_api.internal.controller.http.v1.dependencies.user_videos import (
+    UserVideosRepository,
 )
-from edm_su_api.internal.entity.video import Video
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.video import DurationBucket, Video, VideoFilter
 from edm_su_api.internal.usecase.exceptions.video import VideoNotFoundError
+from edm_su_api.internal.usecase.repository.suggest import (
+    PrefixIndexVideoSuggestionRepository,
+)
 from edm_su_api.internal.usecase.repository.video import (
     MeilisearchVideoRepository,
+    OutboxFullTextVideoRepository,
     PostgresVideoRepository,
 )
 from edm_su_api.internal.usecase.video import (
     CreateVideoUseCase,
     DeleteVideoUseCase,
+    ExportVideosUseCase,
     GetAllVideosUseCase,
     GetCountVideosUseCase,
     GetVideoBySlugUseCase,
+    GetVideoListVersionUseCase,
+    ImportVideosUseCase,
     RestoreVideoUseCase,
+    SearchVideosUseCase,
+    SuggestVideosUseCase,
     UpdateVideoUseCase,
 )
 from edm_su_api.pkg.meilisearch import ms_client
 from edm_su_api.pkg.postgres import get_session
+from edm_su_api.pkg.suggest import video_suggestions
 
 
 async def create_pg_repository(
@@ -52,11 +77,51 @@ MeilisearchRepository = Annotated[
 ]
 
 
+async def create_outbox_ms_repository(
+    outbox_repository: OutboxRepository,
+    ms_repository: MeilisearchRepository,
+) -> OutboxFullTextVideoRepository:
+    return OutboxFullTextVideoRepository(outbox_repository, ms_repository)
+
+
+OutboxMeilisearchRepository = Annotated[
+    OutboxFullTextVideoRepository,
+    Depends(create_outbox_ms_repository),
+]
+
+
+async def create_suggest_repository() -> PrefixIndexVideoSuggestionRepository:
+    return PrefixIndexVideoSuggestionRepository(video_suggestions)
+
+
+SuggestRepository = Annotated[
+    PrefixIndexVideoSuggestionRepository,
+    Depends(create_suggest_repository),
+]
+
+
 def create_get_all_videos_usecase(
     *,
     repository: PgRepository,
+    user_videos_repository: UserVideosRepository,
 ) -> GetAllVideosUseCase:
-    return GetAllVideosUseCase(repository)
+    return GetAllVideosUseCase(repository, user_videos_repository)
+
+
+def create_search_videos_usecase(
+    *,
+    repository: PgRepository,
+    ms_repository: MeilisearchRepository,
+    user_videos_repository: UserVideosRepository,
+) -> SearchVideosUseCase:
+    return SearchVideosUseCase(repository, ms_repository, user_videos_repository)
+
+
+def create_export_videos_usecase(
+    *,
+    repository: PgRepository,
+) -> ExportVideosUseCase:
+    return ExportVideosUseCase(repository)
 
 
 def create_count_videos_usecase(
@@ -66,46 +131,169 @@ def create_count_videos_usecase(
     return GetCountVideosUseCase(repository)
 
 
+def create_get_video_list_version_usecase(
+    *,
+    repository: PgRepository,
+) -> GetVideoListVersionUseCase:
+    return GetVideoListVersionUseCase(repository)
+
+
 def create_get_video_by_slug_usecase(
     *,
     repository: PgRepository,
+    user_videos_repository: UserVideosRepository,
 ) -> GetVideoBySlugUseCase:
-    return GetVideoBySlugUseCase(repository)
+    return GetVideoBySlugUseCase(repository, user_videos_repository)
 
 
 def create_delete_video_usecase(
     *,
     repository: PgRepository,
-    ms_repository: MeilisearchRepository,
-    spicedb_repository: SpiceDBPermissionsRepo,
+    full_text_repository: OutboxMeilisearchRepository,
+    permissions_repository: OutboxPermissionsRepo,
+    cache_repository: CacheRepository,
+    suggest_repository: SuggestRepository,
 ) -> DeleteVideoUseCase:
-    return DeleteVideoUseCase(repository, ms_repository, spicedb_repository)
+    return DeleteVideoUseCase(
+        repository,
+        full_text_repository,
+        permissions_repository,
+        cache_repository,
+        suggest_repository,
+    )
 
 
 def create_create_video_usecase(
     *,
     repository: PgRepository,
-    ms_repository: MeilisearchRepository,
-    spicedb_repository: SpiceDBPermissionsRepo,
+    full_text_repository: OutboxMeilisearchRepository,
+    permissions_repository: OutboxPermissionsRepo,
+    cache_repository: CacheRepository,
+    suggest_repository: SuggestRepository,
 ) -> CreateVideoUseCase:
-    return CreateVideoUseCase(repository, ms_repository, spicedb_repository)
+    return CreateVideoUseCase(
+        repository,
+        full_text_repository,
+        permissions_repository,
+        cache_repository,
+        suggest_repository,
+    )
+
+
+def create_import_videos_usecase(
+    *,
+    repository: PgRepository,
+    full_text_repository: OutboxMeilisearchRepository,
+    permissions_repository: OutboxPermissionsRepo,
+    cache_repository: CacheRepository,
+    suggest_repository: SuggestRepository,
+) -> ImportVideosUseCase:
+    return ImportVideosUseCase(
+        repository,
+        full_text_repository,
+        permissions_repository,
+        cache_repository,
+        suggest_repository,
+        chunk_size=settings.video_import_chunk_size,
+    )
 
 
 def create_update_video_usecase(
     *,
     repository: PgRepository,
-    ms_repository: MeilisearchRepository,
+    full_text_repository: OutboxMeilisearchRepository,
+    cache_repository: CacheRepository,
+    suggest_repository: SuggestRepository,
 ) -> UpdateVideoUseCase:
-    return UpdateVideoUseCase(repository, ms_repository)
+    return UpdateVideoUseCase(
+        repository,
+        full_text_repository,
+        cache_repo=cache_repository,
+        suggest_repo=suggest_repository,
+    )
+
+
+def create_suggest_videos_usecase(
+    *,
+    suggest_repository: SuggestRepository,
+) -> SuggestVideosUseCase:
+    return SuggestVideosUseCase(suggest_repository)
 
 
 def create_restore_video_usecase(
     *,
     repository: PgRepository,
-    ms_repository: MeilisearchRepository,
-    spicedb_repository: SpiceDBPermissionsRepo,
+    full_text_repository: OutboxMeilisearchRepository,
+    permissions_repository: OutboxPermissionsRepo,
+    cache_repository: CacheRepository,
+    suggest_repository: SuggestRepository,
 ) -> RestoreVideoUseCase:
-    return RestoreVideoUseCase(repository, ms_repository, spicedb_repository)
+    return RestoreVideoUseCase(
+        repository,
+        full_text_repository,
+        permissions_repository,
+        cache_repository,
+        suggest_repository,
+    )
+
+
+def get_video_filter(
+    date_from: Annotated[
+        date | None,
+        Query(description="Only videos published on or after this date"),
+    ] = None,
+    date_to: Annotated[
+        date | None,
+        Query(description="Only videos published on or before this date"),
+    ] = None,
+    duration: Annotated[
+        DurationBucket | None,
+        Query(
+            description=(
+                "Only videos of this length: `short` is under 30 minutes, "
+                "`medium` is 30 to 60 minutes, `long` is an hour and more"
+            ),
+        ),
+    ] = None,
+    is_blocked_in_russia: Annotated[
+        bool | None,
+        Query(description="Only videos that are (or aren't) blocked in Russia"),
+    ] = None,
+    slugs: Annotated[
+        frozenset[str] | None,
+        Depends(ReadableSlugs("video")),
+    ] = None,
+) -> VideoFilter:
+    return VideoFilter(
+        date_from=date_from,
+        date_to=date_to,
+        duration=duration,
+        is_blocked_in_russia=is_blocked_in_russia,
+        slugs=slugs,
+    )
+
+
+VideoFilterDeps = Annotated[VideoFilter, Depends(get_video_filter)]
+
+
+async def check_videos_etag(
+    request: Request,
+    response: Response,
+    user: OptionalUser,
+    usecase: Annotated[
+        GetVideoListVersionUseCase,
+        Depends(create_get_video_list_version_usecase),
+    ],
+) -> None:
+    """Answer 304 before the page is queried if the client's copy is current.
+
+    Favorite marks are per user, so only anonymous lists get an ETag.
+    """
+    if user is not None:
+        return
+    version = await usecase.execute()
+    query = sorted(request.query_params.multi_items())
+    set_etag(request, response, make_etag("videos", version, query))
 
 
 async def find_video(
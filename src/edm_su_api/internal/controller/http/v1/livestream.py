@@ -1,9 +1,10 @@
 from datetime import date, datetime, timedelta, timezone
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from starlette import status
 
+from edm_su_api.internal.controller.http.v1.dependencies.cache import tag_response
 from edm_su_api.internal.controller.http.v1.dependencies.livestream import (
     FindLivestream,
     create_create_live_stream_usecase,
@@ -29,6 +30,10 @@ from edm_su_api.internal.usecase.livestream import (
     GetAllLiveStreamsUseCase,
     UpdateLiveStreamUseCase,
 )
+from edm_su_api.internal.usecase.repository.cache import (
+    LIVESTREAMS_LIST,
+    livestream_tag,
+)
 
 router = APIRouter(prefix="/livestreams", tags=["LiveStreams"])
 
@@ -69,6 +74,7 @@ async def new_stream(
     summary="Get live streams",
 )
 async def get_streams(
+    response: Response,
     usecase: Annotated[
         GetAllLiveStreamsUseCase,
         Depends(create_get_all_live_streams_usecase),
@@ -90,6 +96,7 @@ async def get_streams(
         ),
     ],
 ) -> list[LiveStream]:
+    tag_response(response, LIVESTREAMS_LIST)
     return await usecase.execute(start, end)
 
 
@@ -99,8 +106,10 @@ async def get_streams(
 )
 # ruff: noqa: FAST003 False positive. The argument is used depending on
 async def get_stream(
+    response: Response,
     stream: FindLivestream,
 ) -> LiveStream:
+    tag_response(response, livestream_tag(stream.id))
     return stream
 
 
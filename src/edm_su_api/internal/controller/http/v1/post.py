@@ -5,9 +5,15 @@ from fastapi import APIRouter, Depends, HTTPException, Response, status
 from edm_su_api.internal.controller.http.v1.dependencies.auth import (
     CurrentUser,
 )
+from edm_su_api.internal.controller.http.v1.dependencies.cache import tag_response
 from edm_su_api.internal.controller.http.v1.dependencies.paginator import (
     PaginatorDeps,
 )
+from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
+    ReadableSlugs,
+    RequirePermission,
+    require_admin,
+)
 from edm_su_api.internal.controller.http.v1.dependencies.post import (
     FindPost,
     create_create_post_usecase,
@@ -38,12 +44,14 @@ from edm_su_api.internal.usecase.post import (
     GetPostHistoryUseCase,
     UpdatePostUseCase,
 )
+from edm_su_api.internal.usecase.repository.cache import POSTS_LIST, post_tag
 
 router = APIRouter(tags=["Posts"])
 
 
 @router.post(
     "",
+    dependencies=[Depends(require_admin)],
     status_code=status.HTTP_201_CREATED,
     summary="Create post",
 )
@@ -80,6 +88,7 @@ async def new_post(
 async def get_posts(
     response: Response,
     paginate: PaginatorDeps,
+    slugs: Annotated[frozenset[str] | None, Depends(ReadableSlugs("post"))],
     usecase: Annotated[
         GetAllPostsUseCase,
         Depends(create_get_all_posts_usecase),
@@ -89,10 +98,12 @@ async def get_posts(
         Depends(create_get_count_posts_usecase),
     ],
 ) -> list[Post]:
-    response.headers["X-Total-Count"] = str(await count_usecase.execute())
+    response.headers["X-Total-Count"] = str(await count_usecase.execute(slugs))
+    tag_response(response, POSTS_LIST)
     return await usecase.execute(
         paginate.skip,
         paginate.limit,
+        slugs,
     )
 
 
@@ -101,12 +112,14 @@ async def get_posts(
     summary="Get post",
 )
 # ruff: noqa: FAST003 False positive. The argument is used depending on
-async def get_post(post: FindPost) -> Post:
+async def get_post(response: Response, post: FindPost) -> Post:
+    tag_response(response, post_tag(post.id))
     return post
 
 
 @router.delete(
     "/{slug}",
+    dependencies=[Depends(RequirePermission("post", "write"))],
     status_code=status.HTTP_204_NO_CONTENT,
     summary="Delete post",
 )
@@ -133,6 +146,7 @@ async def delete_post(
 
 @router.put(
     "/{slug}",
+    dependencies=[Depends(RequirePermission("post", "write"))],
     summary="Update post",
 )
 async def update_post(
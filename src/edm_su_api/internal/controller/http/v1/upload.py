@@ -1,17 +1,39 @@
 from typing import Annotated
 from uuid import uuid4
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from pydantic import BaseModel, Field, HttpUrl, TypeAdapter
 
 from edm_su_api.internal.controller.http.v1.dependencies.auth import (
     CurrentUser,
 )
 from edm_su_api.internal.controller.http.v1.dependencies.upload import (
+    create_abort_multipart_upload_use_case,
+    create_complete_image_upload_use_case,
+    create_complete_multipart_upload_use_case,
+    create_create_multipart_upload_use_case,
     create_generate_pre_signed_upload_use_case,
+    create_generate_upload_part_urls_use_case,
+)
+from edm_su_api.internal.entity.upload import (
+    CompletedPart,
+    ImageSet,
+    MultipartUpload,
+    UploadPart,
+)
+from edm_su_api.internal.usecase.exceptions.upload import (
+    UploadNotFoundError,
+    UploadNotImageError,
+    UploadPartsInvalidError,
+    UploadTooLargeError,
 )
 from edm_su_api.internal.usecase.upload import (
+    AbortMultipartUploadUseCase,
+    CompleteImageUploadUseCase,
+    CompleteMultipartUploadUseCase,
+    CreateMultipartUploadUseCase,
     GeneratePreSignedUploadUseCase,
+    GenerateUploadPartUrlsUseCase,
 )
 
 router = APIRouter(tags=["Upload"])
@@ -41,3 +63,164 @@ async def generate_pre_signed_upload(
     url_str = await use_case.execute(query.key, query.expires_in)
     url = TypeAdapter(HttpUrl).validate_python(url_str)
     return PreSignedUploadResponse(url=url)
+
+
+class CompleteImageUploadRequest(BaseModel):
+    key: str = Field(min_length=1)
+
+
+@router.post(
+    path="/complete",
+    summary="Process an uploaded image",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Nothing uploaded at `key`"},
+        status.HTTP_413_CONTENT_TOO_LARGE: {"description": "Image too large"},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {"description": "Not an image"},
+    },
+)
+async def complete_image_upload(
+    request: CompleteImageUploadRequest,
+    use_case: Annotated[
+        CompleteImageUploadUseCase,
+        Depends(create_complete_image_upload_use_case),
+    ],
+    user: CurrentUser,
+) -> ImageSet:
+    """Make the variants of an image uploaded through a pre-signed URL.
+
+    Call once the upload is done. The original is resized to several
+    widths and encoded in modern formats, and its dimensions and sizes are
+    recorded so that posts and livestreams can offer responsive images.
+    """
+    try:
+        return await use_case.execute(request.key, user.id)
+    except UploadNotFoundError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e)) from e
+    except UploadTooLargeError as e:
+        raise HTTPException(status.HTTP_413_CONTENT_TOO_LARGE, str(e)) from e
+    except UploadNotImageError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, str(e)) from e
+
+
+class MultipartUploadParams(BaseModel):
+    key: str = Field(min_length=1)
+    upload_id: str = Field(min_length=1)
+
+
+class CreateMultipartUploadRequest(BaseModel):
+    key: str = Field(min_length=1)
+    parts: int = Field(ge=1, le=10_000, description="Number of parts to sign")
+    content_type: str = "application/octet-stream"
+    expires_in: int = Field(1800, ge=60, le=3600)
+
+
+class GenerateUploadPartUrlsRequest(MultipartUploadParams):
+    part_numbers: list[Annotated[int, Field(ge=1, le=10_000)]] = Field(
+        min_length=1,
+        max_length=10_000,
+    )
+    expires_in: int = Field(1800, ge=60, le=3600)
+
+
+class CompleteMultipartUploadRequest(MultipartUploadParams):
+    parts: list[CompletedPart] = Field(min_length=1, max_length=10_000)
+
+
+class CompleteMultipartUploadResponse(BaseModel):
+    url: HttpUrl
+
+
+@router.post(
+    path="/multipart",
+    summary="Start a multipart upload",
+)
+async def create_multipart_upload(
+    request: CreateMultipartUploadRequest,
+    use_case: Annotated[
+        CreateMultipartUploadUseCase,
+        Depends(create_create_multipart_upload_use_case),
+    ],
+    _: CurrentUser,
+) -> MultipartUpload:
+    """Start an upload of a large file in parts.
+
+    Every part but the last must be at least 5 MiB. Parts can be PUT to
+    their URLs in parallel; keep the `ETag` header of each response, the
+    upload is finished by passing them to `/multipart/complete`.
+    """
+    return await use_case.execute(
+        request.key,
+        request.parts,
+        request.content_type,
+        request.expires_in,
+    )
+
+
+@router.post(
+    path="/multipart/parts",
+    summary="Sign parts of a multipart upload again",
+)
+async def generate_upload_part_urls(
+    request: GenerateUploadPartUrlsRequest,
+    use_case: Annotated[
+        GenerateUploadPartUrlsUseCase,
+        Depends(create_generate_upload_part_urls_use_case),
+    ],
+    _: CurrentUser,
+) -> list[UploadPart]:
+    """Get new URLs for parts, to resume an upload once the old ones expired."""
+    return await use_case.execute(
+        request.key,
+        request.upload_id,
+        request.part_numbers,
+        request.expires_in,
+    )
+
+
+@router.post(
+    path="/multipart/complete",
+    summary="Complete a multipart upload",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Upload not found"},
+        status.HTTP_422_UNPROCESSABLE_CONTENT: {
+            "description": "Parts missing, too small or with a wrong ETag",
+        },
+    },
+)
+async def complete_multipart_upload(
+    request: CompleteMultipartUploadRequest,
+    use_case: Annotated[
+        CompleteMultipartUploadUseCase,
+        Depends(create_complete_multipart_upload_use_case),
+    ],
+    _: CurrentUser,
+) -> CompleteMultipartUploadResponse:
+    try:
+        url = await use_case.execute(request.key, request.upload_id, request.parts)
+    except UploadNotFoundError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e)) from e
+    except UploadPartsInvalidError as e:
+        raise HTTPException(status.HTTP_422_UNPROCESSABLE_CONTENT, str(e)) from e
+    return CompleteMultipartUploadResponse(
+        url=TypeAdapter(HttpUrl).validate_python(url),
+    )
+
+
+@router.post(
+    path="/multipart/abort",
+    summary="Abort a multipart upload",
+    status_code=status.HTTP_204_NO_CONTENT,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Upload not found"}},
+)
+async def abort_multipart_upload(
+    request: MultipartUploadParams,
+    use_case: Annotated[
+        AbortMultipartUploadUseCase,
+        Depends(create_abort_multipart_upload_use_case),
+    ],
+    _: CurrentUser,
+) -> None:
+    try:
+        await use_case.execute(request.key, request.upload_id)
+    except UploadNotFoundError as e:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(e)) from e
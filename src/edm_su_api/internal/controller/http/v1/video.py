@@ -1,30 +1,63 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, Response
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Path,
+    Query,
+    Request,
+    Response,
+)
+from fastapi.responses import StreamingResponse
 from starlette import status
 
 from edm_su_api.internal.controller.http.v1.dependencies.auth import (
     OptionalUser,
 )
+from edm_su_api.internal.controller.http.v1.dependencies.cache import (
+    make_etag,
+    set_etag,
+    tag_response,
+)
 from edm_su_api.internal.controller.http.v1.dependencies.paginator import (
+    CursorPaginatorDeps,
     PaginatorDeps,
+    encode_cursor,
+)
+from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
+    RequirePermission,
+    require_admin,
 )
 from edm_su_api.internal.controller.http.v1.dependencies.video import (
     FindVideoIncludingDeleted,
+    VideoFilterDeps,
+    check_videos_etag,
     create_count_videos_usecase,
     create_create_video_usecase,
     create_delete_video_usecase,
+    create_export_videos_usecase,
     create_get_all_videos_usecase,
     create_get_video_by_slug_usecase,
+    create_import_videos_usecase,
     create_restore_video_usecase,
+    create_search_videos_usecase,
+    create_suggest_videos_usecase,
     create_update_video_usecase,
 )
 from edm_su_api.internal.controller.http.v1.requests.video import UpdateVideoRequest
+from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.entity.video import (
     DeleteType,
+    DurationBucket,
+    FoundVideo,
     NewVideoDto,
     UpdateVideoDto,
     Video,
+    VideoImportResult,
+    VideoSort,
+    VideoSuggestion,
 )
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoAlreadyDeletedError,
@@ -33,15 +66,28 @@ from edm_su_api.internal.usecase.exceptions.video import (
     VideoNotFoundError,
     VideoRestoreError,
 )
+from edm_su_api.internal.usecase.repository.cache import (
+    VIDEOS_LIST,
+    VIDEOS_SEARCH,
+    video_tag,
+)
 from edm_su_api.internal.usecase.video import (
     CreateVideoUseCase,
     DeleteVideoUseCase,
+    ExportVideosUseCase,
     GetAllVideosUseCase,
     GetCountVideosUseCase,
     GetVideoBySlugUseCase,
+    ImportVideosUseCase,
     RestoreVideoUseCase,
+    SearchVideosUseCase,
+    SuggestVideosUseCase,
     UpdateVideoUseCase,
 )
+from edm_su_api.pkg.streaming import accepts_gzip, gzip_stream, ndjson
+
+MAX_IMPORT_SIZE = 10_000
+MAX_SUGGESTIONS = 20
 
 router = APIRouter(
     tags=["Videos"],
@@ -69,10 +115,27 @@ router = APIRouter(
     - `deleted`: Boolean indicating if the video is soft-deleted
     - `delete_type`: Type of deletion (temporary/permanent) if video is deleted
 
+    **Cursor pagination:**
+    Deep `skip` values get slower with every page. When a page is full, the
+    response carries an opaque `X-Next-Cursor` header (and a matching `Link`
+    header with `rel="next"`). Pass it back as `cursor` to fetch the next
+    page at constant cost; `skip` is ignored when `cursor` is set. Cursors
+    are only available with the default `-id` sort.
+
+    **Filters and sorting:**
+    Filter by publication date (`date_from`, `date_to`), by length
+    (`duration`) and by `is_blocked_in_russia`. `sort` orders by `date`,
+    `duration` or `title`; prefix it with `-` for descending order.
+
     **Headers:**
-    - `X-Total-Count`: Total number of videos (excluding deleted unless
-      include_deleted=true)
+    - `X-Total-Count`: Total number of videos matching the filters
+      (excluding deleted unless include_deleted=true)
+    - `X-Next-Cursor`: Cursor of the next page, absent on the last page
+    - `Link`: URL of the next page, absent on the last page
+    - `ETag`: Version of the list for anonymous requests; send it back in
+      `If-None-Match` to get `304 Not Modified` while nothing has changed
     """,
+    dependencies=[Depends(check_videos_etag)],
     responses={
         200: {
             "description": "List of videos with deletion status",
@@ -112,8 +175,10 @@ router = APIRouter(
     },
 )
 async def get_videos(  # noqa: PLR0913
+    request: Request,
     response: Response,
-    pagination: PaginatorDeps,
+    pagination: CursorPaginatorDeps,
+    filters: VideoFilterDeps,
     user: OptionalUser,
     get_all_usecase: Annotated[
         GetAllVideosUseCase,
@@ -135,7 +200,17 @@ async def get_videos(  # noqa: PLR0913
             examples=False,
         ),
     ] = False,
+    sort: Annotated[
+        VideoSort,
+        Query(description="Sort order; `-` prefix means descending"),
+    ] = VideoSort.NEWEST,
 ) -> list[Video]:
+    if pagination.after_id is not None and sort is not VideoSort.NEWEST:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+            detail="Cursor pagination is only supported with the default sort",
+        )
+
     user_id = None
     if user:
         user_id = user.id
@@ -144,12 +219,184 @@ async def get_videos(  # noqa: PLR0913
         limit=pagination.limit,
         user_id=user_id,
         include_deleted=include_deleted,
+        after_id=pagination.after_id,
+        filters=filters,
+        sort=sort,
+    )
+    count = await count_usecase.execute(
+        include_deleted=include_deleted,
+        filters=filters,
     )
-    count = await count_usecase.execute()
     response.headers["X-Total-Count"] = str(count)
+    if user is None:
+        tag_response(response, VIDEOS_LIST)
+
+    if len(db_videos) == pagination.limit and sort is VideoSort.NEWEST:
+        next_cursor = encode_cursor(db_videos[-1].id)
+        next_url = request.url.remove_query_params("skip").include_query_params(
+            cursor=next_cursor,
+        )
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
     return db_videos
 
 
+@router.get(
+    "/search",
+    summary="Search videos",
+    description="""
+    Full-text search over video titles, tolerant to typos.
+
+    Results are ranked by relevance unless `sort` is given, and carry
+    `highlights` with the matched words of the title wrapped in `<em>`,
+    the title itself HTML-escaped.
+
+    **Headers:**
+    - `X-Total-Count`: Estimated number of matching videos
+    """,
+    responses={
+        200: {
+            "description": "Matching videos",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "id": 1,
+                            "title": "Sample Video",
+                            "slug": "sample-video",
+                            "deleted": False,
+                            "delete_type": None,
+                            "date": "2024-01-01",
+                            "yt_id": "abc123",
+                            "yt_thumbnail": "https://example.com/thumb.jpg",
+                            "duration": 180,
+                            "is_favorite": False,
+                            "is_blocked_in_russia": False,
+                            "highlights": {"title": "<em>Sample</em> Video"},
+                        },
+                    ]
+                }
+            },
+        },
+    },
+)
+async def search_videos(  # noqa: PLR0913
+    response: Response,
+    pagination: PaginatorDeps,
+    user: OptionalUser,
+    usecase: Annotated[
+        SearchVideosUseCase,
+        Depends(create_search_videos_usecase),
+    ],
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Query")],
+    duration: Annotated[
+        DurationBucket | None,
+        Query(description="Only videos of this length, as in `GET /videos`"),
+    ] = None,
+    sort: Annotated[
+        VideoSort | None,
+        Query(description="Sort order instead of relevance"),
+    ] = None,
+) -> list[FoundVideo]:
+    videos, total = await usecase.execute(
+        q,
+        offset=pagination.skip,
+        limit=pagination.limit,
+        user_id=user.id if user else None,
+        duration=duration,
+        sort=sort,
+    )
+    response.headers["X-Total-Count"] = str(total)
+    if user is None:
+        # The videos are loaded from the database, the hits from the index.
+        tag_response(response, VIDEOS_LIST, VIDEOS_SEARCH)
+    return videos
+
+
+@router.get(
+    "/suggest",
+    summary="Suggest videos",
+    description="""
+    Autocomplete video titles: videos with a word of the title or slug
+    starting with `q`. Accents and case are ignored.
+    """,
+    responses={
+        200: {
+            "description": "Suggested videos",
+            "content": {
+                "application/json": {
+                    "example": [{"title": "Sample Video", "slug": "sample-video"}],
+                }
+            },
+        },
+    },
+)
+async def suggest_videos(
+    usecase: Annotated[
+        SuggestVideosUseCase,
+        Depends(create_suggest_videos_usecase),
+    ],
+    q: Annotated[str, Query(min_length=1, max_length=200, description="Prefix")],
+    limit: Annotated[int, Query(ge=1, le=MAX_SUGGESTIONS)] = 10,
+) -> list[VideoSuggestion]:
+    return await usecase.execute(q, limit)
+
+
+@router.get(
+    "/export",
+    summary="Export all videos",
+    response_class=StreamingResponse,
+    description="""
+    Stream the whole catalog as newline-delimited JSON, one video per line,
+    ordered by id. Fields are the same as in `GET /videos`, without
+    `is_favorite`.
+
+    The response is gzip-compressed when the request's `Accept-Encoding`
+    allows it.
+    """,
+    responses={
+        200: {
+            "description": "Videos as NDJSON",
+            "content": {
+                "application/x-ndjson": {
+                    "example": (
+                        '{"id":1,"title":"Sample Video","date":"2024-01-01",...}\n'
+                        '{"id":2,"title":"Another Video","date":"2024-01-02",...}\n'
+                    ),
+                },
+            },
+        },
+    },
+)
+async def export_videos(
+    request: Request,
+    usecase: Annotated[
+        ExportVideosUseCase,
+        Depends(create_export_videos_usecase),
+    ],
+    *,
+    include_deleted: Annotated[
+        bool,
+        Query(description="Include soft-deleted videos in the export."),
+    ] = False,
+) -> StreamingResponse:
+    batches = usecase.execute(
+        include_deleted=include_deleted,
+        batch_size=settings.video_export_batch_size,
+    )
+    content = ndjson(batches, exclude={"is_favorite"})
+    headers = {"Vary": "Accept-Encoding"}
+    if accepts_gzip(request.headers.get("accept-encoding", "")):
+        content = gzip_stream(content)
+        headers["Content-Encoding"] = "gzip"
+
+    return StreamingResponse(
+        content,
+        media_type="application/x-ndjson",
+        headers=headers,
+    )
+
+
 @router.get(
     "/{slug}",
     summary="Get video by slug",
@@ -162,6 +409,9 @@ async def get_videos(  # noqa: PLR0913
     **Response includes deletion status:**
     - `deleted`: Boolean indicating if the video is soft-deleted
     - `delete_type`: Type of deletion (temporary/permanent) if video is deleted
+
+    Anonymous responses carry an `ETag`; send it back in `If-None-Match` to
+    get `304 Not Modified` while the video hasn't changed.
     """,
     responses={
         200: {
@@ -191,6 +441,8 @@ async def get_videos(  # noqa: PLR0913
     },
 )
 async def read_video(
+    request: Request,
+    response: Response,
     user: OptionalUser,
     slug: Annotated[
         str,
@@ -205,16 +457,21 @@ async def read_video(
     if user:
         user_id = user.id
     try:
-        return await usecase.execute(slug, user_id)
+        video = await usecase.execute(slug, user_id)
     except VideoNotFoundError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e),
         ) from e
+    if user is None:
+        tag_response(response, video_tag(video.id))
+        set_etag(request, response, make_etag("video", video.id, video.version))
+    return video
 
 
 @router.delete(
     "/{slug}",
+    dependencies=[Depends(RequirePermission("video", "write"))],
     summary="Delete video",
     status_code=status.HTTP_204_NO_CONTENT,
     description="""
@@ -290,6 +547,7 @@ async def delete_video(
 
 @router.post(
     "",
+    dependencies=[Depends(require_admin)],
     summary="Create new video",
     status_code=status.HTTP_201_CREATED,
     description="""
@@ -345,8 +603,73 @@ async def add_video(
     return video
 
 
+@router.post(
+    "/batch",
+    dependencies=[Depends(require_admin)],
+    summary="Import videos",
+    status_code=status.HTTP_200_OK,
+    description=f"""
+    Create up to {MAX_IMPORT_SIZE} videos in one request.
+
+    Videos are inserted, indexed for search and granted permissions in
+    chunks, so the cost grows with the number of chunks rather than the
+    number of videos. A video whose YouTube ID already exists is skipped;
+    a taken slug is expanded the same way as in `POST /videos`.
+
+    The response lists one result per submitted video, in the same order.
+    """,
+    responses={
+        200: {
+            "description": "Import report",
+            "content": {
+                "application/json": {
+                    "example": [
+                        {
+                            "yt_id": "abc123",
+                            "status": "created",
+                            "video": {
+                                "id": 1,
+                                "title": "New Video",
+                                "slug": "new-video",
+                                "deleted": False,
+                                "delete_type": None,
+                                "date": "2024-01-01",
+                                "yt_id": "abc123",
+                                "yt_thumbnail": "https://example.com/thumb.jpg",
+                                "duration": 180,
+                                "is_favorite": False,
+                                "is_blocked_in_russia": False,
+                            },
+                            "detail": None,
+                        },
+                        {
+                            "yt_id": "def456",
+                            "status": "conflict",
+                            "video": None,
+                            "detail": "Video with yt_id def456 already exists",
+                        },
+                    ]
+                }
+            },
+        },
+    },
+)
+async def import_videos(
+    new_videos: Annotated[
+        list[NewVideoDto],
+        Body(min_length=1, max_length=MAX_IMPORT_SIZE),
+    ],
+    usecase: Annotated[
+        ImportVideosUseCase,
+        Depends(create_import_videos_usecase),
+    ],
+) -> list[VideoImportResult]:
+    return await usecase.execute(new_videos)
+
+
 @router.patch(
     "/{slug}",
+    dependencies=[Depends(RequirePermission("video", "write"))],
     summary="Update video",
     status_code=status.HTTP_200_OK,
     description="""
@@ -420,6 +743,7 @@ async def update_video(
 
 @router.post(
     "/{slug}/restore",
+    dependencies=[Depends(RequirePermission("video", "write"))],
     summary="Restore soft-deleted video",
     status_code=status.HTTP_200_OK,
     description="""
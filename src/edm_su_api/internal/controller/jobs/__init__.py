@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from contextlib import asynccontextmanager
+
+from edm_su_api.internal.controller.jobs.counters import reconcile_counters
+from edm_su_api.internal.controller.jobs.outbox import drain_outbox
+from edm_su_api.internal.controller.jobs.purge import purge_deleted_videos
+from edm_su_api.internal.controller.jobs.search import reconcile_search_index
+from edm_su_api.internal.controller.jobs.suggest import refresh_video_suggestions
+from edm_su_api.internal.controller.jobs.thumbnails import mirror_video_thumbnails
+from edm_su_api.internal.controller.jobs.uploads import abort_stale_uploads
+from edm_su_api.internal.entity.settings import settings
+
+logger = logging.getLogger("app.jobs")
+
+
+async def run_periodically(
+    name: str,
+    job: Callable[[], Awaitable[None]],
+    interval: float,
+) -> None:
+    while True:
+        try:
+            await job()
+        except Exception:
+            logger.exception("Job %s failed", name)
+        await asyncio.sleep(interval)
+
+
+@asynccontextmanager
+async def start_jobs() -> AsyncGenerator[None]:
+    """Run the periodic background jobs for the lifetime of the app."""
+    jobs: list[tuple[str, Callable[[], Awaitable[None]], float]] = []
+    if settings.counters_reconcile_interval > 0:
+        jobs.append(
+            (
+                "reconcile_counters",
+                reconcile_counters,
+                settings.counters_reconcile_interval,
+            ),
+        )
+    if settings.outbox_poll_interval > 0:
+        jobs.append(("drain_outbox", drain_outbox, settings.outbox_poll_interval))
+    if settings.search_reconcile_interval > 0:
+        jobs.append(
+            (
+                "reconcile_search_index",
+                reconcile_search_index,
+                settings.search_reconcile_interval,
+            ),
+        )
+    if settings.video_purge_interval > 0:
+        jobs.append(
+            (
+                "purge_deleted_videos",
+                purge_deleted_videos,
+                settings.video_purge_interval,
+            ),
+        )
+    if settings.video_suggest_refresh_interval > 0:
+        jobs.append(
+            (
+                "refresh_video_suggestions",
+                refresh_video_suggestions,
+                settings.video_suggest_refresh_interval,
+            ),
+        )
+    if settings.video_thumbnail_interval > 0:
+        jobs.append(
+            (
+                "mirror_video_thumbnails",
+                mirror_video_thumbnails,
+                settings.video_thumbnail_interval,
+            ),
+        )
+    if settings.upload_multipart_sweep_interval > 0:
+        jobs.append(
+            (
+                "abort_stale_uploads",
+                abort_stale_uploads,
+                settings.upload_multipart_sweep_interval,
+            ),
+        )
+
+    tasks = [
+        asyncio.create_task(run_periodically(name, job, interval), name=name)
+        for name, job, interval in jobs
+    ]
+    try:
+        yield
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,18 @@
+import logging
+
+from edm_su_api.internal.usecase.counter import ReconcileCountersUseCase
+from edm_su_api.internal.usecase.repository.counter import (
+    PostgresCounterRepository,
+)
+from edm_su_api.pkg.postgres import async_session
+
+logger = logging.getLogger("app.jobs.counters")
+
+
+async def reconcile_counters() -> None:
+    async with async_session() as session, session.begin():
+        usecase = ReconcileCountersUseCase(PostgresCounterRepository(session))
+        drift = await usecase.execute()
+
+    for name, value in drift.items():
+        logger.warning("Counter %s drifted by %d, fixed", name, value)
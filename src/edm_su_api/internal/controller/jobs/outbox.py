@@ -0,0 +1,66 @@
+import logging
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.usecase.outbox import DrainOutboxUseCase
+from edm_su_api.internal.usecase.repository.cache import ResponseCacheRepository
+from edm_su_api.internal.usecase.repository.outbox import PostgresOutboxRepository
+from edm_su_api.internal.usecase.repository.permission import (
+    SpiceDBOutboxHandler,
+    SpiceDBPermissionRepository,
+)
+from edm_su_api.internal.usecase.repository.video import (
+    MeilisearchVideoOutboxHandler,
+)
+from edm_su_api.pkg.authzed import spicedb_clients
+from edm_su_api.pkg.cache import permission_decisions, response_cache
+from edm_su_api.pkg.meilisearch import ms_client
+from edm_su_api.pkg.postgres import async_session
+
+logger = logging.getLogger("app.jobs.outbox")
+
+
+async def drain_outbox() -> None:
+    """Deliver due outbox events, batch after batch, until none is left."""
+    handlers = [
+        MeilisearchVideoOutboxHandler(
+            ms_client,
+            ResponseCacheRepository(response_cache),
+        ),
+        SpiceDBOutboxHandler(
+            SpiceDBPermissionRepository(
+                await spicedb_clients.get(),
+                permission_decisions,
+            ),
+        ),
+    ]
+    while True:
+        async with async_session() as session, session.begin():
+            usecase = DrainOutboxUseCase(
+                PostgresOutboxRepository(session),
+                handlers,
+                batch_size=settings.outbox_batch_size,
+                retry_delay=settings.outbox_retry_delay,
+                max_retry_delay=settings.outbox_max_retry_delay,
+                max_attempts=settings.outbox_max_attempts,
+            )
+            result = await usecase.execute()
+
+        for topic, error in result.errors.items():
+            logger.error("Outbox delivery to %s failed: %s", topic.value, error)
+        for event, error in result.parked:
+            logger.error(
+                "Outbox event %d (%s %s of %s) parked after %d attempts: %s",
+                event.id,
+                event.topic.value,
+                event.operation.value,
+                event.key,
+                event.attempts + 1,
+                error,
+            )
+        if result.lag > settings.outbox_lag_warning:
+            logger.warning("Outbox lag is %.1f seconds", result.lag)
+        else:
+            logger.debug("Outbox lag is %.1f seconds", result.lag)
+
+        if result.claimed < settings.outbox_batch_size or result.errors:
+            return
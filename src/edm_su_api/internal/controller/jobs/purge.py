@@ -0,0 +1,30 @@
+import logging
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.usecase.repository.video import PostgresVideoRepository
+from edm_su_api.internal.usecase.video import PurgeDeletedVideosUseCase
+from edm_su_api.pkg.postgres import async_session
+
+logger = logging.getLogger("app.jobs.purge")
+
+
+async def purge_videos(batch_size: int) -> int:
+    """Archive every permanently deleted video, committing batch by batch.
+
+    Short transactions keep the row locks short and let the purge stop
+    and resume anywhere.
+    """
+    total = 0
+    while True:
+        async with async_session() as session, session.begin():
+            usecase = PurgeDeletedVideosUseCase(PostgresVideoRepository(session))
+            purged = await usecase.execute(batch_size=batch_size)
+        total += len(purged)
+        if len(purged) < batch_size:
+            return total
+
+
+async def purge_deleted_videos() -> None:
+    count = await purge_videos(settings.video_purge_batch_size)
+    if count:
+        logger.info("Archived %d permanently deleted videos", count)
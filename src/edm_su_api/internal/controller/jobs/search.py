@@ -0,0 +1,51 @@
+import logging
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.usecase.repository.outbox import PostgresOutboxRepository
+from edm_su_api.internal.usecase.repository.video import (
+    MeilisearchVideoIndexStateRepository,
+    MeilisearchVideoRepository,
+    OutboxFullTextVideoRepository,
+    PostgresVideoRepository,
+)
+from edm_su_api.internal.usecase.video import ReconcileSearchIndexUseCase
+from edm_su_api.pkg.meilisearch import ms_client
+from edm_su_api.pkg.postgres import async_session
+from edm_su_api.pkg.ratelimit import RateLimiter
+
+logger = logging.getLogger("app.jobs.search")
+
+
+async def reconcile_search_index() -> None:
+    async with async_session() as session, session.begin():
+        outbox = PostgresOutboxRepository(session)
+        usecase = ReconcileSearchIndexUseCase(
+            PostgresVideoRepository(session),
+            OutboxFullTextVideoRepository(
+                outbox, MeilisearchVideoRepository(ms_client)
+            ),
+            MeilisearchVideoIndexStateRepository(
+                ms_client,
+                RateLimiter(settings.search_reconcile_rate),
+            ),
+            outbox,
+            range_size=settings.search_reconcile_range_size,
+            max_repairs=settings.search_reconcile_max_repairs,
+        )
+        drift = await usecase.execute()
+
+    if not drift.repairs:
+        logger.info("Search index matches the database (%d id ranges)", drift.ranges)
+        return
+    logger.warning(
+        "Search index drifted in %d of %d id ranges: %d missing %s, "
+        "%d stale %s, %d extra %s; repairs queued",
+        drift.drifted_ranges,
+        drift.ranges,
+        len(drift.missing),
+        drift.missing[:20],
+        len(drift.stale),
+        drift.stale[:20],
+        len(drift.extra),
+        drift.extra[:20],
+    )
@@ -0,0 +1,23 @@
+import logging
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.usecase.repository.suggest import (
+    PrefixIndexVideoSuggestionRepository,
+)
+from edm_su_api.internal.usecase.repository.video import PostgresVideoRepository
+from edm_su_api.internal.usecase.video import RebuildVideoSuggestionsUseCase
+from edm_su_api.pkg.postgres import async_session
+from edm_su_api.pkg.suggest import video_suggestions
+
+logger = logging.getLogger("app.jobs.suggest")
+
+
+async def refresh_video_suggestions() -> None:
+    async with async_session() as session, session.begin():
+        usecase = RebuildVideoSuggestionsUseCase(
+            PostgresVideoRepository(session),
+            suggest_repo=PrefixIndexVideoSuggestionRepository(video_suggestions),
+        )
+        await usecase.execute(batch_size=settings.video_export_batch_size)
+
+    logger.info("Video suggestions rebuilt with %d videos", len(video_suggestions))
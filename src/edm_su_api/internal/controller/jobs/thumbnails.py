@@ -0,0 +1,92 @@
+import logging
+
+import aiohttp
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.video import ThumbnailMirrorResult
+from edm_su_api.internal.usecase.repository.outbox import PostgresOutboxRepository
+from edm_su_api.internal.usecase.repository.thumbnail import (
+    ExecutorThumbnailRenderer,
+    HttpThumbnailSourceRepository,
+    S3ThumbnailStorageRepository,
+)
+from edm_su_api.internal.usecase.repository.video import (
+    MeilisearchVideoRepository,
+    OutboxFullTextVideoRepository,
+    PostgresVideoRepository,
+)
+from edm_su_api.internal.usecase.video import (
+    GetVideosWithoutThumbnailsUseCase,
+    MirrorVideoThumbnailsUseCase,
+    SaveVideoThumbnailsUseCase,
+)
+from edm_su_api.pkg.images import get_image_executor
+from edm_su_api.pkg.meilisearch import ms_client
+from edm_su_api.pkg.postgres import async_session
+from edm_su_api.pkg.s3 import open_s3_client
+
+logger = logging.getLogger("app.jobs.thumbnails")
+
+FETCH_TIMEOUT = aiohttp.ClientTimeout(total=10)
+
+
+async def mirror_thumbnails(
+    *,
+    batch_size: int,
+    concurrency: int,
+) -> ThumbnailMirrorResult:
+    """Mirror the thumbnails of every video that has none yet.
+
+    A batch is read in one short session and saved in another, with the
+    downloads and uploads in between kept out of any transaction. Each
+    batch is committed on its own, so an interrupted run keeps what it
+    already mirrored.
+    """
+    total = ThumbnailMirrorResult()
+    async with (
+        aiohttp.ClientSession(timeout=FETCH_TIMEOUT) as http,
+        open_s3_client() as s3_client,
+    ):
+        mirror = MirrorVideoThumbnailsUseCase(
+            HttpThumbnailSourceRepository(http),
+            S3ThumbnailStorageRepository(s3_client),
+            ExecutorThumbnailRenderer(get_image_executor()),
+            concurrency=concurrency,
+        )
+        after_id = 0
+        while True:
+            async with async_session() as session:
+                videos = await GetVideosWithoutThumbnailsUseCase(
+                    PostgresVideoRepository(session),
+                ).execute(after_id=after_id, batch_size=batch_size)
+            if not videos:
+                return total
+
+            result = await mirror.execute(videos)
+
+            async with async_session() as session, session.begin():
+                await SaveVideoThumbnailsUseCase(
+                    PostgresVideoRepository(session),
+                    OutboxFullTextVideoRepository(
+                        PostgresOutboxRepository(session),
+                        MeilisearchVideoRepository(ms_client),
+                    ),
+                ).execute(result.thumbnails)
+            total.mirrored += result.mirrored
+            total.failed += result.failed
+            after_id = videos[-1].id
+
+
+async def mirror_video_thumbnails() -> None:
+    result = await mirror_thumbnails(
+        batch_size=settings.video_thumbnail_batch_size,
+        concurrency=settings.video_thumbnail_concurrency,
+    )
+    if result.mirrored:
+        logger.info("Mirrored the thumbnails of %d videos", len(result.mirrored))
+    if result.failed:
+        logger.warning(
+            "Could not mirror the thumbnails of %d videos: %s",
+            len(result.failed),
+            result.failed[:20],
+        )
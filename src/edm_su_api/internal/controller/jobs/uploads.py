@@ -0,0 +1,23 @@
+import logging
+from datetime import timedelta
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.usecase.repository.upload import (
+    S3MultipartUploadRepository,
+)
+from edm_su_api.internal.usecase.upload import AbortStaleMultipartUploadsUseCase
+from edm_su_api.pkg.s3 import open_s3_client
+
+logger = logging.getLogger("app.jobs.uploads")
+
+
+async def abort_stale_uploads() -> None:
+    async with open_s3_client() as s3_client:
+        usecase = AbortStaleMultipartUploadsUseCase(
+            S3MultipartUploadRepository(s3_client),
+        )
+        aborted = await usecase.execute(
+            timedelta(seconds=settings.upload_multipart_max_age),
+        )
+    if aborted:
+        logger.info("Aborted %d abandoned multipart uploads", len(aborted))
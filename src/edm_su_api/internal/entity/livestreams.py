@@ -3,6 +3,7 @@ from datetime import datetime
 from pydantic import Field, HttpUrl
 
 from edm_su_api.internal.entity.common import AttributeModel, BaseModel
+from edm_su_api.internal.entity.upload import ImageSet
 
 
 class BaseLiveStream(BaseModel):
@@ -22,3 +23,7 @@ class CreateLiveStreamDTO(BaseLiveStream):
 
 class LiveStream(BaseLiveStream, AttributeModel):
     id: int
+    image_set: ImageSet | None = Field(
+        default=None,
+        description="Variants of `image`, if it was uploaded here",
+    )
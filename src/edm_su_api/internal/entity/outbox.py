@@ -0,0 +1,40 @@
+from datetime import datetime
+from enum import Enum
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from edm_su_api.internal.entity.common import AttributeModel
+
+
+class OutboxTopic(Enum):
+    VIDEO_SEARCH = "video_search"
+    PERMISSIONS = "permissions"
+
+
+class OutboxOperation(Enum):
+    UPSERT = "upsert"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class NewOutboxEvent(BaseModel):
+    topic: OutboxTopic
+    operation: OutboxOperation
+    # Events sharing a key are delivered in the order they were written.
+    key: str
+    payload: dict[str, Any]
+
+
+class OutboxEvent(NewOutboxEvent, AttributeModel):
+    id: int
+    attempts: int = 0
+    created_at: datetime
+
+
+class OutboxDrainResult(BaseModel):
+    claimed: int
+    errors: dict[OutboxTopic, str]
+    lag: float
+    # Events given up on, with the error of their last attempt.
+    parked: list[tuple[OutboxEvent, str]] = Field(default_factory=list)
@@ -4,6 +4,7 @@ from typing import Any
 from pydantic import UUID4, Field, FutureDatetime
 
 from edm_su_api.internal.entity.common import AttributeModel, BaseModel
+from edm_su_api.internal.entity.upload import ImageSet
 from edm_su_api.internal.entity.user import User
 
 
@@ -54,6 +55,10 @@ class Post(BasePost, AttributeModel):
     )
     updated_at: datetime | None = Field(None, examples=[datetime.now(tz=timezone.utc)])
     updated_by: UUID4 | None = Field(None)
+    thumbnail_set: ImageSet | None = Field(
+        default=None,
+        description="Variants of `thumbnail`, if it was uploaded here",
+    )
 
 
 class PostEditHistory(BaseModel):
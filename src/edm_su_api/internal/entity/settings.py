@@ -8,6 +8,9 @@ class DBSettings(BaseSettings):
 
 class Settings(DBSettings):
     log_level: str = "ERROR"
+    dev_mode: bool = False
+    dev_query_threshold: int = 20
+    server_timing: bool = True
     disable_openapi: bool = False
     static_url: str = "https://static.dev.edm.su"
 
@@ -22,12 +25,62 @@ class Settings(DBSettings):
     spicedb_api_key: str
     spicedb_insecure: bool = False
     spicedb_tls_cert: str | None = None
+    spicedb_channels: int = 2
+    spicedb_keepalive_time: float = 30
+    spicedb_keepalive_timeout: float = 10
 
     s3_bucket: str
     s3_endpoint: str
     s3_access_key: str
     s3_access_key_id: str
     s3_region: str = "us-east-1"
+    s3_max_pool_connections: int = 20
+    s3_keepalive_timeout: float = 60
+
+    image_workers: int = 2
+    upload_max_image_size: int = 20 * 1024 * 1024
+    upload_max_image_pixels: int = 40_000_000
+    upload_multipart_max_age: int = 86400
+    upload_multipart_sweep_interval: int = 3600
+
+    counters_reconcile_interval: int = 3600
+
+    outbox_poll_interval: float = 1
+    outbox_batch_size: int = 500
+    outbox_retry_delay: float = 1
+    outbox_max_retry_delay: float = 300
+    outbox_max_attempts: int = 20
+    outbox_lag_warning: float = 60
+
+    search_reconcile_interval: int = 3600
+    search_reconcile_range_size: int = 1000
+    search_reconcile_rate: float = 10
+    search_reconcile_max_repairs: int = 1000
+
+    video_import_chunk_size: int = 500
+    video_export_batch_size: int = 1000
+    video_purge_interval: int = 3600
+    video_purge_batch_size: int = 500
+    video_suggest_max_videos: int = 100000
+    video_suggest_refresh_interval: int = 600
+    video_thumbnail_interval: int = 600
+    video_thumbnail_batch_size: int = 50
+    video_thumbnail_concurrency: int = 8
+
+    response_cache_ttl: int = 30
+    response_cache_stale_ttl: int = 300
+    response_cache_max_entries: int = 1024
+
+    liked_videos_cache_ttl: int = 0
+    liked_videos_cache_max_users: int = 10000
+
+    permission_cache_ttl: float = 5
+    permission_cache_negative_ttl: float = 1
+    permission_cache_max_entries: int = 10000
+
+    permission_listing_filter: bool = False
+    permission_lookup_cache_ttl: float = 30
+    permission_lookup_cache_max_users: int = 1000
 
 
 settings = Settings.model_validate({})
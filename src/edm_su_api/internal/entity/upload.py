@@ -0,0 +1,46 @@
+from datetime import datetime
+
+from pydantic import Field
+
+from edm_su_api.internal.entity.common import AttributeModel, BaseModel
+
+
+class ImageVariant(BaseModel):
+    url: str
+    width: int
+    height: int
+    format: str = Field(examples=["webp"])
+    size: int = Field(description="Size in bytes")
+
+
+class ImageSet(AttributeModel):
+    """An uploaded image with the variants made for responsive layouts."""
+
+    key: str
+    url: str
+    width: int
+    height: int
+    size: int = Field(description="Size of the original in bytes")
+    variants: list[ImageVariant] = Field(default_factory=list)
+
+
+class UploadPart(BaseModel):
+    part_number: int
+    url: str = Field(description="Pre-signed URL to PUT the part to")
+
+
+class MultipartUpload(BaseModel):
+    key: str
+    upload_id: str
+    parts: list[UploadPart] = Field(default_factory=list)
+
+
+class CompletedPart(BaseModel):
+    part_number: int = Field(ge=1, le=10_000)
+    etag: str = Field(description="ETag header S3 answered the part PUT with")
+
+
+class PendingMultipartUpload(BaseModel):
+    key: str
+    upload_id: str
+    initiated: datetime
@@ -5,6 +5,7 @@ from pydantic import (
     BaseModel,
     Field,
 )
+from typing_extensions import Self
 
 from edm_su_api.internal.entity.common import AttributeModel, SlugMixin
 
@@ -14,6 +15,65 @@ class DeleteType(Enum):
     TEMPORARY = "temporary"
 
 
+class DurationBucket(Enum):
+    SHORT = "short"
+    MEDIUM = "medium"
+    LONG = "long"
+
+    @property
+    def bounds(self: Self) -> tuple[int | None, int | None]:
+        """Return the duration range in seconds, lower bound inclusive."""
+        if self is DurationBucket.SHORT:
+            return None, 30 * 60
+        if self is DurationBucket.MEDIUM:
+            return 30 * 60, 60 * 60
+        return 60 * 60, None
+
+
+class VideoSort(Enum):
+    NEWEST = "-id"
+    DATE = "date"
+    DATE_DESC = "-date"
+    DURATION = "duration"
+    DURATION_DESC = "-duration"
+    TITLE = "title"
+    TITLE_DESC = "-title"
+
+
+class VideoFilter(BaseModel):
+    date_from: date | None = Field(default=None)
+    date_to: date | None = Field(default=None)
+    duration: DurationBucket | None = Field(default=None)
+    is_blocked_in_russia: bool | None = Field(default=None)
+    # Only these slugs, e.g. the videos a user may read.
+    slugs: frozenset[str] | None = Field(default=None)
+
+    @property
+    def is_empty(self: Self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
+class ThumbnailVariant(BaseModel):
+    width: int
+    height: int
+    url: str
+
+
+class VideoThumbnails(BaseModel):
+    """Thumbnail copies served from our static host instead of YouTube."""
+
+    variants: list[ThumbnailVariant]
+    # Tiny blurred image as a data URI, shown while a variant loads.
+    placeholder: str
+
+
+class ThumbnailMirrorResult(BaseModel):
+    last_id: int | None = Field(default=None)
+    mirrored: list[int] = Field(default_factory=list)
+    failed: list[int] = Field(default_factory=list)
+    thumbnails: dict[int, VideoThumbnails] = Field(default_factory=dict)
+
+
 class Video(AttributeModel):
     id: int
     title: str
@@ -26,6 +86,49 @@ class Video(AttributeModel):
     is_blocked_in_russia: bool = Field(default=False)
     deleted: bool = Field(default=False)
     delete_type: DeleteType | None = Field(default=None)
+    thumbnails: VideoThumbnails | None = Field(default=None)
+    version: int = Field(default=1, exclude=True)
+
+
+class FoundVideo(Video):
+    highlights: dict[str, str] = Field(default_factory=dict)
+
+
+class VideoSearchDrift(BaseModel):
+    """Differences found between the database and the search index."""
+
+    ranges: int = 0
+    drifted_ranges: int = 0
+    missing: list[int] = Field(default_factory=list)
+    stale: list[int] = Field(default_factory=list)
+    extra: list[int] = Field(default_factory=list)
+
+    @property
+    def repairs(self: Self) -> int:
+        return len(self.missing) + len(self.stale) + len(self.extra)
+
+
+class VideoSuggestion(BaseModel):
+    title: str
+    slug: str
+
+
+class VideoTitle(BaseModel):
+    """The columns title suggestions are built from, and nothing else."""
+
+    id: int
+    title: str
+    slug: str
+
+
+class VideoSearchHit(BaseModel):
+    id: int
+    highlights: dict[str, str] = Field(default_factory=dict)
+
+
+class VideoSearchPage(BaseModel):
+    hits: list[VideoSearchHit]
+    total: int
 
 
 class NewVideoDto(SlugMixin, BaseModel):
@@ -41,5 +144,17 @@ class UpdateVideoDto(SlugMixin, BaseModel):
     is_blocked_in_russia: bool = Field(default=False)
 
 
+class VideoImportStatus(Enum):
+    CREATED = "created"
+    CONFLICT = "conflict"
+
+
+class VideoImportResult(BaseModel):
+    yt_id: str
+    status: VideoImportStatus
+    video: Video | None = Field(default=None)
+    detail: str | None = Field(default=None)
+
+
 class RestoreVideoDto(BaseModel):
     delete_type: DeleteType | None = Field(default=None)
@@ -0,0 +1,18 @@
+from typing_extensions import Self
+
+from edm_su_api.internal.usecase.repository.counter import (
+    AbstractCounterRepository,
+)
+
+
+class ReconcileCountersUseCase:
+    def __init__(
+        self: Self,
+        repository: AbstractCounterRepository,
+    ) -> None:
+        self.repository = repository
+
+    async def execute(self: Self) -> dict[str, int]:
+        if not await self.repository.lock():
+            return {}
+        return await self.repository.reconcile()
@@ -0,0 +1,25 @@
+from typing_extensions import Self
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadNotFoundError(UploadError):
+    def __init__(self: Self, key: str) -> None:
+        super().__init__(f"upload {key} not found")
+
+
+class UploadTooLargeError(UploadError):
+    def __init__(self: Self, key: str, limit: int, unit: str = "bytes") -> None:
+        super().__init__(f"upload {key} is larger than {limit} {unit}")
+
+
+class UploadNotImageError(UploadError):
+    def __init__(self: Self, key: str) -> None:
+        super().__init__(f"upload {key} is not an image")
+
+
+class UploadPartsInvalidError(UploadError):
+    def __init__(self: Self, key: str) -> None:
+        super().__init__(f"parts of upload {key} are missing or out of order")
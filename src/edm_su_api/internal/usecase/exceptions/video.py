@@ -13,6 +13,14 @@ class VideoYtIdNotUniqueError(VideoError):
         super().__init__(f"Video with yt_id {yt_id} already exists")
 
 
+class VideoSlugNotUniqueError(VideoError):
+    def __init__(
+        self: Self,
+        slug: str,
+    ) -> None:
+        super().__init__(f"Video with slug {slug} already exists")
+
+
 class VideoNotFoundError(VideoError):
     def __init__(
         self: Self,
@@ -10,17 +10,50 @@ from edm_su_api.internal.usecase.exceptions.livestream import (
     LiveStreamAlreadyExistsError,
     LiveStreamNotFoundError,
 )
+from edm_su_api.internal.usecase.repository.cache import (
+    LIVESTREAMS_LIST,
+    AbstractCacheRepository,
+    livestream_tag,
+)
 from edm_su_api.internal.usecase.repository.livestream import (
     AbstractLiveStreamRepository,
 )
+from edm_su_api.internal.usecase.repository.upload import AbstractUploadRepository
 
 
 class AbstractLiveStreamUseCase:
     def __init__(
         self: Self,
         repository: AbstractLiveStreamRepository,
+        cache_repo: AbstractCacheRepository | None = None,
+        upload_repo: AbstractUploadRepository | None = None,
     ) -> None:
         self.repository = repository
+        self.cache_repo = cache_repo
+        self.upload_repo = upload_repo
+
+    async def _purge_cache(self: Self, live_stream_id: int) -> None:
+        if self.cache_repo is not None:
+            await self.cache_repo.purge(
+                livestream_tag(live_stream_id),
+                LIVESTREAMS_LIST,
+            )
+
+    async def _attach_images(
+        self: Self,
+        livestreams: list[LiveStream],
+    ) -> list[LiveStream]:
+        if self.upload_repo is None or not livestreams:
+            return livestreams
+        images = await self.upload_repo.get_by_urls(
+            {livestream.image for livestream in livestreams},
+        )
+        return [
+            livestream.model_copy(update={"image_set": images[livestream.image]})
+            if livestream.image in images
+            else livestream
+            for livestream in livestreams
+        ]
 
 
 class GetAllLiveStreamsUseCase(AbstractLiveStreamUseCase):
@@ -35,10 +68,11 @@ class GetAllLiveStreamsUseCase(AbstractLiveStreamUseCase):
         if end is None:
             end = datetime.now(tz=timezone.utc).date() + timedelta(days=31)
 
-        return await self.repository.get_all(
+        livestreams = await self.repository.get_all(
             start=start,
             end=end,
         )
+        return await self._attach_images(livestreams)
 
 
 class GetLiveStreamUseCase(AbstractLiveStreamUseCase):
@@ -49,6 +83,7 @@ class GetLiveStreamUseCase(AbstractLiveStreamUseCase):
         livestream = await self.repository.get_by_id(live_stream_id)
         if not livestream:
             raise LiveStreamNotFoundError
+        (livestream,) = await self._attach_images([livestream])
         return livestream
 
 
@@ -64,7 +99,9 @@ class CreateLiveStreamUseCase(AbstractLiveStreamUseCase):
         )
         if db_live_stream:
             raise LiveStreamAlreadyExistsError(live_stream=live_stream)
-        return await self.repository.create(live_stream=live_stream)
+        created = await self.repository.create(live_stream=live_stream)
+        await self._purge_cache(created.id)
+        return created
 
 
 class UpdateLiveStreamUseCase(AbstractLiveStreamUseCase):
@@ -73,6 +110,7 @@ class UpdateLiveStreamUseCase(AbstractLiveStreamUseCase):
         live_stream: LiveStream,
     ) -> LiveStream:
         await self.repository.update(live_stream=live_stream)
+        await self._purge_cache(live_stream.id)
         return live_stream
 
 
@@ -82,3 +120,4 @@ class DeleteLiveStreamUseCase(AbstractLiveStreamUseCase):
         live_stream_id: int,
     ) -> None:
         await self.repository.delete(live_stream_id=live_stream_id)
+        await self._purge_cache(live_stream_id)
@@ -0,0 +1,112 @@
+from collections.abc import Iterable, Sequence
+
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.outbox import (
+    OutboxDrainResult,
+    OutboxEvent,
+    OutboxTopic,
+)
+from edm_su_api.internal.usecase.repository.outbox import (
+    AbstractOutboxHandler,
+    AbstractOutboxRepository,
+)
+
+
+class DrainOutboxUseCase:
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        repository: AbstractOutboxRepository,
+        handlers: Iterable[AbstractOutboxHandler],
+        *,
+        batch_size: int = 500,
+        retry_delay: float = 1,
+        max_retry_delay: float = 300,
+        max_attempts: int = 20,
+    ) -> None:
+        self.repository = repository
+        self.handlers = {handler.topic: handler for handler in handlers}
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.max_attempts = max_attempts
+
+    async def execute(self: Self) -> OutboxDrainResult:
+        """Deliver one batch of due events.
+
+        A topic's events that fail together are split until the failing
+        ones are found alone. Those are retried later with a growing delay,
+        or parked after `max_attempts`; the others are delivered.
+        """
+        if not await self.repository.lock():
+            return OutboxDrainResult(claimed=0, errors={}, lag=0)
+
+        events = await self.repository.claim(self.batch_size)
+        by_topic: dict[OutboxTopic, list[OutboxEvent]] = {}
+        for event in events:
+            by_topic.setdefault(event.topic, []).append(event)
+
+        delivered: list[int] = []
+        failed: list[tuple[OutboxEvent, str]] = []
+        errors: dict[OutboxTopic, str] = {}
+        for topic, topic_events in by_topic.items():
+            topic_delivered, topic_failed = await self._deliver(
+                self.handlers[topic],
+                topic_events,
+            )
+            delivered += [event.id for event in topic_delivered]
+            failed += topic_failed
+            if topic_failed:
+                errors[topic] = topic_failed[0][1]
+
+        parked = [
+            (event, error)
+            for event, error in failed
+            if event.attempts + 1 >= self.max_attempts
+        ]
+        retried = [
+            event.id for event, _ in failed if event.attempts + 1 < self.max_attempts
+        ]
+        if parked:
+            await self.repository.park(parked)
+        if retried:
+            await self.repository.retry(
+                retried,
+                base_delay=self.retry_delay,
+                max_delay=self.max_retry_delay,
+            )
+        await self.repository.delete(delivered)
+        return OutboxDrainResult(
+            claimed=len(events),
+            errors=errors,
+            lag=await self.repository.lag(),
+            parked=parked,
+        )
+
+    async def _deliver(
+        self: Self,
+        handler: AbstractOutboxHandler,
+        events: Sequence[OutboxEvent],
+    ) -> tuple[list[OutboxEvent], list[tuple[OutboxEvent, str]]]:
+        """Return the events delivered and those that failed alone.
+
+        Events left out of both come after a failed one with the same key:
+        they're kept for once it's delivered.
+        """
+        try:
+            await handler.handle(events)
+        except Exception as e:  # noqa: BLE001
+            if len(events) == 1:
+                return [], [(events[0], repr(e))]
+        else:
+            return list(events), []
+
+        middle = len(events) // 2
+        delivered, failed = await self._deliver(handler, events[:middle])
+        failed_keys = {event.key for event, _ in failed}
+        rest = [event for event in events[middle:] if event.key not in failed_keys]
+        if rest:
+            rest_delivered, rest_failed = await self._deliver(handler, rest)
+            delivered += rest_delivered
+            failed += rest_failed
+        return delivered, failed
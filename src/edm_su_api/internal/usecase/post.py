@@ -1,3 +1,4 @@
+from collections.abc import Collection
 from uuid import UUID
 
 from typing_extensions import Self
@@ -12,14 +13,21 @@ from edm_su_api.internal.usecase.exceptions.post import (
     PostNotFoundError,
     PostSlugNotUniqueError,
 )
+from edm_su_api.internal.usecase.repository.cache import (
+    POSTS_LIST,
+    AbstractCacheRepository,
+    post_tag,
+)
 from edm_su_api.internal.usecase.repository.permission import (
     AbstractPermissionRepository,
     Object,
+    RelationshipTuple,
 )
 from edm_su_api.internal.usecase.repository.post import (
     AbstractPostHistoryRepository,
     AbstractPostRepository,
 )
+from edm_su_api.internal.usecase.repository.upload import AbstractUploadRepository
 
 
 class BasePostUseCase:
@@ -27,9 +35,29 @@ class BasePostUseCase:
         self: Self,
         repository: AbstractPostRepository,
         permissions_repo: AbstractPermissionRepository | None = None,
+        cache_repo: AbstractCacheRepository | None = None,
+        upload_repo: AbstractUploadRepository | None = None,
     ) -> None:
         self.repository = repository
         self.permissions_repo = permissions_repo
+        self.cache_repo = cache_repo
+        self.upload_repo = upload_repo
+
+    async def _purge_cache(self: Self, post: Post) -> None:
+        if self.cache_repo is not None:
+            await self.cache_repo.purge(post_tag(post.id), POSTS_LIST)
+
+    async def _attach_images(self: Self, posts: list[Post]) -> list[Post]:
+        urls = {post.thumbnail for post in posts if post.thumbnail}
+        if self.upload_repo is None or not urls:
+            return posts
+        images = await self.upload_repo.get_by_urls(urls)
+        return [
+            post.model_copy(update={"thumbnail_set": images[post.thumbnail]})
+            if post.thumbnail in images
+            else post
+            for post in posts
+        ]
 
 
 class CreatePostUseCase(BasePostUseCase):
@@ -43,23 +71,23 @@ class CreatePostUseCase(BasePostUseCase):
         except PostNotFoundError:
             post = await self.repository.create(new_post)
             await self._set_permissions(post)
+            await self._purge_cache(post)
             return post
 
     async def _set_permissions(self: Self, post: Post) -> None:
         if self.permissions_repo is not None:
             resource = Object("post", post.slug)
 
-            await self.permissions_repo.write(
-                resource,
-                "writer",
-                Object("role", "admin"),
-                "member",
-            )
-
-            await self.permissions_repo.write(
-                resource,
-                "reader",
-                Object("user", "*"),
+            await self.permissions_repo.write_many(
+                [
+                    RelationshipTuple(
+                        resource,
+                        "writer",
+                        Object("role", "admin"),
+                        "member",
+                    ),
+                    RelationshipTuple(resource, "reader", Object("user", "*")),
+                ],
             )
 
 
@@ -71,12 +99,13 @@ class GetPostBySlugUseCase(BasePostUseCase):
         result = await self.repository.get_by_slug(slug)
         if result is None:
             raise PostNotFoundError
-        return result
+        (post,) = await self._attach_images([result])
+        return post
 
 
 class GetPostCountUseCase(BasePostUseCase):
-    async def execute(self: Self) -> int:
-        return await self.repository.count()
+    async def execute(self: Self, slugs: Collection[str] | None = None) -> int:
+        return await self.repository.count(slugs)
 
 
 class GetAllPostsUseCase(BasePostUseCase):
@@ -84,11 +113,14 @@ class GetAllPostsUseCase(BasePostUseCase):
         self: Self,
         skip: int = 0,
         limit: int = 10,
+        slugs: Collection[str] | None = None,
     ) -> list[Post]:
-        return await self.repository.get_all(
+        posts = await self.repository.get_all(
             skip=skip,
             limit=limit,
+            slugs=slugs,
         )
+        return await self._attach_images(posts)
 
 
 class DeletePostUseCase(BasePostUseCase):
@@ -99,6 +131,7 @@ class DeletePostUseCase(BasePostUseCase):
         post = await self.repository.get_by_slug(slug)
         await self.repository.delete(post)
         await self._set_permissions(post)
+        await self._purge_cache(post)
 
     async def _set_permissions(self: Self, post: Post) -> None:
         if self.permissions_repo is not None:
@@ -113,8 +146,9 @@ class UpdatePostUseCase(BasePostUseCase):
         repository: AbstractPostRepository,
         history_repo: AbstractPostHistoryRepository,
         permissions_repo: AbstractPermissionRepository | None = None,
+        cache_repo: AbstractCacheRepository | None = None,
     ) -> None:
-        super().__init__(repository, permissions_repo)
+        super().__init__(repository, permissions_repo, cache_repo)
         self.history_repo = history_repo
 
     async def execute(
@@ -136,6 +170,7 @@ class UpdatePostUseCase(BasePostUseCase):
                 edited_by=UUID(update_data.user.id),
             )
 
+        await self._purge_cache(updated_post)
         return updated_post
 
 
@@ -0,0 +1,42 @@
+from abc import ABC, abstractmethod
+
+from typing_extensions import Self, override
+
+from edm_su_api.pkg.cache import ResponseCache
+
+VIDEOS_LIST = "videos:list"
+# Search results follow the index, which the outbox updates after the commit
+# that purges VIDEOS_LIST; the outbox purges this one once it is delivered.
+VIDEOS_SEARCH = "videos:search"
+POSTS_LIST = "posts:list"
+LIVESTREAMS_LIST = "livestreams:list"
+
+
+def video_tag(video_id: int) -> str:
+    return f"video:{video_id}"
+
+
+def post_tag(post_id: int) -> str:
+    return f"post:{post_id}"
+
+
+def livestream_tag(live_stream_id: int) -> str:
+    return f"livestream:{live_stream_id}"
+
+
+class AbstractCacheRepository(ABC):
+    @abstractmethod
+    async def purge(self: Self, *tags: str) -> None:
+        pass
+
+
+class ResponseCacheRepository(AbstractCacheRepository):
+    def __init__(
+        self: Self,
+        cache: ResponseCache,
+    ) -> None:
+        self._cache = cache
+
+    @override
+    async def purge(self: Self, *tags: str) -> None:
+        await self._cache.purge(*tags)
@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 
-from sqlalchemy import func, insert, select
+from sqlalchemy import insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Self
 
 from edm_su_api.internal.entity.comment import Comment, NewCommentDto
+from edm_su_api.internal.usecase.repository.counter import (
+    COMMENTS,
+    select_counter_sum,
+)
 from edm_su_api.pkg.postgres import Comment as PGComment
 
 
@@ -71,9 +75,7 @@ class PostgresCommentRepository(AbstractCommentRepository):
         return [Comment.model_validate(comment) for comment in result]
 
     async def count(self: Self) -> int:
-        query = select(func.count()).select_from(PGComment)
-
-        return (await self._session.scalars(query)).one()
+        return (await self._session.scalars(select_counter_sum(COMMENTS))).one()
 
     async def get_video_comments(
         self: Self,
@@ -0,0 +1,120 @@
+from abc import ABC, abstractmethod
+
+from sqlalchemy import (
+    BigInteger,
+    CompoundSelect,
+    Select,
+    String,
+    cast,
+    false,
+    func,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Self, override
+
+from edm_su_api.pkg.postgres import CatalogCounter, video_is_live, video_not_purged
+from edm_su_api.pkg.postgres import Comment as PGComment
+from edm_su_api.pkg.postgres import Post as PGPost
+from edm_su_api.pkg.postgres import Video as PGVideo
+
+VIDEOS_LIVE = "videos:live"
+VIDEOS_DELETED = "videos:deleted"
+VIDEOS_VERSION = "videos:version"
+POSTS = "posts"
+COMMENTS = "comments"
+
+# Key of the advisory lock held by the single counter reconciler.
+COUNTERS_LOCK_ID = 0x636F756E74657273
+
+
+def select_counter_sum(*names: str) -> Select[tuple[int]]:
+    total = cast(func.coalesce(func.sum(CatalogCounter.value), 0), BigInteger)
+    return select(total).where(CatalogCounter.name.in_(names))
+
+
+class AbstractCounterRepository(ABC):
+    @abstractmethod
+    async def get(self: Self, *names: str) -> int:
+        pass
+
+    @abstractmethod
+    async def lock(self: Self) -> bool:
+        """Become the only reconciler until the transaction ends.
+
+        Returns False if another reconciler already holds the lock.
+        """
+
+    @abstractmethod
+    async def reconcile(self: Self) -> dict[str, int]:
+        """Recount the counted tables and fix stored counters.
+
+        Returns the drift (actual minus stored value) of every counter
+        that was off.
+        """
+
+
+class PostgresCounterRepository(AbstractCounterRepository):
+    def __init__(
+        self: Self,
+        session: AsyncSession,
+    ) -> None:
+        self._session = session
+
+    @override
+    async def get(self: Self, *names: str) -> int:
+        return (await self._session.scalars(select_counter_sum(*names))).one()
+
+    @override
+    async def lock(self: Self) -> bool:
+        query = select(func.pg_try_advisory_xact_lock(COUNTERS_LOCK_ID))
+        return bool((await self._session.scalars(query)).one())
+
+    @override
+    async def reconcile(self: Self) -> dict[str, int]:
+        # Counted rows and stored values are read by one statement, so from
+        # one snapshot and without locking anything. Writers committed after
+        # it have both their rows missing from the counts and their trigger
+        # increments missing from the stored values, so adding the drift to
+        # the current value, rather than overwriting it, stays right.
+        actual = self._actual_counts().subquery()
+        stored = func.coalesce(CatalogCounter.value, 0)
+        drift_query = select(actual.c.name, actual.c.value - stored).select_from(
+            actual.outerjoin(CatalogCounter, CatalogCounter.name == actual.c.name),
+        )
+        drift = {
+            name: value
+            for name, value in (await self._session.execute(drift_query)).tuples()
+            if value
+        }
+        if drift:
+            query = insert(CatalogCounter).values(
+                [{"name": name, "value": value} for name, value in drift.items()],
+            )
+            query = query.on_conflict_do_update(
+                index_elements=[CatalogCounter.name],
+                set_={"value": CatalogCounter.value + query.excluded.value},
+            )
+            await self._session.execute(query)
+        return drift
+
+    @staticmethod
+    def _actual_counts() -> CompoundSelect:
+        return union_all(
+            _count(VIDEOS_LIVE).select_from(PGVideo).where(video_is_live),
+            _count(VIDEOS_DELETED)
+            .select_from(PGVideo)
+            .where(video_not_purged, PGVideo.deleted.is_not(false())),
+            _count(POSTS).select_from(PGPost),
+            _count(COMMENTS).select_from(PGComment),
+        )
+
+
+def _count(name: str) -> Select[tuple[str, int]]:
+    return select(
+        literal(name, String).label("name"),
+        func.count().label("value"),
+    )
@@ -151,7 +151,7 @@ class PostgresLiveStreamRepository(AbstractLiveStreamRepository):
         self: Self,
         live_stream: LiveStream,
     ) -> None:
-        values = live_stream.model_dump(exclude_unset=True)
+        values = live_stream.model_dump(exclude_unset=True, exclude={"image_set"})
         if "url" in values:
             values["url"] = str(live_stream.url)
 
@@ -0,0 +1,231 @@
+from abc import ABC, abstractmethod
+from collections.abc import Collection, Sequence
+
+from sqlalchemy import (
+    ARRAY,
+    BigInteger,
+    Float,
+    String,
+    any_,
+    delete,
+    exists,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.outbox import NewOutboxEvent, OutboxEvent, OutboxTopic
+from edm_su_api.pkg.postgres import OutboxDeadLetter as PGOutboxDeadLetter
+from edm_su_api.pkg.postgres import OutboxEvent as PGOutboxEvent
+
+# Key of the advisory lock held by the single outbox drainer.
+OUTBOX_LOCK_ID = 0x6F7574626F78
+
+
+class AbstractOutboxRepository(ABC):
+    @abstractmethod
+    async def add(self: Self, *events: NewOutboxEvent) -> None:
+        pass
+
+    @abstractmethod
+    async def lock(self: Self) -> bool:
+        """Become the only drainer until the transaction ends.
+
+        Returns False if another drainer already holds the lock.
+        """
+
+    @abstractmethod
+    async def claim(self: Self, limit: int) -> list[OutboxEvent]:
+        """Get the oldest events that are due.
+
+        Events waiting for a retry hold back the later events with the same
+        key, so that every key sees its events in order.
+        """
+
+    @abstractmethod
+    async def delete(self: Self, ids: Collection[int]) -> None:
+        pass
+
+    @abstractmethod
+    async def retry(
+        self: Self,
+        ids: Collection[int],
+        *,
+        base_delay: float,
+        max_delay: float,
+    ) -> None:
+        """Put the events off, doubling the delay at every attempt."""
+
+    @abstractmethod
+    async def park(self: Self, failures: Sequence[tuple[OutboxEvent, str]]) -> None:
+        """Move events out of the outbox, with the error that failed them.
+
+        Parked events no longer hold back the later events with their key.
+        """
+
+    @abstractmethod
+    async def pending_keys(
+        self: Self,
+        topic: OutboxTopic,
+        keys: Collection[str],
+    ) -> set[str]:
+        """Return the keys among `keys` with events not delivered yet."""
+
+    @abstractmethod
+    async def lag(self: Self) -> float:
+        """Age of the oldest pending event in seconds, 0 when there is none."""
+
+
+class PostgresOutboxRepository(AbstractOutboxRepository):
+    def __init__(
+        self: Self,
+        session: AsyncSession,
+    ) -> None:
+        self._session = session
+
+    @override
+    async def add(self: Self, *events: NewOutboxEvent) -> None:
+        if not events:
+            return
+
+        await self._session.execute(
+            insert(PGOutboxEvent).values(
+                [
+                    {
+                        "topic": event.topic.value,
+                        "operation": event.operation.value,
+                        "key": event.key,
+                        "payload": event.payload,
+                    }
+                    for event in events
+                ],
+            ),
+        )
+
+    @override
+    async def lock(self: Self) -> bool:
+        query = select(func.pg_try_advisory_xact_lock(OUTBOX_LOCK_ID))
+        return bool((await self._session.scalars(query)).one())
+
+    @override
+    async def claim(self: Self, limit: int) -> list[OutboxEvent]:
+        waiting = aliased(PGOutboxEvent)
+        held_back = exists().where(
+            waiting.topic == PGOutboxEvent.topic,
+            waiting.key == PGOutboxEvent.key,
+            waiting.id < PGOutboxEvent.id,
+            waiting.available_at > func.now(),
+        )
+        query = (
+            select(PGOutboxEvent)
+            .where(PGOutboxEvent.available_at <= func.now(), ~held_back)
+            .order_by(PGOutboxEvent.id)
+            .limit(limit)
+        )
+        result = await self._session.scalars(query)
+        return [OutboxEvent.model_validate(event) for event in result]
+
+    @override
+    async def delete(self: Self, ids: Collection[int]) -> None:
+        if not ids:
+            return
+
+        await self._session.execute(
+            delete(PGOutboxEvent).where(
+                PGOutboxEvent.id == any_(literal(list(ids), ARRAY(BigInteger))),
+            ),
+        )
+
+    @override
+    async def retry(
+        self: Self,
+        ids: Collection[int],
+        *,
+        base_delay: float,
+        max_delay: float,
+    ) -> None:
+        if not ids:
+            return
+
+        delay = func.least(
+            literal(base_delay, Float) * func.power(2, PGOutboxEvent.attempts),
+            literal(max_delay, Float),
+        )
+        await self._session.execute(
+            update(PGOutboxEvent)
+            .where(PGOutboxEvent.id == any_(literal(list(ids), ARRAY(BigInteger))))
+            .values(
+                attempts=PGOutboxEvent.attempts + 1,
+                available_at=func.now() + func.make_interval(0, 0, 0, 0, 0, 0, delay),
+            ),
+        )
+
+    @override
+    async def park(self: Self, failures: Sequence[tuple[OutboxEvent, str]]) -> None:
+        if not failures:
+            return
+
+        await self._session.execute(
+            insert(PGOutboxDeadLetter).values(
+                [
+                    {
+                        "id": event.id,
+                        "topic": event.topic.value,
+                        "operation": event.operation.value,
+                        "key": event.key,
+                        "payload": event.payload,
+                        "attempts": event.attempts + 1,
+                        "error": error,
+                        "created_at": event.created_at,
+                    }
+                    for event, error in failures
+                ],
+            ),
+        )
+        await self.delete([event.id for event, _ in failures])
+
+    @override
+    async def pending_keys(
+        self: Self,
+        topic: OutboxTopic,
+        keys: Collection[str],
+    ) -> set[str]:
+        if not keys:
+            return set()
+
+        query = (
+            select(PGOutboxEvent.key)
+            .where(
+                PGOutboxEvent.topic == topic.value,
+                PGOutboxEvent.key == any_(literal(list(keys), ARRAY(String))),
+            )
+            .distinct()
+        )
+        return set((await self._session.scalars(query)).all())
+
+    @override
+    async def lag(self: Self) -> float:
+        oldest = select(func.min(PGOutboxEvent.created_at)).scalar_subquery()
+        query = select(
+            func.coalesce(func.extract("epoch", func.now() - oldest), 0),
+        )
+        return float((await self._session.scalars(query)).one())
+
+
+class AbstractOutboxHandler(ABC):
+    """Delivers the events of one topic to the system they're meant for."""
+
+    topic: OutboxTopic
+
+    @abstractmethod
+    async def handle(self: Self, events: Sequence[OutboxEvent]) -> None:
+        """Apply the events, given in the order they were written.
+
+        Raising makes them be tried again in smaller batches, then later,
+        so applying an event twice must be harmless.
+        """
@@ -1,9 +1,16 @@
+import time
 from abc import ABC, abstractmethod
-from typing import NamedTuple
+from collections.abc import Collection, Iterable, Sequence
+from typing import Any, NamedTuple
 
 from authzed.api.v1 import (
+    CheckBulkPermissionsRequest,
+    CheckBulkPermissionsRequestItem,
+    CheckPermissionResponse,
     Client,
+    Consistency,
     DeleteRelationshipsRequest,
+    LookupResourcesRequest,
     ObjectReference,
     Relationship,
     RelationshipFilter,
@@ -11,8 +18,22 @@ from authzed.api.v1 import (
     SubjectFilter,
     SubjectReference,
     WriteRelationshipsRequest,
+    ZedToken,
 )
-from typing_extensions import Self
+from authzed.api.v1.permission_service_pb2 import LOOKUP_PERMISSIONSHIP_HAS_PERMISSION
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.outbox import (
+    NewOutboxEvent,
+    OutboxEvent,
+    OutboxOperation,
+    OutboxTopic,
+)
+from edm_su_api.internal.usecase.repository.outbox import (
+    AbstractOutboxHandler,
+    AbstractOutboxRepository,
+)
+from edm_su_api.pkg.cache import DecisionCache, TTLCache
 
 
 class Object(NamedTuple):
@@ -20,7 +41,26 @@ class Object(NamedTuple):
     object_id: str
 
 
+class RelationshipTuple(NamedTuple):
+    resource: Object
+    relation: str
+    subject: Object
+    subject_relation: str = ""
+
+
+class PermissionCheck(NamedTuple):
+    resource: Object
+    permission: str
+    subject: Object
+
+
 class AbstractPermissionRepository(ABC):
+    """Relationship changes.
+
+    Every change returns the ZedToken of the revision it was written at,
+    for checks that must see it, or None when it is not applied yet.
+    """
+
     @abstractmethod
     async def write(
         self: Self,
@@ -28,9 +68,19 @@ class AbstractPermissionRepository(ABC):
         relation: str,
         subject: Object,
         subject_relation: str = "",
-    ) -> None:
+    ) -> str | None:
         pass
 
+    @abstractmethod
+    async def write_many(
+        self: Self,
+        relationships: Iterable[RelationshipTuple],
+    ) -> str | None:
+        """Write all the relationships in a single request.
+
+        Relationships that already exist are left as they are.
+        """
+
     @abstractmethod
     async def delete(
         self: Self,
@@ -38,55 +88,57 @@ class AbstractPermissionRepository(ABC):
         relation: str | None = None,
         subject: Object | None = None,
         subject_relation: str | None = None,
-    ) -> None:
-        pass
+    ) -> str | None:
+        """Delete the relationships of `resource` matching the filter."""
 
 
 class SpiceDBPermissionRepository(AbstractPermissionRepository):
-    def __init__(self: Self, client: Client) -> None:
+    """Relationship changes applied right away.
+
+    Changes are reported to `decisions`, so that cached permission checks
+    on the resources changed are made again.
+    """
+
+    def __init__(
+        self: Self,
+        client: Client,
+        decisions: DecisionCache[Any, Any] | None = None,
+    ) -> None:
         self.client = client
+        self.decisions = decisions
 
+    @override
     async def write(
         self: Self,
         resource: Object,
         relation: str,
         subject: Object,
         subject_relation: str = "",
-    ) -> None:
-        _resource = ObjectReference(
-            object_type=resource.object_type,
-            object_id=resource.object_id,
-        )
-        _subject = SubjectReference(
-            object=ObjectReference(
-                object_type=subject.object_type,
-                object_id=subject.object_id,
-            ),
-            optional_relation=subject_relation,
+    ) -> str | None:
+        return await self.write_many(
+            [RelationshipTuple(resource, relation, subject, subject_relation)],
         )
 
-        await self.client.WriteRelationships(
-            WriteRelationshipsRequest(
-                updates=[
-                    RelationshipUpdate(
-                        operation=RelationshipUpdate.Operation.OPERATION_CREATE,
-                        relationship=Relationship(
-                            resource=_resource,
-                            subject=_subject,
-                            relation=relation,
-                        ),
-                    ),
-                ],
-            ),
+    @override
+    async def write_many(
+        self: Self,
+        relationships: Iterable[RelationshipTuple],
+    ) -> str | None:
+        # TOUCH rather than CREATE: writing a relationship that already
+        # exists succeeds, so that retried writes are harmless.
+        return await self._update(
+            RelationshipUpdate.Operation.OPERATION_TOUCH,
+            relationships,
         )
 
+    @override
     async def delete(
         self: Self,
         resource: Object,
         relation: str | None = None,
         subject: Object | None = None,
         subject_relation: str | None = None,
-    ) -> None:
+    ) -> str | None:
         subject_filter = self._build_subject_filter(subject, subject_relation)
 
         relationship_filter = self._build_relationship_filter(
@@ -95,11 +147,63 @@ class SpiceDBPermissionRepository(AbstractPermissionRepository):
             relation,
         )
 
-        await self.client.DeleteRelationships(
+        response = await self.client.DeleteRelationships(
             DeleteRelationshipsRequest(
                 relationship_filter=relationship_filter,
             ),
         )
+        token = response.deleted_at.token
+        self._changed([resource], token)
+        return token
+
+    async def _update(
+        self: Self,
+        operation: RelationshipUpdate.Operation.ValueType,
+        relationships: Iterable[RelationshipTuple],
+    ) -> str | None:
+        # Deduplicated, SpiceDB rejects a request updating a relationship
+        # twice.
+        unique = list(dict.fromkeys(relationships))
+        if not unique:
+            return None
+
+        response = await self.client.WriteRelationships(
+            WriteRelationshipsRequest(
+                updates=[
+                    RelationshipUpdate(
+                        operation=operation,
+                        relationship=self._build_relationship(relationship),
+                    )
+                    for relationship in unique
+                ],
+            ),
+        )
+        token = response.written_at.token
+        self._changed((relationship.resource for relationship in unique), token)
+        return token
+
+    def _changed(self: Self, resources: Iterable[Object], token: str) -> None:
+        if self.decisions is not None:
+            for resource in set(resources):
+                self.decisions.changed(resource, token)
+
+    @staticmethod
+    def _build_relationship(relationship: RelationshipTuple) -> Relationship:
+        resource, relation, subject, subject_relation = relationship
+        return Relationship(
+            resource=ObjectReference(
+                object_type=resource.object_type,
+                object_id=resource.object_id,
+            ),
+            relation=relation,
+            subject=SubjectReference(
+                object=ObjectReference(
+                    object_type=subject.object_type,
+                    object_id=subject.object_id,
+                ),
+                optional_relation=subject_relation,
+            ),
+        )
 
     def _build_relationship_filter(
         self: Self,
@@ -134,3 +238,315 @@ class SpiceDBPermissionRepository(AbstractPermissionRepository):
                 optional_relation=subject_relation_filter,
             )
         return None
+
+
+class AbstractPermissionCheckRepository(ABC):
+    @abstractmethod
+    async def check_many(
+        self: Self,
+        checks: Sequence[PermissionCheck],
+        at_least_as_fresh: Collection[str] = (),
+    ) -> list[bool]:
+        """Tell for each check whether the subject has the permission.
+
+        The answers reflect at least the changes `at_least_as_fresh` holds
+        the ZedTokens of.
+        """
+
+
+class SpiceDBPermissionCheckRepository(AbstractPermissionCheckRepository):
+    def __init__(self: Self, client: Client) -> None:
+        self.client = client
+
+    @override
+    async def check_many(
+        self: Self,
+        checks: Sequence[PermissionCheck],
+        at_least_as_fresh: Collection[str] = (),
+    ) -> list[bool]:
+        if not checks:
+            return []
+
+        response = await self.client.CheckBulkPermissions(
+            CheckBulkPermissionsRequest(
+                consistency=self._consistency(at_least_as_fresh),
+                items=[
+                    CheckBulkPermissionsRequestItem(
+                        resource=ObjectReference(
+                            object_type=check.resource.object_type,
+                            object_id=check.resource.object_id,
+                        ),
+                        permission=check.permission,
+                        subject=SubjectReference(
+                            object=ObjectReference(
+                                object_type=check.subject.object_type,
+                                object_id=check.subject.object_id,
+                            ),
+                        ),
+                    )
+                    for check in checks
+                ],
+            ),
+        )
+        # A failed check is a denial, as is a caveated permission: no
+        # caveat context is ever passed.
+        return [
+            pair.HasField("item")
+            and pair.item.permissionship
+            == CheckPermissionResponse.PERMISSIONSHIP_HAS_PERMISSION
+            for pair in response.pairs
+        ]
+
+    @staticmethod
+    def _consistency(at_least_as_fresh: Collection[str]) -> Consistency:
+        # A request takes a single token; past that, only a fully
+        # consistent check is sure to see all the changes.
+        if not at_least_as_fresh:
+            return Consistency(minimize_latency=True)
+        if len(at_least_as_fresh) == 1:
+            (token,) = at_least_as_fresh
+            return Consistency(at_least_as_fresh=ZedToken(token=token))
+        return Consistency(fully_consistent=True)
+
+
+class CachedPermissionCheckRepository(AbstractPermissionCheckRepository):
+    """Answers recent checks from `decisions`, asks SpiceDB the rest at once.
+
+    Checks on a resource changed in this process skip the cache and ask
+    for an answer at least as fresh as the change. Other processes see
+    the change once the cached answers expire.
+    """
+
+    def __init__(
+        self: Self,
+        repository: AbstractPermissionCheckRepository,
+        decisions: DecisionCache[Any, Any],
+    ) -> None:
+        self._repository = repository
+        self._decisions = decisions
+
+    @override
+    async def check_many(
+        self: Self,
+        checks: Sequence[PermissionCheck],
+        at_least_as_fresh: Collection[str] = (),
+    ) -> list[bool]:
+        answers: dict[PermissionCheck, bool] = {}
+        if not at_least_as_fresh:
+            for check in checks:
+                allowed = self._decisions.get(check, check.resource)
+                if allowed is not None:
+                    answers[check] = allowed
+
+        missing = [check for check in dict.fromkeys(checks) if check not in answers]
+        if missing:
+            tokens = set(at_least_as_fresh)
+            for check in missing:
+                token = self._decisions.token(check.resource)
+                if token is not None:
+                    tokens.add(token)
+
+            asked_at = time.monotonic()
+            fetched = await self._repository.check_many(missing, tokens)
+            for check, is_allowed in zip(missing, fetched, strict=True):
+                self._decisions.set(check, is_allowed, asked_at)
+                answers[check] = is_allowed
+
+        return [answers[check] for check in checks]
+
+
+class AbstractPermissionLookupRepository(ABC):
+    @abstractmethod
+    async def lookup_resources(
+        self: Self,
+        resource_type: str,
+        permission: str,
+        subject: Object,
+    ) -> frozenset[str]:
+        """Return the ids of the resources the subject has the permission on."""
+
+
+class SpiceDBPermissionLookupRepository(AbstractPermissionLookupRepository):
+    def __init__(self: Self, client: Client) -> None:
+        self.client = client
+
+    @override
+    async def lookup_resources(
+        self: Self,
+        resource_type: str,
+        permission: str,
+        subject: Object,
+    ) -> frozenset[str]:
+        responses = self.client.LookupResources(
+            LookupResourcesRequest(
+                consistency=Consistency(minimize_latency=True),
+                resource_object_type=resource_type,
+                permission=permission,
+                subject=SubjectReference(
+                    object=ObjectReference(
+                        object_type=subject.object_type,
+                        object_id=subject.object_id,
+                    ),
+                ),
+            ),
+        )
+        # Streamed into the set as they come rather than collected first.
+        # Caveated permissions are left out: no caveat context is passed.
+        return frozenset(
+            [
+                response.resource_object_id
+                async for response in responses
+                if response.permissionship == LOOKUP_PERMISSIONSHIP_HAS_PERMISSION
+            ],
+        )
+
+
+class CachedPermissionLookupRepository(AbstractPermissionLookupRepository):
+    """Keeps each subject's resources for the TTL of `cache`.
+
+    Resources shared or unshared meanwhile show up once the entry expires.
+    """
+
+    def __init__(
+        self: Self,
+        repository: AbstractPermissionLookupRepository,
+        cache: TTLCache[tuple[str, str, str], frozenset[str]],
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+
+    @override
+    async def lookup_resources(
+        self: Self,
+        resource_type: str,
+        permission: str,
+        subject: Object,
+    ) -> frozenset[str]:
+        key = (resource_type, permission, f"{subject.object_type}:{subject.object_id}")
+        resources = self._cache.get(key)
+        if resources is None:
+            resources = await self._repository.lookup_resources(
+                resource_type,
+                permission,
+                subject,
+            )
+            self._cache.set(key, resources)
+        return resources
+
+
+class OutboxPermissionRepository(AbstractPermissionRepository):
+    """Queue the relationship changes in the outbox instead of applying them.
+
+    The changes are written in the caller's transaction and applied by the
+    outbox worker once it commits.
+    """
+
+    def __init__(self: Self, outbox: AbstractOutboxRepository) -> None:
+        self.outbox = outbox
+
+    @override
+    async def write(
+        self: Self,
+        resource: Object,
+        relation: str,
+        subject: Object,
+        subject_relation: str = "",
+    ) -> str | None:
+        return await self.write_many(
+            [RelationshipTuple(resource, relation, subject, subject_relation)],
+        )
+
+    @override
+    async def write_many(
+        self: Self,
+        relationships: Iterable[RelationshipTuple],
+    ) -> str | None:
+        await self.outbox.add(
+            *(
+                self._event(
+                    relationship.resource,
+                    OutboxOperation.UPSERT,
+                    relationship._asdict(),
+                )
+                for relationship in relationships
+            ),
+        )
+        return None
+
+    @override
+    async def delete(
+        self: Self,
+        resource: Object,
+        relation: str | None = None,
+        subject: Object | None = None,
+        subject_relation: str | None = None,
+    ) -> str | None:
+        payload = {
+            "resource": resource,
+            "relation": relation,
+            "subject": subject,
+            "subject_relation": subject_relation,
+        }
+        await self.outbox.add(
+            self._event(resource, OutboxOperation.DELETE, payload),
+        )
+        return None
+
+    @staticmethod
+    def _event(
+        resource: Object,
+        operation: OutboxOperation,
+        payload: dict[str, Any],
+    ) -> NewOutboxEvent:
+        return NewOutboxEvent(
+            topic=OutboxTopic.PERMISSIONS,
+            operation=operation,
+            key=f"{resource.object_type}:{resource.object_id}",
+            payload=payload,
+        )
+
+
+class SpiceDBOutboxHandler(AbstractOutboxHandler):
+    """Apply queued relationship changes in order.
+
+    Consecutive writes go out batched in a single request; deletes take
+    one request each, as every one has its own filter.
+    """
+
+    topic = OutboxTopic.PERMISSIONS
+
+    def __init__(self: Self, repository: AbstractPermissionRepository) -> None:
+        self.repository = repository
+
+    @override
+    async def handle(self: Self, events: Sequence[OutboxEvent]) -> None:
+        # A delete may match a pending write, so the writes before it are
+        # sent first.
+        pending: list[RelationshipTuple] = []
+        for event in events:
+            payload = event.payload
+            if event.operation is OutboxOperation.UPSERT:
+                pending.append(
+                    RelationshipTuple(
+                        resource=Object(*payload["resource"]),
+                        relation=payload["relation"],
+                        subject=Object(*payload["subject"]),
+                        subject_relation=payload["subject_relation"],
+                    ),
+                )
+                continue
+
+            await self._flush(pending)
+            pending = []
+            await self.repository.delete(
+                Object(*payload["resource"]),
+                payload["relation"],
+                Object(*payload["subject"]) if payload["subject"] else None,
+                payload["subject_relation"],
+            )
+
+        await self._flush(pending)
+
+    async def _flush(self: Self, pending: list[RelationshipTuple]) -> None:
+        if pending:
+            await self.repository.write_many(list(dict.fromkeys(pending)))
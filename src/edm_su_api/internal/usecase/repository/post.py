@@ -1,8 +1,20 @@
 from abc import ABC, abstractmethod
+from collections.abc import Collection
 from datetime import datetime, timezone
 from uuid import UUID
 
-from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
+    String,
+    any_,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Self
@@ -14,10 +26,18 @@ from edm_su_api.internal.entity.post import (
     UpdatePostDTO,
 )
 from edm_su_api.internal.usecase.exceptions.post import PostNotFoundError
+from edm_su_api.internal.usecase.repository.counter import (
+    POSTS,
+    select_counter_sum,
+)
 from edm_su_api.pkg.postgres import Post as PGPost
 from edm_su_api.pkg.postgres import PostEditHistory as PGPostEditHistory
 
 
+def _slug_in(slugs: Collection[str]) -> ColumnElement[bool]:
+    return PGPost.slug == any_(literal(list(slugs), ARRAY(String)))
+
+
 class AbstractPostRepository(ABC):
     @abstractmethod
     async def create(
@@ -38,11 +58,12 @@ class AbstractPostRepository(ABC):
         self: Self,
         skip: int = 0,
         limit: int = 10,
+        slugs: Collection[str] | None = None,
     ) -> list[Post]:
-        pass
+        """Return a page of published posts, only those in `slugs` if given."""
 
     @abstractmethod
-    async def count(self: Self) -> int:
+    async def count(self: Self, slugs: Collection[str] | None = None) -> int:
         pass
 
     @abstractmethod
@@ -127,6 +148,7 @@ class PostgresPostRepository(AbstractPostRepository):
         self: Self,
         skip: int = 0,
         limit: int = 10,
+        slugs: Collection[str] | None = None,
     ) -> list[Post]:
         query = (
             select(PGPost)
@@ -135,15 +157,32 @@ class PostgresPostRepository(AbstractPostRepository):
             .offset(skip)
             .limit(limit)
         )
+        if slugs is not None:
+            query = query.where(_slug_in(slugs))
 
         result = (await self._session.scalars(query)).all()
         return [Post.model_validate(post) for post in result]
 
-    async def count(self: Self) -> int:
-        query = (
+    async def count(self: Self, slugs: Collection[str] | None = None) -> int:
+        if slugs is not None:
+            query = (
+                select(func.count())
+                .select_from(PGPost)
+                .where(PGPost.published_at <= datetime.now(tz=timezone.utc))
+                .where(_slug_in(slugs))
+            )
+            return (await self._session.scalars(query)).one()
+
+        # The counter includes scheduled posts, which are few and served by
+        # the published_at index, so subtract them instead of counting all
+        # published ones.
+        scheduled = (
             select(func.count())
             .select_from(PGPost)
-            .where(PGPost.published_at <= datetime.now(tz=timezone.utc))
+            .where(PGPost.published_at > datetime.now(tz=timezone.utc))
+        )
+        query = select(
+            select_counter_sum(POSTS).scalar_subquery() - scheduled.scalar_subquery(),
         )
 
         return (await self._session.scalars(query)).one()
@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, Iterable
+
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.video import Video, VideoSuggestion, VideoTitle
+from edm_su_api.pkg.suggest import PrefixIndex, prefix_terms
+
+
+class AbstractVideoSuggestionRepository(ABC):
+    @abstractmethod
+    async def add(self: Self, *videos: Video) -> None:
+        """Index the videos, replacing what was indexed for them before."""
+
+    @abstractmethod
+    async def remove(self: Self, *ids: int) -> None:
+        pass
+
+    @abstractmethod
+    async def replace(self: Self, batches: AsyncIterable[Iterable[VideoTitle]]) -> None:
+        """Rebuild the index from scratch with the given videos.
+
+        The batches are read one at a time rather than collected first.
+        """
+
+    @abstractmethod
+    async def search(self: Self, query: str, limit: int = 10) -> list[VideoSuggestion]:
+        pass
+
+
+class PrefixIndexVideoSuggestionRepository(AbstractVideoSuggestionRepository):
+    def __init__(
+        self: Self,
+        index: PrefixIndex[VideoSuggestion],
+    ) -> None:
+        self._index = index
+
+    @override
+    async def add(self: Self, *videos: Video) -> None:
+        for video in videos:
+            self._index.add(video.id, self._suggestion(video), self._terms(video))
+
+    @override
+    async def remove(self: Self, *ids: int) -> None:
+        for id_ in ids:
+            self._index.remove(id_)
+
+    @override
+    async def replace(self: Self, batches: AsyncIterable[Iterable[VideoTitle]]) -> None:
+        await self._index.replace_batches(
+            [(video.id, self._suggestion(video), self._terms(video)) for video in batch]
+            async for batch in batches
+        )
+
+    @override
+    async def search(self: Self, query: str, limit: int = 10) -> list[VideoSuggestion]:
+        return self._index.search(query, limit)
+
+    @staticmethod
+    def _suggestion(video: Video | VideoTitle) -> VideoSuggestion:
+        return VideoSuggestion(title=video.title, slug=video.slug)
+
+    @staticmethod
+    def _terms(video: Video | VideoTitle) -> set[str]:
+        return prefix_terms(video.title, video.slug)
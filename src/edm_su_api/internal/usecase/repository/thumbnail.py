@@ -0,0 +1,79 @@
+import asyncio
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+
+import aiohttp
+from types_aiobotocore_s3.client import S3Client
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.pkg.thumbnails import (
+    THUMBNAIL_WIDTHS,
+    RenderedThumbnails,
+    render_thumbnails,
+)
+
+
+class AbstractThumbnailSourceRepository(ABC):
+    @abstractmethod
+    async def fetch(self: Self, url: str) -> bytes:
+        """Download the original image."""
+
+
+class HttpThumbnailSourceRepository(AbstractThumbnailSourceRepository):
+    def __init__(self: Self, session: aiohttp.ClientSession) -> None:
+        self.session = session
+
+    @override
+    async def fetch(self: Self, url: str) -> bytes:
+        async with self.session.get(url, raise_for_status=True) as response:
+            return await response.read()
+
+
+class AbstractThumbnailRenderer(ABC):
+    @abstractmethod
+    async def render(self: Self, data: bytes) -> RenderedThumbnails:
+        pass
+
+
+class ExecutorThumbnailRenderer(AbstractThumbnailRenderer):
+    """Render in `executor`, a process pool so the event loop stays free."""
+
+    def __init__(
+        self: Self,
+        executor: Executor,
+        widths: tuple[int, ...] = THUMBNAIL_WIDTHS,
+    ) -> None:
+        self.executor = executor
+        self.widths = widths
+
+    @override
+    async def render(self: Self, data: bytes) -> RenderedThumbnails:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            render_thumbnails,
+            data,
+            self.widths,
+        )
+
+
+class AbstractThumbnailStorageRepository(ABC):
+    @abstractmethod
+    async def save(self: Self, key: str, data: bytes, content_type: str) -> str:
+        """Store a file and return the URL it's served from."""
+
+
+class S3ThumbnailStorageRepository(AbstractThumbnailStorageRepository):
+    def __init__(self: Self, s3_client: S3Client) -> None:
+        self.s3_client = s3_client
+
+    @override
+    async def save(self: Self, key: str, data: bytes, content_type: str) -> str:
+        await self.s3_client.put_object(
+            Bucket=settings.s3_bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+        )
+        return f"{settings.static_url}/{key}"
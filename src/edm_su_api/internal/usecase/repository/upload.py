@@ -1,9 +1,29 @@
+import asyncio
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator, Collection, Iterable, Sequence
+from concurrent.futures import Executor
 
+from botocore.exceptions import ClientError
+from sqlalchemy import ARRAY, String, any_, literal, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from types_aiobotocore_s3.client import S3Client
-from typing_extensions import Self
+from typing_extensions import Self, override
 
 from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.upload import (
+    CompletedPart,
+    ImageSet,
+    PendingMultipartUpload,
+    UploadPart,
+)
+from edm_su_api.internal.usecase.exceptions.upload import (
+    UploadNotFoundError,
+    UploadPartsInvalidError,
+    UploadTooLargeError,
+)
+from edm_su_api.pkg.images import IMAGE_WIDTHS, RenderedImage, render_image
+from edm_su_api.pkg.postgres import Upload as PGUpload
 
 
 class AbstractPreSignedUploadRepository(ABC):
@@ -27,3 +47,266 @@ class S3PreSignedUploadRepository(AbstractPreSignedUploadRepository):
             ExpiresIn=expires_in,
             HttpMethod="PUT",
         )
+
+
+class AbstractMultipartUploadRepository(ABC):
+    @abstractmethod
+    async def create(self: Self, key: str, content_type: str) -> str:
+        """Start a multipart upload and return its id."""
+
+    @abstractmethod
+    async def generate_part_urls(
+        self: Self,
+        key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int,
+    ) -> list[UploadPart]:
+        pass
+
+    @abstractmethod
+    async def complete(
+        self: Self,
+        key: str,
+        upload_id: str,
+        parts: Sequence[CompletedPart],
+    ) -> str:
+        """Assemble the uploaded parts and return the URL of the file."""
+
+    @abstractmethod
+    async def abort(self: Self, key: str, upload_id: str) -> None:
+        """Abort an upload and drop the parts uploaded so far."""
+
+    @abstractmethod
+    def get_pending(self: Self) -> AsyncIterator[PendingMultipartUpload]:
+        """Uploads started but neither completed nor aborted."""
+
+
+class S3MultipartUploadRepository(AbstractMultipartUploadRepository):
+    def __init__(self: Self, s3_client: S3Client) -> None:
+        self.s3_client = s3_client
+
+    @override
+    async def create(self: Self, key: str, content_type: str) -> str:
+        response = await self.s3_client.create_multipart_upload(
+            Bucket=settings.s3_bucket,
+            Key=key,
+            ContentType=content_type,
+        )
+        return response["UploadId"]
+
+    @override
+    async def generate_part_urls(
+        self: Self,
+        key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int,
+    ) -> list[UploadPart]:
+        # Signing is local, no request is made per part.
+        return [
+            UploadPart(
+                part_number=part_number,
+                url=await self.s3_client.generate_presigned_url(
+                    ClientMethod="upload_part",
+                    Params={
+                        "Bucket": settings.s3_bucket,
+                        "Key": key,
+                        "UploadId": upload_id,
+                        "PartNumber": part_number,
+                    },
+                    ExpiresIn=expires_in,
+                    HttpMethod="PUT",
+                ),
+            )
+            for part_number in part_numbers
+        ]
+
+    @override
+    async def complete(
+        self: Self,
+        key: str,
+        upload_id: str,
+        parts: Sequence[CompletedPart],
+    ) -> str:
+        try:
+            await self.s3_client.complete_multipart_upload(
+                Bucket=settings.s3_bucket,
+                Key=key,
+                UploadId=upload_id,
+                MultipartUpload={
+                    "Parts": [
+                        {"PartNumber": part.part_number, "ETag": part.etag}
+                        for part in parts
+                    ],
+                },
+            )
+        except ClientError as e:
+            code = e.response.get("Error", {}).get("Code")
+            if code == "NoSuchUpload":
+                raise UploadNotFoundError(key) from e
+            if code in {"InvalidPart", "InvalidPartOrder", "EntityTooSmall"}:
+                raise UploadPartsInvalidError(key) from e
+            raise
+        return f"{settings.static_url}/{key}"
+
+    @override
+    async def abort(self: Self, key: str, upload_id: str) -> None:
+        try:
+            await self.s3_client.abort_multipart_upload(
+                Bucket=settings.s3_bucket,
+                Key=key,
+                UploadId=upload_id,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchUpload":
+                raise UploadNotFoundError(key) from e
+            raise
+
+    @override
+    async def get_pending(self: Self) -> AsyncIterator[PendingMultipartUpload]:
+        paginator = self.s3_client.get_paginator("list_multipart_uploads")
+        async for page in paginator.paginate(Bucket=settings.s3_bucket):
+            for upload in page.get("Uploads", []):
+                yield PendingMultipartUpload(
+                    key=upload["Key"],
+                    upload_id=upload["UploadId"],
+                    initiated=upload["Initiated"],
+                )
+
+
+class AbstractUploadObjectRepository(ABC):
+    """The uploaded files themselves."""
+
+    @abstractmethod
+    async def get(self: Self, key: str, max_size: int) -> bytes:
+        """Read an uploaded file, refusing files larger than `max_size`."""
+
+    @abstractmethod
+    async def put(self: Self, key: str, data: bytes, content_type: str) -> str:
+        """Store a file and return the URL it's served from."""
+
+    @abstractmethod
+    def url(self: Self, key: str) -> str:
+        pass
+
+
+class S3UploadObjectRepository(AbstractUploadObjectRepository):
+    def __init__(self: Self, s3_client: S3Client) -> None:
+        self.s3_client = s3_client
+
+    @override
+    async def get(self: Self, key: str, max_size: int) -> bytes:
+        try:
+            response = await self.s3_client.get_object(
+                Bucket=settings.s3_bucket,
+                Key=key,
+            )
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "NoSuchKey":
+                raise UploadNotFoundError(key) from e
+            raise
+
+        async with response["Body"] as body:
+            if response["ContentLength"] > max_size:
+                raise UploadTooLargeError(key, max_size)
+            return await body.read()
+
+    @override
+    async def put(self: Self, key: str, data: bytes, content_type: str) -> str:
+        await self.s3_client.put_object(
+            Bucket=settings.s3_bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+        )
+        return self.url(key)
+
+    @override
+    def url(self: Self, key: str) -> str:
+        return f"{settings.static_url}/{key}"
+
+
+class AbstractImageRenderer(ABC):
+    @abstractmethod
+    async def render(
+        self: Self,
+        data: bytes,
+        max_pixels: int | None = None,
+    ) -> RenderedImage:
+        """Decode an image and encode its variants.
+
+        Raises PIL.UnidentifiedImageError when `data` is not an image, and
+        ImageTooLargeError or PIL.Image.DecompressionBombError when it has
+        more than `max_pixels` pixels.
+        """
+
+
+class ExecutorImageRenderer(AbstractImageRenderer):
+    """Render in `executor`, a process pool so the event loop stays free."""
+
+    def __init__(
+        self: Self,
+        executor: Executor,
+        widths: tuple[int, ...] = IMAGE_WIDTHS,
+        formats: tuple[str, ...] = ("webp",),
+    ) -> None:
+        self.executor = executor
+        self.widths = widths
+        self.formats = formats
+
+    @override
+    async def render(
+        self: Self,
+        data: bytes,
+        max_pixels: int | None = None,
+    ) -> RenderedImage:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor,
+            render_image,
+            data,
+            self.widths,
+            self.formats,
+            max_pixels,
+        )
+
+
+class AbstractUploadRepository(ABC):
+    @abstractmethod
+    async def save(self: Self, image: ImageSet, user_id: str) -> ImageSet:
+        """Record an image, replacing what was recorded under its key."""
+
+    @abstractmethod
+    async def get_by_urls(self: Self, urls: Collection[str]) -> dict[str, ImageSet]:
+        pass
+
+
+class PostgresUploadRepository(AbstractUploadRepository):
+    def __init__(self: Self, session: AsyncSession) -> None:
+        self._session = session
+
+    @override
+    async def save(self: Self, image: ImageSet, user_id: str) -> ImageSet:
+        values = image.model_dump()
+        query = (
+            pg_insert(PGUpload)
+            .values(**values, user_id=user_id)
+            .on_conflict_do_update(
+                index_elements=[PGUpload.key],
+                set_={name: value for name, value in values.items() if name != "key"},
+            )
+            .returning(PGUpload)
+        )
+        return ImageSet.model_validate((await self._session.scalars(query)).one())
+
+    @override
+    async def get_by_urls(self: Self, urls: Collection[str]) -> dict[str, ImageSet]:
+        if not urls:
+            return {}
+
+        query = select(PGUpload).where(
+            PGUpload.url == any_(literal(list(urls), ARRAY(String))),
+        )
+        result = await self._session.scalars(query)
+        return {upload.url: ImageSet.model_validate(upload) for upload in result}
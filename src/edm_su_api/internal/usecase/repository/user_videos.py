@@ -1,15 +1,18 @@
 from abc import ABC, abstractmethod
+from collections.abc import Collection
 
-from sqlalchemy import delete, insert, select
+from sqlalchemy import Integer, any_, delete, insert, literal, select
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing_extensions import Self
+from typing_extensions import Self, override
 
 from edm_su_api.internal.entity.user import User
 from edm_su_api.internal.entity.video import Video
 from edm_su_api.internal.usecase.exceptions.user_videos import (
     UserVideoNotLikedError,
 )
+from edm_su_api.pkg.cache import TTLCache
 from edm_su_api.pkg.postgres import LikedVideos as PGLikedVideo
 from edm_su_api.pkg.postgres import Video as PGVideo
 
@@ -49,6 +52,14 @@ class AbstractUserVideosRepository(ABC):
     ) -> bool:
         pass
 
+    @abstractmethod
+    async def get_liked_video_ids(
+        self: Self,
+        user_id: str,
+        video_ids: Collection[int] | None = None,
+    ) -> set[int]:
+        """Return the ids the user liked, among `video_ids` if given."""
+
 
 class PostgresUserVideosRepository(AbstractUserVideosRepository):
     def __init__(
@@ -116,3 +127,90 @@ class PostgresUserVideosRepository(AbstractUserVideosRepository):
         )
 
         return bool(await self._session.scalar(query))
+
+    async def get_liked_video_ids(
+        self: Self,
+        user_id: str,
+        video_ids: Collection[int] | None = None,
+    ) -> set[int]:
+        if video_ids is not None and not video_ids:
+            return set()
+
+        query = select(PGLikedVideo.video_id).where(PGLikedVideo.user_id == user_id)
+        if video_ids is not None:
+            ids = literal(list(video_ids), ARRAY(Integer))
+            query = query.where(PGLikedVideo.video_id == any_(ids))
+
+        return set((await self._session.scalars(query)).all())
+
+
+class CachedUserVideosRepository(AbstractUserVideosRepository):
+    """Keeps every user's full set of liked ids in a bounded cache.
+
+    Marking favourites then needs no query as long as the user's set is
+    cached. Likes and unlikes made through this repository drop the set;
+    other processes see them once the entry expires.
+    """
+
+    def __init__(
+        self: Self,
+        repository: AbstractUserVideosRepository,
+        cache: TTLCache[str, frozenset[int]],
+    ) -> None:
+        self._repository = repository
+        self._cache = cache
+
+    @override
+    async def like_video(
+        self: Self,
+        user: User,
+        video: Video,
+    ) -> None:
+        await self._repository.like_video(user, video)
+        self._cache.pop(user.id)
+
+    @override
+    async def unlike_video(
+        self: Self,
+        user: User,
+        video: Video,
+    ) -> None:
+        await self._repository.unlike_video(user, video)
+        self._cache.pop(user.id)
+
+    @override
+    async def get_user_videos(
+        self: Self,
+        user: User,
+        *,
+        limit: int = 20,
+        offset: int = 0,
+    ) -> list[Video]:
+        return await self._repository.get_user_videos(
+            user,
+            limit=limit,
+            offset=offset,
+        )
+
+    @override
+    async def is_liked(
+        self: Self,
+        user: User,
+        video: Video,
+    ) -> bool:
+        return await self._repository.is_liked(user, video)
+
+    @override
+    async def get_liked_video_ids(
+        self: Self,
+        user_id: str,
+        video_ids: Collection[int] | None = None,
+    ) -> set[int]:
+        liked = self._cache.get(user_id)
+        if liked is None:
+            liked = frozenset(await self._repository.get_liked_video_ids(user_id))
+            self._cache.set(user_id, liked)
+
+        if video_ids is None:
+            return set(liked)
+        return {video_id for video_id in video_ids if video_id in liked}
@@ -1,63 +1,247 @@
+import asyncio
+import hashlib
+import html
 from abc import ABC, abstractmethod
-from typing import final
+from collections import defaultdict
+from collections.abc import (
+    AsyncIterable,
+    AsyncIterator,
+    Collection,
+    Mapping,
+    Sequence,
+)
+from typing import TYPE_CHECKING, Any, final
 
 from fastapi.encoders import jsonable_encoder
 from meilisearch_python_async import Client as MeilisearchClient
 from meilisearch_python_async.task import wait_for_task
 from pydantic_core import to_jsonable_python
 from sqlalchemy import (
+    ARRAY,
+    ColumnElement,
     ColumnExpressionArgument,
-    and_,
-    case,
+    Integer,
+    Select,
+    String,
+    UnaryExpression,
+    any_,
+    delete,
     func,
     insert,
-    or_,
+    literal,
     select,
     update,
 )
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 from sqlalchemy.sql.expression import false, true
 from typing_extensions import Self, override
 
+from edm_su_api.internal.entity.outbox import (
+    NewOutboxEvent,
+    OutboxEvent,
+    OutboxOperation,
+    OutboxTopic,
+)
 from edm_su_api.internal.entity.video import (
     DeleteType,
+    DurationBucket,
     NewVideoDto,
     UpdateVideoDto,
     Video,
+    VideoFilter,
+    VideoSearchHit,
+    VideoSearchPage,
+    VideoSort,
+    VideoThumbnails,
+    VideoTitle,
 )
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoAlreadyDeletedError,
     VideoNotDeletedError,
     VideoNotFoundError,
     VideoRestoreError,
+    VideoSlugNotUniqueError,
+    VideoYtIdNotUniqueError,
+)
+from edm_su_api.internal.usecase.repository.cache import (
+    VIDEOS_SEARCH,
+    AbstractCacheRepository,
+)
+from edm_su_api.internal.usecase.repository.counter import (
+    VIDEOS_DELETED,
+    VIDEOS_LIVE,
+    VIDEOS_VERSION,
+    select_counter_sum,
+)
+from edm_su_api.internal.usecase.repository.outbox import (
+    AbstractOutboxHandler,
+    AbstractOutboxRepository,
 )
-from edm_su_api.pkg.meilisearch import normalize_ms_index_name
-from edm_su_api.pkg.postgres import LikedVideos
+from edm_su_api.pkg.meilisearch import VIDEO_INDEX_SETTINGS, normalize_ms_index_name
+from edm_su_api.pkg.postgres import ArchivedVideo as PGArchivedVideo
+from edm_su_api.pkg.postgres import LikedVideos as PGLikedVideos
 from edm_su_api.pkg.postgres import Video as PGVideo
+from edm_su_api.pkg.postgres import (
+    video_is_live,
+    video_not_purged,
+    video_purge_pending,
+)
+from edm_su_api.pkg.ratelimit import RateLimiter
+
+if TYPE_CHECKING:
+    from meilisearch_python_async.models.task import TaskInfo
+
+HIGHLIGHTED_ATTRIBUTES = ["title"]
+# Private use characters Meilisearch marks matches with, swapped for <em>
+# once the text around them is escaped.
+HIGHLIGHT_PRE_TAG = "\ue000"
+HIGHLIGHT_POST_TAG = "\ue001"
+
+
+def highlight_html(formatted: str) -> str:
+    """Turn a highlighted attribute into HTML, its text escaped."""
+    return (
+        html.escape(formatted)
+        .replace(HIGHLIGHT_PRE_TAG, "<em>")
+        .replace(HIGHLIGHT_POST_TAG, "</em>")
+    )
+
+
+def video_document(video: Video) -> dict[str, Any]:
+    """Build the search index document of a video."""
+    document = jsonable_encoder(video, exclude={"is_blocked_in_russia"})
+    # Not part of the API, but lets the index be compared with the database.
+    document["version"] = video.version
+    return document
+
+
+def video_document_update(
+    id_: int,
+    updated_data: UpdateVideoDto,
+    version: int | None = None,
+) -> dict[str, Any]:
+    """Build the partial document applying `updated_data` to a video."""
+    data = updated_data.model_dump(
+        exclude={"is_blocked_in_russia", "slug"},
+        exclude_unset=True,
+    )
+    data["id"] = id_
+    if version is not None:
+        data["version"] = version
+    return to_jsonable_python(data)
+
+
+def version_counts_fingerprint(counts: Mapping[int, int]) -> str:
+    """Hash how many videos of an id range are at each version.
+
+    Both the database and the index count these without listing the
+    videos, and a video missing, extra or stale in the index changes them.
+    """
+    raw = ",".join(f"{version}:{count}" for version, count in sorted(counts.items()))
+    return hashlib.md5(raw.encode(), usedforsecurity=False).hexdigest()
+
+
+def video_version_counts(range_size: int) -> Select[tuple[int, int, int]]:
+    """Count live videos by id range and version."""
+    range_ = (PGVideo.id // range_size).label("id_range")
+    return (
+        select(range_, PGVideo.version, func.count())
+        .where(video_is_live)
+        .group_by(range_, PGVideo.version)
+    )
+
+
+def visible_videos(*, include_deleted: bool = False) -> ColumnElement[bool]:
+    """Return the predicate matching one of the partial indexes on videos."""
+    if include_deleted:
+        return video_not_purged
+    return video_is_live
+
+
+# Sort column and direction; id breaks ties so that pages are stable. Both
+# directions keep PostgreSQL's default NULLS placement so that one
+# (column, id) index serves them forwards and backwards.
+VIDEO_SORT_COLUMNS: dict[VideoSort, tuple[InstrumentedAttribute, bool]] = {
+    VideoSort.NEWEST: (PGVideo.id, True),
+    VideoSort.DATE: (PGVideo.date, False),
+    VideoSort.DATE_DESC: (PGVideo.date, True),
+    VideoSort.DURATION: (PGVideo.duration, False),
+    VideoSort.DURATION_DESC: (PGVideo.duration, True),
+    VideoSort.TITLE: (PGVideo.title, False),
+    VideoSort.TITLE_DESC: (PGVideo.title, True),
+}
+
+
+def video_order(sort: VideoSort) -> list[UnaryExpression]:
+    column, descending = VIDEO_SORT_COLUMNS[sort]
+    if column is PGVideo.id:
+        return [column.desc() if descending else column.asc()]
+    if descending:
+        return [column.desc(), PGVideo.id.desc()]
+    return [column.asc(), PGVideo.id.asc()]
+
+
+def video_filter_clauses(filters: VideoFilter | None) -> list[ColumnElement[bool]]:
+    if filters is None:
+        return []
+
+    clauses = []
+    if filters.date_from is not None:
+        clauses.append(PGVideo.date >= filters.date_from)
+    if filters.date_to is not None:
+        clauses.append(PGVideo.date <= filters.date_to)
+    if filters.duration is not None:
+        low, high = filters.duration.bounds
+        if low is not None:
+            clauses.append(PGVideo.duration >= low)
+        if high is not None:
+            clauses.append(PGVideo.duration < high)
+    if filters.is_blocked_in_russia is not None:
+        clauses.append(PGVideo.is_blocked_in_russia == filters.is_blocked_in_russia)
+    if filters.slugs is not None:
+        clauses.append(
+            PGVideo.slug == any_(literal(list(filters.slugs), ARRAY(String)))
+        )
+    return clauses
 
 
 class AbstractVideoRepository(ABC):
     @abstractmethod
-    async def get_all(
+    async def get_all(  # noqa: PLR0913
         self: Self,
         offset: int = 0,
         limit: int = 20,
         *,
         include_deleted: bool = False,
+        after_id: int | None = None,
+        filters: VideoFilter | None = None,
+        sort: VideoSort = VideoSort.NEWEST,
     ) -> list[Video]:
-        pass
+        """Return a page of videos.
+
+        `after_id` seeks past a video id and only applies to the default
+        `VideoSort.NEWEST` order.
+        """
 
     @abstractmethod
-    async def get_all_with_favorite_mark(
+    def stream_all(
         self: Self,
-        user_id: str,
-        offset: int = 0,
-        limit: int = 20,
         *,
         include_deleted: bool = False,
-    ) -> list[Video]:
-        pass
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Video]]:
+        """Yield every video in id order, `batch_size` videos at a time."""
+
+    @abstractmethod
+    def stream_titles(
+        self: Self,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[VideoTitle]]:
+        """Yield the id, title and slug of every live video in id order."""
 
     @abstractmethod
     async def get_by_slug(
@@ -78,14 +262,8 @@ class AbstractVideoRepository(ABC):
         pass
 
     @abstractmethod
-    async def get_by_slug_with_favorite_mark(
-        self,
-        slug: str,
-        user_id: str,
-        *,
-        include_deleted: bool = False,
-    ) -> Video:
-        pass
+    async def get_by_ids(self: Self, ids: Sequence[int]) -> list[Video]:
+        """Return the live videos among `ids`, in the order of `ids`."""
 
     @abstractmethod
     async def get_by_yt_id(
@@ -101,6 +279,25 @@ class AbstractVideoRepository(ABC):
         self: Self,
         video: NewVideoDto,
     ) -> Video:
+        """Insert the video.
+
+        Raises VideoYtIdNotUniqueError or VideoSlugNotUniqueError if
+        another video, deleted or not, has the same yt_id or slug.
+        """
+
+    @abstractmethod
+    async def create_many(
+        self: Self,
+        videos: Sequence[NewVideoDto],
+    ) -> list[Video]:
+        """Insert the videos in one statement, skipping any that conflict."""
+
+    @abstractmethod
+    async def get_taken_yt_ids(self: Self, yt_ids: Collection[str]) -> set[str]:
+        pass
+
+    @abstractmethod
+    async def get_taken_slugs(self: Self, slugs: Collection[str]) -> set[str]:
         pass
 
     @abstractmethod
@@ -119,7 +316,47 @@ class AbstractVideoRepository(ABC):
         pass
 
     @abstractmethod
-    async def count(self: Self, *, include_deleted: bool = False) -> int:
+    async def count(
+        self: Self,
+        *,
+        include_deleted: bool = False,
+        filters: VideoFilter | None = None,
+    ) -> int:
+        pass
+
+    @abstractmethod
+    async def get_list_version(self: Self) -> int:
+        """Return a number that changes whenever any video does."""
+
+    @abstractmethod
+    async def get_fingerprints(self: Self, range_size: int) -> dict[int, str]:
+        """Fingerprint the ids and versions of live videos per id range.
+
+        Keys are range numbers, the range `n` holding ids from
+        `n * range_size` up to `(n + 1) * range_size` excluded; empty ranges
+        are left out. Fingerprints are built with
+        `version_counts_fingerprint`, so that the index can be fingerprinted
+        without reading its documents.
+        """
+
+    @abstractmethod
+    async def get_versions(self: Self, start: int, end: int) -> dict[int, int]:
+        """Return the version of every live video with an id in [start, end)."""
+
+    @abstractmethod
+    async def get_without_thumbnails(
+        self: Self,
+        *,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> list[Video]:
+        """Return live videos with no mirrored thumbnails, by ascending id."""
+
+    @abstractmethod
+    async def set_thumbnails(
+        self: Self,
+        thumbnails: Mapping[int, VideoThumbnails],
+    ) -> list[Video]:
         pass
 
     @abstractmethod
@@ -129,8 +366,28 @@ class AbstractVideoRepository(ABC):
     ) -> Video:
         pass
 
+    @abstractmethod
+    async def purge(self: Self, limit: int) -> list[int]:
+        """Move up to `limit` permanently deleted videos to the archive.
+
+        Their likes are dropped and their comments are deleted with them.
+        Returns the ids of the videos moved.
+        """
+
 
 class AbstractFullTextVideoRepository(ABC):
+    @abstractmethod
+    async def search(
+        self: Self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        duration: DurationBucket | None = None,
+        sort: VideoSort | None = None,
+    ) -> VideoSearchPage:
+        """Return the ids of matching videos, best match first by default."""
+
     @abstractmethod
     async def create(
         self: Self,
@@ -138,6 +395,13 @@ class AbstractFullTextVideoRepository(ABC):
     ) -> Video:
         pass
 
+    @abstractmethod
+    async def create_many(
+        self: Self,
+        videos: Sequence[Video],
+    ) -> None:
+        pass
+
     @abstractmethod
     async def delete(
         self: Self,
@@ -150,8 +414,9 @@ class AbstractFullTextVideoRepository(ABC):
         self,
         id_: int,
         updated_data: UpdateVideoDto,
+        version: int | None = None,
     ) -> None:
-        pass
+        """Apply `updated_data`; `version` is the video's version after it."""
 
     @abstractmethod
     async def restore(
@@ -161,6 +426,28 @@ class AbstractFullTextVideoRepository(ABC):
         pass
 
 
+class AbstractVideoIndexStateRepository(ABC):
+    """What the search index holds, compared against the database."""
+
+    @abstractmethod
+    async def get_fingerprints(self: Self, range_size: int) -> dict[int, str]:
+        """Fingerprint indexed ids and versions as the database does."""
+
+    @abstractmethod
+    async def get_versions(self: Self, start: int, end: int) -> dict[int, int]:
+        """Return the version of every indexed video with an id in [start, end)."""
+
+
+class AbstractVideoReindexRepository(ABC):
+    @abstractmethod
+    async def rebuild(self: Self, batches: AsyncIterable[Sequence[Video]]) -> int:
+        """Replace the whole search index with the given videos.
+
+        The index keeps serving its previous content until the new one is
+        complete. Returns the number of indexed videos.
+        """
+
+
 @final
 class PostgresVideoRepository(AbstractVideoRepository):
     def __init__(
@@ -176,71 +463,62 @@ class PostgresVideoRepository(AbstractVideoRepository):
         limit: int = 20,
         *,
         include_deleted: bool = False,
+        after_id: int | None = None,
+        filters: VideoFilter | None = None,
+        sort: VideoSort = VideoSort.NEWEST,
     ) -> list[Video]:
         query = (
             select(PGVideo)
             .offset(offset)
             .limit(limit)
-            .order_by(PGVideo.id.desc())
-            .where(
-                or_(
-                    PGVideo.delete_type != DeleteType.PERMANENT,
-                    PGVideo.delete_type == None,  # noqa: E711
-                )
-            )
+            .order_by(*video_order(sort))
+            .where(visible_videos(include_deleted=include_deleted))
+            .where(*video_filter_clauses(filters))
         )
 
-        if not include_deleted:
-            query = query.where(PGVideo.deleted == false())
+        # Keyset pagination: seek past the last seen id instead of skipping rows
+        if after_id is not None and sort is VideoSort.NEWEST:
+            query = query.where(PGVideo.id < after_id)
 
         result = (await self._session.scalars(query)).all()
         return [Video.model_validate(video) for video in result]
 
     @override
-    async def get_all_with_favorite_mark(
+    async def stream_all(
         self: Self,
-        user_id: str,
-        offset: int = 0,
-        limit: int = 20,
         *,
         include_deleted: bool = False,
-    ) -> list[Video]:
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Video]]:
+        # Plain rows from a server-side cursor: no ORM identity map to grow,
+        # and only one batch is held in memory at a time.
         query = (
-            (
-                select(
-                    PGVideo,
-                    case((LikedVideos.video_id.isnot(None), True), else_=False).label(
-                        "is_favorite"
-                    ),
-                )
-            )
-            .outerjoin(
-                LikedVideos,
-                and_(
-                    PGVideo.id == LikedVideos.video_id, LikedVideos.user_id == user_id
-                ),
-            )
-            .offset(offset)
-            .limit(limit)
-            .order_by(PGVideo.id.desc())
-            .where(
-                or_(
-                    PGVideo.delete_type != DeleteType.PERMANENT,
-                    PGVideo.delete_type == None,  # noqa: E711
-                )
-            )
+            select(PGVideo.__table__)
+            .where(visible_videos(include_deleted=include_deleted))
+            .order_by(PGVideo.id)
+            .execution_options(yield_per=batch_size)
         )
 
-        if not include_deleted:
-            query = query.where(PGVideo.deleted == false())
+        result = await self._session.stream(query)
+        async for rows in result.partitions():
+            yield [Video.model_validate(row) for row in rows]
 
-        result = (await self._session.execute(query)).all()
-        videos: list[Video] = []
-        for row in result:
-            video = Video.model_validate(row[0])
-            video.is_favorite = row[1]
-            videos.append(video)
-        return videos
+    @override
+    async def stream_titles(
+        self: Self,
+        *,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[VideoTitle]]:
+        query = (
+            select(PGVideo.id, PGVideo.title, PGVideo.slug)
+            .where(video_is_live)
+            .order_by(PGVideo.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        result = await self._session.stream(query)
+        async for rows in result.partitions():
+            yield [VideoTitle.model_validate(row, from_attributes=True) for row in rows]
 
     async def _get_by(
         self: Self,
@@ -251,17 +529,9 @@ class PostgresVideoRepository(AbstractVideoRepository):
         query = (
             select(PGVideo)
             .where(whereclause)
-            .where(
-                or_(
-                    PGVideo.delete_type != DeleteType.PERMANENT,
-                    PGVideo.delete_type == None,  # noqa: E711
-                )
-            )
+            .where(visible_videos(include_deleted=include_deleted))
         )
 
-        if not include_deleted:
-            query = query.where(PGVideo.deleted == false())
-
         try:
             result = (await self._session.scalars(query)).one()
             return Video.model_validate(result)
@@ -277,6 +547,20 @@ class PostgresVideoRepository(AbstractVideoRepository):
     ) -> Video:
         return await self._get_by(PGVideo.slug == slug, include_deleted=include_deleted)
 
+    @override
+    async def get_by_ids(self: Self, ids: Sequence[int]) -> list[Video]:
+        if not ids:
+            return []
+
+        query = (
+            select(PGVideo)
+            .where(PGVideo.id == any_(literal(list(ids), ARRAY(Integer))))
+            .where(visible_videos())
+        )
+        result = (await self._session.scalars(query)).all()
+        by_id = {video.id: Video.model_validate(video) for video in result}
+        return [by_id[id_] for id_ in ids if id_ in by_id]
+
     @override
     async def get_by_yt_id(
         self: Self,
@@ -297,56 +581,13 @@ class PostgresVideoRepository(AbstractVideoRepository):
     ) -> Video:
         return await self._get_by(PGVideo.id == id_, include_deleted=include_deleted)
 
-    @override
-    async def get_by_slug_with_favorite_mark(
-        self,
-        slug: str,
-        user_id: str,
-        *,
-        include_deleted: bool = False,
-    ) -> Video:
-        query = (
-            select(
-                PGVideo,
-                case((LikedVideos.video_id.isnot(None), True), else_=False).label(
-                    "is_favorite"
-                ),
-            )
-            .outerjoin(
-                LikedVideos,
-                and_(
-                    PGVideo.id == LikedVideos.video_id,
-                    LikedVideos.user_id == user_id,
-                ),
-            )
-            .where(PGVideo.slug == slug)
-            .where(
-                or_(
-                    PGVideo.delete_type != DeleteType.PERMANENT,
-                    PGVideo.delete_type == None,  # noqa: E711
-                )
-            )
-        )
-
-        if not include_deleted:
-            query = query.where(PGVideo.deleted == false())
-
-        try:
-            result = (await self._session.execute(query)).one()
-            video = Video.model_validate(result[0])
-            video.is_favorite = result[1]
-        except NoResultFound as e:
-            raise VideoNotFoundError from e
-        else:
-            return video
-
     @override
     async def create(
         self: Self,
         video: NewVideoDto,
     ) -> Video:
         query = (
-            insert(PGVideo)
+            pg_insert(PGVideo)
             .values(
                 title=video.title,
                 slug=video.slug,
@@ -356,11 +597,73 @@ class PostgresVideoRepository(AbstractVideoRepository):
                 duration=video.duration,
                 is_blocked_in_russia=video.is_blocked_in_russia,
             )
+            .on_conflict_do_nothing()
             .returning(PGVideo)
         )
 
-        result = (await self._session.scalars(query)).one()
-        return Video.model_validate(result)
+        result = (await self._session.scalars(query)).one_or_none()
+        if result is not None:
+            return Video.model_validate(result)
+
+        # Only conflicts cost a second query, to tell which one it was.
+        if await self.get_taken_yt_ids([video.yt_id]):
+            raise VideoYtIdNotUniqueError(video.yt_id)
+        raise VideoSlugNotUniqueError(str(video.slug))
+
+    @override
+    async def create_many(
+        self: Self,
+        videos: Sequence[NewVideoDto],
+    ) -> list[Video]:
+        if not videos:
+            return []
+
+        # One multi-row INSERT per call; rows that lost a uniqueness race
+        # with a concurrent writer are skipped instead of failing the batch.
+        query = (
+            pg_insert(PGVideo)
+            .values(
+                [
+                    {
+                        "title": video.title,
+                        "slug": video.slug,
+                        "date": video.date,
+                        "yt_id": video.yt_id,
+                        "yt_thumbnail": video.yt_thumbnail,
+                        "duration": video.duration,
+                        "is_blocked_in_russia": video.is_blocked_in_russia,
+                    }
+                    for video in videos
+                ],
+            )
+            .on_conflict_do_nothing()
+            .returning(PGVideo)
+        )
+
+        result = (await self._session.scalars(query)).all()
+        return [Video.model_validate(video) for video in result]
+
+    @override
+    async def get_taken_yt_ids(self: Self, yt_ids: Collection[str]) -> set[str]:
+        return await self._get_taken(PGVideo.yt_id, yt_ids)
+
+    @override
+    async def get_taken_slugs(self: Self, slugs: Collection[str]) -> set[str]:
+        return await self._get_taken(PGVideo.slug, slugs)
+
+    async def _get_taken(
+        self: Self,
+        column: InstrumentedAttribute[str],
+        values: Collection[str],
+    ) -> set[str]:
+        if not values:
+            return set()
+
+        # Unique constraints cover deleted videos too, so don't filter them.
+        query = select(column).where(
+            column == any_(literal(list(values), ARRAY(String))),
+        )
+        return set((await self._session.scalars(query)).all())
 
     @override
     async def update(
@@ -424,24 +727,85 @@ class PostgresVideoRepository(AbstractVideoRepository):
                 raise VideoNotFoundError from e
 
     @override
-    async def count(self: Self, *, include_deleted: bool = False) -> int:
-        query = (
-            select(func.count())
-            .select_from(PGVideo)
-            .where(
-                or_(
-                    PGVideo.delete_type != DeleteType.PERMANENT,
-                    PGVideo.delete_type == None,  # noqa: E711
-                )
+    async def count(
+        self: Self,
+        *,
+        include_deleted: bool = False,
+        filters: VideoFilter | None = None,
+    ) -> int:
+        if filters is not None and not filters.is_empty:
+            query = (
+                select(func.count())
+                .select_from(PGVideo)
+                .where(visible_videos(include_deleted=include_deleted))
+                .where(*video_filter_clauses(filters))
             )
-        )
+            return (await self._session.scalars(query)).one()
 
-        # Only filter out deleted videos if include_deleted is False
-        if not include_deleted:
-            query = query.where(PGVideo.deleted == false())
+        counters = [VIDEOS_LIVE]
+        if include_deleted:
+            counters.append(VIDEOS_DELETED)
 
+        return (await self._session.scalars(select_counter_sum(*counters))).one()
+
+    @override
+    async def get_list_version(self: Self) -> int:
+        query = select_counter_sum(VIDEOS_VERSION)
         return (await self._session.scalars(query)).one()
 
+    @override
+    async def get_fingerprints(self: Self, range_size: int) -> dict[int, str]:
+        result = await self._session.execute(video_version_counts(range_size))
+        counts: defaultdict[int, dict[int, int]] = defaultdict(dict)
+        for range_, version, count in result.tuples():
+            counts[range_][version] = count
+        return {
+            range_: version_counts_fingerprint(range_counts)
+            for range_, range_counts in counts.items()
+        }
+
+    @override
+    async def get_versions(self: Self, start: int, end: int) -> dict[int, int]:
+        query = select(PGVideo.id, PGVideo.version).where(
+            video_is_live,
+            PGVideo.id >= start,
+            PGVideo.id < end,
+        )
+        return dict((await self._session.execute(query)).tuples().all())
+
+    @override
+    async def get_without_thumbnails(
+        self: Self,
+        *,
+        after_id: int = 0,
+        limit: int = 50,
+    ) -> list[Video]:
+        query = (
+            select(PGVideo)
+            .where(video_is_live, PGVideo.thumbnails.is_(None), PGVideo.id > after_id)
+            .order_by(PGVideo.id)
+            .limit(limit)
+        )
+        result = await self._session.scalars(query)
+        return [Video.model_validate(video) for video in result]
+
+    @override
+    async def set_thumbnails(
+        self: Self,
+        thumbnails: Mapping[int, VideoThumbnails],
+    ) -> list[Video]:
+        if not thumbnails:
+            return []
+
+        await self._session.execute(
+            update(PGVideo),
+            [
+                {"id": id_, "thumbnails": video_thumbnails.model_dump()}
+                for id_, video_thumbnails in thumbnails.items()
+            ],
+        )
+        return await self.get_by_ids(list(thumbnails))
+
     @override
     async def restore(
         self: Self,
@@ -475,6 +839,41 @@ class PostgresVideoRepository(AbstractVideoRepository):
             msg = "Failed to restore video"
             raise VideoRestoreError(msg) from e
 
+    @override
+    async def purge(self: Self, limit: int) -> list[int]:
+        # Rows being changed elsewhere are left for the next batch rather
+        # than waited for.
+        query = (
+            select(PGVideo.id)
+            .where(video_purge_pending)
+            .order_by(PGVideo.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        ids = list((await self._session.scalars(query)).all())
+        if not ids:
+            return []
+
+        in_batch = any_(literal(ids, ARRAY(Integer)))
+        await self._session.execute(
+            delete(PGLikedVideos).where(PGLikedVideos.video_id == in_batch),
+        )
+        columns = [
+            column.name
+            for column in PGArchivedVideo.__table__.c
+            if column.name != "archived_at"
+        ]
+        purged = (
+            delete(PGVideo)
+            .where(PGVideo.id == in_batch)
+            .returning(*(PGVideo.__table__.c[name] for name in columns))
+            .cte("purged")
+        )
+        await self._session.execute(
+            insert(PGArchivedVideo).from_select(columns, select(purged)),
+        )
+        return ids
+
 
 @final
 class MeilisearchVideoRepository(AbstractFullTextVideoRepository):
@@ -494,11 +893,73 @@ class MeilisearchVideoRepository(AbstractFullTextVideoRepository):
         # Only add to search index if video is not soft-deleted
         # Soft-deleted videos should be excluded from search results by default
         if not video.deleted:
-            documents = [jsonable_encoder(video, exclude={"is_blocked_in_russia"})]
-            task = await self.index.add_documents(documents)
+            task = await self.index.add_documents([video_document(video)])
             _ = await wait_for_task(self.client.http_client, task.task_uid)
         return video
 
+    @override
+    async def search(
+        self: Self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        duration: DurationBucket | None = None,
+        sort: VideoSort | None = None,
+    ) -> VideoSearchPage:
+        filters = []
+        if duration is not None:
+            low, high = duration.bounds
+            if low is not None:
+                filters.append(f"duration >= {low}")
+            if high is not None:
+                filters.append(f"duration < {high}")
+
+        order = None
+        if sort is not None:
+            field = sort.value.removeprefix("-")
+            direction = "desc" if sort.value.startswith("-") else "asc"
+            order = [f"{field}:{direction}"]
+
+        # Only ids and highlights: the videos themselves come from the
+        # database, so the index can't serve stale or deleted ones.
+        result = await self.index.search(
+            query,
+            offset=offset,
+            limit=limit,
+            filter=" AND ".join(filters) or None,
+            sort=order,
+            attributes_to_retrieve=["id", *HIGHLIGHTED_ATTRIBUTES],
+            attributes_to_highlight=HIGHLIGHTED_ATTRIBUTES,
+            highlight_pre_tag=HIGHLIGHT_PRE_TAG,
+            highlight_post_tag=HIGHLIGHT_POST_TAG,
+        )
+        hits = [
+            VideoSearchHit(
+                id=hit["id"],
+                highlights={
+                    attribute: highlight_html(hit["_formatted"][attribute])
+                    for attribute in HIGHLIGHTED_ATTRIBUTES
+                    if attribute in hit.get("_formatted", {})
+                },
+            )
+            for hit in result.hits
+        ]
+        total = result.estimated_total_hits or result.total_hits or len(hits)
+        return VideoSearchPage(hits=hits, total=total)
+
+    @override
+    async def create_many(
+        self: Self,
+        videos: Sequence[Video],
+    ) -> None:
+        documents = [video_document(video) for video in videos if not video.deleted]
+        if not documents:
+            return
+
+        task = await self.index.add_documents(documents)
+        _ = await wait_for_task(self.client.http_client, task.task_uid)
+
     @override
     async def delete(
         self: Self,
@@ -510,13 +971,13 @@ class MeilisearchVideoRepository(AbstractFullTextVideoRepository):
         _ = await wait_for_task(self.client.http_client, task.task_uid)
 
     @override
-    async def update(self, id_: int, updated_data: UpdateVideoDto) -> None:
-        data = updated_data.model_dump(
-            exclude={"is_blocked_in_russia", "slug"},
-            exclude_unset=True,
-        )
-        data["id"] = id_
-        documents = [to_jsonable_python(data)]
+    async def update(
+        self: Self,
+        id_: int,
+        updated_data: UpdateVideoDto,
+        version: int | None = None,
+    ) -> None:
+        documents = [video_document_update(id_, updated_data, version)]
         task = await self.index.update_documents(documents)
         _ = await wait_for_task(self.client.http_client, task_id=task.task_uid)
 
@@ -527,7 +988,302 @@ class MeilisearchVideoRepository(AbstractFullTextVideoRepository):
     ) -> Video:
         # Re-add video to search index when restored
         # This ensures restored videos are included in search results again
-        documents = [jsonable_encoder(video, exclude={"is_blocked_in_russia"})]
-        task = await self.index.add_documents(documents)
+        task = await self.index.add_documents([video_document(video)])
         _ = await wait_for_task(self.client.http_client, task.task_uid)
         return video
+
+
+class MeilisearchVideoReindexRepository(AbstractVideoReindexRepository):
+    def __init__(
+        self: Self,
+        client: MeilisearchClient,
+        *,
+        concurrency: int = 4,
+    ) -> None:
+        self.client = client
+        self.concurrency = concurrency
+
+    @override
+    async def rebuild(self: Self, batches: AsyncIterable[Sequence[Video]]) -> int:
+        name = normalize_ms_index_name("videos")
+        staging_name = f"{name}-reindex"
+        # Left over by an interrupted rebuild.
+        await self.client.delete_index_if_exists(staging_name)
+        staging = await self.client.create_index(staging_name, "id")
+
+        # Settings go first so the documents are indexed only once.
+        tasks = [await staging.update_settings(VIDEO_INDEX_SETTINGS)]
+        count = 0
+        sending: set[asyncio.Task[TaskInfo]] = set()
+        try:
+            async for batch in batches:
+                documents = [video_document(video) for video in batch]
+                if not documents:
+                    continue
+                if len(sending) >= self.concurrency:
+                    done, sending = await asyncio.wait(
+                        sending,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
+                    tasks.extend(task.result() for task in done)
+                sending.add(asyncio.create_task(staging.add_documents(documents)))
+                count += len(documents)
+            tasks.extend(await asyncio.gather(*sending))
+        finally:
+            for task in sending:
+                task.cancel()
+
+        # Tasks of an index run in order: once the last one is done, the
+        # others are too, and waiting on them only checks their status.
+        for task_info in tasks:
+            await wait_for_task(
+                self.client.http_client,
+                task_info.task_uid,
+                timeout_in_ms=None,
+                raise_for_status=True,
+            )
+
+        await self.client.get_or_create_index(name, "id")
+        swap = await self.client.swap_indexes([(name, staging_name)])
+        await wait_for_task(
+            self.client.http_client,
+            swap.task_uid,
+            timeout_in_ms=None,
+            raise_for_status=True,
+        )
+        await self.client.delete_index_if_exists(staging_name)
+        return count
+
+
+class MeilisearchVideoIndexStateRepository(AbstractVideoIndexStateRepository):
+    """Read ids and versions from the index, never whole documents."""
+
+    page_size = 1000
+
+    def __init__(
+        self: Self,
+        client: MeilisearchClient,
+        limiter: RateLimiter | None = None,
+    ) -> None:
+        self.client = client
+        self.index = self.client.index(normalize_ms_index_name("videos"))
+        self.limiter = limiter or RateLimiter(0)
+
+    @override
+    async def get_fingerprints(self: Self, range_size: int) -> dict[int, str]:
+        # Two searches per non-empty range, whatever its size: one finds
+        # the next range holding documents, the other counts its versions.
+        fingerprints: dict[int, str] = {}
+        start = 0
+        while True:
+            await self.limiter.wait()
+            first = await self.index.search(
+                "",
+                limit=1,
+                filter=f"id >= {start}",
+                sort=["id:asc"],
+                attributes_to_retrieve=["id"],
+            )
+            if not first.hits:
+                return fingerprints
+
+            range_ = first.hits[0]["id"] // range_size
+            start = range_ * range_size
+            fingerprints[range_] = version_counts_fingerprint(
+                await self._count_versions(start, start + range_size),
+            )
+            start += range_size
+
+    async def _count_versions(self: Self, start: int, end: int) -> dict[int, int]:
+        await self.limiter.wait()
+        result = await self.index.search(
+            "",
+            filter=f"id >= {start} AND id < {end}",
+            facets=["version"],
+            page=1,
+            hits_per_page=0,
+        )
+        counts = {
+            int(version): count
+            for version, count in (result.facet_distribution or {})
+            .get("version", {})
+            .items()
+        }
+        # Documents indexed before versions were added count as stale. A
+        # range with more versions than the facet values returned only
+        # fails to match, and is then compared video by video.
+        unversioned = (result.total_hits or 0) - sum(counts.values())
+        if unversioned:
+            counts[0] = unversioned
+        return counts
+
+    @override
+    async def get_versions(self: Self, start: int, end: int) -> dict[int, int]:
+        versions: dict[int, int] = {}
+        while True:
+            await self.limiter.wait()
+            page = await self.index.get_documents(
+                offset=len(versions),
+                limit=self.page_size,
+                fields=["id", "version"],
+                filter=f"id >= {start} AND id < {end}",
+            )
+            # Documents indexed before versions were added count as stale.
+            versions.update(
+                (document["id"], document.get("version", 0))
+                for document in page.results
+            )
+            if len(page.results) < self.page_size:
+                return versions
+
+
+class OutboxFullTextVideoRepository(AbstractFullTextVideoRepository):
+    """Queue the index changes in the outbox instead of applying them.
+
+    The changes are written in the caller's transaction and applied by the
+    outbox worker once it commits. Searches go to `search_repo`.
+    """
+
+    def __init__(
+        self: Self,
+        outbox: AbstractOutboxRepository,
+        search_repo: AbstractFullTextVideoRepository,
+    ) -> None:
+        self.outbox = outbox
+        self.search_repo = search_repo
+
+    @override
+    async def search(
+        self: Self,
+        query: str,
+        *,
+        offset: int = 0,
+        limit: int = 20,
+        duration: DurationBucket | None = None,
+        sort: VideoSort | None = None,
+    ) -> VideoSearchPage:
+        return await self.search_repo.search(
+            query,
+            offset=offset,
+            limit=limit,
+            duration=duration,
+            sort=sort,
+        )
+
+    @override
+    async def create(self: Self, video: Video) -> Video:
+        await self.create_many([video])
+        return video
+
+    @override
+    async def create_many(self: Self, videos: Sequence[Video]) -> None:
+        await self.outbox.add(
+            *(
+                self._event(video.id, OutboxOperation.UPSERT, video_document(video))
+                for video in videos
+                if not video.deleted
+            ),
+        )
+
+    @override
+    async def delete(self: Self, id_: int) -> None:
+        await self.outbox.add(self._event(id_, OutboxOperation.DELETE, {}))
+
+    @override
+    async def update(
+        self: Self,
+        id_: int,
+        updated_data: UpdateVideoDto,
+        version: int | None = None,
+    ) -> None:
+        document = video_document_update(id_, updated_data, version)
+        await self.outbox.add(self._event(id_, OutboxOperation.UPDATE, document))
+
+    @override
+    async def restore(self: Self, video: Video) -> Video:
+        document = video_document(video)
+        await self.outbox.add(self._event(video.id, OutboxOperation.UPSERT, document))
+        return video
+
+    @staticmethod
+    def _event(
+        id_: int,
+        operation: OutboxOperation,
+        document: dict[str, Any],
+    ) -> NewOutboxEvent:
+        return NewOutboxEvent(
+            topic=OutboxTopic.VIDEO_SEARCH,
+            operation=operation,
+            key=str(id_),
+            payload=document,
+        )
+
+
+class MeilisearchVideoOutboxHandler(AbstractOutboxHandler):
+    """Apply queued index changes, at most one request per kind of change.
+
+    Cached search responses are purged once the index has the changes.
+    """
+
+    topic = OutboxTopic.VIDEO_SEARCH
+
+    def __init__(
+        self: Self,
+        client: MeilisearchClient,
+        cache_repo: AbstractCacheRepository | None = None,
+    ) -> None:
+        self.client = client
+        self.index = self.client.index(normalize_ms_index_name("videos"))
+        self.cache_repo = cache_repo
+
+    @override
+    async def handle(self: Self, events: Sequence[OutboxEvent]) -> None:
+        upserts, updates, deletes = self.coalesce(events)
+        tasks = []
+        if upserts:
+            tasks.append(await self.index.add_documents(upserts))
+        if updates:
+            tasks.append(await self.index.update_documents(updates))
+        if deletes:
+            tasks.append(await self.index.delete_documents(deletes))
+
+        for task in tasks:
+            await wait_for_task(
+                self.client.http_client,
+                task.task_uid,
+                raise_for_status=True,
+            )
+
+        if tasks and self.cache_repo is not None:
+            await self.cache_repo.purge(VIDEOS_SEARCH)
+
+    @staticmethod
+    def coalesce(
+        events: Sequence[OutboxEvent],
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[str]]:
+        """Fold the events of every document into a single change.
+
+        Returns the documents to add, the partial documents to apply and
+        the ids of documents to delete; a document is in one list at most.
+        """
+        changes: dict[str, tuple[OutboxOperation, dict[str, Any]]] = {}
+        for event in events:
+            previous = changes.get(event.key)
+            operation, document = event.operation, event.payload
+            if operation is OutboxOperation.UPDATE and previous is not None:
+                previous_operation, previous_document = previous
+                if previous_operation is OutboxOperation.DELETE:
+                    continue
+                operation = previous_operation
+                document = {**previous_document, **document}
+            changes[event.key] = (operation, document)
+
+        upserts, updates, deletes = [], [], []
+        for key, (operation, document) in changes.items():
+            if operation is OutboxOperation.UPSERT:
+                upserts.append(document)
+            elif operation is OutboxOperation.UPDATE:
+                updates.append(document)
+            else:
+                deletes.append(key)
+        return upserts, updates, deletes
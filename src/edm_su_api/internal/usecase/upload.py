@@ -1,8 +1,33 @@
+import asyncio
+from collections.abc import Iterable
+from datetime import datetime, timedelta, timezone
+from pathlib import PurePosixPath
+
+from PIL import UnidentifiedImageError
+from PIL.Image import DecompressionBombError
 from typing_extensions import Self
 
+from edm_su_api.internal.entity.upload import (
+    CompletedPart,
+    ImageSet,
+    ImageVariant,
+    MultipartUpload,
+    PendingMultipartUpload,
+    UploadPart,
+)
+from edm_su_api.internal.usecase.exceptions.upload import (
+    UploadNotFoundError,
+    UploadNotImageError,
+    UploadTooLargeError,
+)
 from edm_su_api.internal.usecase.repository.upload import (
+    AbstractImageRenderer,
+    AbstractMultipartUploadRepository,
     AbstractPreSignedUploadRepository,
+    AbstractUploadObjectRepository,
+    AbstractUploadRepository,
 )
+from edm_su_api.pkg.images import CONTENT_TYPES, ImageTooLargeError
 
 
 class GeneratePreSignedUploadUseCase:
@@ -18,3 +43,161 @@ class GeneratePreSignedUploadUseCase:
         expires_in: int = 1800,
     ) -> str:
         return await self.repository.generate(key, expires_in)
+
+
+class CompleteImageUploadUseCase:
+    """Make the size and format variants of an uploaded image.
+
+    Variants are written next to the original: `a/b.png` gets
+    `a/b/640.webp` and so on. Images over `max_pixels` are refused before
+    they are decompressed, however small the file is.
+    """
+
+    def __init__(
+        self: Self,
+        repository: AbstractUploadRepository,
+        object_repo: AbstractUploadObjectRepository,
+        renderer: AbstractImageRenderer,
+        *,
+        max_size: int = 20 * 1024 * 1024,
+        max_pixels: int = 40_000_000,
+    ) -> None:
+        self.repository = repository
+        self.object_repo = object_repo
+        self.renderer = renderer
+        self.max_size = max_size
+        self.max_pixels = max_pixels
+
+    async def execute(self: Self, key: str, user_id: str) -> ImageSet:
+        data = await self.object_repo.get(key, self.max_size)
+        try:
+            rendered = await self.renderer.render(data, self.max_pixels)
+        except UnidentifiedImageError as e:
+            raise UploadNotImageError(key) from e
+        except (ImageTooLargeError, DecompressionBombError) as e:
+            raise UploadTooLargeError(key, self.max_pixels, "pixels") from e
+
+        stem = PurePosixPath(key).with_suffix("")
+        variant_keys = [
+            f"{stem}/{variant.width}.{variant.format}" for variant in rendered.variants
+        ]
+        urls = await asyncio.gather(
+            *(
+                self.object_repo.put(
+                    variant_key,
+                    variant.data,
+                    CONTENT_TYPES[variant.format],
+                )
+                for variant_key, variant in zip(
+                    variant_keys,
+                    rendered.variants,
+                    strict=True,
+                )
+            ),
+        )
+        image = ImageSet(
+            key=key,
+            url=self.object_repo.url(key),
+            width=rendered.width,
+            height=rendered.height,
+            size=len(data),
+            variants=[
+                ImageVariant(
+                    url=url,
+                    width=variant.width,
+                    height=variant.height,
+                    format=variant.format,
+                    size=len(variant.data),
+                )
+                for variant, url in zip(rendered.variants, urls, strict=True)
+            ],
+        )
+        return await self.repository.save(image, user_id)
+
+
+class BaseMultipartUploadUseCase:
+    def __init__(
+        self: Self,
+        repository: AbstractMultipartUploadRepository,
+    ) -> None:
+        self.repository = repository
+
+
+class CreateMultipartUploadUseCase(BaseMultipartUploadUseCase):
+    async def execute(
+        self: Self,
+        key: str,
+        parts: int,
+        content_type: str = "application/octet-stream",
+        expires_in: int = 1800,
+    ) -> MultipartUpload:
+        upload_id = await self.repository.create(key, content_type)
+        return MultipartUpload(
+            key=key,
+            upload_id=upload_id,
+            parts=await self.repository.generate_part_urls(
+                key,
+                upload_id,
+                range(1, parts + 1),
+                expires_in,
+            ),
+        )
+
+
+class GenerateUploadPartUrlsUseCase(BaseMultipartUploadUseCase):
+    """Sign parts again, to resume an upload whose URLs have expired."""
+
+    async def execute(
+        self: Self,
+        key: str,
+        upload_id: str,
+        part_numbers: Iterable[int],
+        expires_in: int = 1800,
+    ) -> list[UploadPart]:
+        return await self.repository.generate_part_urls(
+            key,
+            upload_id,
+            sorted(set(part_numbers)),
+            expires_in,
+        )
+
+
+class CompleteMultipartUploadUseCase(BaseMultipartUploadUseCase):
+    async def execute(
+        self: Self,
+        key: str,
+        upload_id: str,
+        parts: Iterable[CompletedPart],
+    ) -> str:
+        # S3 wants the parts in ascending order, clients finish them in any.
+        ordered = sorted(parts, key=lambda part: part.part_number)
+        return await self.repository.complete(key, upload_id, ordered)
+
+
+class AbortMultipartUploadUseCase(BaseMultipartUploadUseCase):
+    async def execute(self: Self, key: str, upload_id: str) -> None:
+        await self.repository.abort(key, upload_id)
+
+
+class AbortStaleMultipartUploadsUseCase(BaseMultipartUploadUseCase):
+    async def execute(
+        self: Self,
+        max_age: timedelta,
+        now: datetime | None = None,
+    ) -> list[PendingMultipartUpload]:
+        """Abort the uploads started more than `max_age` ago.
+
+        Their parts are stored, and billed, until the upload is aborted.
+        """
+        started_before = (now or datetime.now(tz=timezone.utc)) - max_age
+        aborted = []
+        async for upload in self.repository.get_pending():
+            if upload.initiated >= started_before:
+                continue
+            try:
+                await self.repository.abort(upload.key, upload.upload_id)
+            except UploadNotFoundError:
+                # Completed or aborted since it was listed.
+                continue
+            aborted.append(upload)
+        return aborted
@@ -1,22 +1,57 @@
+import asyncio
+from collections.abc import AsyncIterator, Sequence
+
 from typing_extensions import Self
 
+from edm_su_api.internal.entity.outbox import OutboxTopic
 from edm_su_api.internal.entity.video import (
     DeleteType,
+    DurationBucket,
+    FoundVideo,
     NewVideoDto,
+    ThumbnailMirrorResult,
+    ThumbnailVariant,
     UpdateVideoDto,
     Video,
+    VideoFilter,
+    VideoImportResult,
+    VideoImportStatus,
+    VideoSearchDrift,
+    VideoSort,
+    VideoSuggestion,
+    VideoThumbnails,
 )
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoAlreadyDeletedError,
-    VideoNotFoundError,
+    VideoSlugNotUniqueError,
     VideoYtIdNotUniqueError,
 )
+from edm_su_api.internal.usecase.repository.cache import (
+    VIDEOS_LIST,
+    AbstractCacheRepository,
+    video_tag,
+)
+from edm_su_api.internal.usecase.repository.outbox import AbstractOutboxRepository
 from edm_su_api.internal.usecase.repository.permission import (
     AbstractPermissionRepository,
     Object,
+    RelationshipTuple,
+)
+from edm_su_api.internal.usecase.repository.suggest import (
+    AbstractVideoSuggestionRepository,
+)
+from edm_su_api.internal.usecase.repository.thumbnail import (
+    AbstractThumbnailRenderer,
+    AbstractThumbnailSourceRepository,
+    AbstractThumbnailStorageRepository,
+)
+from edm_su_api.internal.usecase.repository.user_videos import (
+    AbstractUserVideosRepository,
 )
 from edm_su_api.internal.usecase.repository.video import (
     AbstractFullTextVideoRepository,
+    AbstractVideoIndexStateRepository,
+    AbstractVideoReindexRepository,
     AbstractVideoRepository,
 )
 
@@ -26,9 +61,25 @@ class BaseVideoUseCase:
         self: Self,
         repository: AbstractVideoRepository,
         permissions_repo: AbstractPermissionRepository | None = None,
+        cache_repo: AbstractCacheRepository | None = None,
+        suggest_repo: AbstractVideoSuggestionRepository | None = None,
     ) -> None:
         self.repository = repository
         self.permissions_repo = permissions_repo
+        self.cache_repo = cache_repo
+        self.suggest_repo = suggest_repo
+
+    async def _purge_cache(self: Self, video: Video) -> None:
+        if self.cache_repo is not None:
+            await self.cache_repo.purge(video_tag(video.id), VIDEOS_LIST)
+
+    async def _index_suggestions(self: Self, *videos: Video) -> None:
+        if self.suggest_repo is not None:
+            await self.suggest_repo.add(*videos)
+
+    async def _drop_suggestions(self: Self, video: Video) -> None:
+        if self.suggest_repo is not None:
+            await self.suggest_repo.remove(video.id)
 
 
 class AbstractFullTextVideoUseCase(BaseVideoUseCase):
@@ -37,62 +88,380 @@ class AbstractFullTextVideoUseCase(BaseVideoUseCase):
         repository: AbstractVideoRepository,
         full_text_repo: AbstractFullTextVideoRepository,
         permissions_repo: AbstractPermissionRepository | None = None,
+        cache_repo: AbstractCacheRepository | None = None,
+        suggest_repo: AbstractVideoSuggestionRepository | None = None,
     ) -> None:
         self.full_text_repo = full_text_repo
-        super().__init__(repository, permissions_repo)
+        super().__init__(repository, permissions_repo, cache_repo, suggest_repo)
 
 
-class GetAllVideosUseCase(BaseVideoUseCase):
-    async def execute(
+class BaseFavoriteVideoUseCase(BaseVideoUseCase):
+    """Reads videos the same way for everyone, then marks the user's likes.
+
+    Keeping the first step independent of the user lets every user share
+    the same page; the likes come from a single lookup by video ids.
+    """
+
+    def __init__(
+        self: Self,
+        repository: AbstractVideoRepository,
+        user_videos_repo: AbstractUserVideosRepository | None = None,
+    ) -> None:
+        super().__init__(repository)
+        self.user_videos_repo = user_videos_repo
+
+    async def _mark_favorites(
+        self: Self,
+        user_id: str,
+        videos: Sequence[Video],
+    ) -> None:
+        if self.user_videos_repo is None or not videos:
+            return
+
+        liked = await self.user_videos_repo.get_liked_video_ids(
+            user_id,
+            [video.id for video in videos],
+        )
+        for video in videos:
+            video.is_favorite = video.id in liked
+
+
+class GetAllVideosUseCase(BaseFavoriteVideoUseCase):
+    async def execute(  # noqa: PLR0913
         self: Self,
         offset: int = 0,
         limit: int = 20,
         user_id: str | None = None,
         *,
         include_deleted: bool = False,
+        after_id: int | None = None,
+        filters: VideoFilter | None = None,
+        sort: VideoSort = VideoSort.NEWEST,
     ) -> list[Video]:
-        if user_id:
-            return await self.repository.get_all_with_favorite_mark(
-                user_id, offset, limit, include_deleted=include_deleted
-            )
-        return await self.repository.get_all(
+        videos = await self.repository.get_all(
             offset=offset,
             limit=limit,
             include_deleted=include_deleted,
+            after_id=after_id,
+            filters=filters,
+            sort=sort,
+        )
+        if user_id:
+            await self._mark_favorites(user_id, videos)
+        return videos
+
+
+class SearchVideosUseCase(BaseFavoriteVideoUseCase):
+    """Search the index, then load the matching videos from the database."""
+
+    def __init__(
+        self: Self,
+        repository: AbstractVideoRepository,
+        full_text_repo: AbstractFullTextVideoRepository,
+        user_videos_repo: AbstractUserVideosRepository | None = None,
+    ) -> None:
+        super().__init__(repository, user_videos_repo)
+        self.full_text_repo = full_text_repo
+
+    async def execute(  # noqa: PLR0913
+        self: Self,
+        query: str,
+        offset: int = 0,
+        limit: int = 20,
+        user_id: str | None = None,
+        *,
+        duration: DurationBucket | None = None,
+        sort: VideoSort | None = None,
+    ) -> tuple[list[FoundVideo], int]:
+        page = await self.full_text_repo.search(
+            query,
+            offset=offset,
+            limit=limit,
+            duration=duration,
+            sort=sort,
         )
+        videos = await self.repository.get_by_ids([hit.id for hit in page.hits])
+        highlights = {hit.id: hit.highlights for hit in page.hits}
+        found = [
+            FoundVideo.model_validate(
+                {**dict(video), "highlights": highlights[video.id]},
+            )
+            for video in videos
+        ]
+
+        if user_id:
+            await self._mark_favorites(user_id, found)
+        return found, page.total
 
 
 class GetCountVideosUseCase(BaseVideoUseCase):
+    async def execute(
+        self: Self,
+        *,
+        include_deleted: bool = False,
+        filters: VideoFilter | None = None,
+    ) -> int:
+        return await self.repository.count(
+            include_deleted=include_deleted,
+            filters=filters,
+        )
+
+
+class ExportVideosUseCase(BaseVideoUseCase):
+    def execute(
+        self: Self,
+        *,
+        include_deleted: bool = False,
+        batch_size: int = 1000,
+    ) -> AsyncIterator[list[Video]]:
+        return self.repository.stream_all(
+            include_deleted=include_deleted,
+            batch_size=batch_size,
+        )
+
+
+class SuggestVideosUseCase:
+    def __init__(
+        self: Self,
+        suggest_repo: AbstractVideoSuggestionRepository,
+    ) -> None:
+        self.suggest_repo = suggest_repo
+
+    async def execute(self: Self, query: str, limit: int = 10) -> list[VideoSuggestion]:
+        return await self.suggest_repo.search(query, limit)
+
+
+class RebuildVideoSuggestionsUseCase(BaseVideoUseCase):
+    async def execute(self: Self, batch_size: int = 1000) -> None:
+        if self.suggest_repo is None:
+            return
+
+        await self.suggest_repo.replace(
+            self.repository.stream_titles(batch_size=batch_size),
+        )
+
+
+class ReindexVideosUseCase:
+    def __init__(
+        self: Self,
+        repository: AbstractVideoRepository,
+        reindex_repo: AbstractVideoReindexRepository,
+    ) -> None:
+        self.repository = repository
+        self.reindex_repo = reindex_repo
+
+    async def execute(self: Self, batch_size: int = 1000) -> int:
+        batches = self.repository.stream_all(batch_size=batch_size)
+        return await self.reindex_repo.rebuild(batches)
+
+
+class PurgeDeletedVideosUseCase:
+    def __init__(self: Self, repository: AbstractVideoRepository) -> None:
+        self.repository = repository
+
+    async def execute(self: Self, batch_size: int = 500) -> list[int]:
+        """Archive one batch of permanently deleted videos."""
+        return await self.repository.purge(batch_size)
+
+
+class GetVideosWithoutThumbnailsUseCase(BaseVideoUseCase):
+    async def execute(
+        self: Self,
+        *,
+        after_id: int = 0,
+        batch_size: int = 50,
+    ) -> list[Video]:
+        return await self.repository.get_without_thumbnails(
+            after_id=after_id,
+            limit=batch_size,
+        )
+
+
+class MirrorVideoThumbnailsUseCase:
+    """Copy YouTube thumbnails to our storage as resized WebP variants.
+
+    Up to `concurrency` videos are fetched, rendered and stored at once.
+    Nothing is written to the database here, so no transaction has to be
+    held open meanwhile. A video that fails is left out of the result and
+    tried again by a later run.
+    """
+
+    def __init__(
+        self: Self,
+        source_repo: AbstractThumbnailSourceRepository,
+        storage_repo: AbstractThumbnailStorageRepository,
+        renderer: AbstractThumbnailRenderer,
+        *,
+        concurrency: int = 8,
+    ) -> None:
+        self.source_repo = source_repo
+        self.storage_repo = storage_repo
+        self.renderer = renderer
+        self.concurrency = concurrency
+
+    async def execute(
+        self: Self,
+        videos: Sequence[Video],
+    ) -> ThumbnailMirrorResult:
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def mirror(video: Video) -> VideoThumbnails:
+            async with semaphore:
+                return await self._mirror(video)
+
+        results = await asyncio.gather(
+            *(mirror(video) for video in videos),
+            return_exceptions=True,
+        )
+        thumbnails = {
+            video.id: result
+            for video, result in zip(videos, results, strict=True)
+            if isinstance(result, VideoThumbnails)
+        }
+        return ThumbnailMirrorResult(
+            last_id=videos[-1].id if videos else None,
+            mirrored=list(thumbnails),
+            failed=[video.id for video in videos if video.id not in thumbnails],
+            thumbnails=thumbnails,
+        )
+
+    async def _mirror(self: Self, video: Video) -> VideoThumbnails:
+        rendered = await self.renderer.render(
+            await self.source_repo.fetch(video.yt_thumbnail),
+        )
+        urls = await asyncio.gather(
+            *(
+                self.storage_repo.save(
+                    f"thumbnails/{video.id}/{variant.width}.webp",
+                    variant.data,
+                    "image/webp",
+                )
+                for variant in rendered.variants
+            ),
+        )
+        return VideoThumbnails(
+            variants=[
+                ThumbnailVariant(width=variant.width, height=variant.height, url=url)
+                for variant, url in zip(rendered.variants, urls, strict=True)
+            ],
+            placeholder=rendered.placeholder,
+        )
+
+
+class SaveVideoThumbnailsUseCase(AbstractFullTextVideoUseCase):
+    async def execute(self: Self, thumbnails: dict[int, VideoThumbnails]) -> None:
+        if not thumbnails:
+            return
+        # The new row versions have to reach the search index as well.
+        updated = await self.repository.set_thumbnails(thumbnails)
+        await self.full_text_repo.create_many(updated)
+
+
+class ReconcileSearchIndexUseCase(AbstractFullTextVideoUseCase):
+    """Find and repair videos the search index has wrong.
+
+    Fingerprints of id ranges are compared first, and only the ranges
+    that differ are compared video by video. Videos with index changes
+    still in the outbox are left alone: they're about to be fixed anyway.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        repository: AbstractVideoRepository,
+        full_text_repo: AbstractFullTextVideoRepository,
+        index_state_repo: AbstractVideoIndexStateRepository,
+        outbox_repo: AbstractOutboxRepository,
+        *,
+        range_size: int = 1000,
+        max_repairs: int = 1000,
+    ) -> None:
+        super().__init__(repository, full_text_repo)
+        self.index_state_repo = index_state_repo
+        self.outbox_repo = outbox_repo
+        self.range_size = range_size
+        self.max_repairs = max_repairs
+
+    async def execute(self: Self) -> VideoSearchDrift:
+        expected = await self.repository.get_fingerprints(self.range_size)
+        actual = await self.index_state_repo.get_fingerprints(self.range_size)
+
+        drift = VideoSearchDrift(ranges=len(expected.keys() | actual.keys()))
+        for range_ in sorted(expected.keys() | actual.keys()):
+            if drift.repairs >= self.max_repairs:
+                break
+            if expected.get(range_) != actual.get(range_):
+                drift.drifted_ranges += 1
+                await self._compare_range(range_, drift)
+
+        await self._repair(drift)
+        return drift
+
+    async def _compare_range(self: Self, range_: int, drift: VideoSearchDrift) -> None:
+        start = range_ * self.range_size
+        end = start + self.range_size
+        expected = await self.repository.get_versions(start, end)
+        actual = await self.index_state_repo.get_versions(start, end)
+
+        differing = {
+            id_
+            for id_ in expected.keys() | actual.keys()
+            if expected.get(id_) != actual.get(id_)
+        }
+        pending = await self.outbox_repo.pending_keys(
+            OutboxTopic.VIDEO_SEARCH,
+            {str(id_) for id_ in differing},
+        )
+        for id_ in sorted(differing):
+            if str(id_) in pending or drift.repairs >= self.max_repairs:
+                continue
+            if id_ not in actual:
+                drift.missing.append(id_)
+            elif id_ not in expected:
+                drift.extra.append(id_)
+            else:
+                drift.stale.append(id_)
+
+    async def _repair(self: Self, drift: VideoSearchDrift) -> None:
+        # Extra ids are checked again: the versions were read before the
+        # index, so a video created and indexed in between looks extra.
+        videos = await self.repository.get_by_ids(
+            [*drift.missing, *drift.stale, *drift.extra],
+        )
+        live = {video.id for video in videos}
+        extra = set(drift.extra)
+        drift.extra = [id_ for id_ in drift.extra if id_ not in live]
+        videos = [video for video in videos if video.id not in extra]
+        if videos:
+            await self.full_text_repo.create_many(videos)
+        for id_ in drift.extra:
+            await self.full_text_repo.delete(id_)
+
+
+class GetVideoListVersionUseCase(BaseVideoUseCase):
     async def execute(self: Self) -> int:
-        return await self.repository.count()
+        return await self.repository.get_list_version()
 
 
-class GetVideoBySlugUseCase(BaseVideoUseCase):
+class GetVideoBySlugUseCase(BaseFavoriteVideoUseCase):
     async def execute(self: Self, slug: str, user_id: str | None = None) -> Video:
+        video = await self.repository.get_by_slug(slug)
         if user_id:
-            return await self.repository.get_by_slug_with_favorite_mark(slug, user_id)
-        return await self.repository.get_by_slug(slug)
+            await self._mark_favorites(user_id, [video])
+        return video
 
 
 class CreateVideoUseCase(AbstractFullTextVideoUseCase):
     async def execute(self: Self, new_video: NewVideoDto) -> Video:
         try:
-            await self.repository.get_by_yt_id(new_video.yt_id)
-            raise VideoYtIdNotUniqueError(new_video.yt_id)
-        except VideoNotFoundError:
-            pass
-
-        try:
-            if new_video.slug:
-                await self.repository.get_by_slug(new_video.slug)
+            video = await self.repository.create(new_video)
+        except VideoSlugNotUniqueError:
             new_video.expand_slug()
-        except VideoNotFoundError:
-            pass
-
-        video = await self.repository.create(new_video)
+            video = await self.repository.create(new_video)
         await self.full_text_repo.create(video)
 
         await self._set_permissions(video)
+        await self._purge_cache(video)
+        await self._index_suggestions(video)
 
         return video
 
@@ -101,18 +470,171 @@ class CreateVideoUseCase(AbstractFullTextVideoUseCase):
             return
 
         resource = Object("video", video.slug)
-        await self.permissions_repo.write(
-            resource,
-            "writer",
-            Object("role", "admin"),
-            "member",
+        await self.permissions_repo.write_many(
+            [
+                RelationshipTuple(
+                    resource,
+                    "writer",
+                    Object("role", "admin"),
+                    "member",
+                ),
+                RelationshipTuple(resource, "reader", Object("user", "*")),
+            ],
+        )
+
+
+class ImportVideosUseCase(AbstractFullTextVideoUseCase):
+    """Create many videos with a fixed number of round trips per chunk.
+
+    Uniqueness is checked for the whole batch up front, then every chunk
+    is one INSERT, one search index call and one permissions write.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self: Self,
+        repository: AbstractVideoRepository,
+        full_text_repo: AbstractFullTextVideoRepository,
+        permissions_repo: AbstractPermissionRepository | None = None,
+        cache_repo: AbstractCacheRepository | None = None,
+        suggest_repo: AbstractVideoSuggestionRepository | None = None,
+        *,
+        chunk_size: int = 500,
+    ) -> None:
+        super().__init__(
+            repository,
+            full_text_repo,
+            permissions_repo,
+            cache_repo,
+            suggest_repo,
+        )
+        self.chunk_size = chunk_size
+
+    async def execute(
+        self: Self,
+        new_videos: Sequence[NewVideoDto],
+    ) -> list[VideoImportResult]:
+        results: dict[int, VideoImportResult] = {}
+        pending = await self._reject_conflicts(new_videos, results)
+
+        for start in range(0, len(pending), self.chunk_size):
+            chunk = pending[start : start + self.chunk_size]
+            created = await self._create_chunk(chunk, results)
+
+            await self.full_text_repo.create_many(created)
+            await self._set_permissions(created)
+            await self._index_suggestions(*created)
+
+        if pending and self.cache_repo is not None:
+            await self.cache_repo.purge(VIDEOS_LIST)
+
+        return [results[index] for index in range(len(new_videos))]
+
+    async def _create_chunk(
+        self: Self,
+        chunk: Sequence[tuple[int, NewVideoDto]],
+        results: dict[int, VideoImportResult],
+    ) -> list[Video]:
+        created = await self.repository.create_many(
+            [new_video for _, new_video in chunk],
+        )
+        dropped = self._record_created(chunk, created, results)
+        if not dropped:
+            return created
+
+        # Rows dropped by the INSERT lost a race with a concurrent request,
+        # on the yt_id or on the slug. Only the former is a conflict; the
+        # latter are retried under an expanded slug, as single creates are.
+        taken_yt_ids = await self.repository.get_taken_yt_ids(
+            {new_video.yt_id for _, new_video in dropped},
         )
-        await self.permissions_repo.write(
-            resource,
-            "reader",
-            Object("user", "*"),
+        retry = []
+        for index, new_video in dropped:
+            if new_video.yt_id in taken_yt_ids:
+                results[index] = self._conflict(new_video)
+            else:
+                new_video.expand_slug()
+                retry.append((index, new_video))
+        if retry:
+            retried = await self.repository.create_many(
+                [new_video for _, new_video in retry],
+            )
+            for index, new_video in self._record_created(retry, retried, results):
+                results[index] = self._conflict(new_video)
+            created += retried
+        return created
+
+    @staticmethod
+    def _record_created(
+        chunk: Sequence[tuple[int, NewVideoDto]],
+        created: Sequence[Video],
+        results: dict[int, VideoImportResult],
+    ) -> list[tuple[int, NewVideoDto]]:
+        """Record the videos created; return those that weren't."""
+        by_yt_id = {video.yt_id: video for video in created}
+        dropped = []
+        for index, new_video in chunk:
+            video = by_yt_id.get(new_video.yt_id)
+            if video is None:
+                dropped.append((index, new_video))
+            else:
+                results[index] = VideoImportResult(
+                    yt_id=video.yt_id,
+                    status=VideoImportStatus.CREATED,
+                    video=video,
+                )
+        return dropped
+
+    async def _reject_conflicts(
+        self: Self,
+        new_videos: Sequence[NewVideoDto],
+        results: dict[int, VideoImportResult],
+    ) -> list[tuple[int, NewVideoDto]]:
+        taken_yt_ids = await self.repository.get_taken_yt_ids(
+            {new_video.yt_id for new_video in new_videos},
+        )
+        taken_slugs = await self.repository.get_taken_slugs(
+            {str(new_video.slug) for new_video in new_videos},
+        )
+
+        pending = []
+        for index, new_video in enumerate(new_videos):
+            if new_video.yt_id in taken_yt_ids:
+                results[index] = self._conflict(new_video)
+                continue
+            taken_yt_ids.add(new_video.yt_id)
+
+            if new_video.slug in taken_slugs:
+                new_video.expand_slug()
+            taken_slugs.add(str(new_video.slug))
+            pending.append((index, new_video))
+        return pending
+
+    @staticmethod
+    def _conflict(new_video: NewVideoDto) -> VideoImportResult:
+        return VideoImportResult(
+            yt_id=new_video.yt_id,
+            status=VideoImportStatus.CONFLICT,
+            detail=str(VideoYtIdNotUniqueError(new_video.yt_id)),
         )
 
+    async def _set_permissions(self: Self, videos: Sequence[Video]) -> None:
+        if self.permissions_repo is None or not videos:
+            return
+
+        relationships = []
+        for video in videos:
+            resource = Object("video", video.slug)
+            relationships += [
+                RelationshipTuple(
+                    resource,
+                    "writer",
+                    Object("role", "admin"),
+                    "member",
+                ),
+                RelationshipTuple(resource, "reader", Object("user", "*")),
+            ]
+        await self.permissions_repo.write_many(relationships)
+
 
 class DeleteVideoUseCase(AbstractFullTextVideoUseCase):
     async def execute(
@@ -134,6 +656,8 @@ class DeleteVideoUseCase(AbstractFullTextVideoUseCase):
             await self.repository.delete(id_, type_=type_)
             await self.full_text_repo.delete(id_)
             await self._update_permissions_for_soft_delete(video)
+        await self._purge_cache(video)
+        await self._drop_suggestions(video)
 
     async def _update_permissions_for_soft_delete(self: Self, video: Video) -> None:
         """Update permissions for soft-deleted videos.
@@ -151,10 +675,8 @@ class DeleteVideoUseCase(AbstractFullTextVideoUseCase):
         if self.permissions_repo is None:
             return
 
-        resource = Object("video", video.slug)
-        # Remove all permissions for permanent deletion
-        await self.permissions_repo.delete(resource, "reader")
-        await self.permissions_repo.delete(resource, "writer")
+        # Every relationship of the video, whatever the relation.
+        await self.permissions_repo.delete(Object("video", video.slug))
 
 
 class RestoreVideoUseCase(AbstractFullTextVideoUseCase):
@@ -164,6 +686,8 @@ class RestoreVideoUseCase(AbstractFullTextVideoUseCase):
         await self.full_text_repo.restore(video)
 
         await self._restore_permissions(video)
+        await self._purge_cache(video)
+        await self._index_suggestions(video)
 
         return video
 
@@ -174,10 +698,8 @@ class RestoreVideoUseCase(AbstractFullTextVideoUseCase):
 
         resource = Object("video", video.slug)
         # Restore reader access for all users
-        await self.permissions_repo.write(
-            resource,
-            "reader",
-            Object("user", "*"),
+        await self.permissions_repo.write_many(
+            [RelationshipTuple(resource, "reader", Object("user", "*"))],
         )
 
 
@@ -185,5 +707,7 @@ class UpdateVideoUseCase(AbstractFullTextVideoUseCase):
     async def execute(self: Self, updated_data: UpdateVideoDto) -> Video:
         video = await self.repository.get_by_slug(str(updated_data.slug))
         video = await self.repository.update(updated_data)
-        await self.full_text_repo.update(video.id, updated_data)
+        await self.full_text_repo.update(video.id, updated_data, video.version)
+        await self._purge_cache(video)
+        await self._index_suggestions(video)
         return video
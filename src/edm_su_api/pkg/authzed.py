@@ -1,24 +1,144 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from time import perf_counter
+from typing import Any
+
 import aiofiles
+import grpc
 from authzed.api.v1 import Client
 from grpcutil import (
     bearer_token_credentials,
     insecure_bearer_token_credentials,
 )
+from typing_extensions import Self
 
 from edm_su_api.internal.entity.settings import settings
+from edm_su_api.pkg.timing import AUTHZ, current_timings
 
+Continuation = Callable[[grpc.aio.ClientCallDetails, object], Awaitable[grpc.aio.Call]]
+
+
+def track_call(call: grpc.aio.Call) -> grpc.aio.Call:
+    """Record the time of a SpiceDB call in the request timings.
+
+    The call is done once its last message is read, which happens after
+    the interceptor returns.
+    """
+    timings = current_timings()
+    if timings is not None:
+        started = perf_counter()
+        call.add_done_callback(lambda _: timings.add(AUTHZ, perf_counter() - started))
+    return call
+
+
+# gRPC files an interceptor under a single kind of call, hence two classes.
+class UnaryUnaryTimingInterceptor(grpc.aio.UnaryUnaryClientInterceptor):
+    async def intercept_unary_unary(
+        self: Self,
+        continuation: Continuation,
+        client_call_details: grpc.aio.ClientCallDetails,
+        request: object,
+    ) -> grpc.aio.Call:
+        return track_call(await continuation(client_call_details, request))
 
-async def get_spicedb_client() -> Client:
-    token = settings.spicedb_api_key
-    url = settings.spicedb_url
 
+class UnaryStreamTimingInterceptor(grpc.aio.UnaryStreamClientInterceptor):
+    async def intercept_unary_stream(
+        self: Self,
+        continuation: Continuation,
+        client_call_details: grpc.aio.ClientCallDetails,
+        request: object,
+    ) -> grpc.aio.Call:
+        return track_call(await continuation(client_call_details, request))
+
+
+class TimedClient(Client):
+    channel: grpc.aio.Channel
+
+    def create_channel(
+        self: Self,
+        target: str,
+        credentials: grpc.ChannelCredentials,
+        options: Sequence[tuple[str, Any]] | None = None,
+        compression: grpc.Compression | None = None,
+    ) -> grpc.aio.Channel:
+        self.channel = grpc.aio.secure_channel(
+            target,
+            credentials,
+            options,
+            compression,
+            interceptors=[
+                UnaryUnaryTimingInterceptor(),
+                UnaryStreamTimingInterceptor(),
+            ],
+        )
+        return self.channel
+
+
+async def get_spicedb_credentials() -> grpc.ChannelCredentials:
+    token = settings.spicedb_api_key
     if settings.spicedb_insecure:
-        credentials = insecure_bearer_token_credentials(token)
-    else:
-        cert = None
-        if settings.spicedb_tls_cert:
-            async with aiofiles.open(settings.spicedb_tls_cert, "rb") as f:
-                cert = await f.read()
-        credentials = bearer_token_credentials(token, cert)
-
-    return Client(url, credentials)
+        return insecure_bearer_token_credentials(token)
+
+    cert = None
+    if settings.spicedb_tls_cert:
+        async with aiofiles.open(settings.spicedb_tls_cert, "rb") as f:
+            cert = await f.read()
+    return bearer_token_credentials(token, cert)
+
+
+def channel_options() -> list[tuple[str, Any]]:
+    return [
+        # Ping idle connections so that they stay open through proxies and
+        # NATs, and a dead one is noticed before a request waits on it.
+        ("grpc.keepalive_time_ms", int(settings.spicedb_keepalive_time * 1000)),
+        ("grpc.keepalive_timeout_ms", int(settings.spicedb_keepalive_timeout * 1000)),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+        # Channels to the same target share their connection otherwise.
+        ("grpc.use_local_subchannel_pool", 1),
+    ]
+
+
+class SpiceDBClientPool:
+    """Clients kept for the lifetime of the process, handed out in turn.
+
+    Each client has its own channel, and so its own HTTP/2 connection, which
+    spreads concurrent calls over `size` connections. The channels are
+    opened on first use, or up front by `warm_up`.
+    """
+
+    def __init__(self: Self, size: int) -> None:
+        self.size = max(1, size)
+        self._clients: list[TimedClient] = []
+        self._calls = 0
+        self._lock = asyncio.Lock()
+
+    async def get(self: Self) -> Client:
+        if not self._clients:
+            async with self._lock:
+                if not self._clients:
+                    credentials = await get_spicedb_credentials()
+                    self._clients = [
+                        TimedClient(
+                            settings.spicedb_url,
+                            credentials,
+                            options=channel_options(),
+                        )
+                        for _ in range(self.size)
+                    ]
+        self._calls += 1
+        return self._clients[self._calls % len(self._clients)]
+
+    async def warm_up(self: Self) -> None:
+        """Start connecting every channel, without waiting for it."""
+        await self.get()
+        for client in self._clients:
+            client.channel.get_state(try_to_connect=True)
+
+    async def close(self: Self) -> None:
+        clients, self._clients = self._clients, []
+        await asyncio.gather(*(client.channel.close() for client in clients))
+
+
+spicedb_clients = SpiceDBClientPool(settings.spicedb_channels)
@@ -0,0 +1,236 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import AsyncGenerator, Iterable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.settings import settings
+
+K = TypeVar("K")
+V = TypeVar("V")
+R = TypeVar("R")
+
+_deferred_tags: ContextVar[set[str] | None] = ContextVar(
+    "deferred_cache_tags",
+    default=None,
+)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    tags: frozenset[str] = field(default_factory=frozenset)
+    stored_at: float = 0.0
+
+
+class ResponseCache(ABC):
+    """Storage for cached HTTP responses, invalidated by tags."""
+
+    def __init__(self: Self) -> None:
+        self.generation = 0
+
+    @abstractmethod
+    async def get(self: Self, key: str) -> CachedResponse | None:
+        pass
+
+    @abstractmethod
+    async def set(self: Self, key: str, response: CachedResponse) -> None:
+        pass
+
+    @abstractmethod
+    async def purge_tags(self: Self, tags: Iterable[str]) -> None:
+        pass
+
+    @abstractmethod
+    async def clear(self: Self) -> None:
+        pass
+
+    async def purge(self: Self, *tags: str) -> None:
+        """Drop every response carrying one of the tags.
+
+        Inside `defer_purges` the tags are collected and purged when the
+        block exits instead.
+        """
+        deferred = _deferred_tags.get()
+        if deferred is not None:
+            deferred.update(tags)
+            return
+        self.generation += 1
+        await self.purge_tags(tags)
+
+    @asynccontextmanager
+    async def defer_purges(self: Self) -> AsyncGenerator[None]:
+        """Hold back purges until the block exits.
+
+        A request commits its transaction only after the handler returns,
+        so purging from inside the handler would let a concurrent read cache
+        the old rows again before the new ones are visible.
+        """
+        tags: set[str] = set()
+        token = _deferred_tags.set(tags)
+        try:
+            yield
+        finally:
+            _deferred_tags.reset(token)
+            if tags:
+                await self.purge(*tags)
+
+
+class LRUResponseCache(ResponseCache):
+    """In-process cache that evicts the least recently used responses."""
+
+    def __init__(self: Self, max_entries: int) -> None:
+        super().__init__()
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._keys_by_tag: dict[str, set[str]] = {}
+
+    @override
+    async def get(self: Self, key: str) -> CachedResponse | None:
+        response = self._entries.get(key)
+        if response is not None:
+            self._entries.move_to_end(key)
+        return response
+
+    @override
+    async def set(self: Self, key: str, response: CachedResponse) -> None:
+        self._remove(key)
+        self._entries[key] = response
+        for tag in response.tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    @override
+    async def purge_tags(self: Self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            for key in self._keys_by_tag.pop(tag, set()):
+                self._remove(key)
+
+    @override
+    async def clear(self: Self) -> None:
+        self.reset()
+
+    def reset(self: Self) -> None:
+        """Drop every response; `clear` without the event loop."""
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    def __len__(self: Self) -> int:
+        return len(self._entries)
+
+    def _remove(self: Self, key: str) -> None:
+        response = self._entries.pop(key, None)
+        if response is None:
+            return
+        for tag in response.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
+
+
+class TTLCache(Generic[K, V]):
+    """Bounded in-process mapping whose entries expire after `ttl` seconds."""
+
+    def __init__(self: Self, max_entries: int, ttl: float) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self: Self, key: K) -> V | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self: Self, key: K, value: V) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def pop(self: Self, key: K) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self: Self) -> None:
+        self._entries.clear()
+
+
+class DecisionCache(Generic[K, R]):
+    """Yes/no answers about resources, e.g. permission checks.
+
+    Yes is kept for `ttl` seconds and no for `negative_ttl`. `changed`
+    records a change to a resource: answers about it given before are
+    then ignored, and `token` tells how fresh the next answer must be.
+    Once the change is older than both TTLs, every earlier answer has
+    expired and it is forgotten.
+    """
+
+    def __init__(
+        self: Self,
+        max_entries: int,
+        ttl: float,
+        negative_ttl: float,
+    ) -> None:
+        self._allowed: TTLCache[K, float] = TTLCache(max_entries, ttl)
+        self._denied: TTLCache[K, float] = TTLCache(max_entries, negative_ttl)
+        self._changes: TTLCache[R, tuple[float, str | None]] = TTLCache(
+            max_entries,
+            max(ttl, negative_ttl),
+        )
+
+    def get(self: Self, key: K, resource: R) -> bool | None:
+        change = self._changes.get(resource)
+        for allowed, cache in ((True, self._allowed), (False, self._denied)):
+            asked_at = cache.get(key)
+            if asked_at is not None and (change is None or asked_at > change[0]):
+                return allowed
+        return None
+
+    def set(self: Self, key: K, allowed: bool, asked_at: float) -> None:  # noqa: FBT001
+        """Store an answer; `asked_at` is when it was asked, on `time.monotonic`."""
+        (self._allowed if allowed else self._denied).set(key, asked_at)
+        (self._denied if allowed else self._allowed).pop(key)
+
+    def changed(self: Self, resource: R, token: str | None = None) -> None:
+        self._changes.set(resource, (time.monotonic(), token))
+
+    def token(self: Self, resource: R) -> str | None:
+        change = self._changes.get(resource)
+        return None if change is None else change[1]
+
+    def clear(self: Self) -> None:
+        self._allowed.clear()
+        self._denied.clear()
+        self._changes.clear()
+
+
+response_cache = LRUResponseCache(max_entries=settings.response_cache_max_entries)
+liked_videos_cache: TTLCache[str, frozenset[int]] = TTLCache(
+    max_entries=settings.liked_videos_cache_max_users,
+    ttl=settings.liked_videos_cache_ttl,
+)
+readable_resources: TTLCache[tuple[str, str, str], frozenset[str]] = TTLCache(
+    max_entries=settings.permission_lookup_cache_max_users,
+    ttl=settings.permission_lookup_cache_ttl,
+)
+permission_decisions: DecisionCache[tuple[Any, ...], tuple[str, str]] = DecisionCache(
+    max_entries=settings.permission_cache_max_entries,
+    ttl=settings.permission_cache_ttl,
+    negative_ttl=settings.permission_cache_negative_ttl,
+)
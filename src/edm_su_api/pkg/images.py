@@ -0,0 +1,122 @@
+import multiprocessing
+from collections.abc import Iterable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from io import BytesIO
+
+from PIL import Image, features
+
+from edm_su_api.internal.entity.settings import settings
+
+IMAGE_WIDTHS = (320, 640, 1280, 1920)
+QUALITY = {"webp": 80, "avif": 60}
+CONTENT_TYPES = {"webp": "image/webp", "avif": "image/avif"}
+
+
+@dataclass(frozen=True)
+class RenderedVariant:
+    width: int
+    height: int
+    format: str
+    data: bytes
+
+
+@dataclass(frozen=True)
+class RenderedImage:
+    width: int
+    height: int
+    variants: list[RenderedVariant]
+
+
+def image_formats() -> tuple[str, ...]:
+    """Formats variants are encoded in; AVIF needs a Pillow built with it."""
+    return ("avif", "webp") if features.check("avif") else ("webp",)
+
+
+def resize(image: Image.Image, width: int) -> Image.Image:
+    height = max(1, round(image.height * width / image.width))
+    return image.resize((width, height), Image.Resampling.LANCZOS)
+
+
+def encode(image: Image.Image, format_: str, quality: int | None = None) -> bytes:
+    buffer = BytesIO()
+    image.save(buffer, format=format_.upper(), quality=quality or QUALITY[format_])
+    return buffer.getvalue()
+
+
+class ImageTooLargeError(ValueError):
+    """The image has more pixels than it may be decoded with."""
+
+
+def open_image(data: bytes, max_pixels: int | None = None) -> Image.Image:
+    """Decode an image, keeping its alpha channel if it has one.
+
+    The size is read from the header, so an image over `max_pixels` is
+    refused before its pixels are decompressed.
+    """
+    with Image.open(BytesIO(data)) as source:
+        if max_pixels is not None and source.width * source.height > max_pixels:
+            msg = f"{source.width}x{source.height} image is over {max_pixels} pixels"
+            raise ImageTooLargeError(msg)
+        return source.convert("RGBA" if source.has_transparency_data else "RGB")
+
+
+def render_variants(
+    image: Image.Image,
+    widths: Iterable[int],
+    formats: Iterable[str],
+) -> list[RenderedVariant]:
+    """Encode the image at every width in every format.
+
+    Images are never scaled up: widths larger than the image give a single
+    variant at its own width.
+    """
+    targets = sorted({min(width, image.width) for width in widths})
+    variants = []
+    for width in targets:
+        resized = resize(image, width)
+        variants += [
+            RenderedVariant(
+                width=resized.width,
+                height=resized.height,
+                format=format_,
+                data=encode(resized, format_),
+            )
+            for format_ in formats
+        ]
+    return variants
+
+
+def render_image(
+    data: bytes,
+    widths: Iterable[int] = IMAGE_WIDTHS,
+    formats: Iterable[str] = ("webp",),
+    max_pixels: int | None = None,
+) -> RenderedImage:
+    """Decode an uploaded image and encode its variants.
+
+    CPU bound, meant to run in a process pool.
+    """
+    image = open_image(data, max_pixels)
+    return RenderedImage(
+        width=image.width,
+        height=image.height,
+        variants=render_variants(image, widths, tuple(formats)),
+    )
+
+
+@lru_cache
+def get_image_executor() -> ProcessPoolExecutor:
+    # Spawned rather than forked: forking a process running gRPC and
+    # asyncio threads isn't safe.
+    return ProcessPoolExecutor(
+        max_workers=settings.image_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_image_executor() -> None:
+    if get_image_executor.cache_info().currsize:
+        get_image_executor().shutdown(cancel_futures=True)
+        get_image_executor.cache_clear()
@@ -1,14 +1,36 @@
+from time import perf_counter
+
+from httpx import Request, Response
 from meilisearch_python_async import Client as MeilisearchClient
 from meilisearch_python_async.models.settings import MeilisearchSettings
 from meilisearch_python_async.task import wait_for_task
 
 from edm_su_api.internal.entity.settings import settings
+from edm_su_api.pkg.timing import SEARCH, current_timings
 
 ms_client = MeilisearchClient(
     url=settings.meilisearch_api_url,
     api_key=settings.meilisearch_api_key,
 )
 
+# Key of the request extension holding the time the request was sent.
+REQUEST_STARTED = "edm_su_started"
+
+
+async def _request_started(request: Request) -> None:
+    request.extensions[REQUEST_STARTED] = perf_counter()
+
+
+async def _response_received(response: Response) -> None:
+    timings = current_timings()
+    started = response.request.extensions.get(REQUEST_STARTED)
+    if timings is not None and started is not None:
+        timings.add(SEARCH, perf_counter() - started)
+
+
+ms_client.http_client.event_hooks["request"].append(_request_started)
+ms_client.http_client.event_hooks["response"].append(_response_received)
+
 
 def normalize_ms_index_name(index_name: str) -> str:
     postfix = settings.meilisearch_index_postfix
@@ -17,22 +39,25 @@ def normalize_ms_index_name(index_name: str) -> str:
     return index_name
 
 
+VIDEO_INDEX_SETTINGS = MeilisearchSettings(
+    sortable_attributes=["id", "date", "duration", "title"],
+    ranking_rules=[
+        "sort",
+        "words",
+        "typo",
+        "proximity",
+        "attribute",
+        "exactness",
+    ],
+    # Version is filterable to be counted per id range by the reconciler.
+    filterable_attributes=["id", "slug", "yt_id", "duration", "version"],
+)
+
+
 async def config_ms(client: MeilisearchClient) -> None:
     video_index = await client.create_index(
         normalize_ms_index_name("videos"),
         "id",
     )
-    video_index_settings = MeilisearchSettings(
-        sortable_attributes=["date", "title"],
-        ranking_rules=[
-            "sort",
-            "words",
-            "typo",
-            "proximity",
-            "attribute",
-            "exactness",
-        ],
-        filterable_attributes=["slug", "yt_id"],
-    )
-    task = await video_index.update_settings(video_index_settings)
+    task = await video_index.update_settings(VIDEO_INDEX_SETTINGS)
     await wait_for_task(ms_client.http_client, task.task_uid)
@@ -1,9 +1,21 @@
 import datetime
 from collections.abc import AsyncGenerator
+from time import perf_counter
 from typing import Any, ClassVar
 from uuid import UUID
 
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    and_,
+    event,
+    false,
+    literal_column,
+)
+from sqlalchemy.engine import ExceptionContext
 from sqlalchemy.ext.asyncio import (
     AsyncAttrs,
     AsyncSession,
@@ -16,12 +28,38 @@ from sqlalchemy.types import ARRAY, JSON, TIMESTAMP, String
 
 from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.entity.video import DeleteType
+from edm_su_api.pkg.timing import current_timings
 
 async_engine = create_async_engine(
     str(settings.database_url),
     pool_pre_ping=True,
 )
 
+# Start times of the statements running on a connection.
+QUERY_STARTED = "query_started"
+
+
+@event.listens_for(async_engine.sync_engine, "before_cursor_execute")
+def _query_started(conn: Connection, *_: object) -> None:
+    conn.info.setdefault(QUERY_STARTED, []).append(perf_counter())
+
+
+@event.listens_for(async_engine.sync_engine, "after_cursor_execute")
+def _query_finished(
+    conn: Connection, _cursor: object, statement: str, *_: object
+) -> None:
+    started = conn.info[QUERY_STARTED].pop()
+    timings = current_timings()
+    if timings is not None:
+        timings.add_query(statement, perf_counter() - started)
+
+
+@event.listens_for(async_engine.sync_engine, "handle_error")
+def _query_failed(context: ExceptionContext) -> None:
+    if context.connection is not None and context.connection.info.get(QUERY_STARTED):
+        context.connection.info[QUERY_STARTED].pop()
+
+
 async_session = async_sessionmaker(
     bind=async_engine,
     autoflush=False,
@@ -78,6 +116,7 @@ class Post(Base):
     slug: Mapped[str] = mapped_column(unique=True)
     published_at: Mapped[datetime.datetime] = mapped_column(
         server_default=func.now(),
+        index=True,
     )
     thumbnail: Mapped[str | None] = mapped_column()
     user_id: Mapped[UUID] = mapped_column()
@@ -116,6 +155,8 @@ class Video(Base):
     is_blocked_in_russia: Mapped[bool] = mapped_column(server_default="f")
     deleted: Mapped[bool | None] = mapped_column(server_default="f")
     delete_type: Mapped[DeleteType | None] = mapped_column()
+    thumbnails: Mapped[dict[str, Any] | None] = mapped_column()
+    version: Mapped[int] = mapped_column(BigInteger, server_default="1")
 
     liked_by: Mapped[list["LikedVideos"]] = relationship()
     comments: Mapped[list["Comment"]] = relationship(
@@ -123,6 +164,45 @@ class Video(Base):
     )
 
 
+# Predicates shared by the video queries and the partial indexes below.
+# PERMANENT is inlined rather than bound: the planner can only use a
+# partial index when it can prove the predicate from constants.
+video_not_purged = Video.delete_type.is_distinct_from(literal_column("'PERMANENT'"))
+video_is_live = and_(Video.deleted == false(), video_not_purged)
+video_purge_pending = Video.delete_type == literal_column("'PERMANENT'")
+
+Index("ix_videos_live_id", Video.id, postgresql_where=video_is_live)
+Index("ix_videos_not_purged_id", Video.id, postgresql_where=video_not_purged)
+Index("ix_videos_purge_pending_id", Video.id, postgresql_where=video_purge_pending)
+# Sort orders and range filters of the public list; id keeps pages stable.
+Index("ix_videos_live_date_id", Video.date, Video.id, postgresql_where=video_is_live)
+Index(
+    "ix_videos_live_duration_id",
+    Video.duration,
+    Video.id,
+    postgresql_where=video_is_live,
+)
+Index("ix_videos_live_title_id", Video.title, Video.id, postgresql_where=video_is_live)
+
+
+class ArchivedVideo(Base):
+    """Permanently deleted videos, moved out of `videos` by the purge job."""
+
+    __tablename__ = "videos_archive"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=False)
+    title: Mapped[str] = mapped_column()
+    slug: Mapped[str] = mapped_column()
+    date: Mapped[datetime.date | None] = mapped_column()
+    yt_id: Mapped[str] = mapped_column()
+    yt_thumbnail: Mapped[str] = mapped_column()
+    duration: Mapped[int] = mapped_column()
+    is_blocked_in_russia: Mapped[bool] = mapped_column()
+    # The mirrored variants stay in S3 after the purge; this keeps track of them.
+    thumbnails: Mapped[dict[str, Any] | None] = mapped_column()
+    archived_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
+
+
 class Comment(Base):
     __tablename__ = "comments"
 
@@ -162,3 +242,62 @@ class LiveStream(Base):
     image: Mapped[str | None] = mapped_column()
     url: Mapped[str | None] = mapped_column()
     genres: Mapped[list[str] | None] = mapped_column()
+
+
+class CatalogCounter(Base):
+    """Row counters kept in step by triggers on the counted tables."""
+
+    __tablename__ = "catalog_counters"
+
+    name: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[int] = mapped_column(BigInteger, server_default="0")
+
+
+class OutboxEvent(Base):
+    """Side effects on external systems, written with the change causing them."""
+
+    __tablename__ = "outbox"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    topic: Mapped[str] = mapped_column()
+    operation: Mapped[str] = mapped_column()
+    key: Mapped[str] = mapped_column()
+    payload: Mapped[dict[str, Any]] = mapped_column()
+    attempts: Mapped[int] = mapped_column(server_default="0")
+    created_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
+    available_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
+
+
+Index("ix_outbox_available_at_id", OutboxEvent.available_at, OutboxEvent.id)
+Index("ix_outbox_topic_key_id", OutboxEvent.topic, OutboxEvent.key, OutboxEvent.id)
+
+
+class OutboxDeadLetter(Base):
+    """Outbox events given up on after too many failed deliveries."""
+
+    __tablename__ = "outbox_dead_letters"
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    topic: Mapped[str] = mapped_column()
+    operation: Mapped[str] = mapped_column()
+    key: Mapped[str] = mapped_column()
+    payload: Mapped[dict[str, Any]] = mapped_column()
+    attempts: Mapped[int] = mapped_column()
+    error: Mapped[str] = mapped_column()
+    created_at: Mapped[datetime.datetime] = mapped_column()
+    parked_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
+
+
+class Upload(Base):
+    """Images uploaded to the bucket, with the variants made from them."""
+
+    __tablename__ = "uploads"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    url: Mapped[str] = mapped_column(unique=True)
+    width: Mapped[int] = mapped_column()
+    height: Mapped[int] = mapped_column()
+    size: Mapped[int] = mapped_column(BigInteger)
+    variants: Mapped[list[dict[str, Any]]] = mapped_column(JSON)
+    user_id: Mapped[UUID] = mapped_column()
+    created_at: Mapped[datetime.datetime] = mapped_column(server_default=func.now())
@@ -0,0 +1,22 @@
+import asyncio
+import time
+
+from typing_extensions import Self
+
+
+class RateLimiter:
+    """Space calls out so that at most `rate` of them start per second.
+
+    A rate of 0 or less disables the limit.
+    """
+
+    def __init__(self: Self, rate: float) -> None:
+        self.interval = 1 / rate if rate > 0 else 0
+        self._next = 0.0
+
+    async def wait(self: Self) -> None:
+        now = time.monotonic()
+        if self._next > now:
+            await asyncio.sleep(self._next - now)
+            now = self._next
+        self._next = now + self.interval
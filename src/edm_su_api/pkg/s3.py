@@ -1,10 +1,19 @@
 from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from functools import lru_cache
+from time import perf_counter
+from typing import Any
 
 import aioboto3
+from aiobotocore.config import AioConfig
+from fastapi import Request
 from types_aiobotocore_s3.client import S3Client
 
 from edm_su_api.internal.entity.settings import settings
+from edm_su_api.pkg.timing import S3, current_timings
+
+# Key of the call context holding the time the call was sent.
+CALL_STARTED = "edm_su_started"
 
 
 @lru_cache
@@ -16,10 +25,39 @@ def get_s3_session() -> aioboto3.Session:
     )
 
 
-async def get_s3_client() -> AsyncGenerator[S3Client, None]:
-    session = get_s3_session()
-    async with session.client(  # pyright: ignore[reportUnknownMemberType]
+def _call_started(context: dict[str, Any], **_: object) -> None:
+    context[CALL_STARTED] = perf_counter()
+
+
+def _call_finished(context: dict[str, Any], **_: object) -> None:
+    timings = current_timings()
+    started = context.get(CALL_STARTED)
+    if timings is not None and started is not None:
+        timings.add(S3, perf_counter() - started)
+
+
+@asynccontextmanager
+async def open_s3_client() -> AsyncGenerator[S3Client, None]:
+    """Open a client with its own connection pool.
+
+    Opening one loads the service model and every new connection pays
+    for a TLS handshake, so open it once and share it: the app keeps one
+    for its lifetime, see `get_s3_client`.
+    """
+    config = AioConfig(
+        max_pool_connections=settings.s3_max_pool_connections,
+        connector_args={"keepalive_timeout": settings.s3_keepalive_timeout},
+    )
+    async with get_s3_session().client(  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
         service_name="s3",
         endpoint_url=settings.s3_endpoint,
-    ) as client:  # pyright: ignore[reportUnknownVariableType]
+        config=config,
+    ) as client:
+        client.meta.events.register("before-call.s3", _call_started)
+        client.meta.events.register("after-call.s3", _call_finished)
         yield client
+
+
+def get_s3_client(request: Request) -> S3Client:
+    """The client opened by the app lifespan, shared by all requests."""
+    return request.app.state.s3_client
@@ -0,0 +1,49 @@
+import zlib
+from collections.abc import AsyncIterable, AsyncIterator, Iterable, Sequence
+
+from pydantic import BaseModel
+
+# wbits of 16 + 15 makes zlib write a gzip header and trailer.
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+
+async def ndjson(
+    batches: AsyncIterable[Sequence[BaseModel]],
+    exclude: Iterable[str] | None = None,
+) -> AsyncIterator[bytes]:
+    """Serialize every batch of models into one chunk of JSON lines."""
+    excluded = set(exclude) if exclude is not None else None
+    async for batch in batches:
+        if batch:
+            yield b"".join(
+                model.__pydantic_serializer__.to_json(model, exclude=excluded) + b"\n"
+                for model in batch
+            )
+
+
+async def gzip_stream(
+    chunks: AsyncIterable[bytes],
+    level: int = 6,
+) -> AsyncIterator[bytes]:
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Tell whether an Accept-Encoding header allows a gzip response."""
+    qualities: dict[str, float] = {}
+    for coding in accept_encoding.split(","):
+        name, _, params = coding.partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params.removeprefix("q="))
+            except ValueError:
+                quality = 0
+        qualities[name.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0)) > 0
@@ -0,0 +1,127 @@
+from bisect import bisect_left, insort
+from collections.abc import AsyncIterable, Iterable
+from typing import Generic, TypeVar
+
+from slugify import slugify
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.video import VideoSuggestion
+
+V = TypeVar("V")
+
+
+def normalize(text: str) -> str:
+    """Normalize text the way slugs are built, so "Él Café" gives "el-cafe"."""
+    return slugify(text)
+
+
+def prefix_terms(*texts: str) -> set[str]:
+    """Return the terms whose prefixes should match the texts.
+
+    Every word of a text starts a term, so a query can match the
+    beginning of any word, not only the beginning of the text.
+    """
+    terms: set[str] = set()
+    for text in texts:
+        words = normalize(text).split("-")
+        terms.update("-".join(words[start:]) for start in range(len(words)))
+    terms.discard("")
+    return terms
+
+
+class PrefixIndex(Generic[V]):
+    """In-process index of values by the prefixes of their terms.
+
+    Terms live in one sorted list searched with bisect. At most
+    `max_items` values are kept; past that the least recently added ones
+    are dropped.
+    """
+
+    def __init__(self: Self, max_items: int) -> None:
+        self.max_items = max_items
+        self._keys: list[tuple[str, int]] = []
+        self._items: dict[int, tuple[V, tuple[str, ...]]] = {}
+
+    def add(self: Self, id_: int, value: V, terms: Iterable[str]) -> None:
+        self.remove(id_)
+        keys = tuple(set(terms))
+        self._items[id_] = (value, keys)
+        for key in keys:
+            insort(self._keys, (key, id_))
+        while len(self._items) > self.max_items:
+            self.remove(next(iter(self._items)))
+
+    def remove(self: Self, id_: int) -> None:
+        item = self._items.pop(id_, None)
+        if item is None:
+            return
+        for key in item[1]:
+            index = bisect_left(self._keys, (key, id_))
+            if index < len(self._keys) and self._keys[index] == (key, id_):
+                del self._keys[index]
+
+    def replace(self: Self, items: Iterable[tuple[int, V, Iterable[str]]]) -> None:
+        """Swap the whole content for `items`, keeping the last `max_items`."""
+        entries: dict[int, tuple[V, tuple[str, ...]]] = {}
+        self._collect(entries, items)
+        self._swap(entries)
+
+    async def replace_batches(
+        self: Self,
+        batches: AsyncIterable[Iterable[tuple[int, V, Iterable[str]]]],
+    ) -> None:
+        """Like `replace`, reading the items a batch at a time.
+
+        Items past `max_items` are dropped as they come, so no more than
+        that and one batch are held at once.
+        """
+        entries: dict[int, tuple[V, tuple[str, ...]]] = {}
+        async for batch in batches:
+            self._collect(entries, batch)
+        self._swap(entries)
+
+    def _collect(
+        self: Self,
+        entries: dict[int, tuple[V, tuple[str, ...]]],
+        items: Iterable[tuple[int, V, Iterable[str]]],
+    ) -> None:
+        for id_, value, terms in items:
+            entries.pop(id_, None)
+            entries[id_] = (value, tuple(set(terms)))
+            if len(entries) > self.max_items:
+                del entries[next(iter(entries))]
+
+    def _swap(self: Self, entries: dict[int, tuple[V, tuple[str, ...]]]) -> None:
+        keys = sorted(
+            (key, id_) for id_, (_, terms) in entries.items() for key in terms
+        )
+        self._items, self._keys = entries, keys
+
+    def search(self: Self, query: str, limit: int) -> list[V]:
+        prefix = normalize(query)
+        if not prefix:
+            return []
+
+        found: dict[int, V] = {}
+        index = bisect_left(self._keys, (prefix,))
+        while index < len(self._keys) and len(found) < limit:
+            key, id_ = self._keys[index]
+            if not key.startswith(prefix):
+                break
+            if id_ not in found:
+                found[id_] = self._items[id_][0]
+            index += 1
+        return list(found.values())
+
+    def clear(self: Self) -> None:
+        self._keys.clear()
+        self._items.clear()
+
+    def __len__(self: Self) -> int:
+        return len(self._items)
+
+
+video_suggestions: PrefixIndex[VideoSuggestion] = PrefixIndex(
+    max_items=settings.video_suggest_max_videos,
+)
@@ -0,0 +1,40 @@
+import base64
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from PIL import ImageFilter
+
+from edm_su_api.pkg.images import (
+    RenderedVariant,
+    encode,
+    open_image,
+    render_variants,
+    resize,
+)
+
+THUMBNAIL_WIDTHS = (320, 640, 1280)
+PLACEHOLDER_WIDTH = 16
+PLACEHOLDER_QUALITY = 30
+
+
+@dataclass(frozen=True)
+class RenderedThumbnails:
+    variants: list[RenderedVariant]
+    placeholder: str
+
+
+def render_thumbnails(
+    data: bytes,
+    widths: Iterable[int] = THUMBNAIL_WIDTHS,
+) -> RenderedThumbnails:
+    """Encode WebP variants of an image and a blurred placeholder for it.
+
+    CPU bound, meant to run in a process pool.
+    """
+    image = open_image(data)
+    tiny = resize(image, PLACEHOLDER_WIDTH).filter(ImageFilter.GaussianBlur(1))
+    encoded = base64.b64encode(encode(tiny, "webp", PLACEHOLDER_QUALITY)).decode()
+    return RenderedThumbnails(
+        variants=render_variants(image, widths, ("webp",)),
+        placeholder=f"data:image/webp;base64,{encoded}",
+    )
@@ -0,0 +1,97 @@
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from time import perf_counter
+
+from typing_extensions import Self
+
+DB = "db"
+SEARCH = "search"
+AUTHZ = "authz"
+S3 = "s3"
+SERIALIZE = "serialize"
+
+# Order of the metrics in the Server-Timing header.
+METRICS = (DB, SEARCH, AUTHZ, S3, SERIALIZE)
+
+
+@dataclass
+class RequestTimings:
+    """Time spent by one request in each backend, in seconds."""
+
+    started: float = field(default_factory=perf_counter)
+    durations: dict[str, float] = field(default_factory=dict)
+    counts: Counter[str] = field(default_factory=Counter)
+    # Number of times each SQL statement ran, only kept when asked for.
+    statements: Counter[str] | None = None
+
+    def add(self: Self, metric: str, duration: float) -> None:
+        self.durations[metric] = self.durations.get(metric, 0) + duration
+        self.counts[metric] += 1
+
+    def add_query(self: Self, statement: str, duration: float) -> None:
+        self.add(DB, duration)
+        if self.statements is not None:
+            self.statements[statement] += 1
+
+    @property
+    def total(self: Self) -> float:
+        return perf_counter() - self.started
+
+    def server_timing(self: Self) -> str:
+        """Render the timings as a Server-Timing header value.
+
+        Only the backends the request used are listed, with durations in
+        milliseconds as the header expects.
+        """
+        metrics = []
+        for metric in METRICS:
+            if metric not in self.durations:
+                continue
+            entry = f"{metric};dur={self.durations[metric] * 1000:.1f}"
+            if metric == DB:
+                entry += f';desc="{self.counts[DB]} queries"'
+            metrics.append(entry)
+        metrics.append(f"total;dur={self.total * 1000:.1f}")
+        return ", ".join(metrics)
+
+
+_timings: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings",
+    default=None,
+)
+
+
+def current_timings() -> RequestTimings | None:
+    return _timings.get()
+
+
+@contextmanager
+def collect_timings(*, track_statements: bool = False) -> Iterator[RequestTimings]:
+    """Collect the timings recorded by the code running inside the block.
+
+    Tasks and threads started inside the block share the same collector,
+    since they copy the context they were started from.
+    """
+    timings = RequestTimings(statements=Counter() if track_statements else None)
+    token = _timings.set(timings)
+    try:
+        yield timings
+    finally:
+        _timings.reset(token)
+
+
+@contextmanager
+def timed(metric: str) -> Iterator[None]:
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+
+    started = perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(metric, perf_counter() - started)
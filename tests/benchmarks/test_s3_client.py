@@ -0,0 +1,65 @@
+"""Per-request cost of the S3 client behind `/upload/pre_signed`.
+
+Pre-signing is local, so this runs without S3 and measures only what the
+app adds on top: opening a client per request versus sharing the one the
+lifespan opened. Skipped by default; run with
+`pytest tests/benchmarks --benchmark -s` to see the numbers.
+"""
+
+from collections.abc import AsyncGenerator
+from time import perf_counter
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from types_aiobotocore_s3.client import S3Client
+
+from edm_su_api.internal.controller.http import app
+from edm_su_api.internal.controller.http.v1.dependencies.auth import get_current_user
+from edm_su_api.internal.entity.user import User
+from edm_su_api.pkg.s3 import get_s3_client, open_s3_client
+
+pytestmark = [pytest.mark.anyio, pytest.mark.benchmark]
+
+REQUESTS = 200
+
+
+async def per_request_s3_client() -> AsyncGenerator[S3Client, None]:
+    """How `get_s3_client` worked before the client was shared."""
+    async with open_s3_client() as client:
+        yield client
+
+
+async def measure(client: AsyncClient) -> float:
+    # Warm up routing, validation and the botocore loaders' caches.
+    await client.get("/upload/pre_signed")
+    started = perf_counter()
+    for _ in range(REQUESTS):
+        response = await client.get("/upload/pre_signed")
+        response.raise_for_status()
+    return (perf_counter() - started) / REQUESTS
+
+
+@pytest.fixture
+async def client(user: User) -> AsyncGenerator[AsyncClient, None]:
+    app.dependency_overrides[get_current_user] = lambda: user
+    async with (
+        open_s3_client() as s3_client,
+        AsyncClient(base_url="http://test", transport=ASGITransport(app=app)) as client,
+    ):
+        app.state.s3_client = s3_client
+        yield client
+    del app.state.s3_client
+    app.dependency_overrides.clear()
+
+
+async def test_shared_client_overhead(client: AsyncClient) -> None:
+    # Only reported: timings vary too much between machines to assert on.
+    shared = await measure(client)
+    app.dependency_overrides[get_s3_client] = per_request_s3_client
+    per_request = await measure(client)
+
+    print(  # noqa: T201
+        f"\n/upload/pre_signed over {REQUESTS} requests: "
+        f"{per_request * 1000:.2f} ms with a client per request, "
+        f"{shared * 1000:.2f} ms with the shared client",
+    )
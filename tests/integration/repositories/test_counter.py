@@ -0,0 +1,71 @@
+import pytest
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.video import DeleteType, Video
+from edm_su_api.internal.usecase.repository.counter import (
+    VIDEOS_DELETED,
+    VIDEOS_LIVE,
+    PostgresCounterRepository,
+)
+from edm_su_api.internal.usecase.repository.video import (
+    PostgresVideoRepository,
+)
+from edm_su_api.pkg.postgres import CatalogCounter
+
+pytestmark = pytest.mark.anyio
+
+
+class TestPostgresCounterRepository:
+    @pytest.fixture
+    async def repository(
+        self: Self,
+        pg_session: AsyncSession,
+    ) -> PostgresCounterRepository:
+        repository = PostgresCounterRepository(pg_session)
+        await repository.reconcile()
+        return repository
+
+    async def test_triggers_follow_video_lifecycle(
+        self: Self,
+        repository: PostgresCounterRepository,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+    ) -> None:
+        live = await repository.get(VIDEOS_LIVE)
+        deleted = await repository.get(VIDEOS_DELETED)
+
+        await pg_video_repository.delete(pg_video.id, type_=DeleteType.TEMPORARY)
+        assert await repository.get(VIDEOS_LIVE) == live - 1
+        assert await repository.get(VIDEOS_DELETED) == deleted + 1
+
+        await pg_video_repository.restore(pg_video.id)
+        assert await repository.get(VIDEOS_LIVE) == live
+        assert await repository.get(VIDEOS_DELETED) == deleted
+
+        await pg_video_repository.delete(pg_video.id, type_=DeleteType.PERMANENT)
+        assert await repository.get(VIDEOS_LIVE) == live - 1
+        assert await repository.get(VIDEOS_DELETED) == deleted
+
+    @pytest.mark.usefixtures("pg_video")
+    async def test_reconcile_fixes_drift(
+        self: Self,
+        repository: PostgresCounterRepository,
+        pg_session: AsyncSession,
+    ) -> None:
+        live = await repository.get(VIDEOS_LIVE)
+        await pg_session.execute(
+            update(CatalogCounter)
+            .where(CatalogCounter.name == VIDEOS_LIVE)
+            .values(value=live + 10),
+        )
+
+        drift = await repository.reconcile()
+
+        assert drift == {VIDEOS_LIVE: -10}
+        assert await repository.get(VIDEOS_LIVE) == live
+        assert await repository.reconcile() == {}
+
+    async def test_lock(self: Self, repository: PostgresCounterRepository) -> None:
+        assert await repository.lock()
@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.outbox import (
+    NewOutboxEvent,
+    OutboxOperation,
+    OutboxTopic,
+)
+from edm_su_api.internal.usecase.repository.outbox import PostgresOutboxRepository
+from edm_su_api.pkg.postgres import OutboxDeadLetter as PGOutboxDeadLetter
+from edm_su_api.pkg.postgres import OutboxEvent as PGOutboxEvent
+
+pytestmark = pytest.mark.anyio
+
+
+def make_event(key: str, operation: OutboxOperation) -> NewOutboxEvent:
+    return NewOutboxEvent(
+        topic=OutboxTopic.VIDEO_SEARCH,
+        operation=operation,
+        key=key,
+        payload={"id": int(key)},
+    )
+
+
+class TestPostgresOutboxRepository:
+    @pytest.fixture
+    async def repository(
+        self: Self,
+        pg_session: AsyncSession,
+    ) -> PostgresOutboxRepository:
+        await pg_session.execute(delete(PGOutboxEvent))
+        return PostgresOutboxRepository(pg_session)
+
+    async def test_claim_and_delete(
+        self: Self,
+        repository: PostgresOutboxRepository,
+    ) -> None:
+        await repository.add(
+            make_event("1", OutboxOperation.UPSERT),
+            make_event("2", OutboxOperation.DELETE),
+        )
+
+        assert await repository.lock()
+        events = await repository.claim(10)
+        assert [(event.key, event.operation) for event in events] == [
+            ("1", OutboxOperation.UPSERT),
+            ("2", OutboxOperation.DELETE),
+        ]
+        assert events[0].payload == {"id": 1}
+        assert [event.key for event in await repository.claim(1)] == ["1"]
+
+        await repository.delete([events[0].id])
+        assert [event.key for event in await repository.claim(10)] == ["2"]
+
+    async def test_retry_holds_back_later_events(
+        self: Self,
+        repository: PostgresOutboxRepository,
+    ) -> None:
+        await repository.add(
+            make_event("1", OutboxOperation.UPSERT),
+            make_event("2", OutboxOperation.UPSERT),
+            make_event("1", OutboxOperation.DELETE),
+        )
+        first = (await repository.claim(1))[0]
+
+        await repository.retry([first.id], base_delay=60, max_delay=300)
+
+        events = await repository.claim(10)
+        assert [event.key for event in events] == ["2"]
+
+    async def test_park_releases_later_events(
+        self: Self,
+        repository: PostgresOutboxRepository,
+        pg_session: AsyncSession,
+    ) -> None:
+        await repository.add(
+            make_event("1", OutboxOperation.UPSERT),
+            make_event("1", OutboxOperation.DELETE),
+        )
+        first = (await repository.claim(1))[0]
+        await repository.retry([first.id], base_delay=60, max_delay=300)
+
+        await repository.park([(first, "ValueError('poison')")])
+
+        events = await repository.claim(10)
+        assert [event.operation for event in events] == [OutboxOperation.DELETE]
+        parked = await pg_session.get(PGOutboxDeadLetter, first.id)
+        assert parked is not None
+        assert parked.error == "ValueError('poison')"
+        assert parked.attempts == 1
+
+    async def test_lag(
+        self: Self,
+        repository: PostgresOutboxRepository,
+    ) -> None:
+        assert await repository.lag() == 0
+
+        await repository.add(make_event("1", OutboxOperation.UPSERT))
+        assert await repository.lag() >= 0
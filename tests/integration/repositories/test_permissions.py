@@ -1,19 +1,27 @@
+from collections.abc import AsyncGenerator
+
 import pytest
 from authzed.api.v1 import Client, WriteSchemaRequest
 from typing_extensions import Self
 
 from edm_su_api.internal.usecase.repository.permission import (
     Object,
+    PermissionCheck,
+    RelationshipTuple,
+    SpiceDBPermissionCheckRepository,
+    SpiceDBPermissionLookupRepository,
     SpiceDBPermissionRepository,
 )
-from edm_su_api.pkg.authzed import get_spicedb_client
+from edm_su_api.pkg.authzed import SpiceDBClientPool
 
 pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture(scope="session")
-async def spicedb_client() -> Client:
-    return await get_spicedb_client()
+async def spicedb_client() -> AsyncGenerator[Client, None]:
+    pool = SpiceDBClientPool(1)
+    yield await pool.get()
+    await pool.close()
 
 
 @pytest.fixture(autouse=True, scope="session")
@@ -62,6 +70,20 @@ class TestSpiceDBPermissionsRepository:
             subject,
         )
 
+    async def test_write_many(
+        self: Self,
+        repo: SpiceDBPermissionRepository,
+        resource: Object,
+        relation: str,
+    ) -> None:
+        await repo.write_many(
+            [
+                RelationshipTuple(resource, relation, Object("user", "first")),
+                RelationshipTuple(resource, relation, Object("user", "second")),
+            ],
+        )
+        await repo.delete(resource, relation)
+
     async def test_delete(
         self: Self,
         repo: SpiceDBPermissionRepository,
@@ -74,3 +96,64 @@ class TestSpiceDBPermissionsRepository:
             relation,
             subject,
         )
+
+    async def test_write_many_twice(
+        self: Self,
+        repo: SpiceDBPermissionRepository,
+        resource: Object,
+        relation: str,
+        subject: Object,
+    ) -> None:
+        relationships = [RelationshipTuple(resource, relation, subject)]
+
+        assert await repo.write_many(relationships)
+        # A retry must not fail on the relationship written by the first try.
+        assert await repo.write_many(relationships)
+
+
+class TestSpiceDBPermissionCheckRepository:
+    @pytest.fixture
+    def repo(
+        self: Self,
+        spicedb_client: Client,
+    ) -> SpiceDBPermissionCheckRepository:
+        return SpiceDBPermissionCheckRepository(client=spicedb_client)
+
+    async def test_check_many(
+        self: Self,
+        repo: SpiceDBPermissionCheckRepository,
+        spicedb_client: Client,
+    ) -> None:
+        resource = Object("resource", "checked")
+        token = await SpiceDBPermissionRepository(spicedb_client).write(
+            resource,
+            "tester",
+            Object("user", "allowed"),
+        )
+        assert token
+
+        allowed = await repo.check_many(
+            [
+                PermissionCheck(resource, "test", Object("user", "allowed")),
+                PermissionCheck(resource, "test", Object("user", "denied")),
+            ],
+            [token],
+        )
+
+        assert allowed == [True, False]
+
+
+class TestSpiceDBPermissionLookupRepository:
+    async def test_lookup_resources(self: Self, spicedb_client: Client) -> None:
+        subject = Object("user", "looked_up")
+        await SpiceDBPermissionRepository(spicedb_client).write_many(
+            [
+                RelationshipTuple(Object("resource", "first"), "tester", subject),
+                RelationshipTuple(Object("resource", "second"), "tester", subject),
+            ],
+        )
+        repo = SpiceDBPermissionLookupRepository(spicedb_client)
+
+        resources = await repo.lookup_resources("resource", "test", subject)
+
+        assert resources == {"first", "second"}
@@ -86,6 +86,16 @@ class TestPostgresPostRepository:
 
         assert count > 0
 
+    async def test_get_all_with_slugs(
+        self: Self,
+        repository: PostgresPostRepository,
+        pg_post: Post,
+    ) -> None:
+        assert await repository.get_all(slugs=[pg_post.slug]) == [pg_post]
+        assert await repository.get_all(slugs=[]) == []
+        assert await repository.count(slugs=[pg_post.slug]) == 1
+        assert await repository.count(slugs=[]) == 0
+
     async def test_delete(
         self: Self,
         repository: PostgresPostRepository,
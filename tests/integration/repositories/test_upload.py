@@ -1,20 +1,29 @@
 from collections.abc import AsyncGenerator
+from uuid import uuid4
 
+import aiohttp
 import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
 from types_aiobotocore_s3.client import S3Client
 from typing_extensions import Self
 
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.upload import CompletedPart, ImageSet, ImageVariant
+from edm_su_api.internal.entity.user import User
+from edm_su_api.internal.usecase.exceptions.upload import UploadNotFoundError
 from edm_su_api.internal.usecase.repository.upload import (
+    PostgresUploadRepository,
+    S3MultipartUploadRepository,
     S3PreSignedUploadRepository,
 )
-from edm_su_api.pkg.s3 import get_s3_client
+from edm_su_api.pkg.s3 import open_s3_client
 
 pytestmark = pytest.mark.anyio
 
 
 @pytest.fixture
 async def s3_client() -> AsyncGenerator[S3Client, None]:
-    async for client in get_s3_client():
+    async with open_s3_client() as client:
         yield client
 
 
@@ -38,3 +47,91 @@ class TestS3PreSignedUpload:
         )
         assert isinstance(url, str)
         assert url.startswith("http")
+
+
+class TestPostgresUploadRepository:
+    @pytest.fixture
+    def repository(self: Self, pg_session: AsyncSession) -> PostgresUploadRepository:
+        return PostgresUploadRepository(pg_session)
+
+    @pytest.fixture
+    def image(self: Self) -> ImageSet:
+        return ImageSet(
+            key="posts/cover.png",
+            url="https://static.test/posts/cover.png",
+            width=800,
+            height=600,
+            size=1024,
+            variants=[
+                ImageVariant(
+                    url="https://static.test/posts/cover/320.webp",
+                    width=320,
+                    height=240,
+                    format="webp",
+                    size=128,
+                ),
+            ],
+        )
+
+    async def test_save(
+        self: Self,
+        repository: PostgresUploadRepository,
+        image: ImageSet,
+        user: User,
+    ) -> None:
+        assert await repository.save(image, user.id) == image
+
+        replaced = image.model_copy(update={"size": 2048, "variants": []})
+        assert await repository.save(replaced, user.id) == replaced
+
+        assert await repository.get_by_urls([image.url, "https://other"]) == {
+            image.url: replaced,
+        }
+
+    async def test_get_by_urls_empty(
+        self: Self,
+        repository: PostgresUploadRepository,
+    ) -> None:
+        assert await repository.get_by_urls([]) == {}
+
+
+class TestS3MultipartUploadRepository:
+    @pytest.fixture
+    def repository(self: Self, s3_client: S3Client) -> S3MultipartUploadRepository:
+        return S3MultipartUploadRepository(s3_client)
+
+    async def test_upload(
+        self: Self,
+        repository: S3MultipartUploadRepository,
+        s3_client: S3Client,
+    ) -> None:
+        key = f"tests/{uuid4()}.bin"
+        upload_id = await repository.create(key, "application/octet-stream")
+        (part,) = await repository.generate_part_urls(key, upload_id, [1], 60)
+
+        async with (
+            aiohttp.ClientSession() as http,
+            http.put(part.url, data=b"data", raise_for_status=True) as response,
+        ):
+            etag = response.headers["ETag"]
+        url = await repository.complete(
+            key,
+            upload_id,
+            [CompletedPart(part_number=1, etag=etag)],
+        )
+
+        assert url.endswith(key)
+        stored = await s3_client.get_object(Bucket=settings.s3_bucket, Key=key)
+        async with stored["Body"] as body:
+            assert await body.read() == b"data"
+
+    async def test_abort(self: Self, repository: S3MultipartUploadRepository) -> None:
+        key = f"tests/{uuid4()}.bin"
+        upload_id = await repository.create(key, "application/octet-stream")
+        assert upload_id in {u.upload_id async for u in repository.get_pending()}
+
+        await repository.abort(key, upload_id)
+
+        assert upload_id not in {u.upload_id async for u in repository.get_pending()}
+        with pytest.raises(UploadNotFoundError):
+            await repository.complete(key, upload_id, [])
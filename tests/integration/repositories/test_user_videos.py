@@ -84,3 +84,19 @@ class TestPostgresUserVideosRepository:
         response = await repository.is_liked(user, pg_video)
 
         assert response is False
+
+    @pytest.mark.usefixtures("like_video")
+    async def test_get_liked_video_ids(
+        self: Self,
+        repository: PostgresUserVideosRepository,
+        user: User,
+        pg_video: Video,
+    ) -> None:
+        not_liked_id = pg_video.id + 1
+
+        assert await repository.get_liked_video_ids(
+            user.id,
+            [pg_video.id, not_liked_id],
+        ) == {pg_video.id}
+        assert await repository.get_liked_video_ids(user.id, []) == set()
+        assert pg_video.id in await repository.get_liked_video_ids(user.id)
@@ -1,3 +1,7 @@
+from collections import Counter
+from collections.abc import AsyncIterator
+from datetime import timedelta
+
 import pytest
 from faker import Faker
 from meilisearch_python_async import Client
@@ -5,36 +9,37 @@ from meilisearch_python_async.errors import MeilisearchApiError
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing_extensions import Self
 
-from edm_su_api.internal.entity.user import User
 from edm_su_api.internal.entity.video import (
     DeleteType,
     NewVideoDto,
+    ThumbnailVariant,
     UpdateVideoDto,
     Video,
+    VideoFilter,
+    VideoSort,
+    VideoThumbnails,
+    VideoTitle,
 )
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoAlreadyDeletedError,
     VideoNotDeletedError,
     VideoNotFoundError,
-)
-from edm_su_api.internal.usecase.repository.user_videos import (
-    PostgresUserVideosRepository,
+    VideoSlugNotUniqueError,
+    VideoYtIdNotUniqueError,
 )
 from edm_su_api.internal.usecase.repository.video import (
+    MeilisearchVideoReindexRepository,
     MeilisearchVideoRepository,
     PostgresVideoRepository,
+    version_counts_fingerprint,
 )
+from edm_su_api.pkg.meilisearch import normalize_ms_index_name
+from edm_su_api.pkg.postgres import ArchivedVideo as PGArchivedVideo
 
 pytestmark = pytest.mark.anyio
 
 
 class TestPostgresVideoRepository:
-    @pytest.fixture
-    def user_videos_repository(
-        self, pg_session: AsyncSession
-    ) -> PostgresUserVideosRepository:
-        return PostgresUserVideosRepository(pg_session)
-
     @pytest.fixture
     def new_video_data(
         self: Self,
@@ -64,6 +69,81 @@ class TestPostgresVideoRepository:
         assert len(result) > 0
         assert pg_video in result
 
+    async def test_stream_all(
+        self: Self,
+        pg_video: Video,
+        pg_video_repository: PostgresVideoRepository,
+    ) -> None:
+        batches = [
+            batch async for batch in pg_video_repository.stream_all(batch_size=1)
+        ]
+
+        assert all(len(batch) == 1 for batch in batches)
+        videos = [video for batch in batches for video in batch]
+        assert pg_video in videos
+        assert [video.id for video in videos] == sorted(video.id for video in videos)
+
+    async def test_stream_titles(
+        self: Self,
+        pg_video: Video,
+        pg_video_repository: PostgresVideoRepository,
+    ) -> None:
+        titles = [
+            title
+            async for batch in pg_video_repository.stream_titles(batch_size=1)
+            for title in batch
+        ]
+
+        assert (
+            VideoTitle(
+                id=pg_video.id,
+                title=pg_video.title,
+                slug=pg_video.slug,
+            )
+            in titles
+        )
+
+    async def test_get_all_with_filters(
+        self: Self,
+        pg_video: Video,
+        pg_video_repository: PostgresVideoRepository,
+    ) -> None:
+        matching = VideoFilter(
+            date_from=pg_video.date,
+            date_to=pg_video.date,
+            is_blocked_in_russia=pg_video.is_blocked_in_russia,
+        )
+        other = VideoFilter(date_to=pg_video.date - timedelta(days=1))
+
+        assert pg_video in await pg_video_repository.get_all(filters=matching)
+        assert pg_video not in await pg_video_repository.get_all(filters=other)
+        assert await pg_video_repository.count(filters=matching) >= 1
+
+    async def test_get_all_with_slugs(
+        self: Self,
+        pg_video: Video,
+        pg_video_repository: PostgresVideoRepository,
+    ) -> None:
+        readable = VideoFilter(slugs=frozenset([pg_video.slug]))
+        nothing = VideoFilter(slugs=frozenset())
+
+        assert await pg_video_repository.get_all(filters=readable) == [pg_video]
+        assert await pg_video_repository.get_all(filters=nothing) == []
+        assert await pg_video_repository.count(filters=readable) == 1
+        assert await pg_video_repository.count(filters=nothing) == 0
+
+    @pytest.mark.parametrize("sort", list(VideoSort))
+    async def test_get_all_sorted(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        sort: VideoSort,
+    ) -> None:
+        videos = await pg_video_repository.get_all(sort=sort)
+        field = sort.value.removeprefix("-")
+        keys = [(getattr(video, field), video.id) for video in videos]
+
+        assert keys == sorted(keys, reverse=sort.value.startswith("-"))
+
     async def test_get_by_slug(
         self: Self,
         pg_video: Video,
@@ -73,6 +153,18 @@ class TestPostgresVideoRepository:
 
         assert result == pg_video
 
+    async def test_get_by_ids(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+    ) -> None:
+        other = await pg_video_repository.get_all(limit=1)
+        ids = [pg_video.id, -1, other[0].id]
+
+        result = await pg_video_repository.get_by_ids(ids)
+
+        assert [video.id for video in result] == [pg_video.id, other[0].id]
+
     async def test_get_by_yt_id(
         self: Self,
         pg_video_repository: PostgresVideoRepository,
@@ -105,6 +197,54 @@ class TestPostgresVideoRepository:
         assert pg_video == result
         assert pg_video.is_blocked_in_russia == new_video_data.is_blocked_in_russia
 
+    async def test_create_with_taken_yt_id(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+        new_video_data: NewVideoDto,
+    ) -> None:
+        duplicate = new_video_data.model_copy(update={"yt_id": pg_video.yt_id})
+
+        with pytest.raises(VideoYtIdNotUniqueError):
+            await pg_video_repository.create(duplicate)
+
+    async def test_create_with_taken_slug(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+        new_video_data: NewVideoDto,
+    ) -> None:
+        duplicate = new_video_data.model_copy(update={"slug": pg_video.slug})
+
+        with pytest.raises(VideoSlugNotUniqueError):
+            await pg_video_repository.create(duplicate)
+
+    async def test_create_many(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+        new_video_data: NewVideoDto,
+    ) -> None:
+        duplicate = new_video_data.model_copy(
+            update={"yt_id": pg_video.yt_id, "slug": "duplicate"},
+        )
+
+        result = await pg_video_repository.create_many([new_video_data, duplicate])
+
+        assert [video.yt_id for video in result] == [new_video_data.yt_id]
+        assert await pg_video_repository.get_by_id(result[0].id) == result[0]
+
+    async def test_get_taken(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+    ) -> None:
+        yt_ids = await pg_video_repository.get_taken_yt_ids([pg_video.yt_id, "free"])
+        slugs = await pg_video_repository.get_taken_slugs([pg_video.slug, "free"])
+
+        assert yt_ids == {pg_video.yt_id}
+        assert slugs == {pg_video.slug}
+
     async def test_update(
         self: Self,
         pg_video_repository: PostgresVideoRepository,
@@ -140,52 +280,16 @@ class TestPostgresVideoRepository:
         with pytest.raises(VideoNotFoundError):
             await pg_video_repository.get_by_id(pg_video.id)
 
-    async def test_get_all_with_favorite_mark(
+    async def test_get_all_after_id(
         self: Self,
-        pg_video: Video,
         pg_video_repository: PostgresVideoRepository,
-        user: User,
-        user_videos_repository: PostgresUserVideosRepository,
-    ) -> None:
-        await user_videos_repository.like_video(user, pg_video)
-
-        result = await pg_video_repository.get_all_with_favorite_mark(user.id)
-
-        assert isinstance(result, list)
-        assert len(result) > 0
-
-        video = result[0]
-        assert video.id == pg_video.id
-        assert video.is_favorite is True
-
-    async def test_get_by_slug_with_favorite_mark(
-        self: Self,
+        new_video_data: NewVideoDto,
         pg_video: Video,
-        pg_video_repository: PostgresVideoRepository,
-        user: User,
-        user_videos_repository: PostgresUserVideosRepository,
     ) -> None:
-        await user_videos_repository.like_video(user, pg_video)
+        newer_video = await pg_video_repository.create(new_video_data)
 
-        result = await pg_video_repository.get_by_slug_with_favorite_mark(
-            pg_video.slug, user.id
-        )
-
-        assert isinstance(result, Video)
-        assert result.id == pg_video.id
-        assert result.is_favorite is True
-
-        await user_videos_repository.unlike_video(user, pg_video)
-        result = await pg_video_repository.get_by_slug_with_favorite_mark(
-            pg_video.slug, user.id
-        )
-
-        assert result.is_favorite is False
-
-        with pytest.raises(VideoNotFoundError):
-            _ = await pg_video_repository.get_by_slug_with_favorite_mark(
-                "9999", user.id
-            )
+        result = await pg_video_repository.get_all(limit=1, after_id=newer_video.id)
+        assert [video.id for video in result] == [pg_video.id]
 
     @pytest.mark.usefixtures("pg_video")
     async def test_count(
@@ -196,6 +300,23 @@ class TestPostgresVideoRepository:
 
         assert result > 0
 
+    async def test_fingerprints_match_versions(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+    ) -> None:
+        range_size = 100
+        range_ = pg_video.id // range_size
+        start = range_ * range_size
+
+        fingerprints = await pg_video_repository.get_fingerprints(range_size)
+        versions = await pg_video_repository.get_versions(start, start + range_size)
+
+        assert versions[pg_video.id] == pg_video.version
+        assert fingerprints[range_] == version_counts_fingerprint(
+            Counter(versions.values()),
+        )
+
     # Soft Delete Tests
     @pytest.fixture
     async def soft_deleted_video(
@@ -274,32 +395,10 @@ class TestPostgresVideoRepository:
         assert permanently_deleted_video.id not in videos_ids
         assert soft_deleted_video.id in videos_ids
 
-    async def test_get_all_with_favorite_mark_include_deleted(
-        self: Self,
-        pg_video_repository: PostgresVideoRepository,
-        soft_deleted_video: Video,
-        user: User,
-    ) -> None:
-        # Should not include deleted videos by default
-        videos = await pg_video_repository.get_all_with_favorite_mark(
-            user.id, limit=1000
-        )
-        assert not any(v.id == soft_deleted_video.id for v in videos)
-
-        # Should include deleted videos when include_deleted=True
-        videos_with_deleted = await pg_video_repository.get_all_with_favorite_mark(
-            user.id, limit=1000, include_deleted=True
-        )
-
-        assert any(v.id == soft_deleted_video.id for v in videos_with_deleted), (
-            f"Video with ID {soft_deleted_video.id} not found in results"
-        )
-
     async def test_get_by_methods_with_include_deleted(
         self: Self,
         pg_video_repository: PostgresVideoRepository,
         soft_deleted_video: Video,
-        user: User,
     ) -> None:
         # Should raise error when trying to get deleted video without include_deleted
         with pytest.raises(VideoNotFoundError):
@@ -311,11 +410,6 @@ class TestPostgresVideoRepository:
         with pytest.raises(VideoNotFoundError):
             await pg_video_repository.get_by_yt_id(soft_deleted_video.yt_id)
 
-        with pytest.raises(VideoNotFoundError):
-            await pg_video_repository.get_by_slug_with_favorite_mark(
-                soft_deleted_video.slug, user.id
-            )
-
         # Should return the video when include_deleted=True
         video = await pg_video_repository.get_by_id(
             soft_deleted_video.id, include_deleted=True
@@ -335,12 +429,6 @@ class TestPostgresVideoRepository:
         assert video.yt_id == soft_deleted_video.yt_id
         assert video.deleted is True
 
-        video = await pg_video_repository.get_by_slug_with_favorite_mark(
-            soft_deleted_video.slug, user.id, include_deleted=True
-        )
-        assert video.slug == soft_deleted_video.slug
-        assert video.deleted is True
-
     async def test_count_with_include_deleted(
         self: Self,
         pg_video_repository: PostgresVideoRepository,
@@ -391,6 +479,56 @@ class TestPostgresVideoRepository:
         with pytest.raises(VideoNotDeletedError):
             await pg_video_repository.restore(permanently_deleted_video.id)
 
+    async def test_set_thumbnails(
+        self: Self,
+        pg_video_repository: PostgresVideoRepository,
+        pg_video: Video,
+    ) -> None:
+        assert pg_video in await pg_video_repository.get_without_thumbnails()
+        thumbnails = VideoThumbnails(
+            variants=[ThumbnailVariant(width=320, height=180, url="https://s/1.webp")],
+            placeholder="data:image/webp;base64,AAAA",
+        )
+
+        (video,) = await pg_video_repository.set_thumbnails({pg_video.id: thumbnails})
+
+        assert video.thumbnails == thumbnails
+        assert video.version > pg_video.version
+        assert pg_video.id not in {
+            video.id for video in await pg_video_repository.get_without_thumbnails()
+        }
+
+    async def test_purge(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        permanently_deleted_video: Video,
+        new_video_data: NewVideoDto,
+    ) -> None:
+        live_video = await pg_video_repository.create(new_video_data)
+        thumbnails = VideoThumbnails(
+            variants=[ThumbnailVariant(width=320, height=180, url="https://s/1.webp")],
+            placeholder="data:image/webp;base64,AAAA",
+        )
+        await pg_video_repository.set_thumbnails(
+            {permanently_deleted_video.id: thumbnails},
+        )
+
+        purged = await pg_video_repository.purge(10)
+
+        assert purged == [permanently_deleted_video.id]
+        with pytest.raises(VideoNotFoundError):
+            await pg_video_repository.get_by_id(
+                permanently_deleted_video.id,
+                include_deleted=True,
+            )
+        archived = await pg_session.get(PGArchivedVideo, permanently_deleted_video.id)
+        assert archived is not None
+        assert archived.slug == permanently_deleted_video.slug
+        assert VideoThumbnails.model_validate(archived.thumbnails) == thumbnails
+        assert await pg_video_repository.get_by_id(live_video.id)
+        assert await pg_video_repository.purge(10) == []
+
     async def test_restore_only_temporary_deleted_video(
         self: Self,
         pg_video_repository: PostgresVideoRepository,
@@ -461,6 +599,29 @@ class TestMeilisearchVideoRepository:
         assert document
         assert document.get("is_blocked_in_russia") is None
 
+    async def test_create_many(
+        self: Self,
+        pg_video: Video,
+        repository: MeilisearchVideoRepository,
+    ) -> None:
+        await repository.create_many([pg_video])
+        document = await repository.index.get_document(str(pg_video.id))
+
+        assert document
+        assert document.get("is_blocked_in_russia") is None
+
+    async def test_search(
+        self: Self,
+        ms_video: Video,
+        repository: MeilisearchVideoRepository,
+    ) -> None:
+        result = await repository.search(ms_video.title, limit=100)
+        ids = [hit.id for hit in result.hits]
+
+        assert ms_video.id in ids
+        hit = result.hits[ids.index(ms_video.id)]
+        assert "<em>" in hit.highlights["title"]
+
     async def test_delete(
         self: Self,
         ms_video: Video,
@@ -484,3 +645,31 @@ class TestMeilisearchVideoRepository:
 
         assert document
         assert updated_data.title == document.get("title")
+
+
+class TestMeilisearchVideoReindexRepository:
+    async def test_rebuild(
+        self: Self,
+        ms_client: Client,
+        pg_video: Video,
+    ) -> None:
+        repository = MeilisearchVideoReindexRepository(ms_client, concurrency=2)
+
+        async def batches() -> AsyncIterator[list[Video]]:
+            yield [pg_video]
+            yield []
+
+        count = await repository.rebuild(batches())
+        index = ms_client.index(normalize_ms_index_name("videos"))
+        document = await index.get_document(str(pg_video.id))
+        settings = await index.get_settings()
+
+        assert count == 1
+        assert document["title"] == pg_video.title
+        assert settings.sortable_attributes
+        assert (
+            await ms_client.get_raw_index(
+                normalize_ms_index_name("videos") + "-reindex",
+            )
+            is None
+        )
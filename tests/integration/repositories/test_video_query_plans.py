@@ -0,0 +1,202 @@
+import json
+from collections.abc import Generator, Iterator
+from typing import Any
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.video import DurationBucket, VideoFilter, VideoSort
+from edm_su_api.internal.usecase.repository.video import PostgresVideoRepository
+
+pytestmark = pytest.mark.anyio
+
+# Large enough that a sequential scan is clearly the more expensive plan.
+CATALOG_SIZE = 50_000
+
+Statement = tuple[str, Any]
+
+
+def plan_nodes(plan: dict[str, Any]) -> Iterator[dict[str, Any]]:
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from plan_nodes(child)
+
+
+class TestVideoQueryPlans:
+    @pytest.fixture(autouse=True)
+    async def catalog(self: Self, pg_session: AsyncSession) -> None:
+        # One video in ten is live, the rest are split between soft-deleted
+        # and permanently deleted ones.
+        await pg_session.execute(
+            text(
+                """
+                INSERT INTO videos (
+                    title,
+                    slug,
+                    yt_id,
+                    yt_thumbnail,
+                    date,
+                    duration,
+                    deleted,
+                    delete_type
+                )
+                SELECT
+                    'plan ' || n,
+                    'plan-' || n,
+                    'plan-' || n,
+                    'https://example.com/' || n || '.jpg',
+                    current_date - n % 3650,
+                    n % 7200,
+                    n % 10 <> 0,
+                    CASE
+                        WHEN n % 10 = 0 THEN NULL
+                        WHEN n % 2 = 0 THEN 'PERMANENT'::deletetype
+                        ELSE 'TEMPORARY'::deletetype
+                    END
+                FROM generate_series(1, :rows) AS n
+                """
+            ),
+            {"rows": CATALOG_SIZE},
+        )
+        await pg_session.execute(text("ANALYZE videos"))
+
+    @pytest.fixture
+    def statements(
+        self: Self,
+        pg_connection: AsyncConnection,
+    ) -> Generator[list[Statement], None, None]:
+        captured: list[Statement] = []
+
+        def capture(*args: Any) -> None:  # noqa: ANN401
+            _, _, statement, parameters, *_ = args
+            captured.append((statement, parameters))
+
+        engine = pg_connection.sync_engine
+        event.listen(engine, "before_cursor_execute", capture)
+        yield captured
+        event.remove(engine, "before_cursor_execute", capture)
+
+    @staticmethod
+    async def explain(
+        pg_session: AsyncSession,
+        statement: Statement,
+    ) -> list[dict[str, Any]]:
+        sql, parameters = statement
+        connection = await pg_session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {sql}",
+            parameters,
+        )
+        plan = result.scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return list(plan_nodes(plan[0]["Plan"]))
+
+    @staticmethod
+    def assert_no_seq_scan(nodes: list[dict[str, Any]]) -> None:
+        seq_scans = [
+            node
+            for node in nodes
+            if node["Node Type"] == "Seq Scan" and node["Relation Name"] == "videos"
+        ]
+        assert not seq_scans, seq_scans
+
+    @staticmethod
+    def index_names(nodes: list[dict[str, Any]]) -> set[str]:
+        return {node["Index Name"] for node in nodes if "Index Name" in node}
+
+    async def test_get_all(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        await pg_video_repository.get_all(limit=25)
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+        assert "ix_videos_live_id" in self.index_names(nodes)
+
+    async def test_get_all_after_id(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        await pg_video_repository.get_all(limit=25, after_id=CATALOG_SIZE // 2)
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+        assert "ix_videos_live_id" in self.index_names(nodes)
+
+    @pytest.mark.parametrize(
+        ("sort", "index"),
+        [
+            (VideoSort.DATE, "ix_videos_live_date_id"),
+            (VideoSort.DATE_DESC, "ix_videos_live_date_id"),
+            (VideoSort.DURATION_DESC, "ix_videos_live_duration_id"),
+            (VideoSort.TITLE, "ix_videos_live_title_id"),
+        ],
+    )
+    async def test_get_all_sorted(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+        sort: VideoSort,
+        index: str,
+    ) -> None:
+        await pg_video_repository.get_all(limit=25, sort=sort)
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+        assert index in self.index_names(nodes)
+
+    async def test_count_filtered(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        await pg_video_repository.count(
+            filters=VideoFilter(duration=DurationBucket.SHORT),
+        )
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+
+    async def test_get_all_include_deleted(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        await pg_video_repository.get_all(limit=25, include_deleted=True)
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+
+    async def test_get_by_slug(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        await pg_video_repository.get_by_slug("plan-10")
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
+
+    async def test_get_by_id_include_deleted(
+        self: Self,
+        pg_session: AsyncSession,
+        pg_video_repository: PostgresVideoRepository,
+        statements: list[Statement],
+    ) -> None:
+        videos = await pg_video_repository.get_all(limit=1, include_deleted=True)
+        await pg_video_repository.get_by_id(videos[0].id, include_deleted=True)
+
+        nodes = await self.explain(pg_session, statements[-1])
+        self.assert_no_seq_scan(nodes)
@@ -1,18 +1,30 @@
 from collections.abc import AsyncGenerator, Generator
+from unittest.mock import AsyncMock
 
 import pytest
 from faker import Faker
 from httpx import ASGITransport, AsyncClient
+from pytest_mock import MockerFixture
 
 from edm_su_api.internal.controller.http import app
 from edm_su_api.internal.controller.http.v1.dependencies.auth import (
     get_current_user,
     get_optional_user,
 )
+from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
+    create_permission_check_repository,
+    create_permission_lookup_repository,
+)
 from edm_su_api.internal.entity.user import (
     User,
 )
 from edm_su_api.internal.entity.video import Video
+from edm_su_api.internal.usecase.repository.permission import (
+    AbstractPermissionCheckRepository,
+    AbstractPermissionLookupRepository,
+)
+from edm_su_api.pkg.cache import response_cache
+from edm_su_api.pkg.suggest import video_suggestions
 
 
 @pytest.fixture(scope="session")
@@ -43,6 +55,44 @@ def mock_clean_dependencies() -> Generator:
     app.dependency_overrides.clear()
 
 
+@pytest.fixture(autouse=True)
+def mock_s3_client(mocker: MockerFixture) -> Generator[AsyncMock, None, None]:
+    # ASGITransport doesn't run the lifespan that opens the shared client.
+    app.state.s3_client = mocker.AsyncMock()
+    yield app.state.s3_client
+    del app.state.s3_client
+
+
+@pytest.fixture(autouse=True)
+def mock_permission_checks(mocker: MockerFixture) -> AsyncMock:
+    """Allow every permission check; tests of denials set `return_value`."""
+    repository = mocker.AsyncMock(spec=AbstractPermissionCheckRepository)
+    repository.check_many.side_effect = lambda checks, *_: [True] * len(checks)
+    app.dependency_overrides[create_permission_check_repository] = lambda: repository
+    return repository
+
+
+@pytest.fixture(autouse=True)
+def mock_permission_lookups(mocker: MockerFixture) -> AsyncMock:
+    repository = mocker.AsyncMock(spec=AbstractPermissionLookupRepository)
+    repository.lookup_resources.return_value = frozenset()
+    app.dependency_overrides[create_permission_lookup_repository] = lambda: repository
+    return repository
+
+
+@pytest.fixture(autouse=True)
+def clean_response_cache() -> Generator:
+    # Sync, as it also applies to the sync tests of this package.
+    yield
+    response_cache.reset()
+
+
+@pytest.fixture(autouse=True)
+def clean_video_suggestions() -> Generator:
+    yield
+    video_suggestions.clear()
+
+
 @pytest.fixture
 def user_auth_headers(user: User) -> dict[str, str]:
     return {
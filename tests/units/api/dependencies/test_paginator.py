@@ -0,0 +1,37 @@
+import pytest
+from fastapi import HTTPException
+from typing_extensions import Self
+
+from edm_su_api.internal.controller.http.v1.dependencies.paginator import (
+    CursorPaginator,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+class TestCursor:
+    def test_round_trip(self: Self) -> None:
+        assert decode_cursor(encode_cursor(12345)) == 12345
+
+    @pytest.mark.parametrize("cursor", ["", "???", "aWQ6", "Zm9vOjE"])
+    def test_invalid(self: Self, cursor: str) -> None:
+        with pytest.raises(ValueError, match="Invalid cursor"):
+            decode_cursor(cursor)
+
+
+class TestCursorPaginator:
+    def test_without_cursor(self: Self) -> None:
+        paginator = CursorPaginator(skip=10, limit=5)
+
+        assert paginator.skip == 10
+        assert paginator.after_id is None
+
+    def test_with_cursor(self: Self) -> None:
+        paginator = CursorPaginator(skip=10, limit=5, cursor=encode_cursor(42))
+
+        assert paginator.skip == 0
+        assert paginator.after_id == 42
+
+    def test_with_invalid_cursor(self: Self) -> None:
+        with pytest.raises(HTTPException):
+            CursorPaginator(cursor="not-a-cursor")
@@ -0,0 +1,151 @@
+from collections.abc import AsyncGenerator
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_mock import MockerFixture
+from typing_extensions import Self
+
+from edm_su_api.internal.controller.http.v1.dependencies.permissions import (
+    ReadableSlugs,
+    create_permission_check_repository,
+    create_spicedb_repository,
+)
+from edm_su_api.internal.entity.settings import settings
+from edm_su_api.internal.entity.user import User
+from edm_su_api.internal.usecase.repository.permission import (
+    AbstractPermissionLookupRepository,
+    CachedPermissionCheckRepository,
+    Object,
+    RelationshipTuple,
+    SpiceDBPermissionCheckRepository,
+    SpiceDBPermissionRepository,
+)
+from edm_su_api.pkg.authzed import SpiceDBClientPool, TimedClient
+from edm_su_api.pkg.cache import DecisionCache
+
+pytestmark = pytest.mark.anyio
+
+
+class TestSpiceDBClientPool:
+    @pytest.fixture
+    async def pool(
+        self: Self,
+        mocker: MockerFixture,
+    ) -> AsyncGenerator[SpiceDBClientPool, None]:
+        pool = SpiceDBClientPool(2)
+        mocker.patch(
+            "edm_su_api.internal.controller.http.v1.dependencies.permissions.spicedb_clients",
+            pool,
+        )
+        yield pool
+        await pool.close()
+
+    async def test_reuse_clients(self: Self, pool: SpiceDBClientPool) -> None:
+        clients = [(await create_spicedb_repository()).client for _ in range(4)]
+
+        assert all(isinstance(client, TimedClient) for client in clients)
+        assert clients[0] is not clients[1]
+        assert clients[:2] == clients[2:]
+
+    async def test_close(self: Self, pool: SpiceDBClientPool) -> None:
+        client = await pool.get()
+
+        await pool.close()
+
+        assert await pool.get() is not client
+
+
+class TestCreatePermissionCheckRepository:
+    async def test_cached(self: Self) -> None:
+        repository = await create_permission_check_repository()
+
+        assert isinstance(repository, CachedPermissionCheckRepository)
+
+    async def test_without_cache(self: Self, mocker: MockerFixture) -> None:
+        mocker.patch.object(settings, "permission_cache_ttl", 0)
+
+        repository = await create_permission_check_repository()
+
+        assert isinstance(repository, SpiceDBPermissionCheckRepository)
+
+
+async def test_writes_invalidate_decisions(mocker: MockerFixture) -> None:
+    client = mocker.AsyncMock()
+    client.WriteRelationships.return_value.written_at.token = "token"
+    decisions: DecisionCache[Object, Object] = DecisionCache(10, 60, 60)
+    repository = SpiceDBPermissionRepository(client, decisions)
+    resource = Object("video", "slug")
+
+    await repository.write_many(
+        [
+            RelationshipTuple(resource, "writer", Object("user", "first")),
+            RelationshipTuple(resource, "writer", Object("user", "second")),
+        ],
+    )
+
+    assert decisions.token(resource) == "token"
+
+
+class TestReadableSlugs:
+    @pytest.fixture
+    def repository(self: Self, mocker: MockerFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractPermissionLookupRepository)
+        repository.lookup_resources.side_effect = lambda _, __, subject: (
+            frozenset({"first"})
+            if subject.object_id == "*"
+            else frozenset({"first", "second"})
+        )
+        return repository
+
+    @pytest.fixture
+    def enabled(self: Self, mocker: MockerFixture) -> None:
+        mocker.patch.object(settings, "permission_listing_filter", True)  # noqa: FBT003
+
+    @pytest.mark.usefixtures("enabled")
+    async def test_user(
+        self: Self,
+        repository: AsyncMock,
+        user: User,
+    ) -> None:
+        slugs = await ReadableSlugs("video")(user, repository)
+
+        assert slugs == {"first", "second"}
+        repository.lookup_resources.assert_any_await(
+            "video",
+            "read",
+            Object("user", user.id),
+        )
+        repository.lookup_resources.assert_any_await(
+            "video",
+            "read",
+            Object("user", "*"),
+        )
+
+    @pytest.mark.usefixtures("enabled")
+    async def test_user_reads_only_public(
+        self: Self,
+        repository: AsyncMock,
+        user: User,
+    ) -> None:
+        repository.lookup_resources.side_effect = None
+        repository.lookup_resources.return_value = frozenset({"first"})
+
+        assert await ReadableSlugs("video")(user, repository) is None
+
+    @pytest.mark.usefixtures("enabled")
+    @pytest.mark.parametrize("guest", [None, User()])
+    async def test_guest(
+        self: Self,
+        repository: AsyncMock,
+        guest: User,
+    ) -> None:
+        assert await ReadableSlugs("video")(guest, repository) is None
+        repository.lookup_resources.assert_not_awaited()
+
+    async def test_disabled(
+        self: Self,
+        repository: AsyncMock,
+        user: User,
+    ) -> None:
+        assert await ReadableSlugs("video")(user, repository) is None
+        repository.lookup_resources.assert_not_awaited()
@@ -0,0 +1,282 @@
+from collections.abc import AsyncGenerator
+
+import anyio
+import pytest
+from fastapi import FastAPI, HTTPException, Request, Response, status
+from httpx import ASGITransport, AsyncClient
+from typing_extensions import Self
+
+from edm_su_api.internal.controller.http.middleware import (
+    CACHE_TAGS_HEADER,
+    ResponseCacheMiddleware,
+    etag_matches,
+)
+from edm_su_api.internal.controller.http.v1.dependencies.cache import tag_response
+from edm_su_api.pkg.cache import CachedResponse, LRUResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Counter:
+    def __init__(self: Self) -> None:
+        self.calls = 0
+        self.refetched = anyio.Event()
+
+    def call(self: Self) -> int:
+        self.calls += 1
+        if self.calls > 1:
+            self.refetched.set()
+        return self.calls
+
+
+@pytest.fixture
+def cache() -> LRUResponseCache:
+    return LRUResponseCache(max_entries=10)
+
+
+@pytest.fixture
+def counter() -> Counter:
+    return Counter()
+
+
+@pytest.fixture
+def stale_ttl() -> float:
+    return 0
+
+
+@pytest.fixture
+def cached_app(
+    cache: LRUResponseCache,
+    counter: Counter,
+    stale_ttl: float,
+) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/items")
+    async def get_items(response: Response) -> dict[str, int]:
+        tag_response(response, "items:list")
+        return {"calls": counter.call()}
+
+    @app.get("/versioned")
+    async def get_versioned(response: Response) -> dict[str, int]:
+        tag_response(response, "items:list")
+        response.headers["ETag"] = '"v1"'
+        return {"calls": counter.call()}
+
+    @app.get("/conditional")
+    async def get_conditional(request: Request, response: Response) -> dict[str, int]:
+        if request.headers.get("if-none-match") == '"v1"':
+            raise HTTPException(status.HTTP_304_NOT_MODIFIED, headers={"ETag": '"v1"'})
+        tag_response(response, "items:list")
+        response.headers["ETag"] = '"v1"'
+        return {"calls": counter.call()}
+
+    @app.get("/untagged")
+    async def get_untagged() -> dict[str, int]:
+        return {"calls": counter.call()}
+
+    @app.post("/items")
+    async def create_item() -> None:
+        await cache.purge("items:list")
+        # The purge is held back until the request is done.
+        assert len(cache) == 1
+
+    app.add_middleware(
+        ResponseCacheMiddleware,
+        cache=cache,
+        ttl=0 if stale_ttl else 60,
+        stale_ttl=stale_ttl,
+    )
+    return app
+
+
+@pytest.fixture
+async def cached_client(cached_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(
+        base_url="http://test",
+        transport=ASGITransport(app=cached_app),
+    ) as client:
+        yield client
+
+
+class TestResponseCacheMiddleware:
+    async def test_anonymous_response_is_cached(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        first = await cached_client.get("/items")
+        second = await cached_client.get("/items")
+
+        assert counter.calls == 1
+        assert first.headers["X-Cache"] == "MISS"
+        assert second.headers["X-Cache"] == "HIT"
+        assert second.json() == first.json()
+        assert CACHE_TAGS_HEADER not in first.headers
+        assert CACHE_TAGS_HEADER not in second.headers
+
+    async def test_query_order_does_not_matter(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/items?a=1&b=2")
+        response = await cached_client.get("/items?b=2&a=1")
+
+        assert counter.calls == 1
+        assert response.headers["X-Cache"] == "HIT"
+
+    async def test_user_requests_are_not_cached(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/items", headers={"X-User": "user"})
+        response = await cached_client.get("/items", headers={"X-User": "user"})
+
+        assert counter.calls == 2
+        assert "X-Cache" not in response.headers
+        assert CACHE_TAGS_HEADER not in response.headers
+
+    async def test_untagged_responses_are_not_cached(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/untagged")
+        await cached_client.get("/untagged")
+
+        assert counter.calls == 2
+
+    async def test_purge_after_write(
+        self: Self,
+        cached_client: AsyncClient,
+        cache: LRUResponseCache,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/items")
+        await cached_client.post("/items")
+        response = await cached_client.get("/items")
+
+        assert len(cache) == 1
+        assert counter.calls == 2
+        assert response.headers["X-Cache"] == "MISS"
+
+    async def test_not_modified_from_cache(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/versioned")
+        response = await cached_client.get(
+            "/versioned",
+            headers={"If-None-Match": 'W/"v1"'},
+        )
+
+        assert counter.calls == 1
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == '"v1"'
+        assert response.headers["X-Cache"] == "HIT"
+        assert not response.content
+
+    @pytest.mark.parametrize("stale_ttl", [60])
+    async def test_stale_while_revalidate(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/items")
+        stale = await cached_client.get("/items")
+
+        assert stale.headers["X-Cache"] == "STALE"
+        assert stale.json() == {"calls": 1}
+
+        with anyio.fail_after(1):
+            await counter.refetched.wait()
+        # Let the refresh store its response.
+        await anyio.sleep(0.01)
+
+        refreshed = await cached_client.get("/items")
+        assert refreshed.headers["X-Cache"] == "STALE"
+        assert refreshed.json() == {"calls": 2}
+
+    @pytest.mark.parametrize("stale_ttl", [60])
+    async def test_revalidate_conditional_request(
+        self: Self,
+        cached_client: AsyncClient,
+        counter: Counter,
+    ) -> None:
+        await cached_client.get("/conditional")
+        stale = await cached_client.get(
+            "/conditional",
+            headers={"If-None-Match": '"v1"'},
+        )
+
+        assert stale.status_code == status.HTTP_304_NOT_MODIFIED
+        # The refresh runs unconditionally, so it gets a body to store.
+        with anyio.fail_after(1):
+            await counter.refetched.wait()
+        await anyio.sleep(0.01)
+
+        refreshed = await cached_client.get("/conditional")
+        assert refreshed.json() == {"calls": 2}
+
+
+class TestEtagMatches:
+    @pytest.mark.parametrize(
+        ("if_none_match", "expected"),
+        [
+            ('"a"', True),
+            ('W/"a"', True),
+            ('"b", "a"', True),
+            ("*", True),
+            ('"b"', False),
+        ],
+    )
+    async def test_etag_matches(
+        self: Self,
+        if_none_match: str,
+        *,
+        expected: bool,
+    ) -> None:
+        assert etag_matches(if_none_match, '"a"') is expected
+
+
+class TestLRUResponseCache:
+    @staticmethod
+    def response(*tags: str) -> CachedResponse:
+        return CachedResponse(status=200, headers=[], body=b"", tags=frozenset(tags))
+
+    async def test_evicts_least_recently_used(self: Self) -> None:
+        cache = LRUResponseCache(max_entries=2)
+        await cache.set("a", self.response())
+        await cache.set("b", self.response())
+        await cache.get("a")
+        await cache.set("c", self.response())
+
+        assert await cache.get("a") is not None
+        assert await cache.get("b") is None
+        assert await cache.get("c") is not None
+
+    async def test_purge_by_tag(self: Self) -> None:
+        cache = LRUResponseCache(max_entries=10)
+        await cache.set("list", self.response("videos:list"))
+        await cache.set("one", self.response("video:1"))
+        await cache.set("two", self.response("video:2"))
+
+        await cache.purge("video:1", "videos:list")
+
+        assert await cache.get("list") is None
+        assert await cache.get("one") is None
+        assert await cache.get("two") is not None
+        assert cache.generation == 1
+
+    async def test_deferred_purge(self: Self) -> None:
+        cache = LRUResponseCache(max_entries=10)
+        await cache.set("one", self.response("video:1"))
+
+        async with cache.defer_purges():
+            await cache.purge("video:1")
+            assert await cache.get("one") is not None
+
+        assert await cache.get("one") is None
@@ -0,0 +1,93 @@
+import logging
+from collections.abc import AsyncGenerator
+
+import anyio
+import pytest
+from fastapi import FastAPI
+from httpx import ASGITransport, AsyncClient
+
+from edm_su_api.internal.controller.http.timing import (
+    ServerTimingMiddleware,
+    TimedJSONResponse,
+)
+from edm_su_api.pkg.timing import AUTHZ, SEARCH, current_timings, timed
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def timed_app() -> FastAPI:
+    app = FastAPI(default_response_class=TimedJSONResponse)
+    app.add_middleware(ServerTimingMiddleware, query_threshold=3)
+
+    @app.get("/search")
+    async def search() -> dict[str, str]:
+        with timed(SEARCH):
+            await anyio.sleep(0.01)
+        return {"status": "ok"}
+
+    @app.get("/authz")
+    def authz() -> dict[str, str]:
+        # Sync endpoints run in a thread, which still sees the collector.
+        with timed(AUTHZ):
+            pass
+        return {"status": "ok"}
+
+    @app.get("/queries/{count}")
+    async def queries(count: int) -> dict[str, str]:
+        timings = current_timings()
+        assert timings is not None
+        for id_ in range(count):
+            timings.add_query("SELECT * FROM videos WHERE id = $1", 0.001)
+            timings.add_query(f"SELECT {id_}", 0.001)
+        return {"status": "ok"}
+
+    return app
+
+
+@pytest.fixture
+async def timed_client(timed_app: FastAPI) -> AsyncGenerator[AsyncClient, None]:
+    async with AsyncClient(
+        base_url="http://test",
+        transport=ASGITransport(app=timed_app),
+    ) as client:
+        yield client
+
+
+def metrics(header: str) -> dict[str, str]:
+    return dict(metric.strip().split(";", 1) for metric in header.split(","))
+
+
+class TestServerTimingMiddleware:
+    async def test_report_backend_time(self, timed_client: AsyncClient) -> None:
+        response = await timed_client.get("/search")
+
+        reported = metrics(response.headers["server-timing"])
+        assert set(reported) == {"search", "serialize", "total"}
+        assert float(reported["search"].removeprefix("dur=")) >= 10
+
+    async def test_collect_from_threads(self, timed_client: AsyncClient) -> None:
+        response = await timed_client.get("/authz")
+
+        assert "authz" in metrics(response.headers["server-timing"])
+
+    async def test_count_queries(self, timed_client: AsyncClient) -> None:
+        response = await timed_client.get("/queries/1")
+
+        reported = metrics(response.headers["server-timing"])
+        assert reported["db"].endswith('desc="2 queries"')
+
+    async def test_warn_about_many_queries(
+        self,
+        timed_client: AsyncClient,
+        caplog: pytest.LogCaptureFixture,
+    ) -> None:
+        with caplog.at_level(logging.WARNING, logger="app.timing"):
+            await timed_client.get("/queries/1")
+            assert not caplog.records
+
+            await timed_client.get("/queries/5")
+
+        assert len(caplog.records) == 1
+        assert "ran 10 queries, 5 of them the same" in caplog.text
+        assert "FROM videos" in caplog.text
@@ -1,3 +1,5 @@
+from unittest.mock import AsyncMock
+
 import pytest
 from faker import Faker
 from fastapi import status
@@ -8,6 +10,20 @@ from typing_extensions import Self
 from edm_su_api.internal.controller.http.v1.upload import (
     PreSignedUploadResponse,
 )
+from edm_su_api.internal.entity.upload import (
+    CompletedPart,
+    ImageSet,
+    ImageVariant,
+    MultipartUpload,
+    UploadPart,
+)
+from edm_su_api.internal.entity.user import User
+from edm_su_api.internal.usecase.exceptions.upload import (
+    UploadNotFoundError,
+    UploadNotImageError,
+    UploadPartsInvalidError,
+    UploadTooLargeError,
+)
 
 pytestmark = pytest.mark.anyio
 
@@ -51,3 +67,254 @@ class TestGeneratePreSignedURL:
 
         mocked.assert_not_awaited()
         assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestCompleteImageUpload:
+    @pytest.fixture
+    def image(self: Self) -> ImageSet:
+        return ImageSet(
+            key="posts/cover.png",
+            url="https://static.test/posts/cover.png",
+            width=800,
+            height=600,
+            size=1024,
+            variants=[
+                ImageVariant(
+                    url="https://static.test/posts/cover/320.webp",
+                    width=320,
+                    height=240,
+                    format="webp",
+                    size=128,
+                ),
+            ],
+        )
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_complete(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        image: ImageSet,
+        user: User,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.CompleteImageUploadUseCase.execute",
+            return_value=image,
+        )
+
+        response = await client.post("/upload/complete", json={"key": image.key})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert ImageSet.model_validate(response.json()) == image
+        mocked.assert_awaited_once_with(image.key, user.id)
+
+    @pytest.mark.parametrize(
+        ("error", "status_code"),
+        [
+            (UploadNotFoundError("key"), status.HTTP_404_NOT_FOUND),
+            (UploadTooLargeError("key", 1024), status.HTTP_413_CONTENT_TOO_LARGE),
+            (UploadNotImageError("key"), status.HTTP_422_UNPROCESSABLE_CONTENT),
+        ],
+    )
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_errors(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        error: Exception,
+        status_code: int,
+    ) -> None:
+        mocker.patch(
+            "edm_su_api.internal.usecase.upload.CompleteImageUploadUseCase.execute",
+            side_effect=error,
+        )
+
+        response = await client.post("/upload/complete", json={"key": "key"})
+
+        assert response.status_code == status_code
+
+    async def test_unauthorized(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.CompleteImageUploadUseCase.execute",
+        )
+
+        response = await client.post("/upload/complete", json={"key": "key"})
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestMultipartUpload:
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_create(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        upload = MultipartUpload(
+            key="mixes/pack.zip",
+            upload_id="upload-id",
+            parts=[UploadPart(part_number=1, url="https://s3.test/part-1")],
+        )
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.CreateMultipartUploadUseCase.execute",
+            return_value=upload,
+        )
+
+        response = await client.post(
+            "/upload/multipart",
+            json={"key": upload.key, "parts": 1, "content_type": "application/zip"},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert MultipartUpload.model_validate(response.json()) == upload
+        mocked.assert_awaited_once_with(upload.key, 1, "application/zip", 1800)
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_create_too_many_parts(self: Self, client: AsyncClient) -> None:
+        response = await client.post(
+            "/upload/multipart",
+            json={"key": "mixes/pack.zip", "parts": 10_001},
+        )
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_generate_part_urls(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        parts = [UploadPart(part_number=2, url="https://s3.test/part-2")]
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.GenerateUploadPartUrlsUseCase.execute",
+            return_value=parts,
+        )
+
+        response = await client.post(
+            "/upload/multipart/parts",
+            json={
+                "key": "mixes/pack.zip",
+                "upload_id": "upload-id",
+                "part_numbers": [2],
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [part.model_dump() for part in parts]
+        mocked.assert_awaited_once_with("mixes/pack.zip", "upload-id", [2], 1800)
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_complete(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.CompleteMultipartUploadUseCase.execute",
+            return_value="https://static.test/mixes/pack.zip",
+        )
+
+        response = await client.post(
+            "/upload/multipart/complete",
+            json={
+                "key": "mixes/pack.zip",
+                "upload_id": "upload-id",
+                "parts": [{"part_number": 1, "etag": '"a"'}],
+            },
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == {"url": "https://static.test/mixes/pack.zip"}
+        mocked.assert_awaited_once_with(
+            "mixes/pack.zip",
+            "upload-id",
+            [CompletedPart(part_number=1, etag='"a"')],
+        )
+
+    @pytest.mark.parametrize(
+        ("error", "status_code"),
+        [
+            (UploadNotFoundError("key"), status.HTTP_404_NOT_FOUND),
+            (UploadPartsInvalidError("key"), status.HTTP_422_UNPROCESSABLE_CONTENT),
+        ],
+    )
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_complete_errors(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        error: Exception,
+        status_code: int,
+    ) -> None:
+        mocker.patch(
+            "edm_su_api.internal.usecase.upload.CompleteMultipartUploadUseCase.execute",
+            side_effect=error,
+        )
+
+        response = await client.post(
+            "/upload/multipart/complete",
+            json={
+                "key": "key",
+                "upload_id": "upload-id",
+                "parts": [{"part_number": 1, "etag": '"a"'}],
+            },
+        )
+
+        assert response.status_code == status_code
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_abort(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.AbortMultipartUploadUseCase.execute",
+        )
+
+        response = await client.post(
+            "/upload/multipart/abort",
+            json={"key": "mixes/pack.zip", "upload_id": "upload-id"},
+        )
+
+        assert response.status_code == status.HTTP_204_NO_CONTENT
+        mocked.assert_awaited_once_with("mixes/pack.zip", "upload-id")
+
+    async def test_unauthorized(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.upload.CreateMultipartUploadUseCase.execute",
+        )
+
+        response = await client.post(
+            "/upload/multipart",
+            json={"key": "mixes/pack.zip", "parts": 1},
+        )
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_401_UNAUTHORIZED
+
+
+class TestSharedS3Client:
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_uses_lifespan_client(
+        self: Self,
+        client: AsyncClient,
+        mock_s3_client: AsyncMock,
+        faker: Faker,
+    ) -> None:
+        url = faker.url()
+        mock_s3_client.generate_presigned_url.return_value = url
+
+        response = await client.get("/upload/pre_signed")
+
+        assert response.json() == {"url": url}
+        mock_s3_client.generate_presigned_url.assert_awaited_once()
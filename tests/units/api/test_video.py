@@ -1,20 +1,38 @@
+import json
+from collections.abc import AsyncIterator
+from datetime import date
+from unittest.mock import AsyncMock
+
 import pytest
 from fastapi import status
 from httpx import AsyncClient
 from pytest_mock import MockerFixture
+from pytest_mock.plugin import MockType
 from typing_extensions import Self
 
 from edm_su_api.internal.controller.http import app
+from edm_su_api.internal.controller.http.v1.dependencies.paginator import (
+    decode_cursor,
+    encode_cursor,
+)
 from edm_su_api.internal.controller.http.v1.dependencies.video import (
     find_video,
     find_video_including_deleted,
 )
+from edm_su_api.internal.entity.settings import settings
 from edm_su_api.internal.entity.user import User
 from edm_su_api.internal.entity.video import (
     DeleteType,
+    DurationBucket,
+    FoundVideo,
     NewVideoDto,
     UpdateVideoDto,
     Video,
+    VideoFilter,
+    VideoImportResult,
+    VideoImportStatus,
+    VideoSort,
+    VideoSuggestion,
 )
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoNotDeletedError,
@@ -22,6 +40,12 @@ from edm_su_api.internal.usecase.exceptions.video import (
     VideoRestoreError,
     VideoYtIdNotUniqueError,
 )
+from edm_su_api.internal.usecase.repository.permission import (
+    Object,
+    PermissionCheck,
+)
+from edm_su_api.pkg.cache import response_cache
+from edm_su_api.pkg.suggest import video_suggestions
 
 pytestmark = pytest.mark.anyio
 
@@ -47,6 +71,14 @@ def mock_find_video_including_deleted(
     app.dependency_overrides[find_video_including_deleted] = lambda: video
 
 
+@pytest.fixture(autouse=True)
+def mock_video_list_version(mocker: MockerFixture) -> None:
+    mocker.patch(
+        "edm_su_api.internal.usecase.video.GetVideoListVersionUseCase.execute",
+        return_value=1,
+    )
+
+
 class TestGetVideos:
     @pytest.mark.usefixtures("mock_anonymous_user")
     async def test_get_videos(
@@ -66,12 +98,45 @@ class TestGetVideos:
         response = await client.get("/videos")
 
         mocked.assert_awaited_once_with(
-            offset=0, limit=25, user_id=None, include_deleted=False
+            offset=0,
+            limit=25,
+            user_id=None,
+            include_deleted=False,
+            after_id=None,
+            filters=VideoFilter(),
+            sort=VideoSort.NEWEST,
         )
         mocked_count.assert_awaited_once()
         assert response.status_code == status.HTTP_200_OK
         assert response.headers["X-Total-Count"] == "1"
 
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_get_videos_readable(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        mock_permission_lookups: AsyncMock,
+        video: Video,
+    ) -> None:
+        mocker.patch.object(settings, "permission_listing_filter", True)  # noqa: FBT003
+        mock_permission_lookups.lookup_resources.side_effect = lambda _, __, subject: (
+            frozenset() if subject.object_id == "*" else frozenset({video.slug})
+        )
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[video],
+        )
+        mocked_count = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=1,
+        )
+        response = await client.get("/videos")
+
+        assert response.status_code == status.HTTP_200_OK
+        readable = VideoFilter(slugs=frozenset({video.slug}))
+        assert mocked.call_args.kwargs["filters"] == readable
+        mocked_count.assert_awaited_once_with(include_deleted=False, filters=readable)
+
     @pytest.mark.usefixtures("mock_current_user")
     async def test_get_videos_authorized(
         self: Self,
@@ -91,7 +156,13 @@ class TestGetVideos:
         response = await client.get("/videos")
 
         mocked.assert_awaited_once_with(
-            offset=0, limit=25, user_id=user.id, include_deleted=False
+            offset=0,
+            limit=25,
+            user_id=user.id,
+            include_deleted=False,
+            after_id=None,
+            filters=VideoFilter(),
+            sort=VideoSort.NEWEST,
         )
         mocked_count.assert_awaited_once()
         assert response.status_code == status.HTTP_200_OK
@@ -115,12 +186,369 @@ class TestGetVideos:
         response = await client.get("/videos?include_deleted=true")
 
         mocked.assert_awaited_once_with(
-            offset=0, limit=25, user_id=None, include_deleted=True
+            offset=0,
+            limit=25,
+            user_id=None,
+            include_deleted=True,
+            after_id=None,
+            filters=VideoFilter(),
+            sort=VideoSort.NEWEST,
         )
         mocked_count.assert_awaited_once()
         assert response.status_code == status.HTTP_200_OK
         assert response.headers["X-Total-Count"] == "1"
 
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_with_cursor(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[video],
+        )
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=1,
+        )
+        cursor = encode_cursor(100)
+        response = await client.get(f"/videos?cursor={cursor}&skip=50")
+
+        mocked.assert_awaited_once_with(
+            offset=0,
+            limit=25,
+            user_id=None,
+            include_deleted=False,
+            after_id=100,
+            filters=VideoFilter(),
+            sort=VideoSort.NEWEST,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_full_page_has_next_cursor(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> None:
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[video],
+        )
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=10,
+        )
+        response = await client.get("/videos?limit=1&skip=3")
+
+        assert response.status_code == status.HTTP_200_OK
+        next_cursor = response.headers["X-Next-Cursor"]
+        assert decode_cursor(next_cursor) == video.id
+        assert f"cursor={next_cursor}" in response.headers["Link"]
+        assert "skip" not in response.headers["Link"]
+        assert response.headers["Link"].endswith('rel="next"')
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_with_filters_and_sort(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[video],
+        )
+        mocked_count = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=5,
+        )
+        response = await client.get(
+            "/videos",
+            params={
+                "limit": 1,
+                "date_from": "2024-01-01",
+                "duration": "long",
+                "is_blocked_in_russia": False,
+                "sort": "-date",
+            },
+        )
+
+        filters = VideoFilter(
+            date_from=date(2024, 1, 1),
+            duration=DurationBucket.LONG,
+            is_blocked_in_russia=False,
+        )
+        mocked.assert_awaited_once_with(
+            offset=0,
+            limit=1,
+            user_id=None,
+            include_deleted=False,
+            after_id=None,
+            filters=filters,
+            sort=VideoSort.DATE_DESC,
+        )
+        mocked_count.assert_awaited_once_with(include_deleted=False, filters=filters)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Total-Count"] == "5"
+        # Cursors only encode ids, so sorted pages are paginated with skip.
+        assert "X-Next-Cursor" not in response.headers
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_cursor_with_sort(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+        )
+        response = await client.get(
+            "/videos",
+            params={"cursor": encode_cursor(100), "sort": "title"},
+        )
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_with_invalid_cursor(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+        )
+        response = await client.get("/videos?cursor=not-a-cursor")
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_not_modified(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[video],
+        )
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=1,
+        )
+        first = await client.get("/videos")
+        etag = first.headers["ETag"]
+        mocked.reset_mock()
+        await response_cache.clear()
+
+        response = await client.get("/videos", headers={"If-None-Match": etag})
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+        assert not response.content
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_get_videos_etag_depends_on_query(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[],
+        )
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=0,
+        )
+        first = await client.get("/videos")
+        response = await client.get(
+            "/videos?limit=10",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["ETag"] != first.headers["ETag"]
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_get_videos_authorized_has_no_etag(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetAllVideosUseCase.execute",
+            return_value=[],
+        )
+        mocker.patch(
+            "edm_su_api.internal.usecase.video.GetCountVideosUseCase.execute",
+            return_value=0,
+        )
+        response = await client.get("/videos")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert "ETag" not in response.headers
+
+
+class TestSearchVideos:
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_search_videos(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> None:
+        found = FoundVideo.model_validate(
+            {**dict(video), "highlights": {"title": "<em>title</em>"}},
+        )
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.SearchVideosUseCase.execute",
+            return_value=([found], 7),
+        )
+        response = await client.get(
+            "/videos/search",
+            params={"q": "title", "duration": "short", "sort": "-date"},
+        )
+
+        mocked.assert_awaited_once_with(
+            "title",
+            offset=0,
+            limit=25,
+            user_id=None,
+            duration=DurationBucket.SHORT,
+            sort=VideoSort.DATE_DESC,
+        )
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["X-Total-Count"] == "7"
+        assert response.json()[0]["highlights"] == {"title": "<em>title</em>"}
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_search_videos_authorized(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        user: User,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.SearchVideosUseCase.execute",
+            return_value=([], 0),
+        )
+        response = await client.get("/videos/search", params={"q": "title"})
+
+        assert mocked.await_args is not None
+        assert mocked.await_args.kwargs["user_id"] == user.id
+        assert response.status_code == status.HTTP_200_OK
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_search_videos_without_query(
+        self: Self,
+        client: AsyncClient,
+    ) -> None:
+        response = await client.get("/videos/search")
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+class TestSuggestVideos:
+    async def test_suggest_videos(
+        self: Self,
+        client: AsyncClient,
+        video: Video,
+    ) -> None:
+        suggestion = VideoSuggestion(title="Sample Video", slug=video.slug)
+        video_suggestions.add(video.id, suggestion, {"sample-video", "video"})
+
+        response = await client.get("/videos/suggest", params={"q": "VID"})
+
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json() == [suggestion.model_dump()]
+        assert "x-cache" not in response.headers
+
+    @pytest.mark.parametrize("params", [{"q": ""}, {"q": "video", "limit": 21}])
+    async def test_suggest_videos_invalid_params(
+        self: Self,
+        client: AsyncClient,
+        params: dict[str, str | int],
+    ) -> None:
+        response = await client.get("/videos/suggest", params=params)
+
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
+class TestExportVideos:
+    @pytest.fixture
+    def mock_export(
+        self: Self,
+        mocker: MockerFixture,
+        video: Video,
+    ) -> MockType:
+        async def batches() -> AsyncIterator[list[Video]]:
+            yield [video, video]
+            yield []
+            yield [video]
+
+        return mocker.patch(
+            "edm_su_api.internal.usecase.video.ExportVideosUseCase.execute",
+            return_value=batches(),
+        )
+
+    @pytest.mark.usefixtures("mock_anonymous_user")
+    async def test_export_videos(
+        self: Self,
+        client: AsyncClient,
+        mock_export: MockType,
+        video: Video,
+    ) -> None:
+        response = await client.get(
+            "/videos/export",
+            headers={"Accept-Encoding": "identity"},
+        )
+
+        mock_export.assert_called_once_with(include_deleted=False, batch_size=1000)
+        assert response.status_code == status.HTTP_200_OK
+        assert response.headers["Content-Type"] == "application/x-ndjson"
+        assert "Content-Encoding" not in response.headers
+        lines = response.content.splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0]) == video.model_dump(
+            mode="json",
+            exclude={"is_favorite"},
+        )
+
+    @pytest.mark.usefixtures("mock_anonymous_user", "mock_export")
+    async def test_export_videos_gzip(
+        self: Self,
+        client: AsyncClient,
+    ) -> None:
+        response = await client.get(
+            "/videos/export",
+            headers={"Accept-Encoding": "br;q=1.0, gzip;q=0.5"},
+        )
+
+        assert response.headers["Content-Encoding"] == "gzip"
+        assert len(response.content.splitlines()) == 3
+
+    @pytest.mark.usefixtures("mock_anonymous_user", "mock_export")
+    async def test_export_videos_gzip_refused(
+        self: Self,
+        client: AsyncClient,
+    ) -> None:
+        response = await client.get(
+            "/videos/export",
+            headers={"Accept-Encoding": "*, gzip;q=0"},
+        )
+
+        assert "Content-Encoding" not in response.headers
+
 
 class TestGetVideo:
     @pytest.mark.usefixtures("mock_find_video", "mock_anonymous_user")
@@ -132,6 +560,24 @@ class TestGetVideo:
         response = await client.get(f"/videos/{video.slug}")
 
         assert response.status_code == status.HTTP_200_OK
+        assert "ETag" in response.headers
+
+    @pytest.mark.usefixtures("mock_find_video", "mock_anonymous_user")
+    async def test_get_video_not_modified(
+        self: Self,
+        client: AsyncClient,
+        video: Video,
+    ) -> None:
+        first = await client.get(f"/videos/{video.slug}")
+        await response_cache.clear()
+
+        response = await client.get(
+            f"/videos/{video.slug}",
+            headers={"If-None-Match": first.headers["ETag"]},
+        )
+
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert "X-Cache" not in response.headers
 
     @pytest.mark.usefixtures("mock_find_video", "mock_current_user")
     async def test_get_video_authorized(
@@ -249,6 +695,64 @@ class TestCreateVideo:
         assert response.status_code == status.HTTP_409_CONFLICT
 
 
+class TestImportVideos:
+    @pytest.fixture
+    def data(
+        self: Self,
+        video: Video,
+    ) -> NewVideoDto:
+        return NewVideoDto(
+            title=video.title,
+            date=video.date,
+            yt_id=video.yt_id,
+            yt_thumbnail=video.yt_thumbnail,
+            duration=video.duration,
+            slug=video.slug,
+        )
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_import_videos(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        video: Video,
+        data: NewVideoDto,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.ImportVideosUseCase.execute",
+            return_value=[
+                VideoImportResult(
+                    yt_id=video.yt_id,
+                    status=VideoImportStatus.CREATED,
+                    video=video,
+                ),
+            ],
+        )
+        response = await client.post(
+            "/videos/batch",
+            content=f"[{data.model_dump_json()}]",
+        )
+
+        mocked.assert_awaited_once_with([data])
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()[0]["status"] == "created"
+        assert response.json()[0]["video"]["id"] == video.id
+
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_import_no_videos(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+    ) -> None:
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.ImportVideosUseCase.execute",
+        )
+        response = await client.post("/videos/batch", json=[])
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_CONTENT
+
+
 class TestUpdateVideo:
     @pytest.fixture
     def data(self, video: Video) -> UpdateVideoDto:
@@ -316,6 +820,37 @@ class TestUpdateVideo:
         mocked.assert_awaited_once()
         assert response.status_code == status.HTTP_409_CONFLICT
 
+    @pytest.mark.usefixtures("mock_current_user")
+    async def test_update_video_forbidden(
+        self: Self,
+        client: AsyncClient,
+        mocker: MockerFixture,
+        mock_permission_checks: AsyncMock,
+        video: Video,
+        user: User,
+        data: UpdateVideoDto,
+    ) -> None:
+        mock_permission_checks.check_many.side_effect = None
+        mock_permission_checks.check_many.return_value = [False]
+        mocked = mocker.patch(
+            "edm_su_api.internal.usecase.video.UpdateVideoUseCase.execute",
+        )
+        response = await client.patch(
+            f"/videos/{video.slug}", content=data.model_dump_json()
+        )
+
+        mocked.assert_not_awaited()
+        assert response.status_code == status.HTTP_403_FORBIDDEN
+        mock_permission_checks.check_many.assert_awaited_once_with(
+            [
+                PermissionCheck(
+                    Object("video", video.slug),
+                    "write",
+                    Object("user", user.id),
+                ),
+            ],
+        )
+
 
 class TestRestoreVideo:
     @pytest.mark.usefixtures("mock_current_user", "mock_find_video_including_deleted")
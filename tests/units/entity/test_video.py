@@ -1,12 +1,16 @@
+from itertools import pairwise
+
 import pytest
 from faker import Faker
 from typing_extensions import Self
 
 from edm_su_api.internal.entity.video import (
     DeleteType,
+    DurationBucket,
     NewVideoDto,
     UpdateVideoDto,
     Video,
+    VideoFilter,
 )
 
 
@@ -146,3 +150,17 @@ class TestVideo:
         # Check that deletion fields are included in serialized output
         assert serialized["deleted"] is True
         assert serialized["delete_type"] == DeleteType.TEMPORARY
+
+
+class TestVideoFilter:
+    def test_is_empty(self: Self) -> None:
+        assert VideoFilter().is_empty
+        assert not VideoFilter(is_blocked_in_russia=False).is_empty
+
+    def test_duration_buckets_are_contiguous(self: Self) -> None:
+        bounds = [bucket.bounds for bucket in DurationBucket]
+
+        assert bounds[0][0] is None
+        assert bounds[-1][1] is None
+        for (_, high), (low, _) in pairwise(bounds):
+            assert high == low
@@ -2,6 +2,7 @@ from unittest.mock import AsyncMock
 
 import pytest
 
+from edm_su_api.internal.usecase.repository.cache import AbstractCacheRepository
 from edm_su_api.internal.usecase.repository.permission import (
     AbstractPermissionRepository,
 )
@@ -10,3 +11,8 @@ from edm_su_api.internal.usecase.repository.permission import (
 @pytest.fixture
 def permissions_repo() -> AbstractPermissionRepository:
     return AsyncMock(repr=AbstractPermissionRepository)
+
+
+@pytest.fixture
+def cache_repo() -> AsyncMock:
+    return AsyncMock(spec=AbstractCacheRepository)
@@ -0,0 +1,50 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_mock import MockFixture
+from typing_extensions import Self
+
+from edm_su_api.internal.usecase.counter import ReconcileCountersUseCase
+from edm_su_api.internal.usecase.repository.counter import (
+    VIDEOS_LIVE,
+    AbstractCounterRepository,
+)
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def repository(mocker: MockFixture) -> AsyncMock:
+    return mocker.AsyncMock(spec=AbstractCounterRepository)
+
+
+class TestReconcileCountersUseCase:
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+    ) -> ReconcileCountersUseCase:
+        return ReconcileCountersUseCase(repository)
+
+    async def test_reconcile(
+        self: Self,
+        usecase: ReconcileCountersUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        repository.lock.return_value = True
+        repository.reconcile.return_value = {VIDEOS_LIVE: 2}
+
+        drift = await usecase.execute()
+
+        assert drift == {VIDEOS_LIVE: 2}
+        repository.reconcile.assert_awaited_once()
+
+    async def test_locked_by_another_process(
+        self: Self,
+        usecase: ReconcileCountersUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        repository.lock.return_value = False
+
+        assert await usecase.execute() == {}
+        repository.reconcile.assert_not_awaited()
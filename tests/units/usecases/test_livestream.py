@@ -10,6 +10,7 @@ from edm_su_api.internal.entity.livestreams import (
     CreateLiveStreamDTO,
     LiveStream,
 )
+from edm_su_api.internal.entity.upload import ImageSet
 from edm_su_api.internal.usecase.exceptions.livestream import (
     LiveStreamAlreadyExistsError,
     LiveStreamError,
@@ -25,6 +26,7 @@ from edm_su_api.internal.usecase.livestream import (
 from edm_su_api.internal.usecase.repository.livestream import (
     AbstractLiveStreamRepository,
 )
+from edm_su_api.internal.usecase.repository.upload import AbstractUploadRepository
 
 pytestmark = pytest.mark.anyio
 
@@ -170,6 +172,30 @@ class TestGetLiveStreamUseCase:
 
         repository.get_by_id.assert_awaited_once()
 
+    async def test_attach_image_set(
+        self: Self,
+        livestream: LiveStream,
+        repository: AsyncMock,
+        mocker: MockerFixture,
+    ) -> None:
+        image = ImageSet(
+            key="a.png",
+            url=livestream.image,
+            width=800,
+            height=600,
+            size=1024,
+        )
+        upload_repo = mocker.AsyncMock(spec=AbstractUploadRepository)
+        upload_repo.get_by_urls.return_value = {image.url: image}
+        usecase = GetLiveStreamUseCase(repository, upload_repo=upload_repo)
+
+        result = await usecase.execute(livestream.id)
+
+        assert result.image_set == image
+        assert result.model_dump(exclude={"image_set"}) == livestream.model_dump(
+            exclude={"image_set"},
+        )
+
     async def test_livestream_not_found(
         self: Self,
         usecase: GetLiveStreamUseCase,
@@ -211,6 +237,21 @@ class TestUpdateLiveStreamUseCase:
 
         repository.update.assert_awaited_once()
 
+    async def test_update_livestream_purges_cache(
+        self: Self,
+        repository: AsyncMock,
+        cache_repo: AsyncMock,
+        livestream: LiveStream,
+    ) -> None:
+        usecase = UpdateLiveStreamUseCase(repository, cache_repo=cache_repo)
+
+        await usecase.execute(livestream)
+
+        cache_repo.purge.assert_awaited_once_with(
+            f"livestream:{livestream.id}",
+            "livestreams:list",
+        )
+
     async def test_update_not_existing_livestream(
         self: Self,
         usecase: UpdateLiveStreamUseCase,
@@ -0,0 +1,340 @@
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from faker import Faker
+from pytest_mock import MockFixture
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.outbox import (
+    NewOutboxEvent,
+    OutboxEvent,
+    OutboxOperation,
+    OutboxTopic,
+)
+from edm_su_api.internal.entity.video import Video
+from edm_su_api.internal.usecase.outbox import DrainOutboxUseCase
+from edm_su_api.internal.usecase.repository.cache import (
+    VIDEOS_SEARCH,
+    AbstractCacheRepository,
+)
+from edm_su_api.internal.usecase.repository.outbox import (
+    AbstractOutboxHandler,
+    AbstractOutboxRepository,
+)
+from edm_su_api.internal.usecase.repository.permission import (
+    AbstractPermissionRepository,
+    Object,
+    OutboxPermissionRepository,
+    RelationshipTuple,
+    SpiceDBOutboxHandler,
+)
+from edm_su_api.internal.usecase.repository.video import (
+    AbstractFullTextVideoRepository,
+    MeilisearchVideoOutboxHandler,
+    OutboxFullTextVideoRepository,
+    video_document,
+)
+
+pytestmark = pytest.mark.anyio
+
+VIDEO = Object("video", "sample-video")
+GROUP = Object("group", "admins")
+
+
+def make_event(
+    id_: int,
+    key: str,
+    operation: OutboxOperation,
+    payload: dict,
+    topic: OutboxTopic = OutboxTopic.VIDEO_SEARCH,
+) -> OutboxEvent:
+    return OutboxEvent(
+        id=id_,
+        topic=topic,
+        operation=operation,
+        key=key,
+        payload=payload,
+        created_at=datetime.now(tz=timezone.utc),
+    )
+
+
+@pytest.fixture
+def outbox_repository(mocker: MockFixture) -> AsyncMock:
+    return mocker.AsyncMock(spec=AbstractOutboxRepository)
+
+
+class TestDrainOutboxUseCase:
+    @pytest.fixture
+    def search_handler(self: Self, mocker: MockFixture) -> AsyncMock:
+        handler = mocker.AsyncMock(spec=AbstractOutboxHandler)
+        handler.topic = OutboxTopic.VIDEO_SEARCH
+        return handler
+
+    @pytest.fixture
+    def permissions_handler(self: Self, mocker: MockFixture) -> AsyncMock:
+        handler = mocker.AsyncMock(spec=AbstractOutboxHandler)
+        handler.topic = OutboxTopic.PERMISSIONS
+        return handler
+
+    @pytest.fixture
+    def events(self: Self) -> list[OutboxEvent]:
+        return [
+            make_event(1, "1", OutboxOperation.UPSERT, {"id": 1}),
+            make_event(
+                2, "video:a", OutboxOperation.DELETE, {}, OutboxTopic.PERMISSIONS
+            ),
+            make_event(3, "1", OutboxOperation.DELETE, {}),
+        ]
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        outbox_repository: AsyncMock,
+        search_handler: AsyncMock,
+        permissions_handler: AsyncMock,
+        events: list[OutboxEvent],
+    ) -> DrainOutboxUseCase:
+        outbox_repository.lock.return_value = True
+        outbox_repository.claim.return_value = events
+        outbox_repository.lag.return_value = 1.5
+        return DrainOutboxUseCase(
+            outbox_repository,
+            [search_handler, permissions_handler],
+            batch_size=10,
+            retry_delay=2,
+            max_retry_delay=30,
+        )
+
+    async def test_drain(
+        self: Self,
+        usecase: DrainOutboxUseCase,
+        outbox_repository: AsyncMock,
+        search_handler: AsyncMock,
+        permissions_handler: AsyncMock,
+        events: list[OutboxEvent],
+    ) -> None:
+        result = await usecase.execute()
+
+        assert result.claimed == 3
+        assert result.errors == {}
+        assert result.lag == 1.5
+        outbox_repository.claim.assert_awaited_once_with(10)
+        search_handler.handle.assert_awaited_once_with([events[0], events[2]])
+        permissions_handler.handle.assert_awaited_once_with([events[1]])
+        outbox_repository.delete.assert_awaited_once_with([1, 3, 2])
+        outbox_repository.retry.assert_not_awaited()
+
+    async def test_failed_topic_is_retried(
+        self: Self,
+        usecase: DrainOutboxUseCase,
+        outbox_repository: AsyncMock,
+        search_handler: AsyncMock,
+    ) -> None:
+        search_handler.handle.side_effect = ConnectionError("down")
+
+        result = await usecase.execute()
+
+        assert result.errors == {OutboxTopic.VIDEO_SEARCH: "ConnectionError('down')"}
+        # Event 3 waits for event 1, which has the same key.
+        outbox_repository.retry.assert_awaited_once_with(
+            [1],
+            base_delay=2,
+            max_delay=30,
+        )
+        outbox_repository.delete.assert_awaited_once_with([2])
+        outbox_repository.park.assert_not_awaited()
+
+    async def test_failed_event_is_isolated(
+        self: Self,
+        usecase: DrainOutboxUseCase,
+        outbox_repository: AsyncMock,
+        search_handler: AsyncMock,
+        events: list[OutboxEvent],
+    ) -> None:
+        events[2].key = "3"
+
+        async def handle(batch: list[OutboxEvent]) -> None:
+            if events[0] in batch:
+                msg = "poison"
+                raise ValueError(msg)
+
+        search_handler.handle.side_effect = handle
+
+        result = await usecase.execute()
+
+        assert result.errors == {OutboxTopic.VIDEO_SEARCH: "ValueError('poison')"}
+        outbox_repository.retry.assert_awaited_once_with(
+            [1],
+            base_delay=2,
+            max_delay=30,
+        )
+        outbox_repository.delete.assert_awaited_once_with([3, 2])
+
+    async def test_failed_event_is_parked(
+        self: Self,
+        usecase: DrainOutboxUseCase,
+        outbox_repository: AsyncMock,
+        permissions_handler: AsyncMock,
+        events: list[OutboxEvent],
+    ) -> None:
+        events[1].attempts = 19
+        permissions_handler.handle.side_effect = ValueError("poison")
+
+        result = await usecase.execute()
+
+        assert result.parked == [(events[1], "ValueError('poison')")]
+        outbox_repository.park.assert_awaited_once_with(result.parked)
+        outbox_repository.retry.assert_not_awaited()
+        outbox_repository.delete.assert_awaited_once_with([1, 3])
+
+    async def test_locked_by_another_drainer(
+        self: Self,
+        usecase: DrainOutboxUseCase,
+        outbox_repository: AsyncMock,
+    ) -> None:
+        outbox_repository.lock.return_value = False
+
+        result = await usecase.execute()
+
+        assert result.claimed == 0
+        outbox_repository.claim.assert_not_awaited()
+
+
+class TestOutboxFullTextVideoRepository:
+    @pytest.fixture
+    def repository(
+        self: Self,
+        outbox_repository: AsyncMock,
+        mocker: MockFixture,
+    ) -> OutboxFullTextVideoRepository:
+        search_repo = mocker.AsyncMock(spec=AbstractFullTextVideoRepository)
+        return OutboxFullTextVideoRepository(outbox_repository, search_repo)
+
+    @pytest.fixture
+    def video(self: Self, faker: Faker) -> Video:
+        return Video(
+            id=faker.pyint(min_value=1),
+            slug=faker.pystr(),
+            title=faker.sentence(),
+            date=faker.date_between(start_date="-30d", end_date="today"),
+            yt_id=faker.pystr(),
+            yt_thumbnail=faker.image_url(),
+            duration=faker.pyint(),
+        )
+
+    async def test_create_many_skips_deleted(
+        self: Self,
+        repository: OutboxFullTextVideoRepository,
+        outbox_repository: AsyncMock,
+        video: Video,
+    ) -> None:
+        deleted = video.model_copy(update={"id": video.id + 1, "deleted": True})
+
+        await repository.create_many([video, deleted])
+
+        outbox_repository.add.assert_awaited_once_with(
+            NewOutboxEvent(
+                topic=OutboxTopic.VIDEO_SEARCH,
+                operation=OutboxOperation.UPSERT,
+                key=str(video.id),
+                payload=video_document(video),
+            ),
+        )
+
+    async def test_delete(
+        self: Self,
+        repository: OutboxFullTextVideoRepository,
+        outbox_repository: AsyncMock,
+    ) -> None:
+        await repository.delete(7)
+
+        event = outbox_repository.add.await_args.args[0]
+        assert (event.key, event.operation) == ("7", OutboxOperation.DELETE)
+
+
+class TestMeilisearchVideoOutboxHandler:
+    def test_coalesce(self: Self) -> None:
+        events = [
+            make_event(1, "1", OutboxOperation.UPSERT, {"id": 1, "title": "a"}),
+            make_event(2, "1", OutboxOperation.UPDATE, {"id": 1, "title": "b"}),
+            make_event(3, "2", OutboxOperation.UPDATE, {"id": 2, "title": "c"}),
+            make_event(4, "2", OutboxOperation.UPDATE, {"id": 2, "date": "d"}),
+            make_event(5, "3", OutboxOperation.UPSERT, {"id": 3}),
+            make_event(6, "3", OutboxOperation.DELETE, {}),
+            make_event(7, "3", OutboxOperation.UPDATE, {"id": 3, "title": "e"}),
+            make_event(8, "4", OutboxOperation.DELETE, {}),
+            make_event(9, "4", OutboxOperation.UPSERT, {"id": 4}),
+        ]
+
+        upserts, updates, deletes = MeilisearchVideoOutboxHandler.coalesce(events)
+
+        assert upserts == [{"id": 1, "title": "b"}, {"id": 4}]
+        assert updates == [{"id": 2, "title": "c", "date": "d"}]
+        assert deletes == ["3"]
+
+    async def test_purge_search_cache(self: Self, mocker: MockFixture) -> None:
+        wait = mocker.patch(
+            "edm_su_api.internal.usecase.repository.video.wait_for_task",
+        )
+        client = mocker.MagicMock()
+        index = client.index.return_value
+        index.add_documents = mocker.AsyncMock()
+        cache_repo = mocker.AsyncMock(spec=AbstractCacheRepository)
+        handler = MeilisearchVideoOutboxHandler(client, cache_repo)
+
+        await handler.handle([make_event(1, "1", OutboxOperation.UPSERT, {"id": 1})])
+
+        index.add_documents.assert_awaited_once_with([{"id": 1}])
+        wait.assert_awaited_once()
+        cache_repo.purge.assert_awaited_once_with(VIDEOS_SEARCH)
+
+
+class TestOutboxPermissionRepository:
+    async def test_write_many(
+        self: Self,
+        outbox_repository: AsyncMock,
+    ) -> None:
+        repository = OutboxPermissionRepository(outbox_repository)
+
+        await repository.write_many([RelationshipTuple(VIDEO, "reader", GROUP)])
+
+        event = outbox_repository.add.await_args.args[0]
+        assert event.topic is OutboxTopic.PERMISSIONS
+        assert event.operation is OutboxOperation.UPSERT
+        assert event.key == "video:sample-video"
+
+
+class TestSpiceDBOutboxHandler:
+    async def test_handle(self: Self, mocker: MockFixture) -> None:
+        permissions_repo = mocker.AsyncMock(spec=AbstractPermissionRepository)
+        handler = SpiceDBOutboxHandler(permissions_repo)
+        write = {
+            "resource": list(VIDEO),
+            "relation": "reader",
+            "subject": list(GROUP),
+            "subject_relation": "",
+        }
+        delete = {
+            "resource": list(VIDEO),
+            "relation": "reader",
+            "subject": None,
+            "subject_relation": None,
+        }
+        key = "video:sample-video"
+        topic = OutboxTopic.PERMISSIONS
+        events = [
+            make_event(1, key, OutboxOperation.UPSERT, write, topic),
+            make_event(2, key, OutboxOperation.UPSERT, write, topic),
+            make_event(3, key, OutboxOperation.DELETE, delete, topic),
+            make_event(4, key, OutboxOperation.UPSERT, write, topic),
+        ]
+
+        await handler.handle(events)
+
+        relationship = RelationshipTuple(VIDEO, "reader", GROUP)
+        assert permissions_repo.mock_calls == [
+            mocker.call.write_many([relationship]),
+            mocker.call.delete(VIDEO, "reader", None, None),
+            mocker.call.write_many([relationship]),
+        ]
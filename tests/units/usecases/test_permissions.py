@@ -0,0 +1,183 @@
+from unittest.mock import AsyncMock
+
+import pytest
+from pytest_mock import MockFixture
+from typing_extensions import Self
+
+from edm_su_api.internal.usecase.repository.permission import (
+    AbstractPermissionCheckRepository,
+    AbstractPermissionLookupRepository,
+    CachedPermissionCheckRepository,
+    CachedPermissionLookupRepository,
+    Object,
+    PermissionCheck,
+)
+from edm_su_api.pkg.cache import DecisionCache, TTLCache
+
+pytestmark = pytest.mark.anyio
+
+VIDEO = Object("video", "first")
+CHECK = PermissionCheck(VIDEO, "write", Object("user", "admin"))
+OTHER_CHECK = PermissionCheck(
+    Object("video", "second"), "write", Object("user", "admin")
+)
+
+
+class TestDecisionCache:
+    @pytest.fixture
+    def cache(self: Self) -> DecisionCache[PermissionCheck, Object]:
+        return DecisionCache(max_entries=10, ttl=60, negative_ttl=60)
+
+    def test_get(self: Self, cache: DecisionCache[PermissionCheck, Object]) -> None:
+        cache.set(CHECK, True, asked_at=0)  # noqa: FBT003
+        cache.set(OTHER_CHECK, False, asked_at=0)  # noqa: FBT003
+
+        assert cache.get(CHECK, VIDEO) is True
+        assert cache.get(OTHER_CHECK, OTHER_CHECK.resource) is False
+
+    def test_negative_ttl(self: Self) -> None:
+        cache: DecisionCache[PermissionCheck, Object] = DecisionCache(
+            max_entries=10,
+            ttl=60,
+            negative_ttl=0,
+        )
+        cache.set(CHECK, False, asked_at=0)  # noqa: FBT003
+
+        assert cache.get(CHECK, VIDEO) is None
+
+    def test_answer_replaced(
+        self: Self,
+        cache: DecisionCache[PermissionCheck, Object],
+    ) -> None:
+        cache.set(CHECK, False, asked_at=0)  # noqa: FBT003
+        cache.set(CHECK, True, asked_at=0)  # noqa: FBT003
+
+        assert cache.get(CHECK, VIDEO) is True
+
+    def test_changed(
+        self: Self,
+        cache: DecisionCache[PermissionCheck, Object],
+    ) -> None:
+        cache.set(CHECK, True, asked_at=0)  # noqa: FBT003
+
+        cache.changed(VIDEO, "token")
+
+        assert cache.get(CHECK, VIDEO) is None
+        assert cache.token(VIDEO) == "token"
+        assert cache.token(OTHER_CHECK.resource) is None
+
+
+class TestCachedPermissionCheckRepository:
+    @pytest.fixture
+    def repository(self: Self, mocker: MockFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractPermissionCheckRepository)
+        repository.check_many.side_effect = lambda checks, *_: [
+            check == CHECK for check in checks
+        ]
+        return repository
+
+    @pytest.fixture
+    def decisions(self: Self) -> DecisionCache[PermissionCheck, Object]:
+        return DecisionCache(max_entries=10, ttl=60, negative_ttl=60)
+
+    @pytest.fixture
+    def cached_repository(
+        self: Self,
+        repository: AsyncMock,
+        decisions: DecisionCache[PermissionCheck, Object],
+    ) -> CachedPermissionCheckRepository:
+        return CachedPermissionCheckRepository(repository, decisions)
+
+    async def test_checked_once(
+        self: Self,
+        cached_repository: CachedPermissionCheckRepository,
+        repository: AsyncMock,
+    ) -> None:
+        checks = [CHECK, OTHER_CHECK, CHECK]
+
+        assert await cached_repository.check_many(checks) == [True, False, True]
+        assert await cached_repository.check_many(checks) == [True, False, True]
+
+        repository.check_many.assert_awaited_once_with([CHECK, OTHER_CHECK], set())
+
+    async def test_only_misses_checked(
+        self: Self,
+        cached_repository: CachedPermissionCheckRepository,
+        repository: AsyncMock,
+    ) -> None:
+        await cached_repository.check_many([CHECK])
+
+        await cached_repository.check_many([CHECK, OTHER_CHECK])
+
+        repository.check_many.assert_awaited_with([OTHER_CHECK], set())
+
+    async def test_fresh_after_change(
+        self: Self,
+        cached_repository: CachedPermissionCheckRepository,
+        repository: AsyncMock,
+        decisions: DecisionCache[PermissionCheck, Object],
+    ) -> None:
+        await cached_repository.check_many([CHECK])
+
+        decisions.changed(VIDEO, "token")
+        await cached_repository.check_many([CHECK])
+
+        assert repository.check_many.await_count == 2
+        repository.check_many.assert_awaited_with([CHECK], {"token"})
+
+    async def test_at_least_as_fresh_skips_cache(
+        self: Self,
+        cached_repository: CachedPermissionCheckRepository,
+        repository: AsyncMock,
+    ) -> None:
+        await cached_repository.check_many([CHECK])
+
+        await cached_repository.check_many([CHECK], ["token"])
+
+        repository.check_many.assert_awaited_with([CHECK], {"token"})
+
+
+class TestCachedPermissionLookupRepository:
+    @pytest.fixture
+    def repository(self: Self, mocker: MockFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractPermissionLookupRepository)
+        repository.lookup_resources.return_value = frozenset({"first"})
+        return repository
+
+    @pytest.fixture
+    def cached_repository(
+        self: Self,
+        repository: AsyncMock,
+    ) -> CachedPermissionLookupRepository:
+        return CachedPermissionLookupRepository(
+            repository,
+            TTLCache(max_entries=10, ttl=60),
+        )
+
+    async def test_looked_up_once(
+        self: Self,
+        cached_repository: CachedPermissionLookupRepository,
+        repository: AsyncMock,
+    ) -> None:
+        subject = Object("user", "admin")
+
+        for _ in range(2):
+            resources = await cached_repository.lookup_resources(
+                "video",
+                "read",
+                subject,
+            )
+            assert resources == {"first"}
+
+        repository.lookup_resources.assert_awaited_once_with("video", "read", subject)
+
+    async def test_per_subject(
+        self: Self,
+        cached_repository: CachedPermissionLookupRepository,
+        repository: AsyncMock,
+    ) -> None:
+        await cached_repository.lookup_resources("video", "read", Object("user", "a"))
+        await cached_repository.lookup_resources("video", "read", Object("user", "b"))
+        await cached_repository.lookup_resources("post", "read", Object("user", "b"))
+
+        assert repository.lookup_resources.await_count == 3
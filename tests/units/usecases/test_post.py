@@ -14,6 +14,7 @@ from edm_su_api.internal.entity.post import (
     UpdatePost,
     UpdatePostDTO,
 )
+from edm_su_api.internal.entity.upload import ImageSet
 from edm_su_api.internal.entity.user import User
 from edm_su_api.internal.usecase.exceptions.post import (
     PostNotFoundError,
@@ -30,11 +31,13 @@ from edm_su_api.internal.usecase.post import (
 )
 from edm_su_api.internal.usecase.repository.permission import (
     AbstractPermissionRepository,
+    Object,
 )
 from edm_su_api.internal.usecase.repository.post import (
     AbstractPostHistoryRepository,
     AbstractPostRepository,
 )
+from edm_su_api.internal.usecase.repository.upload import AbstractUploadRepository
 
 pytestmark = pytest.mark.anyio
 
@@ -158,6 +161,31 @@ class TestGetAllPostsUseCase:
 
         repository.get_all.assert_awaited_once()
 
+    async def test_attach_thumbnail_set(
+        self: Self,
+        repository: AsyncMock,
+        mocker: MockFixture,
+        post: Post,
+    ) -> None:
+        post = post.model_copy(update={"thumbnail": "https://static.test/a.png"})
+        other = post.model_copy(update={"id": post.id + 1, "thumbnail": None})
+        repository.get_all.return_value = [post, other]
+        image = ImageSet(
+            key="a.png",
+            url="https://static.test/a.png",
+            width=800,
+            height=600,
+            size=1024,
+        )
+        upload_repo = mocker.AsyncMock(spec=AbstractUploadRepository)
+        upload_repo.get_by_urls.return_value = {image.url: image}
+        usecase = GetAllPostsUseCase(repository, upload_repo=upload_repo)
+
+        posts = await usecase.execute()
+
+        assert [p.thumbnail_set for p in posts] == [image, None]
+        upload_repo.get_by_urls.assert_awaited_once_with({image.url})
+
 
 class TestGetPostBySlugUseCase:
     @pytest.fixture
@@ -239,6 +267,7 @@ class TestDeletePostUseCase:
         usecase: DeletePostUseCase,
         post: Post,
         repository: AsyncMock,
+        permissions_repo: AsyncMock,
     ) -> None:
         repository.get_by_slug.return_value = post
 
@@ -247,6 +276,22 @@ class TestDeletePostUseCase:
         repository.delete.assert_awaited_once_with(post)
 
         repository.get_by_slug.assert_awaited_once_with(post.slug)
+        permissions_repo.delete.assert_awaited_once_with(
+            Object("post", post.slug), "reader"
+        )
+
+    async def test_delete_post_purges_cache(
+        self: Self,
+        repository: AsyncMock,
+        cache_repo: AsyncMock,
+        post: Post,
+    ) -> None:
+        repository.get_by_slug.return_value = post
+        usecase = DeletePostUseCase(repository, cache_repo=cache_repo)
+
+        await usecase.execute(post.slug)
+
+        cache_repo.purge.assert_awaited_once_with(f"post:{post.id}", "posts:list")
 
     async def test_delete_post_with_not_existing_slug(
         self: Self,
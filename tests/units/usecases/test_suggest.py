@@ -0,0 +1,130 @@
+from collections.abc import AsyncIterator
+
+import pytest
+from faker import Faker
+from typing_extensions import Self
+
+from edm_su_api.internal.entity.video import Video, VideoSuggestion, VideoTitle
+from edm_su_api.internal.usecase.repository.suggest import (
+    PrefixIndexVideoSuggestionRepository,
+)
+from edm_su_api.pkg.suggest import PrefixIndex, prefix_terms
+
+pytestmark = pytest.mark.anyio
+
+
+def make_video(faker: Faker, id_: int, title: str) -> Video:
+    return Video(
+        id=id_,
+        title=title,
+        slug=faker.slug(title),
+        date=faker.date_between(start_date="-30d"),
+        yt_id=faker.pystr(),
+        yt_thumbnail=faker.url(),
+        duration=faker.pyint(),
+    )
+
+
+def test_prefix_terms() -> None:
+    assert prefix_terms("Él Café Mix") == {"el-cafe-mix", "cafe-mix", "mix"}
+
+
+class TestPrefixIndexVideoSuggestionRepository:
+    @pytest.fixture
+    def index(self: Self) -> PrefixIndex[VideoSuggestion]:
+        return PrefixIndex(max_items=3)
+
+    @pytest.fixture
+    def repository(
+        self: Self,
+        index: PrefixIndex[VideoSuggestion],
+    ) -> PrefixIndexVideoSuggestionRepository:
+        return PrefixIndexVideoSuggestionRepository(index)
+
+    @pytest.fixture
+    def videos(self: Self, faker: Faker) -> list[Video]:
+        return [
+            make_video(faker, 1, "Armin van Buuren Live"),
+            make_video(faker, 2, "Above & Beyond Live"),
+            make_video(faker, 3, "Café del Mar"),
+        ]
+
+    async def test_search(
+        self: Self,
+        repository: PrefixIndexVideoSuggestionRepository,
+        videos: list[Video],
+    ) -> None:
+        await repository.add(*videos)
+
+        found = await repository.search("LIVE")
+        assert [suggestion.title for suggestion in found] == [
+            "Armin van Buuren Live",
+            "Above & Beyond Live",
+        ]
+        assert [s.slug for s in await repository.search("cafe")] == [videos[2].slug]
+        assert await repository.search("a", limit=1) == [
+            VideoSuggestion(title=videos[1].title, slug=videos[1].slug),
+        ]
+        assert await repository.search("-") == []
+
+    async def test_add_replaces_video(
+        self: Self,
+        repository: PrefixIndexVideoSuggestionRepository,
+        videos: list[Video],
+    ) -> None:
+        await repository.add(videos[0])
+        await repository.add(
+            videos[0].model_copy(update={"title": "Renamed", "slug": "renamed"}),
+        )
+
+        assert await repository.search("armin") == []
+        assert [s.title for s in await repository.search("ren")] == ["Renamed"]
+
+    async def test_remove(
+        self: Self,
+        repository: PrefixIndexVideoSuggestionRepository,
+        index: PrefixIndex[VideoSuggestion],
+        videos: list[Video],
+    ) -> None:
+        await repository.add(*videos)
+        await repository.remove(videos[0].id, 100)
+
+        assert [s.title for s in await repository.search("live")] == [videos[1].title]
+        assert len(index) == 2
+
+    async def test_evicts_oldest(
+        self: Self,
+        repository: PrefixIndexVideoSuggestionRepository,
+        index: PrefixIndex[VideoSuggestion],
+        videos: list[Video],
+        faker: Faker,
+    ) -> None:
+        await repository.add(*videos, make_video(faker, 4, "Live at Ultra"))
+
+        assert len(index) == 3
+        assert [s.title for s in await repository.search("live")] == [
+            "Above & Beyond Live",
+            "Live at Ultra",
+        ]
+
+    async def test_replace(
+        self: Self,
+        repository: PrefixIndexVideoSuggestionRepository,
+        index: PrefixIndex[VideoSuggestion],
+        videos: list[Video],
+        faker: Faker,
+    ) -> None:
+        await repository.add(videos[0])
+
+        async def batches() -> AsyncIterator[list[VideoTitle]]:
+            for video in [*videos[1:], make_video(faker, 4, "Cafe Live")]:
+                yield [VideoTitle(id=video.id, title=video.title, slug=video.slug)]
+
+        await repository.replace(batches())
+
+        assert len(index) == 3
+        assert await repository.search("armin") == []
+        assert [s.title for s in await repository.search("caf")] == [
+            "Café del Mar",
+            "Cafe Live",
+        ]
@@ -0,0 +1,216 @@
+import multiprocessing
+from collections.abc import Iterator
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from io import BytesIO
+
+import pytest
+from faker import Faker
+from PIL import Image
+from pytest_mock import MockFixture
+from typing_extensions import Self, override
+
+from edm_su_api.internal.entity.video import ThumbnailVariant, Video, VideoThumbnails
+from edm_su_api.internal.usecase.repository.thumbnail import (
+    AbstractThumbnailSourceRepository,
+    AbstractThumbnailStorageRepository,
+    ExecutorThumbnailRenderer,
+)
+from edm_su_api.internal.usecase.repository.video import (
+    AbstractFullTextVideoRepository,
+    AbstractVideoRepository,
+)
+from edm_su_api.internal.usecase.video import (
+    MirrorVideoThumbnailsUseCase,
+    SaveVideoThumbnailsUseCase,
+)
+from edm_su_api.pkg.thumbnails import render_thumbnails
+
+pytestmark = pytest.mark.anyio
+
+
+def make_image(width: int = 480, height: int = 360) -> bytes:
+    buffer = BytesIO()
+    Image.new("RGB", (width, height), (200, 30, 30)).save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+
+class LocalThumbnailSource(AbstractThumbnailSourceRepository):
+    """Serves generated images instead of downloading from YouTube."""
+
+    def __init__(self: Self, missing: set[str]) -> None:
+        self.missing = missing
+
+    @override
+    async def fetch(self: Self, url: str) -> bytes:
+        if url in self.missing:
+            raise FileNotFoundError(url)
+        return make_image()
+
+
+class MemoryThumbnailStorage(AbstractThumbnailStorageRepository):
+    def __init__(self: Self) -> None:
+        self.files: dict[str, bytes] = {}
+
+    @override
+    async def save(self: Self, key: str, data: bytes, content_type: str) -> str:
+        self.files[key] = data
+        return f"https://static.test/{key}"
+
+
+def test_render_thumbnails() -> None:
+    rendered = render_thumbnails(make_image(), widths=(320, 640, 1280))
+
+    assert [(v.width, v.height) for v in rendered.variants] == [(320, 240), (480, 360)]
+    for variant in rendered.variants:
+        with Image.open(BytesIO(variant.data)) as image:
+            assert image.format == "WEBP"
+    assert rendered.placeholder.startswith("data:image/webp;base64,")
+
+
+class TestMirrorVideoThumbnailsUseCase:
+    @pytest.fixture
+    def videos(self: Self, faker: Faker) -> list[Video]:
+        return [
+            Video(
+                id=id_,
+                title=faker.word(),
+                slug=faker.slug(),
+                date=faker.date_object(),
+                yt_id=faker.pystr(),
+                yt_thumbnail=f"https://i.ytimg.test/{id_}.jpg",
+                duration=faker.pyint(),
+            )
+            for id_ in (3, 5)
+        ]
+
+    @pytest.fixture
+    def storage(self: Self) -> MemoryThumbnailStorage:
+        return MemoryThumbnailStorage()
+
+    @pytest.fixture
+    def executor(self: Self) -> Iterator[Executor]:
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            yield executor
+
+    def usecase(
+        self: Self,
+        storage: MemoryThumbnailStorage,
+        executor: Executor,
+        missing: set[str] | None = None,
+    ) -> MirrorVideoThumbnailsUseCase:
+        return MirrorVideoThumbnailsUseCase(
+            LocalThumbnailSource(missing or set()),
+            storage,
+            ExecutorThumbnailRenderer(executor, widths=(320, 640)),
+            concurrency=2,
+        )
+
+    async def test_mirror(
+        self: Self,
+        videos: list[Video],
+        storage: MemoryThumbnailStorage,
+        executor: Executor,
+    ) -> None:
+        usecase = self.usecase(storage, executor)
+
+        result = await usecase.execute(videos)
+
+        assert result.last_id == 5
+        assert result.mirrored == [3, 5]
+        assert not result.failed
+        assert set(storage.files) == {
+            "thumbnails/3/320.webp",
+            "thumbnails/3/480.webp",
+            "thumbnails/5/320.webp",
+            "thumbnails/5/480.webp",
+        }
+        assert [variant.url for variant in result.thumbnails[3].variants] == [
+            "https://static.test/thumbnails/3/320.webp",
+            "https://static.test/thumbnails/3/480.webp",
+        ]
+
+    async def test_skip_failed(
+        self: Self,
+        videos: list[Video],
+        storage: MemoryThumbnailStorage,
+        executor: Executor,
+    ) -> None:
+        usecase = self.usecase(
+            storage,
+            executor,
+            missing={"https://i.ytimg.test/3.jpg"},
+        )
+
+        result = await usecase.execute(videos)
+
+        assert result.mirrored == [5]
+        assert result.failed == [3]
+        assert set(result.thumbnails) == {5}
+
+    async def test_nothing_to_mirror(
+        self: Self,
+        storage: MemoryThumbnailStorage,
+        executor: Executor,
+    ) -> None:
+        usecase = self.usecase(storage, executor)
+
+        result = await usecase.execute([])
+
+        assert result.last_id is None
+        assert not result.thumbnails
+
+    async def test_render_in_process_pool(
+        self: Self,
+        videos: list[Video],
+        storage: MemoryThumbnailStorage,
+    ) -> None:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            usecase = self.usecase(storage, executor)
+
+            result = await usecase.execute(videos)
+
+        assert result.mirrored == [3, 5]
+
+
+class TestSaveVideoThumbnailsUseCase:
+    @pytest.fixture
+    def thumbnails(self: Self) -> dict[int, VideoThumbnails]:
+        return {
+            3: VideoThumbnails(
+                variants=[
+                    ThumbnailVariant(
+                        width=320,
+                        height=240,
+                        url="https://static.test/thumbnails/3/320.webp",
+                    ),
+                ],
+                placeholder="data:image/webp;base64,",
+            ),
+        }
+
+    async def test_save(
+        self: Self,
+        mocker: MockFixture,
+        thumbnails: dict[int, VideoThumbnails],
+    ) -> None:
+        repository = mocker.AsyncMock(spec=AbstractVideoRepository)
+        full_text_repo = mocker.AsyncMock(spec=AbstractFullTextVideoRepository)
+        usecase = SaveVideoThumbnailsUseCase(repository, full_text_repo)
+
+        await usecase.execute(thumbnails)
+
+        repository.set_thumbnails.assert_awaited_once_with(thumbnails)
+        full_text_repo.create_many.assert_awaited_once_with(
+            repository.set_thumbnails.return_value,
+        )
+
+    async def test_save_nothing(self: Self, mocker: MockFixture) -> None:
+        repository = mocker.AsyncMock(spec=AbstractVideoRepository)
+        full_text_repo = mocker.AsyncMock(spec=AbstractFullTextVideoRepository)
+        usecase = SaveVideoThumbnailsUseCase(repository, full_text_repo)
+
+        await usecase.execute({})
+
+        repository.set_thumbnails.assert_not_awaited()
+        full_text_repo.create_many.assert_not_awaited()
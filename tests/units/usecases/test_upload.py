@@ -1,13 +1,38 @@
+from collections.abc import AsyncIterator, Iterator
+from concurrent.futures import Executor, ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
 from unittest.mock import AsyncMock
 
 import pytest
-from typing_extensions import Self
+from PIL import Image
+from pytest_mock import MockFixture
+from typing_extensions import Self, override
 
+from edm_su_api.internal.entity.upload import (
+    CompletedPart,
+    PendingMultipartUpload,
+    UploadPart,
+)
+from edm_su_api.internal.usecase.exceptions.upload import (
+    UploadNotFoundError,
+    UploadNotImageError,
+    UploadTooLargeError,
+)
 from edm_su_api.internal.usecase.repository.upload import (
+    AbstractMultipartUploadRepository,
     AbstractPreSignedUploadRepository,
+    AbstractUploadObjectRepository,
+    AbstractUploadRepository,
+    ExecutorImageRenderer,
 )
 from edm_su_api.internal.usecase.upload import (
+    AbortStaleMultipartUploadsUseCase,
+    CompleteImageUploadUseCase,
+    CompleteMultipartUploadUseCase,
+    CreateMultipartUploadUseCase,
     GeneratePreSignedUploadUseCase,
+    GenerateUploadPartUrlsUseCase,
 )
 
 pytestmark = pytest.mark.anyio
@@ -40,3 +65,221 @@ class TestGeneratePreSignedUploadUseCase:
 
         assert result == expected_url
         repository.generate.assert_awaited_once_with(key, expires_in)
+
+
+def make_image(width: int = 800, height: int = 600, mode: str = "RGB") -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (30, 30, 200, 128)).save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class MemoryUploadObjectRepository(AbstractUploadObjectRepository):
+    def __init__(self: Self, files: dict[str, bytes]) -> None:
+        self.files = files
+
+    @override
+    async def get(self: Self, key: str, max_size: int) -> bytes:
+        if key not in self.files:
+            raise UploadNotFoundError(key)
+        if len(self.files[key]) > max_size:
+            raise UploadTooLargeError(key, max_size)
+        return self.files[key]
+
+    @override
+    async def put(self: Self, key: str, data: bytes, content_type: str) -> str:
+        self.files[key] = data
+        return self.url(key)
+
+    @override
+    def url(self: Self, key: str) -> str:
+        return f"https://static.test/{key}"
+
+
+class TestCompleteImageUploadUseCase:
+    @pytest.fixture
+    def repository(self: Self, mocker: MockFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractUploadRepository)
+        repository.save.side_effect = lambda image, _: image
+        return repository
+
+    @pytest.fixture
+    def object_repo(self: Self) -> MemoryUploadObjectRepository:
+        return MemoryUploadObjectRepository({"posts/cover.png": make_image()})
+
+    @pytest.fixture
+    def executor(self: Self) -> Iterator[Executor]:
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            yield executor
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+        object_repo: MemoryUploadObjectRepository,
+        executor: Executor,
+    ) -> CompleteImageUploadUseCase:
+        return CompleteImageUploadUseCase(
+            repository,
+            object_repo,
+            ExecutorImageRenderer(executor, widths=(320, 1280), formats=("webp",)),
+            max_size=1024 * 1024,
+            max_pixels=1_000_000,
+        )
+
+    async def test_complete(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        repository: AsyncMock,
+        object_repo: MemoryUploadObjectRepository,
+    ) -> None:
+        image = await usecase.execute("posts/cover.png", "user-id")
+
+        assert (image.url, image.width, image.height) == (
+            "https://static.test/posts/cover.png",
+            800,
+            600,
+        )
+        assert image.size == len(object_repo.files["posts/cover.png"])
+        assert [(v.url, v.width, v.height) for v in image.variants] == [
+            ("https://static.test/posts/cover/320.webp", 320, 240),
+            ("https://static.test/posts/cover/800.webp", 800, 600),
+        ]
+        for variant in image.variants:
+            key = variant.url.removeprefix("https://static.test/")
+            assert variant.size == len(object_repo.files[key])
+        repository.save.assert_awaited_once_with(image, "user-id")
+
+    async def test_not_found(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        with pytest.raises(UploadNotFoundError):
+            await usecase.execute("posts/missing.png", "user-id")
+
+        repository.save.assert_not_awaited()
+
+    async def test_too_large(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        object_repo: MemoryUploadObjectRepository,
+    ) -> None:
+        object_repo.files["posts/huge.png"] = bytes(2 * 1024 * 1024)
+
+        with pytest.raises(UploadTooLargeError):
+            await usecase.execute("posts/huge.png", "user-id")
+
+    async def test_too_many_pixels(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        repository: AsyncMock,
+        object_repo: MemoryUploadObjectRepository,
+    ) -> None:
+        object_repo.files["posts/bomb.png"] = make_image(2000, 1000)
+
+        with pytest.raises(UploadTooLargeError, match="1000000 pixels"):
+            await usecase.execute("posts/bomb.png", "user-id")
+
+        repository.save.assert_not_awaited()
+
+    async def test_keep_alpha(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        object_repo: MemoryUploadObjectRepository,
+    ) -> None:
+        object_repo.files["posts/logo.png"] = make_image(mode="RGBA")
+
+        image = await usecase.execute("posts/logo.png", "user-id")
+
+        for variant in image.variants:
+            key = variant.url.removeprefix("https://static.test/")
+            with Image.open(BytesIO(object_repo.files[key])) as decoded:
+                assert decoded.mode == "RGBA"
+
+    async def test_not_image(
+        self: Self,
+        usecase: CompleteImageUploadUseCase,
+        object_repo: MemoryUploadObjectRepository,
+    ) -> None:
+        object_repo.files["posts/notes.png"] = b"not an image"
+
+        with pytest.raises(UploadNotImageError):
+            await usecase.execute("posts/notes.png", "user-id")
+
+
+class TestMultipartUploadUseCases:
+    @pytest.fixture
+    def repository(self: Self, mocker: MockFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractMultipartUploadRepository)
+        repository.create.return_value = "upload-id"
+        repository.generate_part_urls.side_effect = (
+            lambda key, upload_id, part_numbers, expires_in: [
+                UploadPart(part_number=n, url=f"https://s3.test/{key}?part={n}")
+                for n in part_numbers
+            ]
+        )
+        return repository
+
+    async def test_create(self: Self, repository: AsyncMock) -> None:
+        usecase = CreateMultipartUploadUseCase(repository)
+
+        upload = await usecase.execute("mixes/pack.zip", 3, "application/zip", 600)
+
+        assert upload.upload_id == "upload-id"
+        assert [part.part_number for part in upload.parts] == [1, 2, 3]
+        repository.create.assert_awaited_once_with("mixes/pack.zip", "application/zip")
+
+    async def test_generate_part_urls(self: Self, repository: AsyncMock) -> None:
+        usecase = GenerateUploadPartUrlsUseCase(repository)
+
+        parts = await usecase.execute("mixes/pack.zip", "upload-id", [3, 1, 3])
+
+        assert [part.part_number for part in parts] == [1, 3]
+
+    async def test_complete_sorts_parts(self: Self, repository: AsyncMock) -> None:
+        repository.complete.return_value = "https://static.test/mixes/pack.zip"
+        usecase = CompleteMultipartUploadUseCase(repository)
+        parts = [
+            CompletedPart(part_number=2, etag='"b"'),
+            CompletedPart(part_number=1, etag='"a"'),
+        ]
+
+        url = await usecase.execute("mixes/pack.zip", "upload-id", parts)
+
+        assert url == "https://static.test/mixes/pack.zip"
+        repository.complete.assert_awaited_once_with(
+            "mixes/pack.zip",
+            "upload-id",
+            [parts[1], parts[0]],
+        )
+
+    async def test_abort_stale(self: Self, repository: AsyncMock) -> None:
+        now = datetime(2026, 10, 18, tzinfo=timezone.utc)
+        pending = [
+            PendingMultipartUpload(
+                key=key,
+                upload_id=key,
+                initiated=now - timedelta(hours=hours),
+            )
+            for key, hours in (("fresh", 1), ("stale", 30), ("gone", 48))
+        ]
+
+        async def get_pending() -> AsyncIterator[PendingMultipartUpload]:
+            for upload in pending:
+                yield upload
+
+        async def abort(key: str, _: str) -> None:
+            if key == "gone":
+                raise UploadNotFoundError(key)
+
+        repository.get_pending = get_pending
+        repository.abort.side_effect = abort
+        usecase = AbortStaleMultipartUploadsUseCase(repository)
+
+        aborted = await usecase.execute(timedelta(days=1), now=now)
+
+        assert aborted == [pending[1]]
+        assert [call.args for call in repository.abort.await_args_list] == [
+            ("stale", "stale"),
+            ("gone", "gone"),
+        ]
@@ -13,12 +13,14 @@ from edm_su_api.internal.usecase.exceptions.user_videos import (
 )
 from edm_su_api.internal.usecase.repository.user_videos import (
     AbstractUserVideosRepository,
+    CachedUserVideosRepository,
 )
 from edm_su_api.internal.usecase.user_videos import (
     GetUserVideosUseCase,
     LikeVideoUseCase,
     UnlikeVideoUseCase,
 )
+from edm_su_api.pkg.cache import TTLCache
 
 pytestmark = pytest.mark.anyio
 
@@ -163,3 +165,45 @@ class TestUnlikeVideoUseCase:
 
         repository.is_liked.assert_awaited_once_with(user, video)
         repository.unlike_video.assert_not_awaited()
+
+
+class TestCachedUserVideosRepository:
+    @pytest.fixture
+    def cached_repository(
+        self: Self,
+        repository: AsyncMock,
+    ) -> CachedUserVideosRepository:
+        return CachedUserVideosRepository(
+            repository,
+            TTLCache(max_entries=10, ttl=60),
+        )
+
+    async def test_liked_ids_are_loaded_once(
+        self: Self,
+        cached_repository: CachedUserVideosRepository,
+        repository: AsyncMock,
+    ) -> None:
+        repository.get_liked_video_ids.return_value = {1, 2}
+
+        assert await cached_repository.get_liked_video_ids("user", [1, 3]) == {1}
+        assert await cached_repository.get_liked_video_ids("user", [2]) == {2}
+
+        repository.get_liked_video_ids.assert_awaited_once_with("user")
+
+    async def test_like_drops_cached_ids(
+        self: Self,
+        cached_repository: CachedUserVideosRepository,
+        repository: AsyncMock,
+        user: User,
+        video: Video,
+    ) -> None:
+        repository.get_liked_video_ids.return_value = set()
+        await cached_repository.get_liked_video_ids(user.id, [video.id])
+
+        await cached_repository.like_video(user, video)
+        repository.get_liked_video_ids.return_value = {video.id}
+
+        assert await cached_repository.get_liked_video_ids(user.id, [video.id]) == {
+            video.id
+        }
+        repository.like_video.assert_awaited_once_with(user, video)
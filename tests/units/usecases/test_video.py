@@ -1,4 +1,9 @@
-from unittest.mock import AsyncMock
+import re
+from collections import Counter
+from collections.abc import AsyncIterator
+from types import SimpleNamespace
+from typing import Any, ClassVar
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from faker import Faker
@@ -6,25 +11,61 @@ from pytest_mock import MockFixture
 from pytest_mock.plugin import MockType
 from typing_extensions import Self
 
-from edm_su_api.internal.entity.video import DeleteType, NewVideoDto, UpdateVideoDto
+from edm_su_api.internal.entity.video import (
+    DeleteType,
+    DurationBucket,
+    NewVideoDto,
+    UpdateVideoDto,
+    VideoFilter,
+    VideoImportStatus,
+    VideoSearchHit,
+    VideoSearchPage,
+    VideoSort,
+    VideoSuggestion,
+)
 from edm_su_api.internal.usecase.exceptions.video import (
     VideoAlreadyDeletedError,
     VideoNotDeletedError,
     VideoNotFoundError,
+    VideoSlugNotUniqueError,
     VideoYtIdNotUniqueError,
 )
-from edm_su_api.internal.usecase.repository.permission import Object
+from edm_su_api.internal.usecase.repository.outbox import AbstractOutboxRepository
+from edm_su_api.internal.usecase.repository.permission import (
+    Object,
+    RelationshipTuple,
+)
+from edm_su_api.internal.usecase.repository.suggest import (
+    AbstractVideoSuggestionRepository,
+)
+from edm_su_api.internal.usecase.repository.user_videos import (
+    AbstractUserVideosRepository,
+)
 from edm_su_api.internal.usecase.repository.video import (
     AbstractFullTextVideoRepository,
+    AbstractVideoIndexStateRepository,
+    AbstractVideoReindexRepository,
     AbstractVideoRepository,
+    MeilisearchVideoIndexStateRepository,
+    highlight_html,
+    version_counts_fingerprint,
 )
 from edm_su_api.internal.usecase.video import (
     CreateVideoUseCase,
     DeleteVideoUseCase,
+    ExportVideosUseCase,
     GetAllVideosUseCase,
     GetCountVideosUseCase,
     GetVideoBySlugUseCase,
+    GetVideoListVersionUseCase,
+    ImportVideosUseCase,
+    PurgeDeletedVideosUseCase,
+    RebuildVideoSuggestionsUseCase,
+    ReconcileSearchIndexUseCase,
+    ReindexVideosUseCase,
     RestoreVideoUseCase,
+    SearchVideosUseCase,
+    SuggestVideosUseCase,
     UpdateVideoUseCase,
     Video,
 )
@@ -32,6 +73,14 @@ from edm_su_api.internal.usecase.video import (
 pytestmark = pytest.mark.anyio
 
 
+def test_highlight_html() -> None:
+    formatted = "\ue000Daft\ue001 <script>alert(1)</script> & \ue000Punk\ue001"
+
+    assert highlight_html(formatted) == (
+        "<em>Daft</em> &lt;script&gt;alert(1)&lt;/script&gt; &amp; <em>Punk</em>"
+    )
+
+
 @pytest.fixture
 def repository(mocker: MockFixture) -> AsyncMock:
     return mocker.AsyncMock(spec=AbstractVideoRepository)
@@ -47,6 +96,16 @@ def permissions_repo(mocker: MockFixture) -> AsyncMock:
     return mocker.AsyncMock()
 
 
+@pytest.fixture
+def suggest_repo(mocker: MockFixture) -> AsyncMock:
+    return mocker.AsyncMock(spec=AbstractVideoSuggestionRepository)
+
+
+@pytest.fixture
+def user_videos_repository(mocker: MockFixture) -> AsyncMock:
+    return mocker.AsyncMock(spec=AbstractUserVideosRepository)
+
+
 @pytest.fixture
 def video(faker: Faker) -> Video:
     return Video(
@@ -76,8 +135,9 @@ class TestGetAllVideosUseCase:
     def usecase(
         self: Self,
         repository: AsyncMock,
+        user_videos_repository: AsyncMock,
     ) -> GetAllVideosUseCase:
-        return GetAllVideosUseCase(repository)
+        return GetAllVideosUseCase(repository, user_videos_repository)
 
     async def test_get_all_videos(
         self: Self,
@@ -89,29 +149,50 @@ class TestGetAllVideosUseCase:
         assert len(videos) == 1
 
         repository.get_all.assert_awaited_once_with(
-            offset=0, limit=20, include_deleted=False
+            offset=0,
+            limit=20,
+            include_deleted=False,
+            after_id=None,
+            filters=None,
+            sort=VideoSort.NEWEST,
         )
 
     async def test_get_all_videos_with_user_id(
         self: Self,
         usecase: GetAllVideosUseCase,
         repository: AsyncMock,
+        user_videos_repository: AsyncMock,
         video: Video,
     ) -> None:
         """Test getting all videos with user_id parameter."""
-        repository.get_all_with_favorite_mark.return_value = [video]
+        user_videos_repository.get_liked_video_ids.return_value = {video.id}
 
         videos = await usecase.execute(user_id="test_user_id")
-        assert videos is not None
-        assert len(videos) == 1
+        assert videos == [video]
+        assert videos[0].is_favorite is True
 
-        repository.get_all_with_favorite_mark.assert_awaited_once_with(
-            "test_user_id",
-            0,
-            20,
+        repository.get_all.assert_awaited_once_with(
+            offset=0,
+            limit=20,
             include_deleted=False,
+            after_id=None,
+            filters=None,
+            sort=VideoSort.NEWEST,
+        )
+        user_videos_repository.get_liked_video_ids.assert_awaited_once_with(
+            "test_user_id",
+            [video.id],
         )
 
+    async def test_get_all_videos_anonymous_skips_likes(
+        self: Self,
+        usecase: GetAllVideosUseCase,
+        user_videos_repository: AsyncMock,
+    ) -> None:
+        await usecase.execute()
+
+        user_videos_repository.get_liked_video_ids.assert_not_awaited()
+
     async def test_get_all_videos_with_include_deleted(
         self: Self,
         usecase: GetAllVideosUseCase,
@@ -123,29 +204,135 @@ class TestGetAllVideosUseCase:
         assert len(videos) == 1
 
         repository.get_all.assert_awaited_once_with(
-            offset=0, limit=20, include_deleted=True
+            offset=0,
+            limit=20,
+            include_deleted=True,
+            after_id=None,
+            filters=None,
+            sort=VideoSort.NEWEST,
         )
 
     async def test_get_all_videos_with_user_id_and_include_deleted(
         self: Self,
         usecase: GetAllVideosUseCase,
         repository: AsyncMock,
-        video: Video,
+        user_videos_repository: AsyncMock,
     ) -> None:
         """Test getting all videos with user_id and include_deleted parameters."""
-        repository.get_all_with_favorite_mark.return_value = [video]
+        user_videos_repository.get_liked_video_ids.return_value = set()
 
         videos = await usecase.execute(user_id="test_user_id", include_deleted=True)
         assert videos is not None
         assert len(videos) == 1
+        assert videos[0].is_favorite is False
 
-        repository.get_all_with_favorite_mark.assert_awaited_once_with(
-            "test_user_id",
-            0,
-            20,
+        repository.get_all.assert_awaited_once_with(
+            offset=0,
+            limit=20,
             include_deleted=True,
+            after_id=None,
+            filters=None,
+            sort=VideoSort.NEWEST,
         )
 
+    async def test_get_all_videos_after_id(
+        self: Self,
+        usecase: GetAllVideosUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        """Test getting a keyset page of videos."""
+        videos = await usecase.execute(limit=10, after_id=100)
+        assert len(videos) == 1
+
+        repository.get_all.assert_awaited_once_with(
+            offset=0,
+            limit=10,
+            include_deleted=False,
+            after_id=100,
+            filters=None,
+            sort=VideoSort.NEWEST,
+        )
+
+
+class TestSearchVideosUseCase:
+    @pytest.fixture
+    def videos(self: Self, video: Video) -> list[Video]:
+        return [
+            video.model_copy(update={"id": 1}),
+            video.model_copy(update={"id": 2}),
+        ]
+
+    @pytest.fixture(autouse=True)
+    def mock(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        user_videos_repository: AsyncMock,
+        videos: list[Video],
+    ) -> None:
+        full_text_repository.search.return_value = VideoSearchPage(
+            hits=[
+                VideoSearchHit(id=2, highlights={"title": "<em>two</em>"}),
+                VideoSearchHit(id=1),
+            ],
+            total=10,
+        )
+        repository.get_by_ids.return_value = [videos[1], videos[0]]
+        user_videos_repository.get_liked_video_ids.return_value = {1}
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        user_videos_repository: AsyncMock,
+    ) -> SearchVideosUseCase:
+        return SearchVideosUseCase(
+            repository,
+            full_text_repository,
+            user_videos_repository,
+        )
+
+    async def test_search_videos(
+        self: Self,
+        usecase: SearchVideosUseCase,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        user_videos_repository: AsyncMock,
+    ) -> None:
+        found, total = await usecase.execute(
+            "two",
+            limit=2,
+            duration=DurationBucket.LONG,
+        )
+
+        full_text_repository.search.assert_awaited_once_with(
+            "two",
+            offset=0,
+            limit=2,
+            duration=DurationBucket.LONG,
+            sort=None,
+        )
+        repository.get_by_ids.assert_awaited_once_with([2, 1])
+        user_videos_repository.get_liked_video_ids.assert_not_awaited()
+        assert total == 10
+        assert [video.id for video in found] == [2, 1]
+        assert found[0].highlights == {"title": "<em>two</em>"}
+        assert found[1].highlights == {}
+
+    async def test_search_videos_with_user_id(
+        self: Self,
+        usecase: SearchVideosUseCase,
+        user_videos_repository: AsyncMock,
+    ) -> None:
+        found, _ = await usecase.execute("two", user_id="user")
+
+        user_videos_repository.get_liked_video_ids.assert_awaited_once_with(
+            "user",
+            [2, 1],
+        )
+        assert [video.is_favorite for video in found] == [False, True]
+
 
 class TestGetCountVideosUseCase:
     @pytest.fixture(autouse=True)
@@ -170,9 +357,274 @@ class TestGetCountVideosUseCase:
         count = await usecase.execute()
         assert count == 1
 
+    async def test_get_count_videos_with_filters(
+        self: Self,
+        usecase: GetCountVideosUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        filters = VideoFilter(duration=DurationBucket.SHORT)
+        await usecase.execute(include_deleted=True, filters=filters)
+
+        repository.count.assert_awaited_once_with(
+            include_deleted=True,
+            filters=filters,
+        )
+
         repository.count.assert_awaited_once()
 
 
+class TestExportVideosUseCase:
+    async def test_export_videos(
+        self: Self,
+        repository: MagicMock,
+        video: Video,
+    ) -> None:
+        async def stream_all(
+            *,
+            include_deleted: bool,
+            batch_size: int,
+        ) -> AsyncIterator[list[Video]]:
+            assert include_deleted
+            assert batch_size == 2
+            yield [video]
+
+        repository.stream_all = stream_all
+        usecase = ExportVideosUseCase(repository)
+
+        batches = [
+            batch async for batch in usecase.execute(include_deleted=True, batch_size=2)
+        ]
+
+        assert batches == [[video]]
+
+
+class TestSuggestVideosUseCase:
+    async def test_suggest_videos(
+        self: Self,
+        suggest_repo: AsyncMock,
+        video: Video,
+    ) -> None:
+        suggestion = VideoSuggestion(title=video.title, slug=video.slug)
+        suggest_repo.search.return_value = [suggestion]
+        usecase = SuggestVideosUseCase(suggest_repo)
+
+        assert await usecase.execute("sam", 5) == [suggestion]
+        suggest_repo.search.assert_awaited_once_with("sam", 5)
+
+
+class TestRebuildVideoSuggestionsUseCase:
+    async def test_rebuild_video_suggestions(
+        self: Self,
+        mocker: MockFixture,
+        repository: MagicMock,
+        suggest_repo: AsyncMock,
+    ) -> None:
+        batches = mocker.MagicMock()
+        repository.stream_titles = mocker.MagicMock(return_value=batches)
+        usecase = RebuildVideoSuggestionsUseCase(repository, suggest_repo=suggest_repo)
+
+        await usecase.execute(batch_size=2)
+
+        # Passed on unread: the index reads the batches one at a time.
+        repository.stream_titles.assert_called_once_with(batch_size=2)
+        suggest_repo.replace.assert_awaited_once_with(batches)
+
+
+class TestReindexVideosUseCase:
+    async def test_reindex_videos(
+        self: Self,
+        repository: MagicMock,
+        mocker: MockFixture,
+    ) -> None:
+        batches = mocker.sentinel.batches
+        repository.stream_all = mocker.MagicMock(return_value=batches)
+        reindex_repo = mocker.AsyncMock(spec=AbstractVideoReindexRepository)
+        reindex_repo.rebuild.return_value = 1
+        usecase = ReindexVideosUseCase(repository, reindex_repo)
+
+        assert await usecase.execute(batch_size=50) == 1
+        repository.stream_all.assert_called_once_with(batch_size=50)
+        reindex_repo.rebuild.assert_awaited_once_with(batches)
+
+
+class TestPurgeDeletedVideosUseCase:
+    async def test_purge(self: Self, repository: MagicMock) -> None:
+        repository.purge.return_value = [1, 2]
+        usecase = PurgeDeletedVideosUseCase(repository)
+
+        assert await usecase.execute(batch_size=50) == [1, 2]
+        repository.purge.assert_awaited_once_with(50)
+
+
+class TestMeilisearchVideoIndexStateRepository:
+    """The index is fingerprinted from counts, without reading documents."""
+
+    documents: ClassVar[dict[int, dict[str, int]]] = {
+        3: {"id": 3, "version": 1},
+        5: {"id": 5, "version": 2},
+        # Indexed before versions were added.
+        27: {"id": 27},
+    }
+
+    async def search(self: Self, _: str, **params: Any) -> SimpleNamespace:  # noqa: ANN401
+        bounds = [int(bound) for bound in re.findall(r"\d+", params["filter"])]
+        start, end = bounds[0], bounds[1] if len(bounds) > 1 else None
+        found = [
+            document
+            for id_, document in sorted(self.documents.items())
+            if id_ >= start and (end is None or id_ < end)
+        ]
+        versions = Counter(
+            str(document["version"]) for document in found if "version" in document
+        )
+        return SimpleNamespace(
+            hits=found[: params.get("limit", 20)],
+            total_hits=len(found),
+            facet_distribution={"version": dict(versions)},
+        )
+
+    async def test_fingerprints(self: Self, mocker: MockFixture) -> None:
+        client = mocker.MagicMock()
+        index = client.index.return_value
+        index.search = mocker.AsyncMock(side_effect=self.search)
+        repository = MeilisearchVideoIndexStateRepository(client)
+
+        fingerprints = await repository.get_fingerprints(10)
+
+        assert fingerprints == {
+            0: version_counts_fingerprint({1: 1, 2: 1}),
+            2: version_counts_fingerprint({0: 1}),
+        }
+        # Two searches per non-empty range and a last one finding no more.
+        assert index.search.await_count == 5
+        index.get_documents.assert_not_called()
+
+
+class TestReconcileSearchIndexUseCase:
+    @pytest.fixture
+    def index_state_repo(self: Self, mocker: MockFixture) -> AsyncMock:
+        return mocker.AsyncMock(spec=AbstractVideoIndexStateRepository)
+
+    @pytest.fixture
+    def outbox_repo(self: Self, mocker: MockFixture) -> AsyncMock:
+        repository = mocker.AsyncMock(spec=AbstractOutboxRepository)
+        repository.pending_keys.return_value = {"4"}
+        return repository
+
+    @pytest.fixture(autouse=True)
+    def mock(
+        self: Self,
+        repository: AsyncMock,
+        index_state_repo: AsyncMock,
+        video: Video,
+    ) -> None:
+        repository.get_fingerprints.return_value = {0: "a", 1: "b", 2: "c"}
+        index_state_repo.get_fingerprints.return_value = {0: "a", 1: "x", 3: "d"}
+        repository.get_versions.side_effect = [
+            {10: 1, 11: 2, 12: 1, 4: 1},
+            {20: 1},
+            {},
+        ]
+        index_state_repo.get_versions.side_effect = [
+            {10: 1, 11: 1, 13: 1},
+            {},
+            {30: 1},
+        ]
+        repository.get_by_ids.return_value = [video.model_copy(update={"id": 12})]
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        index_state_repo: AsyncMock,
+        outbox_repo: AsyncMock,
+    ) -> ReconcileSearchIndexUseCase:
+        return ReconcileSearchIndexUseCase(
+            repository,
+            full_text_repository,
+            index_state_repo,
+            outbox_repo,
+            range_size=10,
+        )
+
+    async def test_reconcile(
+        self: Self,
+        usecase: ReconcileSearchIndexUseCase,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        index_state_repo: AsyncMock,
+    ) -> None:
+        drift = await usecase.execute()
+
+        assert (drift.ranges, drift.drifted_ranges) == (4, 3)
+        assert drift.missing == [12, 20]
+        assert drift.stale == [11]
+        assert drift.extra == [13, 30]
+        index_state_repo.get_versions.assert_any_await(10, 20)
+        repository.get_by_ids.assert_awaited_once_with([12, 20, 11, 13, 30])
+        full_text_repository.create_many.assert_awaited_once_with(
+            repository.get_by_ids.return_value,
+        )
+        assert full_text_repository.delete.await_count == 2
+
+    async def test_reconcile_created_meanwhile(
+        self: Self,
+        usecase: ReconcileSearchIndexUseCase,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        video: Video,
+    ) -> None:
+        # Video 30 was created and indexed between the two reads.
+        created = video.model_copy(update={"id": 30})
+        repository.get_by_ids.return_value = [created]
+
+        drift = await usecase.execute()
+
+        assert drift.extra == [13]
+        full_text_repository.create_many.assert_not_awaited()
+        full_text_repository.delete.assert_awaited_once_with(13)
+
+    async def test_reconcile_max_repairs(
+        self: Self,
+        usecase: ReconcileSearchIndexUseCase,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+    ) -> None:
+        usecase.max_repairs = 2
+
+        drift = await usecase.execute()
+
+        assert drift.repairs == 2
+        assert drift.drifted_ranges == 1
+        repository.get_by_ids.assert_awaited_once_with([12, 11])
+        full_text_repository.delete.assert_not_awaited()
+
+
+class TestGetVideoListVersionUseCase:
+    @pytest.fixture(autouse=True)
+    def mock(
+        self: Self,
+        repository: AsyncMock,
+    ) -> None:
+        repository.get_list_version.return_value = 42
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+    ) -> GetVideoListVersionUseCase:
+        return GetVideoListVersionUseCase(repository)
+
+    async def test_get_list_version(
+        self: Self,
+        usecase: GetVideoListVersionUseCase,
+        repository: AsyncMock,
+    ) -> None:
+        assert await usecase.execute() == 42
+        repository.get_list_version.assert_awaited_once()
+
+
 class TestGetVideoBySlugUseCase:
     @pytest.fixture(autouse=True)
     def mock(
@@ -186,8 +638,9 @@ class TestGetVideoBySlugUseCase:
     def usecase(
         self: Self,
         repository: AsyncMock,
+        user_videos_repository: AsyncMock,
     ) -> GetVideoBySlugUseCase:
-        return GetVideoBySlugUseCase(repository)
+        return GetVideoBySlugUseCase(repository, user_videos_repository)
 
     async def test_get_video_by_slug(
         self: Self,
@@ -205,16 +658,19 @@ class TestGetVideoBySlugUseCase:
         usecase: GetVideoBySlugUseCase,
         video: Video,
         repository: AsyncMock,
+        user_videos_repository: AsyncMock,
     ) -> None:
         """Test getting video by slug with user_id parameter."""
-        repository.get_by_slug_with_favorite_mark.return_value = video
+        user_videos_repository.get_liked_video_ids.return_value = {video.id}
 
         db_video = await usecase.execute("slug", user_id="test_user_id")
         assert db_video is video
+        assert db_video.is_favorite is True
 
-        repository.get_by_slug_with_favorite_mark.assert_awaited_once_with(
-            "slug",
+        repository.get_by_slug.assert_awaited_once_with("slug")
+        user_videos_repository.get_liked_video_ids.assert_awaited_once_with(
             "test_user_id",
+            [video.id],
         )
 
     async def test_video_not_found_error(
@@ -246,30 +702,6 @@ class TestCreateVideoUseCase:
     ) -> NewVideoDto:
         return NewVideoDto(**video.model_dump())
 
-    @pytest.fixture
-    def mock_by_slug(
-        self: Self,
-        repository: AsyncMock,
-        video: Video,
-    ) -> None:
-        repository.get_by_slug.return_value = video
-
-    @pytest.fixture
-    def mock_by_yt_id(
-        self: Self,
-        repository: AsyncMock,
-        video: Video,
-    ) -> None:
-        repository.get_by_yt_id.return_value = video
-
-    @pytest.fixture
-    def mock_not_found(
-        self: Self,
-        repository: AsyncMock,
-    ) -> None:
-        repository.get_by_slug.side_effect = VideoNotFoundError
-        repository.get_by_yt_id.side_effect = VideoNotFoundError
-
     @pytest.fixture
     def expand_slug_patch(self: Self, mocker: MockFixture) -> MockType:
         return mocker.patch.object(NewVideoDto, "expand_slug", return_value="")
@@ -287,7 +719,6 @@ class TestCreateVideoUseCase:
             permissions_repo,
         )
 
-    @pytest.mark.usefixtures("mock_not_found")
     async def test_create_video(
         self: Self,
         usecase: CreateVideoUseCase,
@@ -302,36 +733,215 @@ class TestCreateVideoUseCase:
 
         repository.create.assert_awaited_once_with(new_video)
         full_text_repository.create.assert_awaited_once_with(created_video)
-        repository.get_by_slug.assert_awaited_once_with(video.slug)
-        repository.get_by_yt_id.assert_awaited_once_with(video.yt_id)
+        repository.get_by_slug.assert_not_awaited()
+        repository.get_by_yt_id.assert_not_awaited()
         expand_slug_patch.assert_not_called()
 
+    async def test_create_video_permissions(
+        self: Self,
+        usecase: CreateVideoUseCase,
+        new_video: NewVideoDto,
+        video: Video,
+        permissions_repo: AsyncMock,
+    ) -> None:
+        await usecase.execute(new_video)
+
+        resource = Object("video", video.slug)
+        permissions_repo.write_many.assert_awaited_once_with(
+            [
+                RelationshipTuple(
+                    resource, "writer", Object("role", "admin"), "member"
+                ),
+                RelationshipTuple(resource, "reader", Object("user", "*")),
+            ],
+        )
+        permissions_repo.write.assert_not_awaited()
+
+    async def test_create_video_indexes_suggestion(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        suggest_repo: AsyncMock,
+        new_video: NewVideoDto,
+        video: Video,
+    ) -> None:
+        usecase = CreateVideoUseCase(
+            repository,
+            full_text_repository,
+            suggest_repo=suggest_repo,
+        )
+        await usecase.execute(new_video)
+
+        suggest_repo.add.assert_awaited_once_with(video)
+
     async def test_create_video_with_already_existing_slug(
         self: Self,
         usecase: CreateVideoUseCase,
         new_video: NewVideoDto,
+        video: Video,
         repository: AsyncMock,
         expand_slug_patch: MockType,
     ) -> None:
-        """Raise exception if slug is not unique."""
-        repository.get_by_yt_id.side_effect = VideoNotFoundError
+        """Expand the slug and try again if it's taken."""
+        repository.create.side_effect = [VideoSlugNotUniqueError(video.slug), video]
 
-        await usecase.execute(new_video)
+        assert await usecase.execute(new_video) is video
 
         expand_slug_patch.assert_called_once()
+        assert repository.create.await_count == 2
 
-    @pytest.mark.usefixtures("mock_by_yt_id")
     async def test_create_video_with_invalid_yt_id(
         self: Self,
         repository: AsyncMock,
+        full_text_repository: AsyncMock,
         new_video: NewVideoDto,
         usecase: CreateVideoUseCase,
+        expand_slug_patch: MockType,
     ) -> None:
         """Raise exception if yt_id is not unique."""
-        repository.get_by_slug.return_value = None
+        repository.create.side_effect = VideoYtIdNotUniqueError(new_video.yt_id)
+
         with pytest.raises(VideoYtIdNotUniqueError):
             await usecase.execute(new_video)
 
+        expand_slug_patch.assert_not_called()
+        full_text_repository.create.assert_not_awaited()
+
+
+class TestImportVideosUseCase:
+    @pytest.fixture
+    def new_videos(self: Self, faker: Faker) -> list[NewVideoDto]:
+        return [
+            NewVideoDto(
+                title=faker.sentence(),
+                date=faker.date_object(),
+                yt_id=f"yt-{n}",
+                yt_thumbnail=faker.image_url(),
+                duration=faker.pyint(),
+                slug=f"slug-{n}",
+            )
+            for n in range(5)
+        ]
+
+    @pytest.fixture(autouse=True)
+    def mock(self: Self, repository: AsyncMock) -> None:
+        repository.get_taken_yt_ids.return_value = set()
+        repository.get_taken_slugs.return_value = set()
+
+        async def create_many(new_videos: list[NewVideoDto]) -> list[Video]:
+            return [
+                Video(id=n, **new_video.model_dump())
+                for n, new_video in enumerate(new_videos, start=1)
+            ]
+
+        repository.create_many.side_effect = create_many
+
+    @pytest.fixture
+    def usecase(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        permissions_repo: AsyncMock,
+        cache_repo: AsyncMock,
+    ) -> ImportVideosUseCase:
+        return ImportVideosUseCase(
+            repository,
+            full_text_repository,
+            permissions_repo,
+            cache_repo,
+            chunk_size=2,
+        )
+
+    async def test_import_videos(
+        self: Self,
+        usecase: ImportVideosUseCase,
+        new_videos: list[NewVideoDto],
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        permissions_repo: AsyncMock,
+        cache_repo: AsyncMock,
+    ) -> None:
+        results = await usecase.execute(new_videos)
+
+        assert [result.status for result in results] == [
+            VideoImportStatus.CREATED,
+        ] * len(new_videos)
+        repository.get_taken_yt_ids.assert_awaited_once()
+        repository.get_taken_slugs.assert_awaited_once()
+        assert repository.create_many.await_count == 3
+        assert full_text_repository.create_many.await_count == 3
+        assert permissions_repo.write_many.await_count == 3
+        relationships = permissions_repo.write_many.await_args_list[0].args[0]
+        assert len(relationships) == 4
+        cache_repo.purge.assert_awaited_once_with("videos:list")
+
+    async def test_import_videos_with_conflicts(
+        self: Self,
+        usecase: ImportVideosUseCase,
+        new_videos: list[NewVideoDto],
+        repository: AsyncMock,
+    ) -> None:
+        repository.get_taken_yt_ids.return_value = {"yt-0"}
+        repository.get_taken_slugs.return_value = {"slug-1"}
+        new_videos[3].yt_id = "yt-2"
+
+        results = await usecase.execute(new_videos)
+
+        assert [result.status for result in results] == [
+            VideoImportStatus.CONFLICT,
+            VideoImportStatus.CREATED,
+            VideoImportStatus.CREATED,
+            VideoImportStatus.CONFLICT,
+            VideoImportStatus.CREATED,
+        ]
+        assert results[0].detail == "Video with yt_id yt-0 already exists"
+        assert results[1].video is not None
+        assert results[1].video.slug != "slug-1"
+        assert results[1].video.slug.endswith("-slug-1")
+
+    async def test_import_videos_lost_race(
+        self: Self,
+        usecase: ImportVideosUseCase,
+        new_videos: list[NewVideoDto],
+        repository: AsyncMock,
+        cache_repo: AsyncMock,
+    ) -> None:
+        repository.create_many.side_effect = None
+        repository.create_many.return_value = []
+        repository.get_taken_yt_ids.side_effect = [set(), {"yt-0"}]
+
+        results = await usecase.execute(new_videos[:1])
+
+        assert results[0].status == VideoImportStatus.CONFLICT
+        assert results[0].detail == "Video with yt_id yt-0 already exists"
+        repository.create_many.assert_awaited_once()
+        cache_repo.purge.assert_awaited_once_with("videos:list")
+
+    async def test_import_videos_lost_slug_race(
+        self: Self,
+        usecase: ImportVideosUseCase,
+        new_videos: list[NewVideoDto],
+        repository: AsyncMock,
+    ) -> None:
+        create_many = repository.create_many.side_effect
+
+        async def lose_first_slug(videos: list[NewVideoDto]) -> list[Video]:
+            return [
+                video for video in await create_many(videos) if video.slug != "slug-0"
+            ]
+
+        repository.create_many.side_effect = lose_first_slug
+        repository.get_taken_yt_ids.side_effect = [set(), set()]
+
+        results = await usecase.execute(new_videos[:2])
+
+        assert [result.status for result in results] == [
+            VideoImportStatus.CREATED,
+        ] * 2
+        assert results[0].video is not None
+        assert results[0].video.slug.endswith("-slug-0")
+        assert repository.create_many.await_count == 2
+
 
 class TestUpdateVideoUseCase:
     @pytest.fixture(autouse=True)
@@ -374,9 +984,30 @@ class TestUpdateVideoUseCase:
         assert result == video
 
         repository.update.assert_awaited_once_with(update_video)
-        full_text_repository.update.assert_awaited_once_with(video.id, update_video)
+        full_text_repository.update.assert_awaited_once_with(
+            video.id,
+            update_video,
+            video.version,
+        )
         repository.get_by_slug.assert_awaited_once_with(update_video.slug)
 
+    async def test_update_video_purges_cache(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        cache_repo: AsyncMock,
+        update_video: UpdateVideoDto,
+        video: Video,
+    ) -> None:
+        usecase = UpdateVideoUseCase(
+            repository,
+            full_text_repository,
+            cache_repo=cache_repo,
+        )
+        await usecase.execute(update_video)
+
+        cache_repo.purge.assert_awaited_once_with(f"video:{video.id}", "videos:list")
+
     async def test_update_video_dont_exist(
         self: Self,
         usecase: UpdateVideoUseCase,
@@ -481,10 +1112,8 @@ class TestDeleteVideoUseCase:
             type_=DeleteType.PERMANENT,
         )
         full_text_repository.delete.assert_awaited_once_with(video.id)
-        # Should remove both reader and writer permissions for permanent deletion
-        assert permissions_repo.delete.await_count == 2
-        permissions_repo.delete.assert_any_await(Object("video", video.slug), "reader")
-        permissions_repo.delete.assert_any_await(Object("video", video.slug), "writer")
+        # Should remove every relationship in one request for permanent deletion
+        permissions_repo.delete.assert_awaited_once_with(Object("video", video.slug))
 
     async def test_soft_delete_already_soft_deleted_video_raises_exception(
         self: Self,
@@ -539,6 +1168,26 @@ class TestDeleteVideoUseCase:
         )
         full_text_repository.delete.assert_awaited_once_with(video.id)
 
+    @pytest.mark.parametrize("type_", [DeleteType.TEMPORARY, DeleteType.PERMANENT])
+    async def test_delete_video_drops_suggestion(
+        self: Self,
+        repository: AsyncMock,
+        full_text_repository: AsyncMock,
+        suggest_repo: AsyncMock,
+        video: Video,
+        type_: DeleteType,
+    ) -> None:
+        usecase = DeleteVideoUseCase(
+            repository,
+            full_text_repository,
+            suggest_repo=suggest_repo,
+        )
+        repository.get_by_id.return_value = video
+
+        await usecase.execute(video.id, type_)
+
+        suggest_repo.remove.assert_awaited_once_with(video.id)
+
 
 class TestRestoreVideoUseCase:
     @pytest.fixture(autouse=True)
@@ -577,10 +1226,14 @@ class TestRestoreVideoUseCase:
         assert result == video
         repository.restore.assert_awaited_once_with(video.id)
         full_text_repository.restore.assert_awaited_once_with(video)
-        permissions_repo.write.assert_awaited_once_with(
-            Object("video", video.slug),
-            "reader",
-            Object("user", "*"),
+        permissions_repo.write_many.assert_awaited_once_with(
+            [
+                RelationshipTuple(
+                    Object("video", video.slug),
+                    "reader",
+                    Object("user", "*"),
+                ),
+            ],
         )
 
     async def test_restore_video_not_found(